@@ -5,49 +5,19 @@ Analyze vocal waveform dynamics to find loud/quiet sections.
 import sys
 from pathlib import Path
 import numpy as np
-import soundfile as sf
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from flaas.audio_io import read_audio_info
+from flaas.analyze import analyze_wav, window_levels
+from flaas.audio_io import DEFAULT_BLOCK_SIZE
 
 def analyze_dynamics(wav_path: Path):
     """Analyze waveform dynamics and identify problem areas."""
     
-    # Read audio
-    data, sr = sf.read(wav_path)
-    
-    # Convert to mono if stereo
-    if len(data.shape) > 1:
-        mono = np.mean(data, axis=1)
-    else:
-        mono = data
-    
-    # Calculate RMS over 1-second windows
-    window_size = sr  # 1 second
-    hop_size = sr // 2  # 0.5 second hop
-    
-    num_windows = (len(mono) - window_size) // hop_size + 1
-    
-    rms_values = []
-    peak_values = []
-    timestamps = []
-    
-    for i in range(num_windows):
-        start = i * hop_size
-        end = start + window_size
-        window = mono[start:end]
-        
-        rms = np.sqrt(np.mean(window ** 2))
-        peak = np.max(np.abs(window))
-        
-        rms_db = 20 * np.log10(rms) if rms > 0 else -np.inf
-        peak_db = 20 * np.log10(peak) if peak > 0 else -np.inf
-        
-        rms_values.append(rms_db)
-        peak_values.append(peak_db)
-        timestamps.append(start / sr)
+    # Single streamed pass; 100 ms timelines re-windowed to 1 s windows, 0.5 s hop
+    analysis = analyze_wav(wav_path, block_size=DEFAULT_BLOCK_SIZE, timelines=True)
+    timestamps, rms_values, peak_values = window_levels(analysis.timelines, window_sec=1.0, hop_sec=0.5)
     
     rms_values = np.array(rms_values)
     peak_values = np.array(peak_values)
@@ -83,7 +53,7 @@ def analyze_dynamics(wav_path: Path):
         "peak_max": peak_max,
         "loud_sections": loud_sections[:10],  # Top 10
         "quiet_sections": quiet_sections[:10],  # Bottom 10
-        "duration": len(mono) / sr,
+        "duration": analysis.duration_sec,
     }
 
 def main():
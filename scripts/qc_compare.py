@@ -17,86 +17,22 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
 import sys
 from pathlib import Path
 
-import numpy as np
-import soundfile as sf
-
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from flaas.analyze import analyze_wav
+from flaas.audio_io import DEFAULT_BLOCK_SIZE
 
 
-def load_stereo_interleaved(path: str | Path) -> tuple[np.ndarray, int]:
-    """Load audio as float32 interleaved stereo for pyebur128."""
-    data, sr = sf.read(str(path), dtype="float32", always_2d=True)
-    if data.shape[1] == 1:
-        # Mono: duplicate to stereo
-        data = np.column_stack([data[:, 0], data[:, 0]])
-    # Interleave: [L0,R0,L1,R1,...]
-    interleaved = data.flatten(order="F")
-    return interleaved, int(sr)
-
-
-def compute_ebur128_metrics(path: str | Path) -> dict:
-    """Compute short-term, momentary via pyebur128. LRA via pyloudnorm (more reliable)."""
-    result = {}
-
-    # LRA from pyloudnorm (BS.1770 compliant, no mode flags needed)
-    try:
-        import pyloudnorm as pyln
-        from flaas.audio_io import read_mono_float
-        mono, sr = read_mono_float(path)
-        meter = pyln.Meter(sr)
-        result["lra"] = float(meter.loudness_range(mono))
-    except Exception as e:
-        result["lra_error"] = str(e)
-
-    # Short-term, momentary from pyebur128 (requires MODE_S, MODE_M)
-    try:
-        import pyebur128
-    except ImportError:
-        return result
-
-    interleaved, sr = load_stereo_interleaved(path)
-    channels = 2
-    # MODE_I=5, MODE_S=3, MODE_M=1 (from pyebur128) - avoid MODE_LRA which needs extra flag
-    mode = 5 | 3 | 1  # I | S | M
-    state = pyebur128.R128State(channels, sr, mode)
-
-    chunk = 4096
-    n_frames = len(interleaved) // channels
-    n_chunks = (n_frames + chunk - 1) // chunk
-
-    for i in range(n_chunks):
-        start = i * chunk * channels
-        end = min((i + 1) * chunk * channels, len(interleaved))
-        frames = (end - start) // channels
-        if frames <= 0:
-            break
-        state.add_frames(interleaved[start:end], frames)
-
-    try:
-        result["lufs_shortterm"] = float(pyebur128.get_loudness_shortterm(state))
-    except ValueError:
-        pass
-    try:
-        result["lufs_momentary"] = float(pyebur128.get_loudness_momentary(state))
-    except ValueError:
-        pass
-
-    return result
-
-
-def compute_crest_factor(mono: np.ndarray) -> float:
-    """Crest factor = peak / RMS (higher = more dynamic)."""
-    rms = np.sqrt(np.mean(mono**2))
-    if rms == 0:
-        return 0.0
-    peak = np.max(np.abs(mono))
-    return float(peak / rms)
+def _round_finite(x: float | None, nd: int = 2) -> float | None:
+    """Round for JSON; None for missing/NaN/-inf (e.g. LRA on silence)."""
+    if x is None or not math.isfinite(x):
+        return None
+    return round(x, nd)
 
 
 def gain_match_simulation(
@@ -150,17 +86,9 @@ def main():
         print(f"Error: File not found: {path}", file=sys.stderr)
         sys.exit(1)
 
-    # Use flaas analyze for consistency
-    analysis = analyze_wav(path)
-
-    # Extended metrics
-    ebur = compute_ebur128_metrics(path)
-    if "error" in ebur:
-        ebur = {}
-
-    from flaas.audio_io import read_mono_float
-    mono, _ = read_mono_float(path)
-    crest = compute_crest_factor(mono)
+    # One decode + one K-weighting pass: I/S/M loudness, LRA, crest, true peak
+    analysis = analyze_wav(path, block_size=DEFAULT_BLOCK_SIZE)
+    crest = analysis.crest_factor
 
     # Gain-match simulation
     targets = [-14.0, -9.0]
@@ -197,9 +125,11 @@ def main():
         "lufs_i": round(analysis.lufs_i, 2),
         "true_peak_dbtp": round(analysis.true_peak_dbtp, 2),
         "peak_dbfs": round(analysis.peak_dbfs, 2),
-        "lra": round(ebur.get("lra", 0), 2) if ebur else None,
-        "lufs_shortterm": round(ebur.get("lufs_shortterm", 0), 2) if ebur else None,
-        "lufs_momentary": round(ebur.get("lufs_momentary", 0), 2) if ebur else None,
+        "lra": _round_finite(analysis.lra),
+        "lufs_shortterm": _round_finite(analysis.lufs_s_last),
+        "lufs_momentary": _round_finite(analysis.lufs_m_last),
+        "lufs_shortterm_max": _round_finite(analysis.lufs_s_max),
+        "lufs_momentary_max": _round_finite(analysis.lufs_m_max),
         "crest_factor": round(crest, 2),
         "intended_mode": intended_mode,
         "intended_target_lufs": intended_target,
@@ -227,16 +157,19 @@ def main():
     print(f"  LUFS (integrated):  {analysis.lufs_i:.2f}")
     print(f"  True Peak:          {analysis.true_peak_dbtp:.2f} dBTP")
     print(f"  Peak (sample):      {analysis.peak_dbfs:.2f} dBFS")
-    if ebur:
-        if ebur.get("lra") is not None:
-            print(f"  LRA:                {ebur['lra']:.2f} LU")
-        # Short-term/momentary are "last window" - may be silence at tail
-        st = ebur.get("lufs_shortterm")
-        mo = ebur.get("lufs_momentary")
-        if st is not None and st > -80:
-            print(f"  Short-term (3s):    {st:.2f} LUFS (last window)")
-        if mo is not None and mo > -80:
-            print(f"  Momentary (400ms): {mo:.2f} LUFS (last window)")
+    if report["lra"] is not None:
+        print(f"  LRA:                {analysis.lra:.2f} LU")
+    # Short-term/momentary "last window" may be silence at tail; max is over the whole file
+    st = analysis.lufs_s_last
+    mo = analysis.lufs_m_last
+    if st is not None and st > -80:
+        print(f"  Short-term (3s):    {st:.2f} LUFS (last window)")
+    if mo is not None and mo > -80:
+        print(f"  Momentary (400ms): {mo:.2f} LUFS (last window)")
+    if report["lufs_shortterm_max"] is not None:
+        print(f"  Short-term max:     {analysis.lufs_s_max:.2f} LUFS")
+    if report["lufs_momentary_max"] is not None:
+        print(f"  Momentary max:      {analysis.lufs_m_max:.2f} LUFS")
     print(f"  Crest factor:       {crest:.2f}")
     print()
 
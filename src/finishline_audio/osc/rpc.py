@@ -1,64 +1,158 @@
 from __future__ import annotations
 import threading
 import time
+from concurrent.futures import Future, wait
 from dataclasses import dataclass
-from queue import Queue, Empty
-from typing import Any, Tuple
+from typing import Any, Iterable, List, Sequence, Tuple
 
 from pythonosc import udp_client
 from pythonosc.dispatcher import Dispatcher
 from pythonosc.osc_server import ThreadingOSCUDPServer
 
+from osc_common.rtt import RttEstimator, backoff_delay, clip_timeout, deadline_expired, timeout_error
+from osc_common.trace import current_tracer, record_rpc
+
+POLL_INTERVAL_S = 0.02  # serve_forever shutdown latency (default 0.5 s)
+
 @dataclass(frozen=True)
 class OscConfig:
     host: str
     port_in: int
     port_out: int
-    timeout_s: float = 1.0
+    timeout_s: float = 1.0  # first wait per endpoint class; adapts to measured RTT after that
     retries: int = 2
 
+class RpcFuture(Future):
+    """Future for one in-flight request; keeps what is needed to resend it."""
+    def __init__(self, address: str, args: Tuple[Any, ...], expect: str, key: Tuple[Any, ...]):
+        super().__init__()
+        self.address = address
+        self.args = args
+        self.expect = expect
+        self.key = key
+        self.retries = 0
+        self.sent = time.perf_counter()
+        self.last_sent = self.sent
+
 class OscRpc:
     """Minimal request/response OSC helper for AbletonOSC.
 
     AbletonOSC listens on port_in and replies to port_out.
+
+    Any number of requests can be in flight. A reply is matched to the oldest
+    pending request with the same reply address whose leading args (track_id,
+    device_id, ...) it echoes; replies nobody is waiting for are dropped.
+
+    Waits follow a per-endpoint-class RTT estimate (osc_common.rtt), and resends
+    back off with jitter; an active osc_common.rtt.deadline() caps the total.
     """
     def __init__(self, cfg: OscConfig):
         self.cfg = cfg
         self.client = udp_client.SimpleUDPClient(cfg.host, cfg.port_in)
-        self._q: "Queue[Tuple[str, Tuple[Any, ...]]]" = Queue()
         self._server: ThreadingOSCUDPServer | None = None
         self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._pending: dict[str, List[RpcFuture]] = {}
+        self.rtt = RttEstimator(initial_rto=cfg.timeout_s)
 
     def start(self) -> None:
         disp = Dispatcher()
         disp.set_default_handler(self._on_msg)
         self._server = ThreadingOSCUDPServer(("0.0.0.0", self.cfg.port_out), disp)
-        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(POLL_INTERVAL_S,), daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
         if self._server is not None:
             self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            pending = [f for waiting in self._pending.values() for f in waiting]
+            self._pending.clear()
+        for f in pending:
+            if f.set_running_or_notify_cancel():
+                f.set_exception(ConnectionError("OSC RPC stopped"))
 
     def _on_msg(self, address: str, *args: Any) -> None:
-        self._q.put((address, args))
+        with self._lock:
+            waiting = self._pending.get(address, [])
+            for i, f in enumerate(waiting):
+                if args[:len(f.key)] == f.key:
+                    del waiting[i]
+                    break
+            else:
+                return
+        if f.set_running_or_notify_cancel():
+            if f.retries == 0:  # a reply to a resend could answer either copy (Karn)
+                self.rtt.observe(f.address, time.perf_counter() - f.sent)
+            f.set_result(tuple(args))
 
-    def call(self, address: str, *args: Any, expect: str | None = None) -> Tuple[Any, ...]:
-        expect_addr = expect or address
-        last_err: Exception | None = None
+    def _forget(self, f: RpcFuture) -> None:
+        with self._lock:
+            waiting = self._pending.get(f.expect, [])
+            if f in waiting:
+                waiting.remove(f)
+
+    def submit(
+        self,
+        address: str,
+        *args: Any,
+        expect: str | None = None,
+        match: int | None = None,
+    ) -> RpcFuture:
+        """Send a request and return a Future for its reply args.
 
-        for _ in range(self.cfg.retries + 1):
-            self.client.send_message(address, list(args))
-            t0 = time.time()
+        `match` is how many leading request args the reply echoes. Default: all
+        of them, or none when the reply comes back on a different `expect`
+        address. The future is not retried or timed out; see gather().
+        """
+        if match is None:
+            match = len(args) if expect is None else 0
+        f = RpcFuture(address, tuple(args), expect or address, tuple(args[:match]))
+        with self._lock:
+            self._pending.setdefault(f.expect, []).append(f)
+        f.add_done_callback(self._forget)  # cancelled/stopped futures stop matching
+        tracer = current_tracer()
+        if tracer is not None:
+            f.add_done_callback(lambda f: record_rpc(
+                tracer, f.address, list(f.args), f.sent, time.perf_counter(),
+                timeout=f.cancelled(), retries=f.retries, transport="finishline"))
+        self.client.send_message(address, list(args))
+        return f
 
-            while (time.time() - t0) < self.cfg.timeout_s:
-                try:
-                    addr, a = self._q.get(timeout=0.05)
-                except Empty:
-                    continue
-                if addr == expect_addr:
-                    return a
+    def gather(self, futures: Sequence[RpcFuture]) -> List[Tuple[Any, ...]]:
+        """Wait for submitted requests, resending the unanswered ones up to cfg.retries times.
 
-            last_err = TimeoutError(f"OSC timeout waiting for {expect_addr}")
+        Each attempt waits the slowest pending class's RTO; resends go out
+        after a jittered backoff.
+        """
+        not_done: set = set(futures)
+        for attempt in range(self.cfg.retries + 1):
+            rto = max(self.rtt.timeout(f.address) for f in not_done)
+            _, not_done = wait(not_done, timeout=clip_timeout(rto))
+            if not not_done:
+                break
+            for f in not_done:
+                self.rtt.on_timeout(f.address, f.last_sent)
+            if attempt < self.cfg.retries:
+                _, not_done = wait(not_done, timeout=clip_timeout(backoff_delay(attempt)))
+                if not not_done or deadline_expired():
+                    break
+                for f in not_done:
+                    f.retries += 1
+                    f.last_sent = time.perf_counter()
+                    self.client.send_message(f.address, list(f.args))
+        if not_done:
+            missing = [f.expect for f in futures if f in not_done]
+            for f in not_done:
+                f.cancel()
+            raise timeout_error(f"OSC timeout waiting for {', '.join(missing)}")
+        return [f.result() for f in futures]
 
-        raise last_err  # type: ignore[misc]
+    def call_many(self, requests: Iterable[Tuple[str, Sequence[Any]]]) -> List[Tuple[Any, ...]]:
+        """Issue all (address, args) requests at once; one round-trip of latency for the batch."""
+        return self.gather([self.submit(address, *args) for address, args in requests])
+
+    def call(self, address: str, *args: Any, expect: str | None = None) -> Tuple[Any, ...]:
+        return self.gather([self.submit(address, *args, expect=expect)])[0]
@@ -3,10 +3,24 @@ import json
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 import numpy as np
-import pyloudnorm as pyln
 
-from flaas.audio_io import read_audio_info, read_mono_float
+from flaas.audio_io import DEFAULT_BLOCK_SIZE, AudioData, read_audio_info, read_blocks
+from flaas.meter import StreamingMeter, channel_weights
+from flaas.session import AudioSession
+
+if TYPE_CHECKING:
+    from flaas.cache import AnalysisCache
+
+@dataclass
+class Timelines:
+    """Per-segment series (one value every hop_sec). Loudness windows end at each hop."""
+    hop_sec: float
+    momentary_lufs: list[float]
+    shortterm_lufs: list[float]
+    rms_dbfs: list[float]
+    peak_dbfs: list[float]
 
 @dataclass
 class AnalysisResult:
@@ -19,30 +33,49 @@ class AnalysisResult:
     true_peak_dbtp: float
     lufs_i: float
     created_at_utc: str
+    # Extended metrics (same traversal)
+    lufs_s_max: float | None = None
+    lufs_m_max: float | None = None
+    lufs_s_last: float | None = None
+    lufs_m_last: float | None = None
+    lra: float | None = None
+    rms_dbfs: float | None = None
+    crest_factor: float | None = None
+    # Per-channel (file channel order)
+    channel_peak_dbfs: list[float] | None = None
+    channel_true_peak_dbtp: list[float] | None = None
+    timelines: Timelines | None = None
 
-def analyze_wav(path: str | Path) -> AnalysisResult:
-    info = read_audio_info(path)
-    mono, sr = read_mono_float(path)
-    if mono.size == 0:
-        raise ValueError("empty audio")
+def _new_meter(info: AudioData) -> StreamingMeter:
+    return StreamingMeter(info.sr, info.channels, channel_weights(info.channels, info.channel_mask))
 
-    # Sample peak
-    peak = float(np.max(np.abs(mono)))
-    peak_dbfs = -float("inf") if peak == 0.0 else float(20.0 * np.log10(peak))
+def _meter_wav(path: str | Path, info: AudioData, block_size: int | None) -> StreamingMeter:
+    meter = _new_meter(info)
+    for block in read_blocks(path, block_size or DEFAULT_BLOCK_SIZE):
+        meter.process(block)
+    return meter
 
-    # True peak (4x oversampling approximation)
-    # NOTE: This is an APPROXIMATION, not a full ITU-R BS.1770-4 implementation
-    # Proper true peak requires: 4x oversample + proper lowpass filter + inter-sample peak detection
-    # TODO: Validate against reference meter (Youlean, ffmpeg ebur128=peak=true)
-    # See: tests/validate_true_peak.py for validation methodology
-    from scipy import signal
-    oversampled = signal.resample(mono, len(mono) * 4)
-    true_peak = float(np.max(np.abs(oversampled)))
-    true_peak_dbtp = -float("inf") if true_peak == 0.0 else float(20.0 * np.log10(true_peak))
+def _last_max(x: np.ndarray) -> tuple[float, float]:
+    if x.size == 0:
+        return -float("inf"), -float("inf")
+    return float(x[-1]), float(np.max(x))
+
+def result_from_meter(info: AudioData, meter: StreamingMeter, timelines: bool = False) -> AnalysisResult:
+    """Build an AnalysisResult from a meter that has consumed all of `info`'s samples."""
+    momentary = meter.momentary_lufs()
+    shortterm = meter.shortterm_lufs()
+    lufs_m_last, lufs_m_max = _last_max(momentary)
+    lufs_s_last, lufs_s_max = _last_max(shortterm)
 
-    # LUFS-I (BS.1770)
-    meter = pyln.Meter(sr)
-    lufs_i = float(meter.integrated_loudness(mono))
+    tl = None
+    if timelines:
+        tl = Timelines(
+            hop_sec=meter.hop / meter.sr,
+            momentary_lufs=momentary.tolist(),
+            shortterm_lufs=shortterm.tolist(),
+            rms_dbfs=meter.rms_timeline().tolist(),
+            peak_dbfs=meter.peak_timeline().tolist(),
+        )
 
     dur = info.samples / info.sr
     return AnalysisResult(
@@ -51,15 +84,103 @@ def analyze_wav(path: str | Path) -> AnalysisResult:
         channels=info.channels,
         samples=info.samples,
         duration_sec=float(dur),
-        peak_dbfs=peak_dbfs,
-        true_peak_dbtp=true_peak_dbtp,
-        lufs_i=lufs_i,
+        peak_dbfs=meter.peak_dbfs,
+        true_peak_dbtp=meter.true_peak_dbtp,
+        lufs_i=float(meter.integrated_loudness()),
         created_at_utc=datetime.now(timezone.utc).isoformat(),
+        lufs_s_max=lufs_s_max,
+        lufs_m_max=lufs_m_max,
+        lufs_s_last=lufs_s_last,
+        lufs_m_last=lufs_m_last,
+        lra=meter.loudness_range(),
+        rms_dbfs=meter.rms_dbfs,
+        crest_factor=meter.crest_factor,
+        channel_peak_dbfs=meter.channel_peak_dbfs(),
+        channel_true_peak_dbtp=meter.channel_true_peak_dbtp(),
+        timelines=tl,
     )
 
-def write_analysis(path_in: str | Path, path_out: str | Path = "data/reports/analysis.json") -> Path:
+def analyze_wav(
+    path: str | Path | AudioSession,
+    block_size: int | None = None,
+    timelines: bool = False,
+    cache: AnalysisCache | None = None,
+) -> AnalysisResult:
+    """
+    Measure peak, true peak (4x oversampled), LUFS-I/S/M, LRA and crest factor
+    in a single decode and K-weighting pass.
+
+    Loudness is BS.1770 channel-weighted (all channels K-weighted together,
+    LFE excluded, surrounds x1.41); peaks are also reported per channel.
+    The file is metered in blocks of block_size frames (None = 65536), so
+    memory stays bounded; every block size gives identical results.
+    timelines=True also returns the 100 ms momentary/short-term/RMS/peak series.
+    With a cache, unchanged files are served from disk without decoding.
+
+    Passing an AudioSession reuses its decoded/K-weighted arrays and memoizes
+    the result on the session (block_size is ignored).
+    """
+    session = path if isinstance(path, AudioSession) else None
+    src = session.path if session is not None else path
+    variant = "timelines" if timelines else ""
+    if session is not None:
+        # A timelines result also satisfies a plain request
+        for v in (variant, "timelines"):
+            if v in session.analyses:
+                return session.analyses[v]
+    if cache is not None:
+        hit = cache.get(src, variant)
+        if hit is not None:
+            if session is not None:
+                session.analyses[variant] = hit
+            return hit
+
+    info = session.info if session is not None else read_audio_info(src)
+    if info.samples == 0:
+        raise ValueError("empty audio")
+
+    # True peak: BS.1770-4 Annex 2 polyphase 4x interpolation (flaas.true_peak)
+    # See: tests/validate_true_peak.py for validation methodology
+    if session is not None:
+        meter = _new_meter(info)
+        meter.process(session.audio, k_weighted=session.k_weighted)
+    else:
+        meter = _meter_wav(src, info, block_size)
+
+    res = result_from_meter(info, meter, timelines)
+    if cache is not None:
+        cache.put(src, res, variant)
+    if session is not None:
+        session.analyses[variant] = res
+    return res
+
+def window_levels(tl: Timelines, window_sec: float = 1.0, hop_sec: float = 0.5) -> tuple[list[float], list[float], list[float]]:
+    """
+    Re-window the 100 ms RMS/peak timelines (power-averaged RMS, max peak).
+
+    window_sec and hop_sec are rounded to whole segments.
+    Returns (start_times_sec, rms_dbfs, peak_dbfs).
+    """
+    win = max(1, int(round(window_sec / tl.hop_sec)))
+    hop = max(1, int(round(hop_sec / tl.hop_sec)))
+    power = np.power(10.0, np.asarray(tl.rms_dbfs) / 10.0)
+    peak = np.asarray(tl.peak_dbfs)
+    starts, rms_out, peak_out = [], [], []
+    for i in range(0, len(power) - win + 1, hop):
+        with np.errstate(divide="ignore"):
+            rms_out.append(float(10.0 * np.log10(np.mean(power[i:i + win]))))
+        peak_out.append(float(np.max(peak[i:i + win])))
+        starts.append(i * tl.hop_sec)
+    return starts, rms_out, peak_out
+
+def write_analysis(
+    path_in: str | Path,
+    path_out: str | Path = "data/reports/analysis.json",
+    block_size: int | None = None,
+    cache: AnalysisCache | None = None,
+) -> Path:
     out = Path(path_out)
     out.parent.mkdir(parents=True, exist_ok=True)
-    res = analyze_wav(path_in)
+    res = analyze_wav(path_in, block_size=block_size, cache=cache)
     out.write_text(json.dumps(asdict(res), indent=2) + "\n", encoding="utf-8")
     return out
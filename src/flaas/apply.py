@@ -2,12 +2,13 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from pythonosc.udp_client import SimpleUDPClient
 
-from flaas.osc_rpc import OscTarget, request_once
-from flaas.param_map import get_param_range, linear_to_norm
-from flaas.scan import scan_live
+from flaas.observe import expect_param, read_param_value
+from flaas.osc_rpc import OscTarget, client_for
+from flaas.param_map import get_param_table
+from flaas.scan import load_model_cache, scan_live, scan_live_incremental
 from flaas.targets import MASTER_TRACK_ID, resolve_utility_device_id
+from osc_common.rtt import deadline
 
 @dataclass(frozen=True)
 class LoadedAction:
@@ -17,6 +18,7 @@ class LoadedAction:
     delta_db: float  # "linear delta" for Utility Gain (-1..+1)
 
 UTILITY_GAIN_PARAM_ID = 9
+APPLY_BUDGET_S = 30.0  # fingerprint scan + param table + reads, retries included
 
 def _read_actions_file(path: str | Path) -> tuple[str | None, list[LoadedAction]]:
     p = Path(path)
@@ -43,35 +45,46 @@ def apply_actions_osc(
     actions_path: str | Path = "data/actions/actions.json",
     target: OscTarget = OscTarget(),
     enforce_fingerprint: bool = True,
+    model_cache: str | Path | None = "data/caches/model_cache.json",
+    budget_sec: float | None = APPLY_BUDGET_S,
 ) -> None:
     """
     MVP apply: supports MASTER Utility Gain as a RELATIVE delta.
     Uses MASTER_TRACK_ID (-1000) and dynamically resolves Utility device index.
+
+    If the model cache holds a full scan with the expected fingerprint, the
+    fingerprint check is an incremental scan against it (probes only).
+    Every OSC wait, retries included, shares one budget_sec deadline.
     """
-    expected_fp, actions = _read_actions_file(actions_path)
+    with deadline(budget_sec, "apply_actions_osc"):
+        expected_fp, actions = _read_actions_file(actions_path)
 
-    if enforce_fingerprint and expected_fp:
-        current_fp = scan_live(target=target).fingerprint
-        if current_fp != expected_fp:
-            raise RuntimeError(f"Live fingerprint mismatch: expected {expected_fp}, got {current_fp}")
+        if enforce_fingerprint and expected_fp:
+            previous = load_model_cache(model_cache) if model_cache else None
+            if previous is not None and previous.ok and previous.track_ids is None and previous.fingerprint == expected_fp:
+                current_fp = scan_live_incremental(previous, target=target).fingerprint
+            else:
+                current_fp = scan_live(target=target).fingerprint
+            if current_fp != expected_fp:
+                raise RuntimeError(f"Live fingerprint mismatch: expected {expected_fp}, got {current_fp}")
 
-    # Resolve Utility device ID on master track
-    track_id = MASTER_TRACK_ID
-    device_id = resolve_utility_device_id(target)
+        # Resolve Utility device ID on master track
+        track_id = MASTER_TRACK_ID
+        device_id = resolve_utility_device_id(target)
 
-    client = SimpleUDPClient(target.host, target.port)
-    pr = get_param_range(track_id, device_id, UTILITY_GAIN_PARAM_ID, target=target)
+        client = client_for(target)
+        table = get_param_table(track_id, device_id, target=target)  # fetched once per session
 
-    for a in actions:
-        if a.track_role == "MASTER" and a.device == "Utility" and a.param == "Gain":
-            cur = request_once(target, "/live/device/get/parameter/value", [track_id, device_id, UTILITY_GAIN_PARAM_ID], timeout_sec=3.0)
-            cur_norm = float(cur[3])
-            cur_linear = pr.min + cur_norm * (pr.max - pr.min)
+        for a in actions:
+            if a.track_role == "MASTER" and a.device == "Utility" and a.param == "Gain":
+                cur_norm = read_param_value(track_id, device_id, UTILITY_GAIN_PARAM_ID, target)
+                cur_linear = table.norm_to_linear(cur_norm, UTILITY_GAIN_PARAM_ID)
 
-            new_linear = cur_linear + float(a.delta_db)
-            new_norm = linear_to_norm(new_linear, pr)
+                new_linear = cur_linear + float(a.delta_db)
+                new_norm = table.linear_to_norm(new_linear, UTILITY_GAIN_PARAM_ID)
 
-            client.send_message("/live/device/set/parameter/value", [track_id, device_id, UTILITY_GAIN_PARAM_ID, float(new_norm)])
-            print(f"APPLIED: Utility.Gain {cur_linear:.3f} -> {new_linear:.3f} (norm {cur_norm:.3f}->{new_norm:.3f})")
-        else:
-            print(f"SKIP: unsupported action {a}")
+                expect_param(track_id, device_id, UTILITY_GAIN_PARAM_ID, new_norm, target)
+                client.send_message("/live/device/set/parameter/value", [track_id, device_id, UTILITY_GAIN_PARAM_ID, float(new_norm)])
+                print(f"APPLIED: Utility.Gain {cur_linear:.3f} -> {new_linear:.3f} (norm {cur_norm:.3f}->{new_norm:.3f})")
+            else:
+                print(f"SKIP: unsupported action {a}")
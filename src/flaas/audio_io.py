@@ -1,6 +1,8 @@
 from __future__ import annotations
+import struct
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
 import soundfile as sf
 import numpy as np
 
@@ -10,9 +12,154 @@ class AudioData:
     sr: int
     channels: int
     samples: int
+    channel_mask: int = 0  # WAVE_FORMAT_EXTENSIBLE speaker bits (0 = unknown)
+
+DEFAULT_BLOCK_SIZE = 65536
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+@dataclass(frozen=True)
+class WavLayout:
+    """Where and how the sample data sits in a RIFF/WAVE file."""
+    path: str
+    sr: int
+    channels: int
+    frames: int
+    format_tag: int      # WAVE_FORMAT_PCM or WAVE_FORMAT_IEEE_FLOAT (EXTENSIBLE resolved)
+    bits: int            # container bits per sample
+    block_align: int
+    data_offset: int
+    channel_mask: int = 0
+
+def parse_wav_header(path: str | Path, trust_data_size: bool = True) -> WavLayout | None:
+    """
+    Parse RIFF/WAVE chunks (PCM, IEEE float, WAVE_FORMAT_EXTENSIBLE).
+
+    Returns None for anything this reader does not handle (non-RIFF, RF64,
+    compressed formats) so callers can fall back to soundfile. A data chunk
+    size larger than the file (export still being written) is clamped.
+    trust_data_size=False ignores the declared size and takes everything up
+    to EOF, for writers that only patch the header when they finish.
+    """
+    p = Path(path)
+    file_size = p.stat().st_size
+    with p.open("rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            return None
+        fmt = None
+        pos = 12
+        while pos + 8 <= file_size:
+            f.seek(pos)
+            cid, size = struct.unpack("<4sI", f.read(8))
+            if cid == b"fmt ":
+                fmt = f.read(min(size, 40))
+            elif cid == b"data":
+                if fmt is None or len(fmt) < 16:
+                    return None
+                tag, channels, sr, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+                mask = 0
+                if tag == WAVE_FORMAT_EXTENSIBLE:
+                    if len(fmt) < 40:
+                        return None
+                    mask = struct.unpack("<I", fmt[20:24])[0]
+                    tag = struct.unpack("<H", fmt[24:26])[0]  # first field of SubFormat GUID
+                if tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) or channels == 0 or block_align == 0:
+                    return None
+                if tag == WAVE_FORMAT_PCM and bits not in (8, 16, 24, 32):
+                    return None
+                if tag == WAVE_FORMAT_IEEE_FLOAT and bits not in (32, 64):
+                    return None
+                data_offset = pos + 8
+                size = min(size, file_size - data_offset) if trust_data_size else file_size - data_offset
+                return WavLayout(
+                    path=str(p),
+                    sr=int(sr),
+                    channels=int(channels),
+                    frames=int(size // block_align),
+                    format_tag=int(tag),
+                    bits=int(bits),
+                    block_align=int(block_align),
+                    data_offset=int(data_offset),
+                    channel_mask=int(mask),
+                )
+            pos += 8 + size + (size & 1)
+    return None
+
+class MappedWav:
+    """
+    Zero-copy view of a WAV data chunk.
+
+    `raw` is a strided np.memmap over the file (no samples are read until
+    touched); `blocks()` converts to float32 one block at a time, so a long
+    master never needs a full-size float copy.
+    """
+
+    def __init__(self, layout: WavLayout):
+        self.layout = layout
+        self._raw: np.ndarray | None = None
+
+    @property
+    def info(self) -> AudioData:
+        lo = self.layout
+        return AudioData(path=lo.path, sr=lo.sr, channels=lo.channels, samples=lo.frames, channel_mask=lo.channel_mask)
+
+    @property
+    def raw(self) -> np.ndarray:
+        """(frames, channels) view in the file's sample type; 24-bit is (frames, channels, 3) bytes."""
+        if self._raw is None:
+            lo = self.layout
+            if lo.frames == 0:
+                self._raw = np.zeros((0, lo.channels), dtype=np.float32)
+                return self._raw
+            width = lo.bits // 8
+            if lo.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+                dtype = np.dtype("<f4") if lo.bits == 32 else np.dtype("<f8")
+            else:
+                dtype = {1: np.dtype("u1"), 2: np.dtype("<i2"), 3: np.dtype("u1"), 4: np.dtype("<i4")}[width]
+            mm = np.memmap(lo.path, dtype=np.uint8, mode="r", offset=lo.data_offset,
+                           shape=(lo.frames * lo.block_align,))
+            # Frames may be padded beyond channels * width; stride by block_align
+            frames = mm.reshape(lo.frames, lo.block_align)[:, :lo.channels * width]
+            if width == 3:
+                self._raw = frames.reshape(lo.frames, lo.channels, 3)
+            else:
+                self._raw = frames.view(dtype).reshape(lo.frames, lo.channels)
+        return self._raw
+
+    def to_float(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Convert frames [start, stop) to float32 (frames, channels), same scaling as soundfile."""
+        lo = self.layout
+        r = self.raw[start:stop]
+        if lo.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            return np.asarray(r, dtype=np.float32)
+        if lo.bits == 8:
+            return (r.astype(np.float32) - 128.0) * np.float32(1.0 / 128.0)
+        if lo.bits == 16:
+            return r.astype(np.float32) * np.float32(1.0 / 32768.0)
+        if lo.bits == 24:
+            v = (r[..., 0].astype(np.int32)
+                 | (r[..., 1].astype(np.int32) << 8)
+                 | (r[..., 2].astype(np.int8).astype(np.int32) << 16))
+            return v.astype(np.float32) * np.float32(1.0 / 8388608.0)
+        return r.astype(np.float32) * np.float32(1.0 / 2147483648.0)
+
+    def blocks(self, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[np.ndarray]:
+        for start in range(0, self.layout.frames, block_size):
+            yield self.to_float(start, start + block_size)
+
+def open_wav(path: str | Path) -> MappedWav | None:
+    """Memory-mapped reader for PCM/float WAV, or None if soundfile must handle the file."""
+    layout = parse_wav_header(path)
+    return MappedWav(layout) if layout is not None else None
 
 def read_audio_info(path: str | Path) -> AudioData:
     p = Path(path)
+    layout = parse_wav_header(p)
+    if layout is not None:
+        return MappedWav(layout).info
     info = sf.info(str(p))
     return AudioData(
         path=str(p),
@@ -21,8 +168,34 @@ def read_audio_info(path: str | Path) -> AudioData:
         samples=int(info.frames),
     )
 
-def read_mono_float(path: str | Path) -> tuple[np.ndarray, int]:
-    x, sr = sf.read(str(path), always_2d=True)
-    x = x.astype(np.float32)
-    mono = x.mean(axis=1)
-    return mono, int(sr)
+def read_float(path: str | Path, block_size: int = DEFAULT_BLOCK_SIZE) -> tuple[np.ndarray, int]:
+    """Whole file as float32 (frames, channels); WAVs convert block-wise from the mapping."""
+    wav = open_wav(path)
+    if wav is None:
+        x, sr = sf.read(str(path), dtype="float32", always_2d=True)
+        return x, int(sr)
+    lo = wav.layout
+    out = np.empty((lo.frames, lo.channels), dtype=np.float32)
+    for start in range(0, lo.frames, block_size):
+        out[start:start + block_size] = wav.to_float(start, start + block_size)
+    return out, lo.sr
+
+def read_mono_float(path: str | Path, block_size: int = DEFAULT_BLOCK_SIZE) -> tuple[np.ndarray, int]:
+    """Mono float32 downmix; the only full-size allocation is the returned array."""
+    wav = open_wav(path)
+    if wav is None:
+        x, sr = sf.read(str(path), dtype="float32", always_2d=True)
+        return x.mean(axis=1), int(sr)
+    lo = wav.layout
+    mono = np.empty(lo.frames, dtype=np.float32)
+    for start in range(0, lo.frames, block_size):
+        mono[start:start + block_size] = wav.to_float(start, start + block_size).mean(axis=1)
+    return mono, lo.sr
+
+def read_blocks(path: str | Path, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[np.ndarray]:
+    """Yield float32 (frames, channels) blocks of at most `block_size` frames (bounded memory)."""
+    wav = open_wav(path)
+    if wav is not None:
+        yield from wav.blocks(block_size)
+        return
+    yield from sf.blocks(str(path), blocksize=block_size, dtype="float32", always_2d=True)
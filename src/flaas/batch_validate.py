@@ -0,0 +1,329 @@
+"""
+Batch streaming validation.
+
+Validates every WAV under a directory against streaming platform requirements
+and prints a summary report showing which masters are ready for distribution.
+Files are analyzed in a process pool in chunks; results come back in input
+order as soon as each chunk's predecessors are done, so JSONL and report
+output are identical for any worker count.
+"""
+
+from __future__ import annotations
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Iterator
+
+from flaas.analyze import analyze_wav
+from flaas.cache import AnalysisCache
+
+
+@dataclass
+class ValidationResult:
+    """Result of validating a single file"""
+    file_path: str
+    file_name: str
+    lufs_i: float
+    true_peak_dbtp: float
+    sample_rate: int
+    duration_sec: float
+    streaming_safe: bool  # True if meets -1.0 dBTP requirement
+    spotify_ready: bool  # -16 to -13 LUFS
+    apple_ready: bool  # -17 to -15 LUFS
+    youtube_ready: bool  # -15 to -12 LUFS
+    issues: list[str]
+
+
+def validate_file(file_path: Path, cache: AnalysisCache | None = None) -> ValidationResult:
+    """Validate a single WAV file (unchanged files are served from the analysis cache)"""
+    try:
+        analysis = analyze_wav(str(file_path), cache=cache)
+        
+        # Check streaming safety (true peak)
+        streaming_safe = analysis.true_peak_dbtp <= -1.0
+        
+        # Check platform-specific LUFS targets
+        spotify_ready = -16.0 <= analysis.lufs_i <= -13.0 and streaming_safe
+        apple_ready = -17.0 <= analysis.lufs_i <= -15.0 and streaming_safe
+        youtube_ready = -15.0 <= analysis.lufs_i <= -12.0 and streaming_safe
+        
+        # Collect issues
+        issues = []
+        if not streaming_safe:
+            issues.append(f"True Peak {analysis.true_peak_dbtp:.2f} dBTP > -1.0 (CLIPPING RISK)")
+        if not (spotify_ready or apple_ready or youtube_ready):
+            issues.append(f"LUFS {analysis.lufs_i:.2f} outside all platform ranges")
+        
+        return ValidationResult(
+            file_path=str(file_path),
+            file_name=file_path.name,
+            lufs_i=analysis.lufs_i,
+            true_peak_dbtp=analysis.true_peak_dbtp,
+            sample_rate=analysis.sr,
+            duration_sec=analysis.duration_sec,
+            streaming_safe=streaming_safe,
+            spotify_ready=spotify_ready,
+            apple_ready=apple_ready,
+            youtube_ready=youtube_ready,
+            issues=issues,
+        )
+    except Exception as e:
+        return ValidationResult(
+            file_path=str(file_path),
+            file_name=file_path.name,
+            lufs_i=0.0,
+            true_peak_dbtp=0.0,
+            sample_rate=0,
+            duration_sec=0.0,
+            streaming_safe=False,
+            spotify_ready=False,
+            apple_ready=False,
+            youtube_ready=False,
+            issues=[f"Analysis failed: {str(e)}"],
+        )
+
+
+def find_wav_files(output_dir: Path) -> list[Path]:
+    """Recursively find all WAV files in output directory"""
+    return sorted(output_dir.rglob("*.wav"))
+
+
+def print_summary_report(results: list[ValidationResult]):
+    """Print comprehensive batch validation report"""
+    print("╔═══════════════════════════════════════════════════════════════════════╗")
+    print("║            BATCH STREAMING VALIDATION REPORT                          ║")
+    print("╚═══════════════════════════════════════════════════════════════════════╝")
+    print()
+    
+    if not results:
+        print("❌ No WAV files found in output/ directory")
+        return
+    
+    # Summary statistics
+    total_files = len(results)
+    streaming_safe_count = sum(1 for r in results if r.streaming_safe)
+    spotify_ready_count = sum(1 for r in results if r.spotify_ready)
+    apple_ready_count = sum(1 for r in results if r.apple_ready)
+    youtube_ready_count = sum(1 for r in results if r.youtube_ready)
+    files_with_issues = sum(1 for r in results if r.issues)
+    
+    print("═" * 75)
+    print("SUMMARY STATISTICS")
+    print("═" * 75)
+    print(f"  Total files scanned:       {total_files}")
+    print(f"  Streaming safe (-1.0 dBTP): {streaming_safe_count}/{total_files}")
+    print(f"  Spotify ready:             {spotify_ready_count}/{total_files}")
+    print(f"  Apple Music ready:         {apple_ready_count}/{total_files}")
+    print(f"  YouTube ready:             {youtube_ready_count}/{total_files}")
+    print(f"  Files with issues:         {files_with_issues}/{total_files}")
+    print()
+    
+    # Files ready for distribution
+    ready_files = [r for r in results if not r.issues]
+    if ready_files:
+        print("═" * 75)
+        print("✅ READY FOR DISTRIBUTION")
+        print("═" * 75)
+        for result in ready_files:
+            platforms = []
+            if result.spotify_ready:
+                platforms.append("Spotify")
+            if result.apple_ready:
+                platforms.append("Apple")
+            if result.youtube_ready:
+                platforms.append("YouTube")
+            
+            platform_str = ", ".join(platforms) if platforms else "No optimal platform"
+            print(f"  {result.file_name}")
+            print(f"    LUFS: {result.lufs_i:.2f}  |  True Peak: {result.true_peak_dbtp:.2f} dBTP")
+            print(f"    Platforms: {platform_str}")
+            print()
+    
+    # Files needing attention
+    issues_files = [r for r in results if r.issues]
+    if issues_files:
+        print("═" * 75)
+        print("⚠️  NEEDS ATTENTION")
+        print("═" * 75)
+        for result in issues_files:
+            print(f"  {result.file_name}")
+            print(f"    LUFS: {result.lufs_i:.2f}  |  True Peak: {result.true_peak_dbtp:.2f} dBTP")
+            for issue in result.issues:
+                print(f"    ❌ {issue}")
+            
+            # Suggest fix
+            if not result.streaming_safe:
+                print(f"    💡 Fix: Re-master with L3 'Out Ceiling' set to -1.5 dB or lower")
+            print()
+    
+    # Overall verdict
+    print("═" * 75)
+    print("VERDICT")
+    print("═" * 75)
+    
+    if files_with_issues == 0:
+        print("🎉 All masters are ready for streaming distribution!")
+    elif files_with_issues == total_files:
+        print("⚠️  All masters need attention before distribution")
+        print("    Recommendation: Re-run mastering with correct limiter settings")
+    else:
+        print(f"⚠️  {files_with_issues}/{total_files} master(s) need attention")
+        print(f"✅ {total_files - files_with_issues}/{total_files} master(s) ready for distribution")
+    print()
+    
+    # Detailed file list
+    print("═" * 75)
+    print("DETAILED FILE LIST")
+    print("═" * 75)
+    print(f"{'File':<40} {'LUFS':>8} {'Peak':>8} {'Safe':>6} {'Status':>12}")
+    print("-" * 75)
+    
+    for result in results:
+        status = "✅ READY" if not result.issues else "⚠️  REVIEW"
+        safe_icon = "✅" if result.streaming_safe else "❌"
+        
+        # Truncate filename if too long
+        display_name = result.file_name
+        if len(display_name) > 40:
+            display_name = display_name[:37] + "..."
+        
+        print(
+            f"{display_name:<40} "
+            f"{result.lufs_i:>8.2f} "
+            f"{result.true_peak_dbtp:>8.2f} "
+            f"{safe_icon:>6} "
+            f"{status:>12}"
+        )
+    
+    print()
+
+
+def _validate_chunk(paths: list[Path], cache: AnalysisCache | None) -> tuple[list[ValidationResult], int, int]:
+    """Worker entry point: validate a chunk, return results plus cache hit/miss counts."""
+    if cache is None:
+        return [validate_file(p) for p in paths], 0, 0
+    # The cache arrives pickled with the parent's counters; report deltas only
+    hits0, misses0 = cache.hits, cache.misses
+    results = [validate_file(p, cache=cache) for p in paths]
+    return results, cache.hits - hits0, cache.misses - misses0
+
+
+def validate_files(
+    paths: list[Path],
+    workers: int | None = None,
+    chunk_size: int = 4,
+    cache: AnalysisCache | None = None,
+) -> Iterator[ValidationResult]:
+    """
+    Yield one ValidationResult per path, in input order.
+
+    workers=None uses os.cpu_count(); workers=1 runs in-process. At most
+    2 * workers chunks are in flight so huge catalogues don't queue up at once.
+    Cache hit/miss counts from workers are folded into `cache`.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, int(chunk_size))
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            for p in chunk:
+                yield validate_file(p, cache=cache)
+        return
+
+    def _tally(hits: int, misses: int) -> None:
+        if cache is not None:
+            cache.hits += hits
+            cache.misses += misses
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        done_chunks: dict[int, list[ValidationResult]] = {}
+        next_submit = 0
+        next_emit = 0
+        while next_emit < len(chunks):
+            while next_submit < len(chunks) and len(pending) < 2 * workers:
+                fut = pool.submit(_validate_chunk, chunks[next_submit], cache)
+                pending[fut] = next_submit
+                next_submit += 1
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                results, hits, misses = fut.result()
+                _tally(hits, misses)
+                done_chunks[pending.pop(fut)] = results
+            # Reorder buffer: emit every chunk whose predecessors are all in
+            while next_emit in done_chunks:
+                yield from done_chunks.pop(next_emit)
+                next_emit += 1
+
+
+def run_batch_validate(
+    root: str | Path = "output",
+    workers: int | None = None,
+    chunk_size: int = 4,
+    jsonl_out: str | Path | None = "data/reports/batch_validate.jsonl",
+    cache: AnalysisCache | None = None,
+    on_result: Callable[[int, int, ValidationResult], None] | None = None,
+) -> list[ValidationResult]:
+    """Validate all WAVs under root; write JSONL (input order) and return results."""
+    wav_files = find_wav_files(Path(root))
+    out = None
+    if jsonl_out is not None:
+        out = Path(jsonl_out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+
+    results: list[ValidationResult] = []
+    fh = out.open("w", encoding="utf-8") if out is not None else None
+    try:
+        for i, result in enumerate(validate_files(wav_files, workers, chunk_size, cache), 1):
+            results.append(result)
+            if fh is not None:
+                fh.write(json.dumps(asdict(result)) + "\n")
+                fh.flush()
+            if on_result is not None:
+                on_result(i, len(wav_files), result)
+    finally:
+        if fh is not None:
+            fh.close()
+    return results
+
+
+def batch_validate(
+    root: str | Path = "output",
+    workers: int | None = None,
+    chunk_size: int = 4,
+    jsonl_out: str | Path | None = "data/reports/batch_validate.jsonl",
+    cache: AnalysisCache | None = None,
+) -> int:
+    """CLI flow: progress lines, summary report. Returns 0 if every file passes, 1 otherwise."""
+    root = Path(root)
+    if not root.exists():
+        print(f"❌ Error: Output directory not found: {root}")
+        return 1
+
+    print(f"Scanning: {root}")
+    n = len(find_wav_files(root))
+    if n == 0:
+        print("❌ No WAV files found")
+        return 0
+
+    print(f"Found {n} WAV file(s)")
+    print(f"Analyzing files ({workers or os.cpu_count()} worker(s), chunk size {chunk_size})...")
+    print()
+
+    def _progress(i: int, total: int, result: ValidationResult) -> None:
+        status = "✅" if not result.issues else "⚠️"
+        print(f"  [{i}/{total}] {result.file_name}... {status}")
+
+    results = run_batch_validate(root, workers, chunk_size, jsonl_out, cache, on_result=_progress)
+    print()
+    if cache is not None:
+        print(f"Analysis cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+    if jsonl_out is not None:
+        print(f"JSONL: {jsonl_out}")
+    print()
+
+    print_summary_report(results)
+    return 1 if any(r.issues for r in results) else 0
@@ -0,0 +1,176 @@
+"""
+OSC transport benchmarks against the stand-in AbletonOSC server.
+
+Measures, for flaas.osc_rpc and finishline_audio.osc.rpc:
+  - round-trip latency percentiles and requests/sec for sequential calls
+  - throughput of pipelined batches (request_many / call_many)
+  - scan_live time vs. track and device count
+
+Every case runs against its own FakeAbletonOSC on free ports, so numbers
+reflect the client side plus loopback (and any NetworkModel latency you add).
+Results are written as JSON (default: <reports_root>/bench_rpc.json) and can
+be compared with a previous run to catch transport regressions.
+"""
+
+from __future__ import annotations
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from finishline_audio.osc.rpc import OscConfig, OscRpc
+from flaas.config import load_config
+from flaas.fake_live import FakeAbletonOSC, FakeLiveSet, NetworkModel, free_udp_port
+from flaas.osc_rpc import OscSession, request_many, request_once
+from flaas.scan import scan_live
+
+BENCH_VERSION = 1
+PROBE = ("/live/track/get/name", [0])
+
+# request_once without a session binds and tears down a server per call
+UNPOOLED_REQUESTS = 50
+
+@dataclass(frozen=True)
+class LatencyStats:
+    n: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    mean_ms: float
+    rps: float
+
+    @classmethod
+    def from_samples(cls, samples_ms: list[float], elapsed_s: float, per_sample: int = 1) -> "LatencyStats":
+        s = sorted(samples_ms)
+
+        def _pct(q: float) -> float:
+            return s[min(len(s) - 1, int(round(q * (len(s) - 1))))]
+
+        return cls(
+            n=len(s),
+            p50_ms=round(_pct(0.50), 4),
+            p90_ms=round(_pct(0.90), 4),
+            p99_ms=round(_pct(0.99), 4),
+            mean_ms=round(statistics.fmean(s), 4),
+            rps=round(len(s) * per_sample / elapsed_s, 1) if elapsed_s > 0 else 0.0,
+        )
+
+@dataclass(frozen=True)
+class ScanPoint:
+    tracks: int
+    devices: int
+    max_in_flight: int
+    ms: float
+
+@dataclass
+class BenchReport:
+    created_at_utc: str
+    network: dict[str, Any]
+    host: dict[str, str]
+    latency: dict[str, LatencyStats] = field(default_factory=dict)
+    throughput: dict[str, LatencyStats] = field(default_factory=dict)  # latency per batch, rps per request
+    scan: list[ScanPoint] = field(default_factory=list)
+    version: int = BENCH_VERSION
+
+def _timed(n: int, call: Callable[[], Any], per_call: int = 1) -> LatencyStats:
+    """Latency per call(); rps counts `per_call` requests per call."""
+    samples: list[float] = []
+    t_start = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return LatencyStats.from_samples(samples, time.perf_counter() - t_start, per_call)
+
+def _latency_cases(n: int, batch: int, network: NetworkModel, report: BenchReport) -> None:
+    address, value = PROBE
+
+    port = free_udp_port()
+    with FakeAbletonOSC(reply_port=port, network=network) as fake:
+        target = fake.target
+        report.latency["flaas.request_once"] = _timed(
+            min(n, UNPOOLED_REQUESTS), lambda: request_once(target, address, value, port))
+
+    port = free_udp_port()
+    with FakeAbletonOSC(reply_port=port, network=network) as fake, OscSession(fake.target, port) as session:
+        session.request(address, value)  # bind outside the measurement
+        report.latency["flaas.OscSession.request"] = _timed(n, lambda: session.request(address, value))
+        reqs = [(address, value)] * batch
+        report.throughput["flaas.request_many"] = _timed(
+            max(1, n // batch), lambda: request_many(fake.target, reqs, port), batch)
+
+    port = free_udp_port()
+    with FakeAbletonOSC(reply_port=port, network=network) as fake:
+        rpc = OscRpc(OscConfig(host=fake.target.host, port_in=fake.target.port, port_out=port, retries=0))
+        rpc.start()
+        try:
+            rpc.call(address, *value)
+            report.latency["finishline.OscRpc.call"] = _timed(n, lambda: rpc.call(address, *value))
+            reqs_f = [(address, value)] * batch
+            report.throughput["finishline.OscRpc.call_many"] = _timed(max(1, n // batch), lambda: rpc.call_many(reqs_f), batch)
+        finally:
+            rpc.stop()
+
+def _scan_cases(tracks: list[int], devices: list[int], network: NetworkModel, report: BenchReport) -> None:
+    for nt in tracks:
+        for nd in devices:
+            for window in (1, 24):  # serial walk vs. default pipelining
+                port = free_udp_port()
+                live_set = FakeLiveSet.synthetic(nt, nd)
+                with FakeAbletonOSC(live_set, reply_port=port, network=network) as fake:
+                    t0 = time.perf_counter()
+                    scan_live(fake.target, max_in_flight=window, listen_port=port)
+                    ms = (time.perf_counter() - t0) * 1000.0
+                report.scan.append(ScanPoint(tracks=nt, devices=nd, max_in_flight=window, ms=round(ms, 3)))
+
+def run_bench(
+    requests: int = 500,
+    batch: int = 50,
+    tracks: Sequence[int] = (8, 32, 128),
+    devices: Sequence[int] = (2, 8),
+    network: NetworkModel = NetworkModel(),
+) -> BenchReport:
+    report = BenchReport(
+        created_at_utc=datetime.now(timezone.utc).isoformat(),
+        network=asdict(network),
+        host={"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine()},
+    )
+    _latency_cases(requests, batch, network, report)
+    _scan_cases(list(tracks), list(devices), network, report)
+    return report
+
+def compare_to_baseline(report: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.25) -> list[str]:
+    """
+    Regressions vs. a previous report (both as loaded JSON).
+
+    Flags p50/p99 latency or scan time more than `tolerance` slower, and
+    requests/sec more than `tolerance` lower. Cases missing from either side
+    are ignored.
+    """
+    out: list[str] = []
+    for section in ("latency", "throughput"):
+        for name, cur in report.get(section, {}).items():
+            base = baseline.get(section, {}).get(name)
+            if base is None:
+                continue
+            for key in ("p50_ms", "p99_ms"):
+                if base[key] > 0 and cur[key] > base[key] * (1.0 + tolerance):
+                    out.append(f"{section}.{name}.{key}: {cur[key]:.3f} vs {base[key]:.3f}")
+            if base["rps"] > 0 and cur["rps"] < base["rps"] * (1.0 - tolerance):
+                out.append(f"{section}.{name}.rps: {cur['rps']:.1f} vs {base['rps']:.1f}")
+    base_scan = {(p["tracks"], p["devices"], p["max_in_flight"]): p["ms"] for p in baseline.get("scan", [])}
+    for p in report.get("scan", []):
+        key = (p["tracks"], p["devices"], p["max_in_flight"])
+        if key in base_scan and base_scan[key] > 0 and p["ms"] > base_scan[key] * (1.0 + tolerance):
+            out.append(f"scan.t{key[0]}.d{key[1]}.w{key[2]}.ms: {p['ms']:.1f} vs {base_scan[key]:.1f}")
+    return out
+
+def write_bench(report: BenchReport, out: str | Path | None = None) -> Path:
+    path = Path(out) if out is not None else Path(load_config().reports_root) / "bench_rpc.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(report), indent=2) + "\n", encoding="utf-8")
+    return path
@@ -0,0 +1,142 @@
+"""
+Persistent analysis cache.
+
+Entries live under <cache_root>/analysis/<key>.json, one file per result, so
+concurrent writers (batch validation workers) never share an index. The key
+is a hash of file size, mtime and a fast content digest (first + last 1 MiB),
+plus the analysis variant and version, so edits or re-exports miss cleanly.
+
+Eviction is LRU by entry mtime (bumped on every hit) once the directory
+exceeds max_bytes.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from flaas.analyze import AnalysisResult, Timelines
+from flaas.config import load_config
+
+# Bump when analysis output changes so stale entries are never served
+ANALYSIS_CACHE_VERSION = 3
+_PROBE_BYTES = 1 << 20
+
+@dataclass(frozen=True)
+class CacheStats:
+    root: str
+    entries: int
+    total_bytes: int
+    max_bytes: int
+
+def fast_digest(path: str | Path, probe_bytes: int = _PROBE_BYTES) -> str:
+    """blake2b over size + head + tail of the file (reads at most 2 * probe_bytes)."""
+    p = Path(path)
+    size = p.stat().st_size
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(size).encode("ascii"))
+    with p.open("rb") as f:
+        h.update(f.read(probe_bytes))
+        if size > probe_bytes:
+            f.seek(max(probe_bytes, size - probe_bytes))
+            h.update(f.read(probe_bytes))
+    return h.hexdigest()
+
+def _result_from_dict(d: dict) -> AnalysisResult:
+    d = dict(d)
+    if d.get("timelines") is not None:
+        d["timelines"] = Timelines(**d["timelines"])
+    return AnalysisResult(**d)
+
+class AnalysisCache:
+    def __init__(self, root: str | Path = "data/caches", max_bytes: int = 256 * 1024 * 1024):
+        self.dir = Path(root) / "analysis"
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config_path: str | Path = "config.yaml") -> "AnalysisCache":
+        cfg = load_config(config_path)
+        root = Path(cfg.cache_root)
+        if not root.is_absolute():
+            root = Path(config_path).parent / root
+        return cls(root, int(cfg.analysis_cache_max_mb * 1024 * 1024))
+
+    def key(self, path: str | Path, variant: str = "") -> str:
+        st = Path(path).stat()
+        ident = f"v{ANALYSIS_CACHE_VERSION}:{variant}:{st.st_size}:{st.st_mtime_ns}:{fast_digest(path)}"
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def get(self, path: str | Path, variant: str = "") -> AnalysisResult | None:
+        entry = self._entry(self.key(path, variant))
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(entry)  # LRU bump
+        self.hits += 1
+        res = _result_from_dict(data)
+        res.file = str(Path(path))
+        return res
+
+    def put(self, path: str | Path, result: AnalysisResult, variant: str = "") -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(self.key(path, variant))
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(asdict(result)) + "\n", encoding="utf-8")
+        os.replace(tmp, entry)
+        self.evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        if not self.dir.exists():
+            return []
+        out = []
+        for p in self.dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def evict(self) -> int:
+        """Delete least-recently-used entries until under max_bytes. Returns count removed."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> CacheStats:
+        entries = self._entries()
+        return CacheStats(
+            root=str(self.dir),
+            entries=len(entries),
+            total_bytes=sum(size for _, size, _ in entries),
+            max_bytes=self.max_bytes,
+        )
+
+    def clear(self) -> int:
+        n = 0
+        for _, _, p in self._entries():
+            try:
+                p.unlink()
+                n += 1
+            except OSError:
+                continue
+        return n
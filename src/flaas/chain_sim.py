@@ -0,0 +1,348 @@
+"""
+Offline model of the stock master chain (Glue Compressor -> Saturator -> Limiter).
+
+master_consensus used to find its settings by exporting from Live once per
+iteration (real time, up to 15 exports). With a bounce of the signal that
+reaches the Glue Compressor (the chain bypassed), the same search runs here
+in NumPy and Live only exports to confirm the chosen settings:
+
+    x, sr = read_float("output/master_loud_preview_prechain.wav")
+    found = search_chain(x, sr, ChainParams(threshold_db=-20.0), target_lufs=-9.0, tp_limit_dbtp=-2.0)
+    found.params, found.prediction   # settings to send, predicted LUFS-I / dBTP
+
+The limiter gain is bisected with a LimiterProbe (loudness from per-block
+gains, no render), so a search renders and meters the full chain only once
+per candidate.
+
+The devices are approximations, not clones:
+
+- Glue: stereo-linked feed-forward compressor on the block peak (soft knee,
+  attack/release smoothing in dB), then makeup.
+- Saturator: tanh soft clip after Drive.
+- Limiter: Gain, then a lookahead brickwall at Ceiling on sample peaks
+  (instant attack, exponential release). Like Live's Limiter it does not
+  look between samples, so intersample overs show up in the predicted true
+  peak as they do in the export.
+
+Gain computers run once per BLOCK samples; levels are measured with the
+same StreamingMeter as analyze_wav(). Whatever the model gets wrong is
+absorbed by the offsets measured on a confirm export (search_chain's
+lufs_offset / tp_offset).
+"""
+
+from __future__ import annotations
+import time
+from dataclasses import dataclass, replace
+from typing import Callable
+
+import numpy as np
+from scipy import signal
+
+from flaas.audio_io import DEFAULT_BLOCK_SIZE
+from flaas.meter import (
+    GATE_BLOCK_SEC,
+    GATE_OVERLAP,
+    StreamingMeter,
+    channel_weights,
+    gated_loudness,
+    k_weighting_sos,
+)
+
+BLOCK = 32                  # samples per gain-computer step (0.67 ms at 48 kHz)
+GLUE_KNEE_DB = 6.0
+GLUE_RELEASE_MS = 200.0     # Glue's release is left as set in Live; ~Auto on program material
+LIMITER_RELEASE_MS = 300.0
+LIMITER_LOOKAHEAD_MS = 3.0  # Live's Limiter default
+SILENCE_DB = -180.0
+
+DRIVE_STEPS_DB = (0.0, 2.0, 4.0, 6.0)  # extra Saturator drive tried, least first
+GLUE_STEPS_DB = ((0.0, 0.0), (-3.0, 3.0), (-6.0, 6.0))  # (threshold, makeup) moves tried, least first
+GLUE_ATTACK_STEPS_MS = (0.01, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0)  # Glue's quantized Attack
+TP_MARGIN_DB = 0.3          # initial ceiling below the true-peak limit
+GAIN_RESOLUTION_DB = 0.05   # limiter gain bisection stops here
+MAX_BISECT = 12
+MAX_CEILING_STEPS = 4
+
+@dataclass(frozen=True)
+class ChainParams:
+    threshold_db: float = -20.0
+    ratio: float = 4.0
+    attack_ms: float = 10.0
+    release_ms: float = GLUE_RELEASE_MS
+    makeup_db: float = 0.0
+    saturator_drive_db: float | None = None  # None: no Saturator in the chain
+    limiter_gain_db: float = 0.0
+    limiter_ceiling_db: float = -0.3
+
+@dataclass(frozen=True)
+class ChainPrediction:
+    lufs_i: float
+    true_peak_dbtp: float
+    peak_dbfs: float
+
+@dataclass(frozen=True)
+class SearchResult:
+    params: ChainParams
+    prediction: ChainPrediction  # offsets applied
+    reached_target: bool         # within tolerance and under the true-peak limit
+    renders: int                 # full chain renders metered (bisection steps use LimiterProbe)
+    elapsed_ms: float
+
+def _db_to_lin(db: np.ndarray | float) -> np.ndarray | float:
+    return np.power(10.0, np.asarray(db) / 20.0)
+
+def _coef(ms: float, sr: int) -> float:
+    """One-pole smoothing coefficient per BLOCK for a time constant in ms (0: instant)."""
+    if ms <= 0.0:
+        return 0.0
+    return float(np.exp(-BLOCK / (sr * ms / 1000.0)))
+
+def _as_frames(x: np.ndarray) -> np.ndarray:
+    a = np.asarray(x, dtype=np.float32)
+    return a[:, None] if a.ndim == 1 else a
+
+def _block_peaks_db(x: np.ndarray) -> np.ndarray:
+    """Stereo-linked peak per BLOCK, in dBFS."""
+    n = x.shape[0]
+    a = np.zeros(-(-n // BLOCK) * BLOCK, dtype=np.float32)
+    a[:n] = np.abs(x).max(axis=1)
+    peaks = a.reshape(-1, BLOCK).max(axis=1)
+    with np.errstate(divide="ignore"):
+        return np.maximum(20.0 * np.log10(peaks), SILENCE_DB)
+
+def _smooth(target_db: np.ndarray, attack: float, release: float) -> np.ndarray:
+    """Gain reduction (dB, >= 0) smoothed with attack while rising, release while falling."""
+    out = np.empty(len(target_db))
+    g = 0.0
+    for i, t in enumerate(target_db.tolist()):
+        g = t + (g - t) * (attack if t > g else release)
+        out[i] = g
+    return out
+
+def _hold_release(need_db: np.ndarray, release: float) -> np.ndarray:
+    """
+    Instant attack, exponential release: g[i] = max(need[i], release * g[i-1]).
+
+    Vectorized as a running max of need[j] / release**j, in chunks short
+    enough that release**-chunk stays finite.
+    """
+    if release <= 0.0:
+        return need_db.astype(np.float64)
+    chunk = max(1, int(50.0 / -np.log(release)))
+    out = np.empty(len(need_db))
+    carry = 0.0
+    for s in range(0, len(need_db), chunk):
+        grow = release ** -np.arange(min(chunk, len(need_db) - s), dtype=np.float64)
+        held = np.maximum(np.maximum.accumulate(need_db[s:s + chunk] * grow), carry * release)
+        out[s:s + chunk] = held / grow
+        carry = float(out[s + len(grow) - 1])
+    return out
+
+def glue_compress(
+    x: np.ndarray,
+    sr: int,
+    threshold_db: float,
+    ratio: float,
+    attack_ms: float,
+    release_ms: float = GLUE_RELEASE_MS,
+    makeup_db: float = 0.0,
+) -> np.ndarray:
+    """Soft-knee compressor + makeup on (frames, channels) float audio."""
+    x = _as_frames(x)
+    over = _block_peaks_db(x) - threshold_db
+    slope = 1.0 - 1.0 / max(1.0, ratio)
+    half = GLUE_KNEE_DB / 2.0
+    gr = np.where(over <= -half, 0.0,
+                  np.where(over >= half, slope * over, slope * (over + half) ** 2 / (2.0 * GLUE_KNEE_DB)))
+    gr = _smooth(gr, _coef(attack_ms, sr), _coef(release_ms, sr))
+    # Interpolate block gains to samples (block centres) so the gain has no steps
+    centres = np.arange(len(gr)) * BLOCK + BLOCK / 2.0
+    gain_db = np.interp(np.arange(x.shape[0]), centres, makeup_db - gr)
+    return x * _db_to_lin(gain_db).astype(np.float32)[:, None]
+
+def saturate(x: np.ndarray, drive_db: float) -> np.ndarray:
+    """Soft clip after `drive_db` of gain."""
+    return np.tanh(_as_frames(x) * np.float32(_db_to_lin(drive_db)))
+
+def _limiter_gr(peaks_db: np.ndarray, sr: int, gain_db: float, ceiling_db: float,
+                release_ms: float, lookahead_ms: float) -> np.ndarray:
+    """Limiter gain reduction (dB) per BLOCK, from the block peaks before Gain."""
+    need = np.maximum(0.0, peaks_db + gain_db - ceiling_db)
+    # Reduction starts `lookahead` blocks before the peak that needs it
+    for k in range(1, int(np.ceil(lookahead_ms * sr / 1000.0 / BLOCK)) + 1):
+        np.maximum(need[:-k], need[k:], out=need[:-k])
+    return _hold_release(need, _coef(release_ms, sr))
+
+def limit(
+    x: np.ndarray,
+    sr: int,
+    gain_db: float,
+    ceiling_db: float,
+    release_ms: float = LIMITER_RELEASE_MS,
+    lookahead_ms: float = LIMITER_LOOKAHEAD_MS,
+) -> np.ndarray:
+    """Gain, then a lookahead brickwall: no output sample exceeds `ceiling_db`."""
+    x = _as_frames(x)
+    gr = _limiter_gr(_block_peaks_db(x), sr, gain_db, ceiling_db, release_ms, lookahead_ms)
+    gain = np.repeat(_db_to_lin(gain_db - gr).astype(np.float32), BLOCK)[:x.shape[0]]
+    c = np.float32(_db_to_lin(ceiling_db))
+    return np.clip(x * gain[:, None], -c, c)
+
+class LimiterProbe:
+    """
+    Integrated loudness after limit() for any gain/ceiling, without rendering.
+
+    The limiter only scales whole BLOCKs, so the K-weighted energy of the
+    input is split once into pieces that lie in one block and one 100 ms
+    meter segment; a setting then costs a gain computation per block and a
+    weighted sum per segment. Swapping the gain and the K-weighting filter
+    is exact for a constant gain and close for a limiter's slow release.
+    """
+
+    def __init__(self, x: np.ndarray, sr: int,
+                 release_ms: float = LIMITER_RELEASE_MS, lookahead_ms: float = LIMITER_LOOKAHEAD_MS):
+        x = _as_frames(x)
+        self.sr = int(sr)
+        self.samples = x.shape[0]
+        self.release_ms = release_ms
+        self.lookahead_ms = lookahead_ms
+        self.peaks_db = _block_peaks_db(x)
+        k = signal.sosfilt(k_weighting_sos(self.sr).astype(np.float32), x, axis=0)
+        energy = np.square(k) @ channel_weights(x.shape[1]).astype(np.float32)
+        hop = int(round(self.sr * GATE_BLOCK_SEC * (1.0 - GATE_OVERLAP)))
+        edges = np.union1d(np.arange(0, self.samples, BLOCK), np.arange(0, self.samples, hop))
+        self._energy = np.add.reduceat(energy, edges, dtype=np.float64)
+        self._block = edges // BLOCK
+        self._segment = edges // hop
+
+    def lufs(self, gain_db: float, ceiling_db: float) -> float:
+        gr = _limiter_gr(self.peaks_db, self.sr, gain_db, ceiling_db, self.release_ms, self.lookahead_ms)
+        power = np.power(10.0, (gain_db - gr) / 10.0)
+        seg_k = np.bincount(self._segment, weights=self._energy * power[self._block])
+        return gated_loudness(seg_k, self.samples, self.sr)
+
+def pre_limiter(x: np.ndarray, sr: int, p: ChainParams) -> np.ndarray:
+    """Glue (and Saturator, if present) stage of the chain."""
+    y = glue_compress(x, sr, p.threshold_db, p.ratio, p.attack_ms, p.release_ms, p.makeup_db)
+    return y if p.saturator_drive_db is None else saturate(y, p.saturator_drive_db)
+
+def simulate_chain(x: np.ndarray, sr: int, p: ChainParams) -> np.ndarray:
+    """Full chain output for a pre-chain bounce."""
+    return limit(pre_limiter(x, sr, p), sr, p.limiter_gain_db, p.limiter_ceiling_db)
+
+def measure(y: np.ndarray, sr: int) -> ChainPrediction:
+    """Integrated loudness, true peak and sample peak, metered like analyze_wav()."""
+    y = _as_frames(y)
+    meter = StreamingMeter(sr, y.shape[1], channel_weights(y.shape[1]))
+    for start in range(0, y.shape[0], DEFAULT_BLOCK_SIZE):
+        meter.process(y[start:start + DEFAULT_BLOCK_SIZE])
+    return ChainPrediction(
+        lufs_i=float(meter.integrated_loudness()),
+        true_peak_dbtp=meter.true_peak_dbtp,
+        peak_dbfs=meter.peak_dbfs,
+    )
+
+def predict(x: np.ndarray, sr: int, p: ChainParams) -> ChainPrediction:
+    """Post-chain LUFS-I / true peak for a pre-chain bounce."""
+    return measure(simulate_chain(x, sr, p), sr)
+
+def _fit_gain(
+    lufs: Callable[[float], float],
+    gain_range: tuple[float, float],
+    target_lufs: float,
+) -> float:
+    """Bisect limiter gain onto target_lufs (loudness rises with gain); the range end if out of reach."""
+    lo, hi = gain_range
+    if lufs(hi) <= target_lufs:
+        return hi
+    if lufs(lo) >= target_lufs:
+        return lo
+    for _ in range(MAX_BISECT):
+        if hi - lo < GAIN_RESOLUTION_DB:
+            break
+        mid = (lo + hi) / 2.0
+        if lufs(mid) < target_lufs:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+def search_chain(
+    x: np.ndarray,
+    sr: int,
+    start: ChainParams,
+    target_lufs: float,
+    tp_limit_dbtp: float,
+    gain_range: tuple[float, float] = (-24.0, 24.0),
+    ceiling_range: tuple[float, float] = (-24.0, 0.0),
+    drive_steps: tuple[float, ...] = DRIVE_STEPS_DB,
+    glue_steps: tuple[tuple[float, float], ...] = GLUE_STEPS_DB,
+    threshold_range: tuple[float, float] = (-40.0, 0.0),
+    makeup_range: tuple[float, float] = (0.0, 20.0),
+    tolerance_lu: float = 0.5,
+    lufs_offset: float = 0.0,
+    tp_offset: float = 0.0,
+) -> SearchResult:
+    """
+    Settings that hit `target_lufs` under `tp_limit_dbtp`, found in simulation.
+
+    Candidates are tried least processing first: for each Saturator drive
+    (start + drive_steps), each Glue threshold/makeup move (glue_steps, as
+    the export loop moves them, clamped to threshold_range / makeup_range).
+    Ratio, attack and release are kept from `start`. Per candidate the
+    limiter gain is bisected onto the target with a LimiterProbe, the chain
+    is rendered and metered, and the ceiling is lowered by any true-peak
+    excess until it fits. The first candidate that reaches the target wins,
+    else the closest safe one.
+
+    lufs_offset / tp_offset (measured - predicted, from a confirm export) are
+    added to every prediction, so a second search corrects for model error.
+    """
+    t0 = time.perf_counter()
+    renders = 0
+    drives = [None] if start.saturator_drive_db is None else [start.saturator_drive_db + d for d in drive_steps]
+    glues: list[tuple[float, float]] = []
+    for dt, dm in glue_steps:
+        g = (round(min(threshold_range[1], max(threshold_range[0], start.threshold_db + dt)), 2),
+             round(min(makeup_range[1], max(makeup_range[0], start.makeup_db + dm)), 2))
+        if g not in glues:  # moves that clamp to the same settings are tried once
+            glues.append(g)
+    glued: dict[tuple[float, float], np.ndarray] = {}
+    candidates = [(drive, g) for drive in drives for g in glues]
+    best: tuple[tuple[bool, float], ChainParams, ChainPrediction] | None = None
+
+    for drive, (threshold, makeup) in candidates:
+        p = replace(start, threshold_db=threshold, makeup_db=makeup, saturator_drive_db=drive)
+        if (threshold, makeup) not in glued:
+            glued[threshold, makeup] = glue_compress(x, sr, threshold, p.ratio, p.attack_ms, p.release_ms, makeup)
+        y = glued[threshold, makeup]
+        y = y if drive is None else saturate(y, drive)
+        probe = LimiterProbe(y, sr)
+        ceiling = round(min(ceiling_range[1], max(ceiling_range[0], tp_limit_dbtp - tp_offset - TP_MARGIN_DB)), 2)
+        for _ in range(MAX_CEILING_STEPS):
+            gain = round(_fit_gain(lambda g: probe.lufs(g, ceiling) + lufs_offset, gain_range, target_lufs), 2)
+            m = measure(limit(y, sr, gain, ceiling), sr)
+            renders += 1
+            m = ChainPrediction(m.lufs_i + lufs_offset, m.true_peak_dbtp + tp_offset, m.peak_dbfs + tp_offset)
+            excess = m.true_peak_dbtp - tp_limit_dbtp
+            if excess <= 0.0 or ceiling <= ceiling_range[0]:
+                break
+            ceiling = round(max(ceiling_range[0], ceiling - excess - 0.1), 2)
+
+        cand = replace(p, limiter_gain_db=gain, limiter_ceiling_db=ceiling)
+        safe = m.true_peak_dbtp <= tp_limit_dbtp
+        distance = abs(m.lufs_i - target_lufs)
+        rank = (not safe, distance)
+        if best is None or rank < best[0]:
+            best = (rank, cand, m)
+        if safe and distance <= tolerance_lu:
+            break
+
+    (unsafe, distance), params, prediction = best
+    return SearchResult(
+        params=params,
+        prediction=prediction,
+        reached_target=not unsafe and distance <= tolerance_lu,
+        renders=renders,
+        elapsed_ms=round((time.perf_counter() - t0) * 1000.0, 1),
+    )
@@ -2,9 +2,14 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 from flaas.analyze import analyze_wav
+from flaas.session import AudioSession
 from flaas.targets import Targets, DEFAULT_TARGETS
 
+if TYPE_CHECKING:
+    from flaas.cache import AnalysisCache
+
 @dataclass
 class CheckResult:
     file: str
@@ -15,8 +20,12 @@ class CheckResult:
     target_lufs: float
     target_peak_dbfs: float
 
-def check_wav(path: str | Path, targets: Targets = DEFAULT_TARGETS) -> CheckResult:
-    a = analyze_wav(path)
+def check_wav(
+    path: str | Path | AudioSession,
+    targets: Targets = DEFAULT_TARGETS,
+    cache: AnalysisCache | None = None,
+) -> CheckResult:
+    a = analyze_wav(path, cache=cache)
     pass_lufs = abs(a.lufs_i - targets.master_lufs) <= 0.5
     pass_peak = a.peak_dbfs <= targets.stem_peak_ceiling_dbfs
     return CheckResult(
@@ -29,9 +38,13 @@ def check_wav(path: str | Path, targets: Targets = DEFAULT_TARGETS) -> CheckResu
         target_peak_dbfs=targets.stem_peak_ceiling_dbfs,
     )
 
-def write_check(path_in: str | Path, path_out: str | Path = "data/reports/check.json") -> Path:
+def write_check(
+    path_in: str | Path,
+    path_out: str | Path = "data/reports/check.json",
+    cache: AnalysisCache | None = None,
+) -> Path:
     out = Path(path_out)
     out.parent.mkdir(parents=True, exist_ok=True)
-    res = check_wav(path_in)
+    res = check_wav(path_in, cache=cache)
     out.write_text(json.dumps(asdict(res), indent=2) + "\n", encoding="utf-8")
     return out
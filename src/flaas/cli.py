@@ -1,11 +1,19 @@
 import argparse
+import json
 import sys
+from pathlib import Path
 
 from flaas.version import FLAAS_VERSION, ABLETONOSC_VERSION_EXPECTED
 from flaas.osc import OscTarget as FireAndForgetTarget, send_ping
-from flaas.osc_rpc import OscTarget as RpcTarget, request_once
+from flaas.osc_rpc import OscTarget as RpcTarget, OscSession, request_once
 from flaas.scan import write_model_cache
 from flaas.analyze import write_analysis
+from flaas.audio_io import DEFAULT_BLOCK_SIZE
+from flaas.cache import AnalysisCache
+from flaas.registry import DeviceRegistry
+from flaas.fake_live import FakeAbletonOSC, FakeLiveSet, NetworkModel
+from flaas.bench_rpc import compare_to_baseline, run_bench, write_bench
+from flaas.batch_validate import batch_validate
 from flaas.check import write_check
 from flaas.plan import write_plan_gain_actions
 from flaas.apply import apply_actions_dry_run, apply_actions_osc
@@ -29,12 +37,17 @@ from flaas.experiment_run import experiment_run
 from flaas.master_candidates import master_candidates
 from flaas.master_consensus import master_consensus
 from flaas.master_premium import master_premium
+from osc_common.rtt import deadline
+from osc_common.trace import Tracer, span, summarize_trace, to_chrome
 
 def main() -> None:
     p = argparse.ArgumentParser(prog="flaas")
     sub = p.add_subparsers(dest="cmd")
 
     p.add_argument("--version", action="store_true", help=f"Show version ({FLAAS_VERSION})")
+    p.add_argument("--trace", default=None, metavar="PATH", help="Write per-call trace spans (JSONL) for this command")
+    p.add_argument("--deadline", type=float, default=None, metavar="SEC",
+                   help="Deadline budget for every OSC wait of this command, retries included")
 
     ping = sub.add_parser("ping", help="Ping AbletonOSC via /live/test")
     ping.add_argument("--host", default="127.0.0.1")
@@ -48,15 +61,20 @@ def main() -> None:
     scan.add_argument("--out", default="data/caches/model_cache.json")
     scan.add_argument("--tracks", type=int, nargs='+', help="Scan only specific track IDs (e.g., --tracks 41)")
     scan.add_argument("--devices", action="store_true", help="Include device information (default: true)")
+    scan.add_argument("--incremental", action="store_true", help="Re-query only tracks whose name/device count changed since --out")
 
 
     analyze = sub.add_parser("analyze", help="Analyze a WAV and write analysis.json")
     analyze.add_argument("wav")
     analyze.add_argument("--out", default="data/reports/analysis.json")
+    analyze.add_argument("--stream", action="store_true", help="Stream the file in blocks (bounded memory)")
+    analyze.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help=f"Frames per block with --stream (default: {DEFAULT_BLOCK_SIZE})")
+    analyze.add_argument("--no-cache", action="store_true", help="Bypass the analysis cache")
 
     check = sub.add_parser("check", help="Check WAV against compliance targets")
     check.add_argument("wav")
     check.add_argument("--out", default="data/reports/check.json")
+    check.add_argument("--no-cache", action="store_true", help="Bypass the analysis cache")
 
     pg = sub.add_parser("plan-gain", help="Plan Utility gain action to hit LUFS target (writes actions.json)")
     pg.add_argument("wav")
@@ -105,6 +123,46 @@ def main() -> None:
 
     va = sub.add_parser("verify-audio", help="Analyze+check a WAV and print PASS/FAIL")
     va.add_argument("wav")
+    va.add_argument("--no-cache", action="store_true", help="Bypass the analysis cache")
+
+    bv = sub.add_parser("batch-validate", help="Validate every WAV under a directory against streaming targets")
+    bv.add_argument("root", nargs="?", default="output")
+    bv.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = in-process)")
+    bv.add_argument("--chunk-size", type=int, default=4, help="Files per work item (default: 4)")
+    bv.add_argument("--jsonl", default="data/reports/batch_validate.jsonl", help="Per-file results, input order")
+    bv.add_argument("--no-cache", action="store_true", help="Bypass the analysis cache")
+
+    cache = sub.add_parser("cache", help="Inspect or clear the analysis cache")
+    cache.add_argument("action", choices=["stats", "clear"])
+
+    trace = sub.add_parser("trace", help="Summarize or convert a trace file (from --trace or a mastering run)")
+    trace.add_argument("action", choices=["summarize", "chrome"])
+    trace.add_argument("path", help="Trace JSONL, e.g. output/master_streaming_safe.trace.jsonl")
+    trace.add_argument("--out", default=None, help="chrome: output JSON (default: <path>.json)")
+
+    bench = sub.add_parser("bench-rpc", help="Benchmark OSC round trips and scan_live against a stand-in server")
+    bench.add_argument("--requests", type=int, default=500, help="Sequential calls per client (default: 500)")
+    bench.add_argument("--batch", type=int, default=50, help="Requests per pipelined batch (default: 50)")
+    bench.add_argument("--tracks", type=int, nargs="+", default=[8, 32, 128])
+    bench.add_argument("--devices", type=int, nargs="+", default=[2, 8])
+    bench.add_argument("--latency-ms", type=float, default=0.0)
+    bench.add_argument("--jitter-ms", type=float, default=0.0)
+    bench.add_argument("--out", default=None, help="Report path (default: <reports_root>/bench_rpc.json)")
+    bench.add_argument("--baseline", default=None, help="Previous report; exit 1 on regressions")
+    bench.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (default: 0.25)")
+
+    registry = sub.add_parser("registry", help="Inspect or clear the device/parameter metadata registry")
+    registry.add_argument("action", choices=["stats", "clear"])
+
+    fake = sub.add_parser("fake-live", help="Run a stand-in AbletonOSC server (no Live needed)")
+    fake.add_argument("--fixture", default=None, help="Live set JSON (default: bundled stock master chain)")
+    fake.add_argument("--host", default="127.0.0.1")
+    fake.add_argument("--port", type=int, default=11000)
+    fake.add_argument("--reply-port", type=int, default=11001)
+    fake.add_argument("--latency-ms", type=float, default=0.0)
+    fake.add_argument("--jitter-ms", type=float, default=0.0)
+    fake.add_argument("--loss", type=float, default=0.0, help="Reply drop probability (0..1)")
+    fake.add_argument("--seed", type=int, default=None)
 
     isd = sub.add_parser("inspect-selected-device", help="Print full parameter table for selected device")
     isd.add_argument("--timeout", type=float, default=5.0)
@@ -211,6 +269,8 @@ def main() -> None:
     master_cons.add_argument("--port", type=int, default=11000)
     master_cons.add_argument("--no-auto-export", action="store_true", help="Disable auto-export (manual)")
     master_cons.add_argument("--mode", choices=["streaming_safe", "loud_preview", "headroom"], default="streaming_safe", help="Target mode: streaming_safe (-14 LUFS, -1 dBTP, default), loud_preview (-9 LUFS, -2 dBTP), headroom (-10 LUFS, -6 dBFS)")
+    master_cons.add_argument("--no-simulate", action="store_true", help="Export from Live every iteration instead of searching the chain offline")
+    master_cons.add_argument("--pre-chain", default=None, help="Existing bounce of the master with Glue/Saturator/Limiter bypassed (skips the pre-chain export)")
 
     master_prem = sub.add_parser("master-premium", help="Premium master with Waves C6/SSL/L3 (auto-optimized)")
     master_prem.add_argument("--host", default="127.0.0.1")
@@ -226,6 +286,18 @@ def main() -> None:
         print(f"Expected AbletonOSC version: {ABLETONOSC_VERSION_EXPECTED}")
         return
 
+    # One OSC listener/client for the whole command (bound lazily on first RPC),
+    # for the target the subcommand was pointed at
+    target = RpcTarget(getattr(args, "host", RpcTarget.host), getattr(args, "port", RpcTarget.port))
+    with OscSession(target, getattr(args, "listen_port", 11001)):
+        with deadline(args.deadline, f"flaas {args.cmd}"):
+            if args.trace:
+                with Tracer(args.trace), span(str(args.cmd), cat="run"):
+                    _dispatch(p, args)
+            else:
+                _dispatch(p, args)
+
+def _dispatch(p: argparse.ArgumentParser, args: argparse.Namespace) -> None:
     if args.cmd == "ping":
         if args.wait:
             resp = request_once(
@@ -243,17 +315,23 @@ def main() -> None:
 
     if args.cmd == "scan":
         track_ids = args.tracks if hasattr(args, 'tracks') and args.tracks else None
-        path = write_model_cache(args.out, track_ids=track_ids)
+        path = write_model_cache(args.out, track_ids=track_ids, registry=DeviceRegistry.from_config(),
+                                 incremental=args.incremental)
         print(str(path))
         return
 
     if args.cmd == "analyze":
-        out = write_analysis(args.wav, args.out)
+        out = write_analysis(
+            args.wav,
+            args.out,
+            block_size=args.block_size if args.stream else None,
+            cache=None if args.no_cache else AnalysisCache.from_config(),
+        )
         print(str(out))
         return
 
     if args.cmd == "check":
-        out = write_check(args.wav, args.out)
+        out = write_check(args.wav, args.out, cache=None if args.no_cache else AnalysisCache.from_config())
         print(str(out))
         return
 
@@ -329,7 +407,90 @@ def main() -> None:
         return
 
     if args.cmd == "verify-audio":
-        raise SystemExit(verify_audio(args.wav))
+        raise SystemExit(verify_audio(args.wav, cache=None if args.no_cache else AnalysisCache.from_config()))
+
+    if args.cmd == "batch-validate":
+        raise SystemExit(batch_validate(
+            args.root,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            jsonl_out=args.jsonl,
+            cache=None if args.no_cache else AnalysisCache.from_config(),
+        ))
+
+    if args.cmd == "cache":
+        ac = AnalysisCache.from_config()
+        if args.action == "clear":
+            print(f"removed {ac.clear()} entries from {ac.dir}")
+        else:
+            st = ac.stats()
+            print(f"root: {st.root}")
+            print(f"entries: {st.entries}")
+            print(f"size: {st.total_bytes / 1024:.1f} KiB / {st.max_bytes / (1024 * 1024):.0f} MiB")
+        return
+
+    if args.cmd == "trace":
+        if args.action == "chrome":
+            print(str(to_chrome(args.path, args.out)))
+            return
+        stats = summarize_trace(args.path)
+        print(f"{'cat':10s} {'name':44s} {'count':>6s} {'total_ms':>10s} {'p50_ms':>9s} {'p95_ms':>9s} {'p99_ms':>9s} {'timeouts':>9s}")
+        for st in stats:
+            print(f"{st.cat:10s} {st.name:44s} {st.count:6d} {st.total_ms:10.1f} {st.p50_ms:9.3f} {st.p95_ms:9.3f} "
+                  f"{st.p99_ms:9.3f} {st.timeout_rate:8.1%}")
+        totals: dict[str, float] = {}
+        for st in stats:
+            if st.cat != "run":  # enclosing spans would double count
+                totals[st.cat] = totals.get(st.cat, 0.0) + st.total_ms
+        print("time by category: " + ", ".join(f"{c}={ms / 1000.0:.2f}s" for c, ms in sorted(totals.items(), key=lambda kv: -kv[1])))
+        return
+
+    if args.cmd == "bench-rpc":
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+        report = run_bench(
+            requests=args.requests, batch=args.batch, tracks=args.tracks, devices=args.devices,
+            network=NetworkModel(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms),
+        )
+        for section in (report.latency, report.throughput):
+            for name, st in section.items():
+                print(f"{name:32s} n={st.n:<5d} p50={st.p50_ms:.3f}ms p99={st.p99_ms:.3f}ms {st.rps:.0f}/s")
+        for pt in report.scan:
+            print(f"scan_live tracks={pt.tracks:<4d} devices={pt.devices:<3d} window={pt.max_in_flight:<3d} {pt.ms:.1f}ms")
+        out = write_bench(report, args.out)
+        print(str(out))
+        if baseline is not None:
+            regressions = compare_to_baseline(json.loads(out.read_text(encoding="utf-8")), baseline, args.tolerance)
+            for r in regressions:
+                print(f"REGRESSION: {r}", file=sys.stderr)
+            if regressions:
+                raise SystemExit(1)
+        return
+
+    if args.cmd == "fake-live":
+        live_set = FakeLiveSet.load(args.fixture) if args.fixture else FakeLiveSet.load()
+        server = FakeAbletonOSC(
+            live_set, host=args.host, port=args.port, reply_port=args.reply_port,
+            network=NetworkModel(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, loss=args.loss, seed=args.seed),
+        )
+        print(f"fake AbletonOSC on {args.host}:{args.port} -> :{args.reply_port} ({len(live_set.tracks)} tracks)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        print(f"stats: {server.stats}")
+        return
+
+    if args.cmd == "registry":
+        reg = DeviceRegistry.from_config()
+        if args.action == "clear":
+            reg.invalidate()
+            print(f"cleared {reg.path}")
+        else:
+            st = reg.stats()
+            print(f"path: {st.path}")
+            print(f"tracks: {st.tracks}")
+            print(f"devices with params: {st.devices_with_params}")
+        return
 
     if args.cmd == "inspect-selected-device":
         inspect_selected_device(target=RpcTarget(host=args.host, port=args.port), timeout_sec=args.timeout, raw=args.raw)
@@ -407,6 +568,8 @@ def main() -> None:
             target=RpcTarget(host=args.host, port=args.port),
             auto_export_enabled=(not args.no_auto_export),
             mode=args.mode,
+            simulate=(not args.no_simulate),
+            pre_chain=args.pre_chain,
         )
         raise SystemExit(code)
     
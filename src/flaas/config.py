@@ -0,0 +1,39 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+
+@dataclass(frozen=True)
+class FlaasConfig:
+    cache_root: str = "./data/caches"
+    reports_root: str = "./data/reports"
+    registry_root: str = "./data/registry"
+    analysis_cache_max_mb: float = 256.0
+    throttle_ms: float = 25.0  # debug.throttle_ms: gap between OSC write bundles
+    verify_after_set: bool = True  # debug.verify_after_set: read back parameter writes
+
+def load_config(path: str | Path = "config.yaml") -> FlaasConfig:
+    """
+    Read the subset of config.yaml flaas uses.
+
+    A missing file falls back to defaults so the CLI keeps working outside
+    the repo root.
+    """
+    p = Path(path)
+    if not p.exists():
+        return FlaasConfig()
+
+    data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    project = data.get("project") or {}
+    analysis = data.get("analysis") or {}
+    debug = data.get("debug") or {}
+    d = FlaasConfig()
+    return FlaasConfig(
+        cache_root=str(project.get("cache_root", d.cache_root)),
+        reports_root=str(project.get("reports_root", d.reports_root)),
+        registry_root=str(project.get("registry_root", d.registry_root)),
+        analysis_cache_max_mb=float(analysis.get("cache_max_mb", d.analysis_cache_max_mb)),
+        throttle_ms=float(debug.get("throttle_ms", d.throttle_ms)),
+        verify_after_set=bool(debug.get("verify_after_set", d.verify_after_set)),
+    )
@@ -1,6 +1,62 @@
 from __future__ import annotations
-from flaas.osc_rpc import OscTarget, request_once
-from pythonosc.udp_client import SimpleUDPClient
+from flaas.osc_rpc import OscTarget, osc_session, request_once
+from flaas.param_batch import ParamBatch, ParamVerifyError
+from flaas.param_map import DeviceParamTable
+
+
+def device_set_params(
+    track_id: int,
+    device_id: int,
+    values: dict[int, float],
+    target: OscTarget = OscTarget(),
+    timeout_sec: float = 5.0,
+    dry: bool = False,
+    table: DeviceParamTable | None = None,
+) -> None:
+    """
+    Set several parameters on one device as one write-then-verify transaction.
+
+    Uses:
+    - /live/device/get/parameters/value → (track_id, device_id, val0, val1, ...), once before
+    - /live/device/set/parameter/value → all writes, bundled (ParamBatch)
+    - one readback of the device if debug.verify_after_set (ParamBatch.commit)
+
+    `table` (e.g. DeviceParamTable.from_device_map) supplies ranges and
+    quantization for the check; otherwise they are queried with the readback.
+
+    Prints one line per param: track_id=<t> device_id=<d> param_id=<id> before=<b> after=<a>
+    Raises ParamVerifyError (after printing) if a value did not land.
+    """
+    with osc_session(target):
+        values_before = request_once(target, "/live/device/get/parameters/value", [track_id, device_id], timeout_sec=timeout_sec)
+
+        for param_id in values:
+            if 2 + int(param_id) >= len(values_before):
+                raise IndexError(f"param_id {param_id} out of range (device has {len(values_before)-2} params)")
+
+        if dry:
+            for param_id, value in values.items():
+                before = float(values_before[2 + int(param_id)])
+                print(f"DRY_RUN: track_id={track_id} device_id={device_id} param_id={param_id} before={before:.6f} -> would_set={value:.6f}")
+            return
+
+        batch = ParamBatch(target)
+        if table is not None:
+            batch.use_table(table)
+        for param_id, value in values.items():
+            batch.set_value(track_id, device_id, param_id, value)
+        checked = None
+        try:
+            checked = batch.commit(timeout_sec=timeout_sec).verify
+        except ParamVerifyError as e:
+            checked = e.report
+            raise
+        finally:
+            for param_id, value in values.items():
+                before = float(values_before[2 + int(param_id)])
+                after = checked.values.get((track_id, device_id, int(param_id))) if checked is not None else None
+                shown = f"after={after:.6f}" if after is not None else f"sent={float(value):.6f}"
+                print(f"track_id={track_id} device_id={device_id} param_id={param_id} before={before:.6f} {shown}")
 
 
 def device_set_param(
@@ -14,29 +70,11 @@ def device_set_param(
 ) -> None:
     """
     Set any parameter on any device (generic version).
-    
+
     Uses:
     - /live/device/get/parameters/value → (track_id, device_id, val0, val1, ...)
     - /live/device/set/parameter/value → sends [track_id, device_id, param_id, value]
-    
+
     Prints: track_id=<t> device_id=<d> param_id=<id> before=<b> after=<a>
     """
-    values_before = request_once(target, "/live/device/get/parameters/value", [track_id, device_id], timeout_sec=timeout_sec)
-    
-    idx = 2 + int(param_id)
-    if idx >= len(values_before):
-        raise IndexError(f"param_id {param_id} out of range (device has {len(values_before)-2} params)")
-    
-    before = float(values_before[idx])
-    
-    if dry:
-        print(f"DRY_RUN: track_id={track_id} device_id={device_id} param_id={param_id} before={before:.6f} -> would_set={value:.6f}")
-        return
-    
-    client = SimpleUDPClient(target.host, target.port)
-    client.send_message("/live/device/set/parameter/value", [track_id, device_id, param_id, float(value)])
-    
-    values_after = request_once(target, "/live/device/get/parameters/value", [track_id, device_id], timeout_sec=timeout_sec)
-    after = float(values_after[idx])
-    
-    print(f"track_id={track_id} device_id={device_id} param_id={param_id} before={before:.6f} after={after:.6f}")
+    device_set_params(track_id, device_id, {param_id: value}, target, timeout_sec, dry)
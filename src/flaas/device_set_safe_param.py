@@ -4,8 +4,8 @@ import sys
 from pathlib import Path
 from flaas.osc_rpc import OscTarget, request_once
 from flaas.device_map import generate_device_map
-from flaas.device_set_param import device_set_param
-from pythonosc.udp_client import SimpleUDPClient
+from flaas.param_batch import ParamBatch, ParamVerifyError
+from flaas.param_map import DeviceParamTable
 
 
 # Preference list for safe parameters (case-insensitive)
@@ -21,6 +21,15 @@ AVOID_PARAMS = [
 ]
 
 
+def _set_verified(track_id: int, device_id: int, param_id: int, value: float, table: DeviceParamTable, target: OscTarget, timeout_sec: float) -> float:
+    """Write one value and read it back (one device query, or local if a ParamMirror watches it)."""
+    batch = ParamBatch(target)
+    batch.use_table(table)
+    batch.set_value(track_id, device_id, param_id, value)
+    report = batch.commit(verify=True, timeout_sec=timeout_sec)
+    return report.verify.values[(track_id, device_id, param_id)]
+
+
 def device_set_safe_param(
     track_id: int,
     device_id: int,
@@ -114,61 +123,32 @@ def device_set_safe_param(
     new_value = original_value + delta
     new_value = max(param_min, min(param_max, new_value))
     
-    # Set new value
+    table = DeviceParamTable.from_device_map(device_map)
+
+    # Set new value and verify (tolerance from the device map's range)
     try:
-        client = SimpleUDPClient(target.host, target.port)
-        client.send_message(
-            "/live/device/set/parameter/value", 
-            [track_id, device_id, param_id, float(new_value)]
-        )
-    except Exception as e:
-        print(f"ERROR: Failed to set parameter: {e}", file=sys.stderr)
+        after_value = _set_verified(track_id, device_id, param_id, new_value, table, target, timeout_sec)
+    except ParamVerifyError as e:
+        print(f"ERROR: Value did not change as expected ({e.report.mismatches[0]})", file=sys.stderr)
         return 30
-    
-    # Verify change
-    try:
-        values_after = request_once(
-            target, 
-            "/live/device/get/parameters/value", 
-            [track_id, device_id], 
-            timeout_sec=timeout_sec
-        )
-        after_value = float(values_after[idx])
-    except Exception as e:
+    except TimeoutError as e:
         print(f"ERROR: Failed to verify parameter change: {e}", file=sys.stderr)
         return 20
-    
-    # Check if value actually changed
-    if abs(after_value - new_value) > 0.001:
-        print(f"ERROR: Value did not change as expected (expected {new_value:.6f}, got {after_value:.6f})", file=sys.stderr)
-        return 30
-    
-    # Revert to original
-    try:
-        client.send_message(
-            "/live/device/set/parameter/value", 
-            [track_id, device_id, param_id, float(original_value)]
-        )
     except Exception as e:
-        print(f"ERROR: Failed to revert parameter: {e}", file=sys.stderr)
+        print(f"ERROR: Failed to set parameter: {e}", file=sys.stderr)
         return 30
     
-    # Verify revert
+    # Revert to original and verify
     try:
-        values_reverted = request_once(
-            target, 
-            "/live/device/get/parameters/value", 
-            [track_id, device_id], 
-            timeout_sec=timeout_sec
-        )
-        reverted_value = float(values_reverted[idx])
-    except Exception as e:
+        reverted_value = _set_verified(track_id, device_id, param_id, original_value, table, target, timeout_sec)
+    except ParamVerifyError as e:
+        print(f"ERROR: Value did not revert as expected ({e.report.mismatches[0]})", file=sys.stderr)
+        return 30
+    except TimeoutError as e:
         print(f"ERROR: Failed to verify revert: {e}", file=sys.stderr)
         return 20
-    
-    # Check if reverted correctly
-    if abs(reverted_value - original_value) > 0.001:
-        print(f"ERROR: Value did not revert as expected (expected {original_value:.6f}, got {reverted_value:.6f})", file=sys.stderr)
+    except Exception as e:
+        print(f"ERROR: Failed to revert parameter: {e}", file=sys.stderr)
         return 30
     
     # Success - print result
@@ -1,7 +1,8 @@
 from __future__ import annotations
-from pathlib import Path
 from flaas.osc_rpc import OscTarget
-from flaas.eq8_set import eq8_set
+from flaas.device_set_param import device_set_params
+from flaas.eq8_set import load_eq8_map, resolve_eq8_param
+from flaas.param_map import DeviceParamTable
 
 
 def eq8_reset_gains(
@@ -17,27 +18,23 @@ def eq8_reset_gains(
     Requires map file: data/registry/eq8_map_t{track_id}_d{device_id}.json
     Generated by: flaas eq8-map <track_id> <device_id>
     
-    Calls eq8_set for each band/side combination, fail-fast on error.
+    All 16 writes go out as one bundle and are verified with one readback of
+    the device (device_set_params); raises on any gain that did not land.
     """
-    map_path = Path(f"data/registry/eq8_map_t{track_id}_d{device_id}.json")
-    
-    if not map_path.exists():
-        print(f"ERROR: Map file not found: {map_path}")
-        print(f"Run this first: flaas eq8-map {track_id} {device_id}")
-        raise SystemExit(1)
-    
-    for band in range(1, 9):
-        for side in ["A", "B"]:
-            eq8_set(
-                track_id=track_id,
-                device_id=device_id,
-                band=band,
-                side=side,
-                param="gain",
-                value=0.0,
-                target=target,
-                timeout_sec=timeout_sec,
-                dry=dry,
-            )
+    map_data = load_eq8_map(track_id, device_id)
+    values = {
+        resolve_eq8_param(map_data, band, side, "gain"): 0.0
+        for band in range(1, 9)
+        for side in ["A", "B"]
+    }
+    device_set_params(
+        track_id=track_id,
+        device_id=device_id,
+        values=values,
+        target=target,
+        timeout_sec=timeout_sec,
+        dry=dry,
+        table=DeviceParamTable.from_device_map(map_data),
+    )
     
     print(f"DONE eq8-reset-gains track_id={track_id} device_id={device_id} dry={dry}")
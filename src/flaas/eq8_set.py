@@ -2,7 +2,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 from flaas.osc_rpc import OscTarget
-from flaas.device_set_param import device_set_param
+from flaas.device_set_param import device_set_params
+from flaas.param_map import DeviceParamTable
 
 
 def eq8_set(
@@ -22,8 +23,25 @@ def eq8_set(
     Requires map file: data/registry/eq8_map_t{track_id}_d{device_id}.json
     Generated by: flaas eq8-map <track_id> <device_id>
     
-    Resolves semantic name to param_id, then calls device_set_param.
+    Resolves semantic name to param_id, then calls device_set_params
+    (verified against the map's range/quantization).
     """
+    map_data = load_eq8_map(track_id, device_id)
+    param_id = resolve_eq8_param(map_data, band, side, param)
+
+    device_set_params(
+        track_id=track_id,
+        device_id=device_id,
+        values={param_id: value},
+        target=target,
+        timeout_sec=timeout_sec,
+        dry=dry,
+        table=DeviceParamTable.from_device_map(map_data),
+    )
+
+
+def load_eq8_map(track_id: int, device_id: int) -> dict:
+    """data/registry/eq8_map_t{track_id}_d{device_id}.json (SystemExit with a hint if missing)."""
     map_path = Path(f"data/registry/eq8_map_t{track_id}_d{device_id}.json")
     
     if not map_path.exists():
@@ -31,22 +49,15 @@ def eq8_set(
         print(f"Run this first: flaas eq8-map {track_id} {device_id}")
         raise SystemExit(1)
     
-    map_data = json.loads(map_path.read_text(encoding="utf-8"))
-    
+    return json.loads(map_path.read_text(encoding="utf-8"))
+
+
+def resolve_eq8_param(map_data: dict, band: int, side: str, param: str) -> int:
+    """Semantic band/side/param to param_id (SystemExit on an invalid path)."""
     try:
-        param_id = map_data["groups"]["bands"][str(band)][side][param]
+        return map_data["groups"]["bands"][str(band)][side][param]
     except KeyError as e:
         print(f"ERROR: Invalid semantic path: band={band} side={side} param={param}")
         print(f"KeyError: {e}")
         print(f"Valid bands: 1-8, sides: A/B, params: on|type|freq|gain|res")
         raise SystemExit(1)
-    
-    device_set_param(
-        track_id=track_id,
-        device_id=device_id,
-        param_id=param_id,
-        value=value,
-        target=target,
-        timeout_sec=timeout_sec,
-        dry=dry,
-    )
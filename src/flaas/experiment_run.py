@@ -7,11 +7,13 @@ from pathlib import Path
 from datetime import datetime, timezone
 from dataclasses import dataclass
 
-from flaas.osc_rpc import OscTarget, request_once
+from flaas.osc_rpc import OscTarget, send_message
 from flaas.analyze import analyze_wav
 from flaas.check import check_wav
+from flaas.session import AudioSession
+from flaas.param_batch import ParamBatch
+from flaas.registry import DeviceRegistry, resolve_device_id_by_name, resolve_device_params
 from flaas.targets import DEFAULT_TARGETS
-from pythonosc.udp_client import SimpleUDPClient
 
 # UI automation for macOS
 if sys.platform == "darwin":
@@ -34,81 +36,6 @@ class DeviceInfo:
     params: dict[str, dict]  # param_name -> {id, min, max, is_quantized}
 
 
-def resolve_device_id_by_name(
-    track_id: int,
-    device_name: str,
-    target: OscTarget = OscTarget(),
-    timeout_sec: float = 3.0,
-) -> int:
-    """
-    Resolve device ID by name on a track.
-    
-    Returns device index if found.
-    Raises SystemExit(20) if device not found.
-    """
-    try:
-        response = request_once(
-            target,
-            "/live/track/get/devices/name",
-            [track_id],
-            timeout_sec=timeout_sec
-        )
-        names = list(response)[1:]  # Drop track_id
-        
-        for idx, name in enumerate(names):
-            if str(name).strip().lower() == device_name.strip().lower():
-                return idx
-        
-        print(f"ERROR: Device '{device_name}' not found on track {track_id}")
-        print(f"Available devices: {names}")
-        raise SystemExit(20)
-        
-    except SystemExit:
-        raise
-    except Exception as e:
-        print(f"ERROR: Failed to query devices on track {track_id}: {e}")
-        raise SystemExit(20)
-
-
-def resolve_device_params(
-    track_id: int,
-    device_id: int,
-    target: OscTarget = OscTarget(),
-    timeout_sec: float = 3.0,
-) -> dict[str, dict]:
-    """
-    Resolve all parameter info for a device.
-    
-    Returns dict: param_name -> {id, min, max, is_quantized}
-    """
-    try:
-        names_resp = request_once(target, "/live/device/get/parameters/name", [track_id, device_id], timeout_sec=timeout_sec)
-        mins_resp = request_once(target, "/live/device/get/parameters/min", [track_id, device_id], timeout_sec=timeout_sec)
-        maxs_resp = request_once(target, "/live/device/get/parameters/max", [track_id, device_id], timeout_sec=timeout_sec)
-        quants_resp = request_once(target, "/live/device/get/parameters/is_quantized", [track_id, device_id], timeout_sec=timeout_sec)
-        
-        names = list(names_resp[2:])
-        mins = list(mins_resp[2:])
-        maxs = list(maxs_resp[2:])
-        quants = list(quants_resp[2:])
-        
-        params = {}
-        for i in range(len(names)):
-            param_name = str(names[i])
-            params[param_name] = {
-                "id": i,
-                "min": float(mins[i]) if i < len(mins) else 0.0,
-                "max": float(maxs[i]) if i < len(maxs) else 1.0,
-                "is_quantized": bool(quants[i]) if i < len(quants) else False,
-            }
-        
-        return params
-        
-    except Exception as e:
-        print(f"ERROR: Failed to query device params (track={track_id}, device={device_id}): {e}")
-        raise SystemExit(20)
-
-
 def set_device_param_by_name(
     track_id: int,
     device_id: int,
@@ -116,12 +43,14 @@ def set_device_param_by_name(
     value: float,
     param_info: dict,
     target: OscTarget = OscTarget(),
-    timeout_sec: float = 3.0,
+    timeout_sec: float | None = None,
+    batch: ParamBatch | None = None,
 ) -> None:
     """
     Set device parameter by name.
     
-    Converts value to normalized [0,1] and sends via OSC (fire-and-forget).
+    Converts value to normalized [0,1] and sends via OSC (fire-and-forget),
+    or queues it on `batch` to go out with the next flush.
     """
     param_id = param_info["id"]
     min_val = param_info["min"]
@@ -131,10 +60,14 @@ def set_device_param_by_name(
     norm_value = (value - min_val) / (max_val - min_val)
     norm_value = max(0.0, min(1.0, norm_value))  # Clamp
     
+    if batch is not None:
+        batch.set(track_id, device_id, param_id, norm_value)
+        return
+
     try:
         # Fire-and-forget write (no reply expected)
-        client = SimpleUDPClient(target.host, target.port)
-        client.send_message(
+        send_message(
+            target,
             "/live/device/set/parameter/value",
             [track_id, device_id, param_id, norm_value]
         )
@@ -147,7 +80,7 @@ def set_master_fader(
     track_id: int,
     linear_value: float,
     target: OscTarget = OscTarget(),
-    timeout_sec: float = 3.0,
+    timeout_sec: float | None = None,
 ) -> None:
     """
     Set track volume (master fader).
@@ -243,21 +176,26 @@ def experiment_run(
         print("ERROR: No runs defined in config")
         return 20
     
-    # Resolve device IDs
-    print(f"Resolving devices on track {master_track_id}...")
-    glue_device_id = resolve_device_id_by_name(master_track_id, glue_name, target)
-    limiter_device_id = resolve_device_id_by_name(master_track_id, limiter_name, target)
-    print(f"  Glue Compressor: device {glue_device_id}")
-    print(f"  Limiter: device {limiter_device_id}")
-    
-    # Resolve parameters
-    print(f"Resolving Glue Compressor parameters...")
-    glue_params = resolve_device_params(master_track_id, glue_device_id, target)
-    print(f"  Found {len(glue_params)} params")
-    
-    print(f"Resolving Limiter parameters...")
-    limiter_params = resolve_device_params(master_track_id, limiter_device_id, target)
-    print(f"  Found {len(limiter_params)} params")
+    registry = DeviceRegistry.from_config()  # cached names/param tables, checked per track
+    try:
+        # Resolve device IDs
+        print(f"Resolving devices on track {master_track_id}...")
+        glue_device_id = resolve_device_id_by_name(master_track_id, glue_name, target, registry=registry)
+        limiter_device_id = resolve_device_id_by_name(master_track_id, limiter_name, target, registry=registry)
+        print(f"  Glue Compressor: device {glue_device_id}")
+        print(f"  Limiter: device {limiter_device_id}")
+
+        # Resolve parameters
+        print(f"Resolving Glue Compressor parameters...")
+        glue_params = resolve_device_params(master_track_id, glue_device_id, target, registry=registry)
+        print(f"  Found {len(glue_params)} params")
+
+        print(f"Resolving Limiter parameters...")
+        limiter_params = resolve_device_params(master_track_id, limiter_device_id, target, registry=registry)
+        print(f"  Found {len(limiter_params)} params")
+    except Exception as e:
+        print(f"ERROR: Failed to resolve devices on track {master_track_id}: {e}")
+        raise SystemExit(20)
     
     # Set master fader to 0.0 dB (manual - OSC not available)
     print(f"\n{'─'*70}")
@@ -282,6 +220,7 @@ def experiment_run(
     
     # Run experiments
     success_count = 0
+    batch = ParamBatch(target)
     for idx, run in enumerate(runs, 1):
         exp_id = run.get("id", f"exp{idx}")
         export_file = run.get("export_file", f"output/exp_{exp_id}.wav")
@@ -316,9 +255,10 @@ def experiment_run(
                 key,
                 value,
                 glue_params[key],
-                target
+                target,
+                batch=batch,
             )
-            print(f"    ✓ {key} set")
+            print(f"    ✓ {key} queued")
         
         # Set Limiter params
         print(f"\nSetting Limiter...")
@@ -344,9 +284,15 @@ def experiment_run(
                 key,
                 value,
                 limiter_params[key],
-                target
+                target,
+                batch=batch,
             )
-            print(f"    ✓ {key} set")
+            print(f"    ✓ {key} queued")
+        try:
+            print(f"  ✓ Sent {batch.flush()}")
+        except OSError as e:
+            print(f"ERROR: Failed to send param writes for {exp_id}: {e}")
+            raise SystemExit(30)
         
         # Export (auto or manual)
         # CRITICAL: Resolve to absolute path, delete existing
@@ -415,8 +361,9 @@ def experiment_run(
         # Verify audio
         print(f"\nVerifying {export_path.name}...")
         try:
-            analysis = analyze_wav(export_path)
-            check = check_wav(export_path, DEFAULT_TARGETS)
+            session = AudioSession(export_path)  # one decode for analyze + check
+            analysis = analyze_wav(session)
+            check = check_wav(session, DEFAULT_TARGETS)
             
             print(f"  LUFS: {analysis.lufs_i:.2f} (target {check.target_lufs:.2f}) pass={check.pass_lufs}")
             print(f"  PEAK: {analysis.peak_dbfs:.2f} dBFS (limit {check.target_peak_dbfs:.2f}) pass={check.pass_peak}")
@@ -0,0 +1,354 @@
+"""
+Stand-in AbletonOSC server for tests, load testing and offline benchmarks.
+
+FakeAbletonOSC answers the endpoints FLAAS uses (song/track/device getters,
+parameter set/get, start_listen pushes, view selection) from a FakeLiveSet
+loaded from JSON (default: fixtures/fake_live_set.json, a stock master chain
+plus a few tracks). A NetworkModel adds latency, jitter and packet loss to
+every reply and push:
+
+    with FakeAbletonOSC(network=NetworkModel(latency_ms=2, jitter_ms=1, loss=0.01)) as live:
+        scan_live(live.target)
+
+or as a subprocess: `flaas fake-live --latency-ms 2 --loss 0.01`.
+
+Track id -1000 is the master track. Requests for unknown tracks, devices or
+addresses get no reply (counted in stats), like AbletonOSC logging an error.
+"""
+
+from __future__ import annotations
+import heapq
+import json
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import ThreadingOSCUDPServer
+from pythonosc.udp_client import SimpleUDPClient
+
+from flaas.osc_rpc import POLL_INTERVAL_S, OscTarget
+from flaas.targets import MASTER_TRACK_ID
+from flaas.version import ABLETONOSC_VERSION_EXPECTED
+
+DEFAULT_FIXTURE = Path(__file__).parent / "fixtures" / "fake_live_set.json"
+
+def free_udp_port(host: str = "127.0.0.1") -> int:
+    """A UDP port nothing is bound to right now (reply port for a fake + session pair)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+@dataclass
+class FakeParam:
+    name: str
+    min: float = 0.0
+    max: float = 1.0
+    value: float = 0.0
+    is_quantized: bool = False
+
+    def set(self, value: float) -> float:
+        v = max(self.min, min(self.max, float(value)))
+        self.value = float(round(v)) if self.is_quantized else v
+        return self.value
+
+@dataclass
+class FakeDevice:
+    name: str
+    class_name: str
+    parameters: list[FakeParam] = field(default_factory=list)
+
+@dataclass
+class FakeTrack:
+    name: str
+    devices: list[FakeDevice] = field(default_factory=list)
+    volume: float = 0.85
+
+@dataclass
+class FakeLiveSet:
+    tracks: list[FakeTrack]
+    master: FakeTrack
+    selected: tuple[int, int] = (MASTER_TRACK_ID, 0)  # (track_id, device_id)
+
+    @classmethod
+    def from_dict(cls, obj: dict[str, Any]) -> "FakeLiveSet":
+        def _track(t: dict[str, Any]) -> FakeTrack:
+            return FakeTrack(
+                name=str(t["name"]),
+                volume=float(t.get("volume", 0.85)),
+                devices=[
+                    FakeDevice(
+                        name=str(d["name"]),
+                        class_name=str(d.get("class_name", d["name"])),
+                        parameters=[FakeParam(**p) for p in d.get("parameters", [])],
+                    )
+                    for d in t.get("devices", [])
+                ],
+            )
+
+        sel = obj.get("selected") or {}
+        return cls(
+            tracks=[_track(t) for t in obj.get("tracks", [])],
+            master=_track(obj.get("master") or {"name": "Master"}),
+            selected=(int(sel.get("track_id", MASTER_TRACK_ID)), int(sel.get("device_id", 0))),
+        )
+
+    @classmethod
+    def synthetic(cls, num_tracks: int, devices_per_track: int, params_per_device: int = 8) -> "FakeLiveSet":
+        """Generated set of a given size (scaling benchmarks)."""
+        def _device(i: int) -> FakeDevice:
+            return FakeDevice(
+                name=f"Device {i}",
+                class_name="PluginDevice",
+                parameters=[FakeParam(name=f"Param {p}", value=0.5) for p in range(params_per_device)],
+            )
+
+        return cls(
+            tracks=[FakeTrack(name=f"Track {t}", devices=[_device(i) for i in range(devices_per_track)])
+                    for t in range(num_tracks)],
+            master=FakeTrack(name="Master", devices=[_device(i) for i in range(devices_per_track)]),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_FIXTURE) -> "FakeLiveSet":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def track(self, track_id: int) -> FakeTrack:
+        if int(track_id) == MASTER_TRACK_ID:
+            return self.master
+        if not 0 <= int(track_id) < len(self.tracks):
+            raise KeyError(f"no track {track_id}")
+        return self.tracks[int(track_id)]
+
+    def device(self, track_id: int, device_id: int) -> FakeDevice:
+        devices = self.track(track_id).devices
+        if not 0 <= int(device_id) < len(devices):
+            raise KeyError(f"no device {device_id} on track {track_id}")
+        return devices[int(device_id)]
+
+    def param(self, track_id: int, device_id: int, param_id: int) -> FakeParam:
+        params = self.device(track_id, device_id).parameters
+        if not 0 <= int(param_id) < len(params):
+            raise KeyError(f"no parameter {param_id} on device {track_id}/{device_id}")
+        return params[int(param_id)]
+
+@dataclass(frozen=True)
+class NetworkModel:
+    latency_ms: float = 0.0   # one-way delay added to every reply/push
+    jitter_ms: float = 0.0    # uniform +/- around latency_ms (replies may reorder)
+    loss: float = 0.0         # probability a reply/push is dropped
+    seed: int | None = None
+
+@dataclass
+class FakeStats:
+    requests: int = 0
+    replies: int = 0
+    pushes: int = 0
+    dropped: int = 0
+    unknown: int = 0    # unhandled address or missing track/device/parameter
+    by_address: Counter = field(default_factory=Counter, repr=False)  # requests per OSC address
+
+class _Delayed:
+    """One thread sending datagrams at their due time (a Timer per reply doesn't scale)."""
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, Callable[[], None]]] = []
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def call_at(self, due: float, fn: Callable[[], None]) -> None:
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._heap, (due, self._seq, fn))
+            self._cond.notify()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._cond.wait(None if not self._heap else self._heap[0][0] - time.monotonic())
+                if self._stopped:
+                    return
+                _, _, fn = heapq.heappop(self._heap)
+            fn()
+
+Handler = Callable[..., "list[Any] | None"]
+
+class FakeAbletonOSC:
+    """
+    UDP server speaking the AbletonOSC subset FLAAS uses.
+
+    Listens on (host, port) - port 0 picks a free one, see .target - and
+    replies to (reply_host, reply_port), like AbletonOSC's fixed reply port.
+    """
+
+    def __init__(
+        self,
+        live_set: FakeLiveSet | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        reply_port: int = 11001,
+        reply_host: str = "127.0.0.1",
+        network: NetworkModel = NetworkModel(),
+    ):
+        self.live_set = live_set if live_set is not None else FakeLiveSet.load()
+        self.network = network
+        self.stats = FakeStats()
+        self._rng = random.Random(network.seed)
+        self._lock = threading.RLock()  # handlers run under it and may push
+        self._listening: set[tuple[int, int, int]] = set()
+        self._reply = SimpleUDPClient(reply_host, int(reply_port))
+        disp = Dispatcher()
+        disp.set_default_handler(self._on_message)
+        self._server = ThreadingOSCUDPServer((host, int(port)), disp)
+        self._thread: threading.Thread | None = None
+        self._delayed: _Delayed | None = None
+        self._handlers: dict[str, Handler] = {
+            "/live/test": lambda *a: ["ok"],
+            "/live/flaas/version": lambda *a: [ABLETONOSC_VERSION_EXPECTED],
+            "/live/song/get/num_tracks": lambda *a: [len(self.live_set.tracks)],
+            "/live/song/get/track_names": lambda *a: [t.name for t in self.live_set.tracks],
+            "/live/view/get/selected_track": lambda *a: [self.live_set.selected[0]],
+            "/live/view/get/selected_device": lambda *a: list(self.live_set.selected),
+            "/live/track/get/name": lambda tid, *a: [tid, self.live_set.track(tid).name],
+            "/live/track/get/volume": lambda tid, *a: [tid, self.live_set.track(tid).volume],
+            "/live/track/get/num_devices": lambda tid, *a: [tid, len(self.live_set.track(tid).devices)],
+            "/live/track/get/devices/name": lambda tid, *a: [tid] + [d.name for d in self.live_set.track(tid).devices],
+            "/live/track/get/devices/class_name": lambda tid, *a: [tid] + [d.class_name for d in self.live_set.track(tid).devices],
+            "/live/track/set/volume": self._set_volume,
+            "/live/device/get/name": lambda tid, did, *a: [tid, did, self.live_set.device(tid, did).name],
+            "/live/device/get/class_name": lambda tid, did, *a: [tid, did, self.live_set.device(tid, did).class_name],
+            "/live/device/get/num_parameters": lambda tid, did, *a: [tid, did, len(self.live_set.device(tid, did).parameters)],
+            "/live/device/get/parameters/name": lambda tid, did, *a: self._params(tid, did, "name"),
+            "/live/device/get/parameters/min": lambda tid, did, *a: self._params(tid, did, "min"),
+            "/live/device/get/parameters/max": lambda tid, did, *a: self._params(tid, did, "max"),
+            "/live/device/get/parameters/value": lambda tid, did, *a: self._params(tid, did, "value"),
+            "/live/device/get/parameters/is_quantized": lambda tid, did, *a: self._params(tid, did, "is_quantized"),
+            "/live/device/get/parameter/value": lambda tid, did, pid, *a: [tid, did, pid, self.live_set.param(tid, did, pid).value],
+            "/live/device/set/parameter/value": self._set_param,
+            "/live/device/start_listen/parameter/value": self._start_listen,
+            "/live/device/stop_listen/parameter/value": self._stop_listen,
+        }
+
+    # --- lifecycle ---------------------------------------------------------
+
+    @property
+    def target(self) -> OscTarget:
+        host, port = self._server.server_address[:2]
+        return OscTarget(host=host, port=port)
+
+    def start(self) -> "FakeAbletonOSC":
+        if self._thread is None:
+            self._delayed = _Delayed()
+            self._thread = threading.Thread(target=self._server.serve_forever, args=(POLL_INTERVAL_S,), daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread (subprocess use); Ctrl-C stops."""
+        self._delayed = _Delayed()
+        try:
+            self._server.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+        if self._delayed is not None:
+            self._delayed.stop()
+            self._delayed = None
+
+    def __enter__(self) -> "FakeAbletonOSC":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # --- transport ---------------------------------------------------------
+
+    def _send(self, address: str, args: list[Any], push: bool = False) -> None:
+        with self._lock:
+            if push:
+                self.stats.pushes += 1
+            else:
+                self.stats.replies += 1
+            if self.network.loss > 0 and self._rng.random() < self.network.loss:
+                self.stats.dropped += 1
+                return
+            delay = self.network.latency_ms
+            if self.network.jitter_ms > 0:
+                delay += self._rng.uniform(-self.network.jitter_ms, self.network.jitter_ms)
+        if delay <= 0 or self._delayed is None:
+            self._reply.send_message(address, args)
+        else:
+            self._delayed.call_at(time.monotonic() + delay / 1000.0, lambda: self._reply.send_message(address, args))
+
+    def _on_message(self, address: str, *args: Any) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.by_address[address] += 1
+        handler = self._handlers.get(address)
+        try:
+            if handler is None:
+                raise KeyError(address)
+            with self._lock:
+                out = handler(*args)
+        except (KeyError, TypeError, ValueError):
+            with self._lock:
+                self.stats.unknown += 1
+            return
+        if out is not None:
+            self._send(address, out)
+
+    # --- handlers (called with self._lock held) ----------------------------
+
+    def _params(self, tid: int, did: int, attr: str) -> list[Any]:
+        return [tid, did] + [getattr(p, attr) for p in self.live_set.device(tid, did).parameters]
+
+    def _set_volume(self, tid: int, value: float, *a: Any) -> None:
+        self.live_set.track(tid).volume = max(0.0, min(1.0, float(value)))
+
+    def _set_param(self, tid: int, did: int, pid: int, value: float, *a: Any) -> None:
+        self.set_param(tid, did, pid, value)
+
+    def _start_listen(self, tid: int, did: int, pid: int, *a: Any) -> None:
+        p = self.live_set.param(tid, did, pid)
+        self._listening.add((int(tid), int(did), int(pid)))
+        # AbletonOSC reports the current value as soon as a listener starts
+        self._send("/live/device/get/parameter/value", [tid, did, pid, p.value], push=True)
+
+    def _stop_listen(self, tid: int, did: int, pid: int, *a: Any) -> None:
+        self._listening.discard((int(tid), int(did), int(pid)))
+
+    # --- test hooks --------------------------------------------------------
+
+    @property
+    def listening(self) -> set[tuple[int, int, int]]:
+        """(track_id, device_id, param_id) with an active start_listen."""
+        with self._lock:
+            return set(self._listening)
+
+    def set_param(self, tid: int, did: int, pid: int, value: float) -> float:
+        """Change a parameter (as the user or automation would) and notify listeners."""
+        with self._lock:
+            new = self.live_set.param(tid, did, pid).set(value)
+            if (int(tid), int(did), int(pid)) in self._listening:
+                self._send("/live/device/get/parameter/value", [tid, did, pid, new], push=True)
+        return new
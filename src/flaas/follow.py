@@ -0,0 +1,116 @@
+"""
+Follow a WAV while it is being written.
+
+FollowingMeter tails an export in progress: each poll() maps whatever frames
+have landed since the last call and feeds them to a StreamingMeter, so
+K-weighting, gating and true-peak state are already up to date when the
+writer finishes. finish() only has to meter the last few blocks.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+
+from flaas.analyze import AnalysisResult, analyze_wav, result_from_meter
+from flaas.audio_io import DEFAULT_BLOCK_SIZE, AudioData, MappedWav, WavLayout, parse_wav_header
+from flaas.meter import StreamingMeter, channel_weights
+from flaas.session import AudioSession
+
+def _same_format(a: WavLayout, b: WavLayout) -> bool:
+    return (a.sr, a.channels, a.format_tag, a.bits, a.block_align, a.data_offset) == \
+           (b.sr, b.channels, b.format_tag, b.bits, b.block_align, b.data_offset)
+
+class FollowingMeter:
+    """
+    Incremental meter for a growing WAV file.
+
+    The declared data size is ignored while following (writers patch it at the
+    end). If the file is deleted, replaced or shrinks, metering restarts.
+    """
+
+    def __init__(self, path: str | Path, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.path = Path(path)
+        self.block_size = int(block_size)
+        self.reset()
+
+    def reset(self) -> None:
+        self.layout: WavLayout | None = None
+        self.meter: StreamingMeter | None = None
+        self.frames_done = 0
+        self._inode: int | None = None
+        self._size_seen = 0
+
+    def _consume(self, layout: WavLayout) -> int:
+        if self.layout is None or not _same_format(self.layout, layout):
+            self.reset()
+            self.meter = StreamingMeter(layout.sr, layout.channels, channel_weights(layout.channels, layout.channel_mask))
+        self.layout = layout
+        if layout.frames <= self.frames_done:
+            return 0
+        wav = MappedWav(layout)
+        start0 = self.frames_done
+        for start in range(start0, layout.frames, self.block_size):
+            stop = min(layout.frames, start + self.block_size)
+            self.meter.process(wav.to_float(start, stop))
+        self.frames_done = layout.frames
+        return layout.frames - start0
+
+    def poll(self) -> int:
+        """Meter frames written since the last poll. Returns the number of new frames."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            if self.frames_done:
+                self.reset()
+            return 0
+        if self._inode is not None and (st.st_ino != self._inode or st.st_size < self._size_seen):
+            self.reset()
+        self._inode = st.st_ino
+        self._size_seen = st.st_size
+
+        layout = parse_wav_header(self.path, trust_data_size=False)
+        if layout is None:
+            return 0  # header not written yet
+        return self._consume(layout)
+
+    @property
+    def seconds(self) -> float:
+        return self.frames_done / self.layout.sr if self.layout is not None else 0.0
+
+    def partial_lufs_i(self) -> float | None:
+        """Integrated loudness of what has been written so far (None before 400 ms)."""
+        if self.meter is None or self.meter.samples < self.meter.block_len:
+            return None
+        return self.meter.integrated_loudness()
+
+    def partial_true_peak_dbtp(self) -> float | None:
+        return self.meter.true_peak_dbtp if self.meter is not None and self.meter.samples else None
+
+    def finish(self, timelines: bool = False, session: AudioSession | None = None) -> AnalysisResult:
+        """
+        Meter the remainder using the final header and return the full analysis.
+
+        Equivalent to analyze_wav() on the finished file. Falls back to it when
+        the file is not a mappable WAV or the followed frames don't line up.
+        With `session` (an AudioSession on the same file), the result is
+        memoized on it, so a later analyze_wav/check_wav(session) doesn't decode.
+        """
+        final = parse_wav_header(self.path)
+        if final is None:
+            return analyze_wav(session if session is not None else self.path, timelines=timelines)
+        if final.frames < self.frames_done:
+            # Bytes after the data chunk were metered as audio while following
+            self.reset()
+        self._consume(final)
+        if self.frames_done == 0:
+            raise ValueError("empty audio")
+        info = AudioData(
+            path=str(self.path),
+            sr=final.sr,
+            channels=final.channels,
+            samples=self.frames_done,
+            channel_mask=final.channel_mask,
+        )
+        res = result_from_meter(info, self.meter, timelines)
+        if session is not None:
+            session.analyses["timelines" if timelines else ""] = res
+        return res
@@ -4,9 +4,19 @@ from pathlib import Path
 from flaas.analyze import analyze_wav
 from flaas.plan import write_plan_gain_actions
 from flaas.apply import apply_actions_osc, apply_actions_dry_run
-from flaas.verify import verify_master_utility_gain
+from flaas.observe import ParamMirror
+from flaas.osc_rpc import OscTarget, osc_session
+from flaas.targets import MASTER_TRACK_ID, resolve_utility_device_id
+from flaas.verify import UTILITY_GAIN_PARAM_ID, verify_master_utility_gain
 
 def run_loop(wav: str | Path, dry: bool = False) -> None:
+    # Mirror master Utility gain: reads below are local and a knob touched mid-run is reported
+    with osc_session(OscTarget()) as session, ParamMirror.for_session(session) as mirror:
+        mirror.on_drift(lambda c: print(f"DRIFT: {c} (expected {c.expected:.6f})"))
+        mirror.watch(MASTER_TRACK_ID, resolve_utility_device_id(), UTILITY_GAIN_PARAM_ID)
+        _run_loop(wav, dry)
+
+def _run_loop(wav: str | Path, dry: bool) -> None:
     cur_norm = verify_master_utility_gain()
     if cur_norm >= 0.99:
         print(f"STOP: utility gain already near max (norm={cur_norm:.3f})")
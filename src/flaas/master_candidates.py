@@ -6,11 +6,13 @@ from pathlib import Path
 from datetime import datetime, timezone
 from dataclasses import dataclass
 
-from flaas.osc_rpc import OscTarget, request_once
+from flaas.osc_rpc import OscTarget, send_message
 from flaas.analyze import analyze_wav
 from flaas.check import check_wav
+from flaas.param_batch import ParamBatch
+from flaas.registry import DeviceRegistry, resolve_device_id_by_name, resolve_device_params
+from flaas.session import AudioSession
 from flaas.targets import DEFAULT_TARGETS
-from pythonosc.udp_client import SimpleUDPClient
 
 if sys.platform == "darwin":
     from flaas.ui_export_macos import auto_export_wav
@@ -72,46 +74,16 @@ CANDIDATES = [
 ]
 
 
-def resolve_device_id_by_name(
+def set_param(
     track_id: int,
-    device_name: str,
-    target: OscTarget = OscTarget(),
-) -> int:
-    """Resolve device ID by name (case-insensitive)."""
-    response = request_once(target, "/live/track/get/devices/name", [track_id], timeout_sec=3.0)
-    names = list(response)[1:]
-    
-    for idx, name in enumerate(names):
-        if str(name).strip().lower() == device_name.strip().lower():
-            return idx
-    
-    raise RuntimeError(f"Device '{device_name}' not found on track {track_id}. Available: {names}")
-
-
-def resolve_device_params(track_id: int, device_id: int, target: OscTarget = OscTarget()) -> dict[str, dict]:
-    """Resolve all parameter info for a device."""
-    names_resp = request_once(target, "/live/device/get/parameters/name", [track_id, device_id], timeout_sec=3.0)
-    mins_resp = request_once(target, "/live/device/get/parameters/min", [track_id, device_id], timeout_sec=3.0)
-    maxs_resp = request_once(target, "/live/device/get/parameters/max", [track_id, device_id], timeout_sec=3.0)
-    
-    names = list(names_resp[2:])
-    mins = list(mins_resp[2:])
-    maxs = list(maxs_resp[2:])
-    
-    params = {}
-    for i in range(len(names)):
-        param_name = str(names[i])
-        params[param_name] = {
-            "id": i,
-            "min": float(mins[i]) if i < len(mins) else 0.0,
-            "max": float(maxs[i]) if i < len(maxs) else 1.0,
-        }
-    
-    return params
-
-
-def set_param(track_id: int, device_id: int, param_name: str, value: float, params: dict, target: OscTarget) -> None:
-    """Set device parameter (dB → normalized conversion)."""
+    device_id: int,
+    param_name: str,
+    value: float,
+    params: dict,
+    target: OscTarget,
+    batch: ParamBatch | None = None,
+) -> None:
+    """Set device parameter (dB → normalized conversion). With `batch`, queue it for the next flush."""
     if param_name not in params:
         raise RuntimeError(f"Parameter '{param_name}' not found in device")
     
@@ -124,9 +96,12 @@ def set_param(track_id: int, device_id: int, param_name: str, value: float, para
     norm_value = (value - min_val) / (max_val - min_val)
     norm_value = max(0.0, min(1.0, norm_value))
     
+    if batch is not None:
+        batch.set(track_id, device_id, param_id, norm_value)
+        return
+
     # Fire-and-forget write
-    client = SimpleUDPClient(target.host, target.port)
-    client.send_message("/live/device/set/parameter/value", [track_id, device_id, param_id, norm_value])
+    send_message(target, "/live/device/set/parameter/value", [track_id, device_id, param_id, norm_value])
 
 
 def compute_sha256(path: Path) -> str:
@@ -156,11 +131,12 @@ def master_candidates(target: OscTarget = OscTarget(), auto_export_enabled: bool
     print("MASTER CANDIDATES: Generating 3 Spotify-ready masters")
     print("="*70)
     
+    registry = DeviceRegistry.from_config()  # cached names/param tables, checked per track
     # Resolve devices
     print(f"\nResolving devices on track {master_track_id}...")
     try:
-        glue_device_id = resolve_device_id_by_name(master_track_id, "Glue Compressor", target)
-        limiter_device_id = resolve_device_id_by_name(master_track_id, "Limiter", target)
+        glue_device_id = resolve_device_id_by_name(master_track_id, "Glue Compressor", target, registry=registry)
+        limiter_device_id = resolve_device_id_by_name(master_track_id, "Limiter", target, registry=registry)
         print(f"  Glue Compressor: device {glue_device_id}")
         print(f"  Limiter: device {limiter_device_id}")
     except RuntimeError as e:
@@ -170,8 +146,8 @@ def master_candidates(target: OscTarget = OscTarget(), auto_export_enabled: bool
     # Resolve parameters
     print(f"\nResolving parameters...")
     try:
-        glue_params = resolve_device_params(master_track_id, glue_device_id, target)
-        limiter_params = resolve_device_params(master_track_id, limiter_device_id, target)
+        glue_params = resolve_device_params(master_track_id, glue_device_id, target, registry=registry)
+        limiter_params = resolve_device_params(master_track_id, limiter_device_id, target, registry=registry)
         print(f"  Glue: {len(glue_params)} params")
         print(f"  Limiter: {len(limiter_params)} params")
     except Exception as e:
@@ -194,6 +170,7 @@ def master_candidates(target: OscTarget = OscTarget(), auto_export_enabled: bool
     
     # Run candidates
     results = []
+    batch = ParamBatch(target)
     
     for candidate in CANDIDATES:
         print(f"\n{'='*70}")
@@ -204,22 +181,23 @@ def master_candidates(target: OscTarget = OscTarget(), auto_export_enabled: bool
         print(f"\nSetting fixed parameters...")
         try:
             # Glue fixed params
-            set_param(master_track_id, glue_device_id, "Makeup", candidate.glue_makeup, glue_params, target)
+            set_param(master_track_id, glue_device_id, "Makeup", candidate.glue_makeup, glue_params, target, batch)
             print(f"  ✓ Glue Makeup = {candidate.glue_makeup} dB")
             
-            set_param(master_track_id, glue_device_id, "Ratio", candidate.glue_ratio, glue_params, target)
+            set_param(master_track_id, glue_device_id, "Ratio", candidate.glue_ratio, glue_params, target, batch)
             print(f"  ✓ Glue Ratio = {candidate.glue_ratio}:1")
             
-            set_param(master_track_id, glue_device_id, "Attack", candidate.glue_attack, glue_params, target)
+            set_param(master_track_id, glue_device_id, "Attack", candidate.glue_attack, glue_params, target, batch)
             print(f"  ✓ Glue Attack = {candidate.glue_attack} ms")
             
             # Limiter params
-            set_param(master_track_id, limiter_device_id, "Ceiling", candidate.limiter_ceiling, limiter_params, target)
+            set_param(master_track_id, limiter_device_id, "Ceiling", candidate.limiter_ceiling, limiter_params, target, batch)
             print(f"  ✓ Limiter Ceiling = {candidate.limiter_ceiling} dB")
             
-            set_param(master_track_id, limiter_device_id, "Gain", candidate.limiter_gain, limiter_params, target)
+            set_param(master_track_id, limiter_device_id, "Gain", candidate.limiter_gain, limiter_params, target, batch)
             print(f"  ✓ Limiter Gain = {candidate.limiter_gain} dB")
             
+            print(f"  ✓ Sent {batch.flush()}")
         except Exception as e:
             print(f"ERROR: Failed to set fixed params: {e}")
             continue
@@ -263,8 +241,9 @@ def master_candidates(target: OscTarget = OscTarget(), auto_export_enabled: bool
             
             # Verify
             try:
-                analysis = analyze_wav(temp_export)
-                check = check_wav(temp_export, DEFAULT_TARGETS)
+                session = AudioSession(temp_export)  # one decode for analyze + check
+                analysis = analyze_wav(session)
+                check = check_wav(session, DEFAULT_TARGETS)
                 
                 print(f"    LUFS: {analysis.lufs_i:.2f} (target -10.50) pass={check.pass_lufs}")
                 print(f"    PEAK: {analysis.peak_dbfs:.2f} (limit -6.00) pass={check.pass_peak}")
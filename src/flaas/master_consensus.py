@@ -2,56 +2,39 @@ from __future__ import annotations
 import sys
 import json
 import hashlib
+import math
+from dataclasses import replace
 from pathlib import Path
 from datetime import datetime, timezone
 
-from flaas.osc_rpc import OscTarget, request_once
-from flaas.analyze import analyze_wav
+from flaas.osc_rpc import OscTarget, send_message
+from flaas.analyze import AnalysisResult
+from flaas.audio_io import read_float
+from flaas.chain_sim import GLUE_ATTACK_STEPS_MS, ChainParams, search_chain
 from flaas.check import check_wav
+from flaas.param_batch import ParamBatch
+from flaas.registry import DeviceRegistry, resolve_device_id_by_name, resolve_device_params
+from flaas.follow import FollowingMeter
 from flaas.targets import DEFAULT_TARGETS
 from flaas.preflight import run_preflight_checks
-from pythonosc.udp_client import SimpleUDPClient
+from osc_common.trace import Tracer, span
 
 if sys.platform == "darwin":
     from flaas.ui_export_macos import auto_export_wav
 
-
-def resolve_device_id_by_name(track_id: int, device_name: str, target: OscTarget = OscTarget()) -> int:
-    """Resolve device ID by name (case-insensitive)."""
-    response = request_once(target, "/live/track/get/devices/name", [track_id], timeout_sec=3.0)
-    names = list(response)[1:]
-    
-    for idx, name in enumerate(names):
-        if str(name).strip().lower() == device_name.strip().lower():
-            return idx
-    
-    raise RuntimeError(f"Device '{device_name}' not found on track {track_id}. Available: {names}")
+MAX_CONFIRM_EXPORTS = 3  # Live exports per simulated run (each re-search uses the previous miss)
 
 
-def resolve_device_params(track_id: int, device_id: int, target: OscTarget = OscTarget()) -> dict[str, dict]:
-    """Resolve all parameter info for a device."""
-    names_resp = request_once(target, "/live/device/get/parameters/name", [track_id, device_id], timeout_sec=3.0)
-    mins_resp = request_once(target, "/live/device/get/parameters/min", [track_id, device_id], timeout_sec=3.0)
-    maxs_resp = request_once(target, "/live/device/get/parameters/max", [track_id, device_id], timeout_sec=3.0)
-    
-    names = list(names_resp[2:])
-    mins = list(mins_resp[2:])
-    maxs = list(maxs_resp[2:])
-    
-    params = {}
-    for i in range(len(names)):
-        param_name = str(names[i])
-        params[param_name] = {
-            "id": i,
-            "min": float(mins[i]) if i < len(mins) else 0.0,
-            "max": float(maxs[i]) if i < len(maxs) else 1.0,
-        }
-    
-    return params
-
-
-def set_param(track_id: int, device_id: int, param_name: str, value: float, params: dict, target: OscTarget) -> None:
-    """Set device parameter (dB → normalized conversion)."""
+def set_param(
+    track_id: int,
+    device_id: int,
+    param_name: str,
+    value: float,
+    params: dict,
+    target: OscTarget,
+    batch: ParamBatch | None = None,
+) -> None:
+    """Set device parameter (dB → normalized conversion). With `batch`, queue it for the next flush."""
     if param_name not in params:
         raise RuntimeError(f"Parameter '{param_name}' not found in device")
     
@@ -64,9 +47,236 @@ def set_param(track_id: int, device_id: int, param_name: str, value: float, para
     norm_value = (value - min_val) / (max_val - min_val)
     norm_value = max(0.0, min(1.0, norm_value))
     
+    if batch is not None:
+        batch.set(track_id, device_id, param_id, norm_value)
+        return
+
     # Fire-and-forget write
-    client = SimpleUDPClient(target.host, target.port)
-    client.send_message("/live/device/set/parameter/value", [track_id, device_id, param_id, norm_value])
+    send_message(target, "/live/device/set/parameter/value", [track_id, device_id, param_id, norm_value])
+
+
+def _clamp(value: float, params: dict, param_name: str) -> float:
+    """Clamp a value to a device parameter's range (values outside it can't be set)."""
+    info = params.get(param_name)
+    return value if info is None else max(info["min"], min(info["max"], value))
+
+
+def _param_range(params: dict, param_name: str, default: tuple[float, float]) -> tuple[float, float]:
+    info = params.get(param_name)
+    return default if info is None else (info["min"], info["max"])
+
+
+def _glue_attack(attack_ms: float, params: dict) -> tuple[float, float]:
+    """
+    Nearest Glue Attack to `attack_ms`: (ms to simulate, value to send).
+
+    A quantized Attack takes a step index, so the value sent is the index of
+    the closest step (on a log scale) and the simulation uses that step's ms.
+    """
+    info = params.get("Attack")
+    if info is None or not info.get("is_quantized"):
+        return attack_ms, attack_ms
+    steps = GLUE_ATTACK_STEPS_MS[:int(info["max"] - info["min"]) + 1]
+    i = min(range(len(steps)), key=lambda k: abs(math.log(steps[k] / attack_ms)))
+    return steps[i], info["min"] + i
+
+
+def _export_and_analyze(path: Path, auto_export_enabled: bool, **span_args) -> AnalysisResult | None:
+    """Export from Live to `path` (metered while it is written); None if the export failed."""
+    if path.exists():
+        path.unlink()
+    print(f"\nExporting: {path.name}")
+    follower = FollowingMeter(path)
+    with span("export", cat="export", file=path.name, **span_args):
+        if auto_export_enabled and sys.platform == "darwin":
+            try:
+                auto_export_wav(path, timeout_s=600, on_poll=lambda _p: follower.poll())
+                print(f"  ✓ Export complete")
+            except RuntimeError as e:
+                print(f"  ✗ Export failed: {e}")
+                return None
+        else:
+            print(f"  Manual export to: {path}")
+            input("  Press Enter after export completes...")
+    with span("analyze", cat="analysis", **span_args):
+        try:
+            return follower.finish()
+        except Exception as e:
+            print(f"ERROR: Failed to analyze {path.name}: {e}")
+            return None
+
+
+def _bounce_pre_chain(
+    path: Path,
+    master_track_id: int,
+    devices: dict[str, tuple[int | None, dict | None]],
+    target: OscTarget,
+    batch: ParamBatch,
+    auto_export_enabled: bool,
+) -> AnalysisResult | None:
+    """Export the master with Glue/Saturator/Limiter bypassed (re-enabled afterwards); None on failure."""
+    chain = [(device_id, params) for device_id, params in devices.values() if device_id is not None and params]
+    missing = [name for name, (device_id, params) in devices.items()
+               if device_id is not None and params and "Device On" not in params]
+    if missing:
+        print(f"ERROR: Can't bypass {', '.join(missing)}: no 'Device On' parameter")
+        return None
+    pre = None
+    try:
+        for device_id, params in chain:
+            set_param(master_track_id, device_id, "Device On", 0.0, params, target, batch)
+        print(f"\nBypassing chain for pre-chain bounce: {batch.flush()}")
+        pre = _export_and_analyze(path, auto_export_enabled, stage="pre_chain")
+    except Exception as e:
+        print(f"ERROR: Failed to bypass chain: {e}")
+    finally:
+        try:
+            for device_id, params in chain:
+                set_param(master_track_id, device_id, "Device On", 1.0, params, target, batch)
+            print(f"Re-enabled chain: {batch.flush()}")
+        except Exception as e:
+            print(f"ERROR: Failed to re-enable chain: {e}")
+            pre = None
+    return pre
+
+
+def _simulated_consensus(
+    target: OscTarget,
+    auto_export_enabled: bool,
+    mode: str,
+    mode_desc: str,
+    target_lufs: float,
+    true_peak_limit: float,
+    final_output: Path,
+    log_path: Path,
+    batch: ParamBatch,
+    pre_chain: str | Path | None,
+    devices: dict[str, tuple[int | None, dict | None]],
+    start: ChainParams,
+) -> int:
+    """Search the chain offline on a pre-chain bounce; export from Live only to confirm."""
+    master_track_id = -1000
+    glue_device_id, glue_params = devices["glue"]
+    saturator_device_id, saturator_params = devices["saturator"]
+    limiter_device_id, limiter_params = devices["limiter"]
+
+    if pre_chain is None:
+        pre_chain = final_output.parent / f"{final_output.stem}_prechain{final_output.suffix}"
+        pre = _bounce_pre_chain(Path(pre_chain).resolve(), master_track_id, devices, target, batch, auto_export_enabled)
+        if pre is None:
+            return 20
+        print(f"  Pre-chain: LUFS {pre.lufs_i:.2f}, peak {pre.peak_dbfs:.2f} dBFS")
+        if pre.peak_dbfs > -0.1:
+            print(f"  ⚠️  Pre-chain bounce is clipping; predictions will read low on peaks")
+    try:
+        x, sr = read_float(pre_chain)
+    except Exception as e:
+        print(f"ERROR: Failed to read pre-chain bounce {pre_chain}: {e}")
+        return 20
+
+    attack_ms, attack_value = _glue_attack(start.attack_ms, glue_params)
+    start = replace(start, attack_ms=attack_ms)
+    gain_range = _param_range(limiter_params, "Gain", (-24.0, 24.0))
+    ceiling_range = _param_range(limiter_params, "Ceiling", (-24.0, 0.0))
+    threshold_range = _param_range(glue_params, "Threshold", (-40.0, 0.0))
+    makeup_range = _param_range(glue_params, "Makeup", (0.0, 20.0))
+    lufs_offset = tp_offset = 0.0
+    best_result = None
+    best_distance = float('inf')
+    stop_reason = None
+    confirms = []
+
+    for iteration in range(1, MAX_CONFIRM_EXPORTS + 1):
+        print(f"\n{'─'*70}")
+        print(f"CONFIRM {iteration}/{MAX_CONFIRM_EXPORTS} (offsets: LUFS {lufs_offset:+.2f}, TP {tp_offset:+.2f})")
+        print(f"{'─'*70}")
+
+        with span("simulate", cat="sim", iteration=iteration):
+            found = search_chain(
+                x, sr, start, target_lufs, true_peak_limit,
+                gain_range=gain_range, ceiling_range=ceiling_range,
+                threshold_range=threshold_range, makeup_range=makeup_range,
+                lufs_offset=lufs_offset, tp_offset=tp_offset,
+            )
+        p, pred = found.params, found.prediction
+        print(f"Simulated ({found.renders} renders, {found.elapsed_ms / 1000.0:.1f}s): "
+              f"LUFS {pred.lufs_i:.2f}, TP {pred.true_peak_dbtp:.2f} dBTP, reached_target={found.reached_target}")
+
+        print(f"Setting parameters...")
+        try:
+            set_param(master_track_id, glue_device_id, "Threshold", p.threshold_db, glue_params, target, batch)
+            set_param(master_track_id, glue_device_id, "Makeup", p.makeup_db, glue_params, target, batch)
+            set_param(master_track_id, glue_device_id, "Ratio", p.ratio, glue_params, target, batch)
+            set_param(master_track_id, glue_device_id, "Attack", attack_value, glue_params, target, batch)
+            if saturator_device_id is not None and saturator_params:
+                set_param(master_track_id, saturator_device_id, "Drive", p.saturator_drive_db, saturator_params, target, batch)
+            set_param(master_track_id, limiter_device_id, "Gain", p.limiter_gain_db, limiter_params, target, batch)
+            if "Ceiling" in limiter_params:
+                set_param(master_track_id, limiter_device_id, "Ceiling", p.limiter_ceiling_db, limiter_params, target, batch)
+            print(f"  ✓ Sent {batch.flush()}")
+        except Exception as e:
+            print(f"ERROR: Failed to set params: {e}")
+            return 20
+
+        export = (final_output.parent / f"{final_output.stem}_iter{iteration}{final_output.suffix}").resolve()
+        analysis = _export_and_analyze(export, auto_export_enabled, iteration=iteration)
+        if analysis is None:
+            return 20
+
+        lufs_distance = abs(analysis.lufs_i - target_lufs)
+        true_peak_safe = analysis.true_peak_dbtp <= true_peak_limit
+        print(f"  LUFS: {analysis.lufs_i:.2f} (predicted {pred.lufs_i:.2f}, target {target_lufs:.1f})")
+        print(f"  True Peak: {analysis.true_peak_dbtp:.2f} dBTP (predicted {pred.true_peak_dbtp:.2f}, limit {true_peak_limit:.1f})")
+
+        iter_log = {
+            "iteration": iteration,
+            "threshold_db": p.threshold_db,
+            "makeup_db": p.makeup_db,
+            "ratio": p.ratio,
+            "saturator_drive_db": p.saturator_drive_db,
+            "limiter_gain_db": p.limiter_gain_db,
+            "limiter_ceiling_db": p.limiter_ceiling_db,
+            "lufs_i": analysis.lufs_i,
+            "peak_dbfs": analysis.peak_dbfs,
+            "true_peak_dbtp": analysis.true_peak_dbtp,
+            "lufs_distance": lufs_distance,
+            "true_peak_safe": true_peak_safe,
+        }
+        confirms.append({
+            "iteration": iteration,
+            "predicted_lufs_i": pred.lufs_i,
+            "predicted_true_peak_dbtp": pred.true_peak_dbtp,
+            "lufs_i": analysis.lufs_i,
+            "true_peak_dbtp": analysis.true_peak_dbtp,
+            "renders": found.renders,
+            "search_ms": found.elapsed_ms,
+        })
+
+        if true_peak_safe and lufs_distance < best_distance:
+            best_distance = lufs_distance
+            best_result = iter_log
+
+        if true_peak_safe and lufs_distance <= 0.5:
+            print(f"\n✅ CONFIRMED after {iteration} export(s)")
+            if final_output.exists():
+                final_output.unlink()
+            export.rename(final_output)
+            best_result["export_file"] = str(final_output)
+            best_result["final"] = True
+            stop_reason = "hit_target"
+            break
+
+        # Whatever the model missed this time is corrected for in the next search
+        lufs_offset += analysis.lufs_i - pred.lufs_i
+        tp_offset += analysis.true_peak_dbtp - pred.true_peak_dbtp
+
+    return _finish_consensus(
+        best_result, stop_reason or "max_confirm_exports", iteration,
+        mode=mode, mode_desc=mode_desc, final_output=final_output, log_path=log_path,
+        target_lufs=target_lufs, true_peak_limit=true_peak_limit, attack=start.attack_ms,
+        has_saturator=saturator_device_id is not None,
+        extra={"simulation": {"pre_chain": str(pre_chain), "confirm_exports": confirms}},
+    )
 
 
 def compute_sha256(path: Path) -> str:
@@ -82,6 +292,8 @@ def master_consensus(
     target: OscTarget = OscTarget(),
     auto_export_enabled: bool = True,
     mode: str = "loud_preview",  # streaming_safe | loud_preview | headroom
+    simulate: bool = True,
+    pre_chain: str | Path | None = None,
 ) -> int:
     """
     Generate ONE high-quality consensus master with mode-based optimization.
@@ -91,7 +303,13 @@ def master_consensus(
     - loud_preview: -9 LUFS, -2 dBTP (competitive commercial, addresses 'super quiet')
     - headroom: -6 dBFS sample peak (internal safety)
     
-    Strategy:
+    Strategy (simulate=True, default):
+    - Bounce the master with Glue/Saturator/Limiter bypassed (or use `pre_chain`)
+    - Search Glue/Saturator/Limiter settings offline on that bounce (flaas.chain_sim)
+    - Export from Live only to confirm; on a miss, re-search with the measured
+      model error as offset (up to MAX_CONFIRM_EXPORTS exports)
+
+    Strategy (simulate=False, export per iteration):
     - Resolve devices at runtime (Glue, Saturator, Limiter)
     - Start aggressive, iterate up to 15 times
     - Use Saturator for RMS boost (more efficient than extreme compression)
@@ -100,9 +318,20 @@ def master_consensus(
     
     Output: output/master_{mode}.wav
     Log: output/master_{mode}.jsonl
+    Trace: output/master_{mode}.trace.jsonl (OSC calls, export, analysis; see `flaas trace summarize`)
     
     Returns 0 on success, 20 on failure.
     """
+    with Tracer(Path(f"output/master_{mode}.trace.jsonl")), span("master_consensus", cat="run", mode=mode):
+        return _master_consensus(target, auto_export_enabled, mode, simulate, pre_chain)
+
+def _master_consensus(
+    target: OscTarget,
+    auto_export_enabled: bool,
+    mode: str,
+    simulate: bool = True,
+    pre_chain: str | Path | None = None,
+) -> int:
     # Mode-based targets
     mode_configs = {
         "streaming_safe": {
@@ -143,21 +372,22 @@ def master_consensus(
     print(f"True peak limit: {true_peak_limit:.1f} dBTP")
     print(f"")
     
+    registry = DeviceRegistry.from_config()  # cached names/param tables, checked per track
     # Resolve devices (Glue, Saturator, Limiter)
     print(f"Resolving devices on track {master_track_id}...")
     try:
-        glue_device_id = resolve_device_id_by_name(master_track_id, "Glue Compressor", target)
+        glue_device_id = resolve_device_id_by_name(master_track_id, "Glue Compressor", target, registry=registry)
         print(f"  ✓ Glue Compressor: device {glue_device_id}")
         
         # Saturator is optional but recommended for RMS boost
         saturator_device_id = None
         try:
-            saturator_device_id = resolve_device_id_by_name(master_track_id, "Saturator", target)
+            saturator_device_id = resolve_device_id_by_name(master_track_id, "Saturator", target, registry=registry)
             print(f"  ✓ Saturator: device {saturator_device_id}")
         except RuntimeError:
             print(f"  ⚠ Saturator not found (optional, but recommended for max loudness)")
         
-        limiter_device_id = resolve_device_id_by_name(master_track_id, "Limiter", target)
+        limiter_device_id = resolve_device_id_by_name(master_track_id, "Limiter", target, registry=registry)
         print(f"  ✓ Limiter: device {limiter_device_id}")
     except RuntimeError as e:
         print(f"ERROR: {e}")
@@ -166,15 +396,15 @@ def master_consensus(
     # Resolve parameters
     print(f"\nResolving parameters...")
     try:
-        glue_params = resolve_device_params(master_track_id, glue_device_id, target)
+        glue_params = resolve_device_params(master_track_id, glue_device_id, target, registry=registry)
         print(f"  ✓ Glue Compressor: {len(glue_params)} params")
         
         saturator_params = None
         if saturator_device_id is not None:
-            saturator_params = resolve_device_params(master_track_id, saturator_device_id, target)
+            saturator_params = resolve_device_params(master_track_id, saturator_device_id, target, registry=registry)
             print(f"  ✓ Saturator: {len(saturator_params)} params")
         
-        limiter_params = resolve_device_params(master_track_id, limiter_device_id, target)
+        limiter_params = resolve_device_params(master_track_id, limiter_device_id, target, registry=registry)
         print(f"  ✓ Limiter: {len(limiter_params)} params")
     except Exception as e:
         print(f"ERROR: Failed to resolve params: {e}")
@@ -235,6 +465,25 @@ def master_consensus(
     best_distance = float('inf')
     last_lufs = None  # Track diminishing returns
     stop_reason = None  # Track why we stopped
+    batch = ParamBatch(target)  # one client, one bundle per iteration
+
+    if simulate:
+        return _simulated_consensus(
+            target, auto_export_enabled, mode, mode_desc, target_lufs, true_peak_limit,
+            final_output, log_path, batch, pre_chain,
+            devices={
+                "glue": (glue_device_id, glue_params),
+                "saturator": (saturator_device_id, saturator_params),
+                "limiter": (limiter_device_id, limiter_params),
+            },
+            start=ChainParams(
+                threshold_db=_clamp(threshold, glue_params, "Threshold"),
+                ratio=ratio,
+                attack_ms=attack,
+                makeup_db=_clamp(makeup, glue_params, "Makeup"),
+                saturator_drive_db=saturator_drive if saturator_device_id is not None else None,
+            ),
+        )
     
     for iteration in range(1, 16):  # Up to 15 iterations for convergence
         print(f"\n{'─'*70}")
@@ -244,26 +493,27 @@ def master_consensus(
         # Set all parameters
         print(f"Setting parameters...")
         try:
-            set_param(master_track_id, glue_device_id, "Threshold", threshold, glue_params, target)
+            set_param(master_track_id, glue_device_id, "Threshold", threshold, glue_params, target, batch)
             print(f"  ✓ Glue Threshold = {threshold:.1f} dB")
             
-            set_param(master_track_id, glue_device_id, "Makeup", makeup, glue_params, target)
+            set_param(master_track_id, glue_device_id, "Makeup", makeup, glue_params, target, batch)
             print(f"  ✓ Glue Makeup = {makeup:.1f} dB")
             
-            set_param(master_track_id, glue_device_id, "Ratio", ratio, glue_params, target)
+            set_param(master_track_id, glue_device_id, "Ratio", ratio, glue_params, target, batch)
             print(f"  ✓ Glue Ratio = {ratio:.1f}:1")
             
-            set_param(master_track_id, glue_device_id, "Attack", attack, glue_params, target)
+            set_param(master_track_id, glue_device_id, "Attack", attack, glue_params, target, batch)
             print(f"  ✓ Glue Attack = {attack:.1f} ms")
             
             # Saturator (if available)
             if saturator_device_id and saturator_params:
-                set_param(master_track_id, saturator_device_id, "Drive", saturator_drive, saturator_params, target)
+                set_param(master_track_id, saturator_device_id, "Drive", saturator_drive, saturator_params, target, batch)
                 print(f"  ✓ Saturator Drive = {saturator_drive:.1f} dB")
             
-            set_param(master_track_id, limiter_device_id, "Gain", limiter_gain, limiter_params, target)
+            set_param(master_track_id, limiter_device_id, "Gain", limiter_gain, limiter_params, target, batch)
             print(f"  ✓ Limiter Gain = {limiter_gain:.1f} dB")
             
+            print(f"  ✓ Sent {batch.flush()}")
         except Exception as e:
             print(f"ERROR: Failed to set params: {e}")
             return 20
@@ -275,22 +525,26 @@ def master_consensus(
             temp_export.unlink()
         
         print(f"\nExporting: {temp_export.name}")
+        # Meter the export while Ableton writes it; only the tail is left afterwards
+        follower = FollowingMeter(temp_export)
         
-        if auto_export_enabled and sys.platform == "darwin":
-            try:
-                auto_export_wav(temp_export, timeout_s=600)
-                print(f"  ✓ Export complete")
-            except RuntimeError as e:
-                print(f"  ✗ Export failed: {e}")
-                return 20
-        else:
-            print(f"  Manual export to: {temp_export}")
-            input("  Press Enter after export completes...")
+        with span("export", cat="export", iteration=iteration, file=temp_export.name):
+            if auto_export_enabled and sys.platform == "darwin":
+                try:
+                    auto_export_wav(temp_export, timeout_s=600, on_poll=lambda _p: follower.poll())
+                    print(f"  ✓ Export complete")
+                except RuntimeError as e:
+                    print(f"  ✗ Export failed: {e}")
+                    return 20
+            else:
+                print(f"  Manual export to: {temp_export}")
+                input("  Press Enter after export completes...")
         
         # Verify
         print(f"\nVerifying...")
         try:
-            analysis = analyze_wav(temp_export)
+            with span("analyze", cat="analysis", iteration=iteration):
+                analysis = follower.finish()
             
             lufs_distance = abs(analysis.lufs_i - target_lufs)
             true_peak_safe = analysis.true_peak_dbtp <= true_peak_limit
@@ -432,6 +686,30 @@ def master_consensus(
             print(f"  ✗ Verification failed: {e}")
             return 20
     
+    return _finish_consensus(
+        best_result, stop_reason, iteration,
+        mode=mode, mode_desc=mode_desc, final_output=final_output, log_path=log_path,
+        target_lufs=target_lufs, true_peak_limit=true_peak_limit, attack=attack,
+        has_saturator=saturator_device_id is not None,
+    )
+
+
+def _finish_consensus(
+    best_result: dict | None,
+    stop_reason: str | None,
+    iteration: int,
+    *,
+    mode: str,
+    mode_desc: str,
+    final_output: Path,
+    log_path: Path,
+    target_lufs: float,
+    true_peak_limit: float,
+    attack: float,
+    has_saturator: bool,
+    extra: dict | None = None,
+) -> int:
+    """Promote the best export to `final_output`, write the run log and EXPORT_FINDINGS entry."""
     # Check if we hit max iterations
     if not stop_reason:
         stop_reason = "max_iterations"
@@ -481,9 +759,10 @@ def master_consensus(
             },
             "saturator": {
                 "drive_db": best_result.get("saturator_drive_db"),
-            } if saturator_device_id else None,
+            } if has_saturator else None,
             "limiter": {
                 "gain_db": best_result["limiter_gain_db"],
+                **({"ceiling_db": best_result["limiter_ceiling_db"]} if "limiter_ceiling_db" in best_result else {}),
             },
         },
         "results": {
@@ -500,6 +779,7 @@ def master_consensus(
         "iterations_total": best_result["iteration"],
         "converged": best_result.get("final", False),
         "stop_reason": stop_reason,
+        **(extra or {}),
     }
     
     with log_path.open("w", encoding="utf-8") as f:
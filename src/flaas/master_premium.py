@@ -26,56 +26,31 @@ import hashlib
 from pathlib import Path
 from datetime import datetime, timezone
 
-from flaas.osc_rpc import OscTarget, request_once
-from flaas.analyze import analyze_wav
+from flaas.osc_rpc import OscTarget, send_message
+from flaas.follow import FollowingMeter
+from flaas.param_batch import ParamBatch
+from flaas.registry import DeviceRegistry, resolve_device_id_by_name, resolve_device_params
 from flaas.targets import MASTER_TRACK_ID
 from flaas.preflight import run_preflight_checks
-from pythonosc.udp_client import SimpleUDPClient
 
 if sys.platform == "darwin":
     from flaas.ui_export_macos import auto_export_wav
 
 
-def resolve_device_id_by_name(track_id: int, device_name: str, target: OscTarget = OscTarget()) -> int:
-    """Resolve device ID by name (case-insensitive, partial match)."""
-    response = request_once(target, "/live/track/get/devices/name", [track_id], timeout_sec=3.0)
-    names = list(response)[1:]
-    
-    search_lower = device_name.strip().lower()
-    for idx, name in enumerate(names):
-        if search_lower in str(name).strip().lower():
-            return idx
-    
-    raise RuntimeError(f"Device '{device_name}' not found on track {track_id}. Available: {names}")
-
-
-def resolve_device_params(track_id: int, device_id: int, target: OscTarget = OscTarget()) -> dict[str, dict]:
-    """Resolve all parameter info for a device."""
-    names_resp = request_once(target, "/live/device/get/parameters/name", [track_id, device_id], timeout_sec=3.0)
-    mins_resp = request_once(target, "/live/device/get/parameters/min", [track_id, device_id], timeout_sec=3.0)
-    maxs_resp = request_once(target, "/live/device/get/parameters/max", [track_id, device_id], timeout_sec=3.0)
-    
-    names = list(names_resp[2:])
-    mins = list(mins_resp[2:])
-    maxs = list(maxs_resp[2:])
-    
-    params = {}
-    for i in range(len(names)):
-        param_name = str(names[i])
-        params[param_name] = {
-            "id": i,
-            "min": float(mins[i]) if i < len(mins) else 0.0,
-            "max": float(maxs[i]) if i < len(maxs) else 1.0,
-        }
-    
-    return params
-
-
-def set_param_normalized(track_id: int, device_id: int, param_id: int, norm_value: float, target: OscTarget) -> None:
-    """Set parameter with normalized value [0, 1]."""
+def set_param_normalized(
+    track_id: int,
+    device_id: int,
+    param_id: int,
+    norm_value: float,
+    target: OscTarget,
+    batch: ParamBatch | None = None,
+) -> None:
+    """Set parameter with normalized value [0, 1]. With `batch`, queue it for the next flush."""
     norm_value = max(0.0, min(1.0, norm_value))
-    client = SimpleUDPClient(target.host, target.port)
-    client.send_message("/live/device/set/parameter/value", [track_id, device_id, param_id, norm_value])
+    if batch is not None:
+        batch.set(track_id, device_id, param_id, norm_value)
+        return
+    send_message(target, "/live/device/set/parameter/value", [track_id, device_id, param_id, norm_value])
 
 
 def db_to_normalized(db_value: float, min_db: float, max_db: float) -> float:
@@ -152,14 +127,15 @@ def master_premium(
     
     print("\n✅ Pre-flight checks passed - starting optimization...\n")
     
+    registry = DeviceRegistry.from_config()  # cached names/param tables, checked per track
     # Resolve devices
     tid = MASTER_TRACK_ID
     try:
-        utility_id = resolve_device_id_by_name(tid, "Utility", target)
-        c6_id = resolve_device_id_by_name(tid, "C6", target)
-        ssl_id = resolve_device_id_by_name(tid, "SSL", target)
-        saturator_id = resolve_device_id_by_name(tid, "Saturator", target)
-        l3_id = resolve_device_id_by_name(tid, "L3", target)
+        utility_id = resolve_device_id_by_name(tid, "Utility", target, registry=registry, partial=True)
+        c6_id = resolve_device_id_by_name(tid, "C6", target, registry=registry, partial=True)
+        ssl_id = resolve_device_id_by_name(tid, "SSL", target, registry=registry, partial=True)
+        saturator_id = resolve_device_id_by_name(tid, "Saturator", target, registry=registry, partial=True)
+        l3_id = resolve_device_id_by_name(tid, "L3", target, registry=registry, partial=True)
         
         print(f"✓ Resolved devices: Utility={utility_id}, C6={c6_id}, SSL={ssl_id}, Saturator={saturator_id}, L3={l3_id}\n")
     except Exception as e:
@@ -167,11 +143,11 @@ def master_premium(
         return 1
     
     # Get parameter info
-    utility_params = resolve_device_params(tid, utility_id, target)
-    c6_params = resolve_device_params(tid, c6_id, target)
-    ssl_params = resolve_device_params(tid, ssl_id, target)
-    saturator_params = resolve_device_params(tid, saturator_id, target)
-    l3_params = resolve_device_params(tid, l3_id, target)
+    utility_params = resolve_device_params(tid, utility_id, target, registry=registry)
+    c6_params = resolve_device_params(tid, c6_id, target, registry=registry)
+    ssl_params = resolve_device_params(tid, ssl_id, target, registry=registry)
+    saturator_params = resolve_device_params(tid, saturator_id, target, registry=registry)
+    l3_params = resolve_device_params(tid, l3_id, target, registry=registry)
     
     # Check macOS export
     if auto_export_enabled and sys.platform != "darwin":
@@ -224,6 +200,7 @@ def master_premium(
     prev_lufs = None
     stop_reason = None
     
+    batch = ParamBatch(target)  # whole chain goes out as one bundle per iteration
     for iteration in range(1, max_iterations + 1):
         print("─" * 70)
         print(f"ITERATION {iteration}/{max_iterations}")
@@ -233,42 +210,43 @@ def master_premium(
         print("Setting C6 multiband compression...")
         # Band 1 (low): params 11, 12
         set_param_normalized(tid, c6_id, c6_params["Band 1 Threshold"]["id"], 
-                            db_to_normalized(c6_low_thresh, -60, 0), target)
+                            db_to_normalized(c6_low_thresh, -60, 0), target, batch)
         # Band 3 (mid): params around 23, 24
         set_param_normalized(tid, c6_id, c6_params["Band 3 Threshold"]["id"] if "Band 3 Threshold" in c6_params else 23,
-                            db_to_normalized(c6_mid_thresh, -60, 0), target)
+                            db_to_normalized(c6_mid_thresh, -60, 0), target, batch)
         # Band 5 (high): params around 35, 36
         set_param_normalized(tid, c6_id, c6_params["Band 5 Threshold"]["id"] if "Band 5 Threshold" in c6_params else 35,
-                            db_to_normalized(c6_high_thresh, -60, 0), target)
+                            db_to_normalized(c6_high_thresh, -60, 0), target, batch)
         print(f"  ✓ C6: Low={c6_low_thresh:.1f} dB, Mid={c6_mid_thresh:.1f} dB, High={c6_high_thresh:.1f} dB")
         
         # Set SSL parameters
         print("Setting SSL compression...")
         set_param_normalized(tid, ssl_id, ssl_params["Thresh"]["id"], 
-                            db_to_normalized(ssl_thresh, -60, 0), target)
+                            db_to_normalized(ssl_thresh, -60, 0), target, batch)
         set_param_normalized(tid, ssl_id, ssl_params["Makeup"]["id"],
-                            db_to_normalized(ssl_makeup, -20, 20), target)
+                            db_to_normalized(ssl_makeup, -20, 20), target, batch)
         # Ratio: 0.0=2:1, 0.5=4:1, 1.0=10:1 (approximate)
         ssl_ratio_norm = (ssl_ratio - 2.0) / 8.0
-        set_param_normalized(tid, ssl_id, ssl_params["Ratio"]["id"], ssl_ratio_norm, target)
+        set_param_normalized(tid, ssl_id, ssl_params["Ratio"]["id"], ssl_ratio_norm, target, batch)
         print(f"  ✓ SSL: Thresh={ssl_thresh:.1f} dB, Makeup={ssl_makeup:.1f} dB, Ratio={ssl_ratio:.1f}:1")
         
         # Set Saturator
         print("Setting Saturator...")
         # Drive: normalized directly (0-1 maps to reasonable range)
         saturator_drive_norm = saturator_drive / 20.0  # Assume 0-20 dB range
-        set_param_normalized(tid, saturator_id, saturator_params["Drive"]["id"], saturator_drive_norm, target)
+        set_param_normalized(tid, saturator_id, saturator_params["Drive"]["id"], saturator_drive_norm, target, batch)
         print(f"  ✓ Saturator: Drive={saturator_drive:.1f} dB")
         
         # Set L3
         print("Setting L3 limiter...")
         # Threshold: typically -30 to 0 dB
         set_param_normalized(tid, l3_id, l3_params["Threshold"]["id"],
-                            db_to_normalized(l3_threshold, -30, 0), target)
+                            db_to_normalized(l3_threshold, -30, 0), target, batch)
         # Out Ceiling: typically -20 to 0 dB (set to -1.0 dBTP equivalent)
         set_param_normalized(tid, l3_id, l3_params["Out Ceiling"]["id"],
-                            db_to_normalized(-1.0, -20, 0), target)
+                            db_to_normalized(-1.0, -20, 0), target, batch)
         print(f"  ✓ L3: Threshold={l3_threshold:.1f} dB, Ceiling=-1.0 dB")
+        print(f"  ✓ Sent {batch.flush()}")
         
         print()
         
@@ -277,6 +255,8 @@ def master_premium(
         export_file_abs = export_file.resolve()
         
         print(f"Exporting: {export_file.name}")
+        # Meter the export while Ableton writes it; only the tail is left afterwards
+        follower = FollowingMeter(export_file_abs)
         
         if not auto_export_enabled:
             print("  ⚠️  Auto-export disabled - manual export required")
@@ -287,7 +267,7 @@ def master_premium(
                 export_file_abs.unlink()
             
             try:
-                auto_export_wav(export_file_abs, timeout_s=600)
+                auto_export_wav(export_file_abs, timeout_s=600, on_poll=lambda _p: follower.poll())
                 print(f"  ✓ Exported: {export_file.name}")
             except Exception as e:
                 print(f"  ✗ Export failed: {e}")
@@ -295,7 +275,7 @@ def master_premium(
         
         # Verify
         print("Analyzing...")
-        analysis = analyze_wav(export_file_abs)
+        analysis = follower.finish()
         lufs_i = analysis.lufs_i
         peak_dbfs = analysis.peak_dbfs
         true_peak_dbtp = analysis.true_peak_dbtp
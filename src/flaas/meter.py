@@ -0,0 +1,277 @@
+"""
+Block-wise BS.1770 metering.
+
+StreamingMeter accepts audio in arbitrary-sized blocks and carries all filter
+state between calls, so feeding a whole file at once or in 64k-sample chunks
+produces the same results. Memory is bounded by the block size plus a few
+floats per 100 ms of audio.
+
+Everything is derived from one traversal: per 100 ms segment the meter keeps
+the channel-weighted K-weighted energy (BS.1770: sum of G_i * z_i), the
+unweighted energy and the sample peak. All channels are filtered at once on
+the (frames, channels) block with per-channel filter state. Momentary
+(400 ms), short-term (3 s), integrated loudness, LRA, crest factor and RMS
+timelines are all windows over those segments.
+"""
+
+from __future__ import annotations
+import warnings
+import numpy as np
+import pyloudnorm as pyln
+from scipy import signal
+
+from flaas.true_peak import TruePeakState
+
+GATE_BLOCK_SEC = 0.400   # BS.1770 gating block (= momentary window)
+GATE_OVERLAP = 0.75      # 75% overlap -> 100 ms hop
+SHORT_TERM_SEC = 3.0     # EBU R128 short-term window
+ABS_GATE_LUFS = -70.0
+REL_GATE_LU = -10.0
+LRA_REL_GATE_LU = -20.0  # EBU Tech 3342
+LRA_PERCENTILES = (10.0, 95.0)
+
+# WAVE_FORMAT_EXTENSIBLE speaker bits
+SPEAKER_LFE = 0x8
+_SURROUND_SPEAKERS = 0x10 | 0x20 | 0x200 | 0x400  # back L/R, side L/R
+SURROUND_WEIGHT = 1.41  # BS.1770-4 G for Ls/Rs
+
+
+def k_weighting_sos(sr: int) -> np.ndarray:
+    """K-weighting (pre-filter + RLB) as second-order sections, same design as pyloudnorm."""
+    shelf = pyln.IIRfilter(4.0, 1 / np.sqrt(2), 1500.0, sr, "high_shelf")
+    hp = pyln.IIRfilter(0.0, 0.5, 38.0, sr, "high_pass")
+    return np.vstack([np.concatenate([shelf.b, shelf.a]), np.concatenate([hp.b, hp.a])])
+
+
+def channel_weights(channels: int, channel_mask: int = 0) -> np.ndarray:
+    """
+    BS.1770 channel weights G_i: 1.0 for front channels, 1.41 for surrounds,
+    0.0 for LFE.
+
+    The WAV channel mask is used when present. Without one, 5 channels are
+    taken as L R C Ls Rs and 6 as L R C LFE Ls Rs (SMPTE 5.1); other counts
+    weight every channel 1.0.
+    """
+    if channel_mask:
+        bits = [b for b in range(32) if channel_mask >> b & 1][:channels]
+        if len(bits) == channels:
+            return np.array([
+                0.0 if (1 << b) == SPEAKER_LFE else SURROUND_WEIGHT if (1 << b) & _SURROUND_SPEAKERS else 1.0
+                for b in bits
+            ])
+    if channels == 5:
+        return np.array([1.0, 1.0, 1.0, SURROUND_WEIGHT, SURROUND_WEIGHT])
+    if channels == 6:
+        return np.array([1.0, 1.0, 1.0, 0.0, SURROUND_WEIGHT, SURROUND_WEIGHT])
+    return np.ones(channels)
+
+
+def _to_db(x: float) -> float:
+    return -float("inf") if x == 0.0 else float(20.0 * np.log10(x))
+
+
+def _power_to_lufs(z: np.ndarray) -> np.ndarray:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        with np.errstate(divide="ignore"):
+            return -0.691 + 10.0 * np.log10(z)
+
+
+def _window_sum(x: np.ndarray, width: int) -> np.ndarray:
+    """Sliding sums of `width` consecutive entries (empty if too short)."""
+    if len(x) < width:
+        return np.zeros(0)
+    return np.convolve(x, np.ones(width), mode="valid")
+
+
+def gated_loudness(seg_k: np.ndarray, samples: int, sr: int) -> float:
+    """
+    BS.1770 gated integrated loudness from channel-weighted K-weighted energy
+    per 100 ms segment (StreamingMeter's layout) of a `samples`-long signal.
+    """
+    T = samples / sr
+    step = GATE_BLOCK_SEC * (1.0 - GATE_OVERLAP)
+    num_blocks = int(np.round((T - GATE_BLOCK_SEC) / step)) + 1
+    per_block = int(round(GATE_BLOCK_SEC / step))
+    block_len = int(round(sr * GATE_BLOCK_SEC))
+
+    segs = np.zeros(num_blocks + per_block - 1)
+    n = min(len(seg_k), len(segs))
+    segs[:n] = seg_k[:n]
+    z = np.convolve(segs, np.ones(per_block), mode="valid")[:num_blocks] / block_len
+    lk = _power_to_lufs(z)
+
+    abs_gated = lk >= ABS_GATE_LUFS
+    if not np.any(abs_gated):
+        return -float("inf")
+    gamma_r = -0.691 + 10.0 * np.log10(np.mean(z[abs_gated])) + REL_GATE_LU
+    gated = (lk > gamma_r) & (lk > ABS_GATE_LUFS)
+    if not np.any(gated):
+        return -float("inf")
+    return float(-0.691 + 10.0 * np.log10(np.mean(z[gated])))
+
+
+class StreamingMeter:
+    """
+    Incremental multichannel meter: peaks, loudness (I/S/M), LRA, crest factor, RMS.
+
+    Gating follows pyloudnorm's block layout (400 ms blocks, 100 ms hop, block
+    count rounded from duration) so results stay comparable with historical logs.
+    Per-channel sample and true peaks are tracked alongside.
+
+    Filtering, squaring and peak search run in `dtype` (float32 by default);
+    the per-segment energy sums that feed gating and LRA accumulate in float64.
+    """
+
+    def __init__(self, sr: int, channels: int = 1, weights: np.ndarray | None = None,
+                 dtype: np.dtype | type = np.float32):
+        self.sr = int(sr)
+        self.channels = int(channels)
+        self.weights = np.asarray(weights if weights is not None else channel_weights(self.channels), dtype=np.float64)
+        if self.weights.shape != (self.channels,):
+            raise ValueError(f"expected {self.channels} channel weights, got {self.weights.shape}")
+        self.hop = int(round(self.sr * GATE_BLOCK_SEC * (1.0 - GATE_OVERLAP)))
+        self.block_len = int(round(self.sr * GATE_BLOCK_SEC))
+        self.samples = 0
+        self.dtype = np.dtype(dtype)
+        self._sos = k_weighting_sos(self.sr).astype(self.dtype)
+        self._w = self.weights.astype(self.dtype)
+        self._zi = np.zeros((self._sos.shape[0], 2, self.channels), dtype=self.dtype)
+        self._tp_state = TruePeakState(channels=self.channels, dtype=self.dtype)
+        self._ch_peak = np.zeros(self.channels)
+        # Per completed 100 ms segment: K-weighted sum of squares, raw sum of squares, abs peak
+        self._seg_k: list[float] = []
+        self._seg_e: list[float] = []
+        self._seg_p: list[float] = []
+        self._cur = [0.0, 0.0, 0.0]
+        self._fill = 0
+
+    def process(self, block: np.ndarray, k_weighted: np.ndarray | None = None) -> None:
+        """
+        Feed one block, 1D (mono) or (frames, channels). `k_weighted` may supply
+        the already K-weighted block (e.g. memoized by AudioSession); it must come
+        from one continuous filter run.
+        """
+        x = np.asarray(block, dtype=self.dtype)
+        if x.ndim == 1:
+            x = x[:, None]
+        if x.shape[1] != self.channels:
+            raise ValueError(f"expected {self.channels} channels, got {x.shape[1]}")
+        if x.shape[0] == 0:
+            return
+        self.samples += x.shape[0]
+        self._tp_state.process(x)
+
+        if k_weighted is None:
+            y, self._zi = signal.sosfilt(self._sos, x, axis=0, zi=self._zi)
+        else:
+            y = np.asarray(k_weighted, dtype=self.dtype).reshape(x.shape)
+        ax = np.abs(x)
+        np.maximum(self._ch_peak, ax.max(axis=0), out=self._ch_peak)
+        self._accumulate(np.square(y) @ self._w, np.square(x).mean(axis=1), ax.max(axis=1))
+
+    def _accumulate(self, k2: np.ndarray, e2: np.ndarray, ax: np.ndarray) -> None:
+        n = len(k2)
+        # Piece boundaries: first piece completes the open segment, then whole hops
+        idx = np.concatenate([[0], np.arange(self.hop - self._fill, n, self.hop)]).astype(np.intp)
+        # float64 accumulators: a 100 ms segment sums thousands of squared samples
+        ks = np.add.reduceat(k2, idx, dtype=np.float64)
+        es = np.add.reduceat(e2, idx, dtype=np.float64)
+        ps = np.maximum.reduceat(ax, idx)
+        lengths = np.diff(np.append(idx, n))
+        for i in range(len(idx)):
+            self._cur[0] += float(ks[i])
+            self._cur[1] += float(es[i])
+            self._cur[2] = max(self._cur[2], float(ps[i]))
+            self._fill += int(lengths[i])
+            if self._fill == self.hop:
+                self._seg_k.append(self._cur[0])
+                self._seg_e.append(self._cur[1])
+                self._seg_p.append(self._cur[2])
+                self._cur = [0.0, 0.0, 0.0]
+                self._fill = 0
+
+    def _segments(self, which: int) -> np.ndarray:
+        done = (self._seg_k, self._seg_e, self._seg_p)[which]
+        tail = [self._cur[which]] if self._fill else []
+        return np.asarray(done + tail, dtype=np.float64)
+
+    # --- peaks -------------------------------------------------------------
+
+    @property
+    def _peak(self) -> float:
+        return float(max(self._seg_p + [self._cur[2]]))
+
+    @property
+    def peak_dbfs(self) -> float:
+        return _to_db(self._peak)
+
+    @property
+    def true_peak_dbtp(self) -> float:
+        # Interpolation filter droop can dip below a sample; TP is never below sample peak
+        return _to_db(max(self._tp_state.peak, self._peak))
+
+    def channel_peak_dbfs(self) -> list[float]:
+        return [_to_db(float(p)) for p in self._ch_peak]
+
+    def channel_true_peak_dbtp(self) -> list[float]:
+        return [_to_db(float(p)) for p in np.maximum(self._tp_state.peaks, self._ch_peak)]
+
+    # --- loudness ----------------------------------------------------------
+
+    def integrated_loudness(self) -> float:
+        if self.samples < self.block_len:
+            raise ValueError("Audio must have length greater than the block size.")
+        return gated_loudness(self._segments(0), self.samples, self.sr)
+
+    def _windowed_lufs(self, window_sec: float) -> np.ndarray:
+        width = int(round(window_sec * self.sr / self.hop))
+        return _power_to_lufs(_window_sum(np.asarray(self._seg_k), width) / (width * self.hop))
+
+    def momentary_lufs(self) -> np.ndarray:
+        """Momentary loudness (400 ms window) every 100 ms."""
+        return self._windowed_lufs(GATE_BLOCK_SEC)
+
+    def shortterm_lufs(self) -> np.ndarray:
+        """Short-term loudness (3 s window) every 100 ms."""
+        return self._windowed_lufs(SHORT_TERM_SEC)
+
+    def loudness_range(self) -> float:
+        """LRA (EBU Tech 3342) over the 10 Hz short-term series; NaN if undefined."""
+        st = self.shortterm_lufs()
+        st = st[st >= ABS_GATE_LUFS]
+        if st.size == 0:
+            return float("nan")
+        integrated = 10.0 * np.log10(np.mean(np.power(10.0, st / 10.0)))
+        st = st[st >= integrated + LRA_REL_GATE_LU]
+        if st.size == 0:
+            return float("nan")
+        lo, hi = np.percentile(st, LRA_PERCENTILES)
+        return float(hi - lo)
+
+    # --- level -------------------------------------------------------------
+
+    @property
+    def rms(self) -> float:
+        return float(np.sqrt(np.sum(self._segments(1)) / self.samples)) if self.samples else 0.0
+
+    @property
+    def rms_dbfs(self) -> float:
+        return _to_db(self.rms)
+
+    @property
+    def crest_factor(self) -> float:
+        """Peak / RMS (linear ratio, higher = more dynamic); 0.0 for silence."""
+        rms = self.rms
+        return 0.0 if rms == 0.0 else self._peak / rms
+
+    def rms_timeline(self) -> np.ndarray:
+        """RMS level (dBFS) of each 100 ms segment."""
+        e = np.asarray(self._seg_e)
+        with np.errstate(divide="ignore"):
+            return 10.0 * np.log10(e / self.hop)
+
+    def peak_timeline(self) -> np.ndarray:
+        """Sample peak (dBFS) of each 100 ms segment."""
+        with np.errstate(divide="ignore"):
+            return 20.0 * np.log10(np.asarray(self._seg_p))
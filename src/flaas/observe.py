@@ -0,0 +1,265 @@
+"""
+Push-based parameter observation.
+
+AbletonOSC's /live/device/start_listen/parameter/value makes Live push
+/live/device/get/parameter/value (track_id, device_id, param_id, value) on
+every change. ParamMirror subscribes to watched parameters on an OscSession
+and keeps their last value locally, so readback and verification are local
+reads instead of round trips:
+
+    with osc_session(target) as session:
+        mirror = ParamMirror.for_session(session)
+        mirror.watch(MASTER_TRACK_ID, utility_id, 9)
+        mirror.on_drift(lambda c: print(f"DRIFT: {c}"))
+        ...
+        gain = read_param_value(MASTER_TRACK_ID, utility_id, 9, target)  # no RPC
+
+Writes announced with expect() (ParamBatch, apply) set the value the mirror
+should see next; any other change to a watched parameter is reported as
+drift, e.g. a user touching a knob mid-run.
+
+Device lists have no listener endpoint to rely on, so the mirror records
+every devices/name reply seen on the session and refreshes on demand.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from flaas.osc_rpc import OscSession, OscTarget, active_session, request_once
+from osc_common.rtt import clip_timeout
+
+PARAM_VALUE = "/live/device/get/parameter/value"
+START_LISTEN = "/live/device/start_listen/parameter/value"
+STOP_LISTEN = "/live/device/stop_listen/parameter/value"
+DEVICE_NAMES = "/live/track/get/devices/name"
+
+DEFAULT_TOLERANCE = 1e-3
+
+ParamKey = tuple[int, int, int]  # (track_id, device_id, param_id)
+
+@dataclass(frozen=True)
+class ParamChange:
+    key: ParamKey
+    old: float | None
+    new: float
+    expected: float | None  # value the mirror was told to expect, if any
+
+    def __str__(self) -> str:
+        t, d, p = self.key
+        old = "?" if self.old is None else f"{self.old:.6f}"
+        return f"t{t}/d{d}/p{p} {old} -> {self.new:.6f}"
+
+class ParamMirror:
+    """
+    Local mirror of watched parameter values (and seen device lists) on one session.
+
+    Callbacks run on the session's listener thread; keep them short.
+    """
+
+    def __init__(self, session: OscSession, tolerance: float = DEFAULT_TOLERANCE):
+        self.session = session
+        self.tolerance = float(tolerance)
+        self.drift: list[ParamChange] = []
+        self._cond = threading.Condition()
+        self._values: dict[ParamKey, float] = {}
+        self._expected: dict[ParamKey, float] = {}
+        self._watched: set[ParamKey] = set()
+        self._devices: dict[int, list[str]] = {}
+        self._on_change: list[Callable[[ParamChange], None]] = []
+        self._on_drift: list[Callable[[ParamChange], None]] = []
+        self._remove = [
+            session.add_listener(PARAM_VALUE, self._on_param),
+            session.add_listener(DEVICE_NAMES, self._on_devices),
+        ]
+
+    @classmethod
+    def for_session(cls, session: OscSession) -> "ParamMirror":
+        """The session's mirror, created on first use."""
+        mirror = session.memo.get("param_mirror")
+        if mirror is None:
+            mirror = session.memo["param_mirror"] = cls(session)
+        return mirror
+
+    def __enter__(self) -> "ParamMirror":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop every listener and detach from the session."""
+        for key in list(self._watched):
+            self.unwatch(*key)
+        for remove in self._remove:
+            remove()
+        self._remove = []
+        if self.session.memo.get("param_mirror") is self:
+            del self.session.memo["param_mirror"]
+
+    # --- incoming ----------------------------------------------------------
+
+    def _on_param(self, *args: Any) -> None:
+        if len(args) < 4:
+            return
+        key = (int(args[0]), int(args[1]), int(args[2]))
+        new = float(args[3])
+        with self._cond:
+            if key not in self._watched:
+                return
+            old = self._values.get(key)
+            self._values[key] = new
+            expected = self._expected.get(key)
+            if expected is None:
+                # First value seen (seed): becomes the baseline for drift
+                self._expected[key] = expected = new
+            self._cond.notify_all()
+        if old == new:
+            return  # polled reply or re-push of the same value
+        change = ParamChange(key=key, old=old, new=new, expected=expected)
+        for cb in list(self._on_change):
+            cb(change)
+        if abs(new - expected) > self.tolerance:
+            self.drift.append(change)
+            for cb in list(self._on_drift):
+                cb(change)
+
+    def _on_devices(self, *args: Any) -> None:
+        if args:
+            with self._cond:
+                self._devices[int(args[0])] = [str(x) for x in args[1:]]
+
+    # --- subscriptions -----------------------------------------------------
+
+    def watch(self, track_id: int, device_id: int, param_id: int, timeout_sec: float | None = None) -> float:
+        """Start listening to a parameter and seed it with one read; returns the current value."""
+        key = (int(track_id), int(device_id), int(param_id))
+        with self._cond:
+            if key in self._watched and key in self._values:
+                return self._values[key]
+            self._watched.add(key)
+        self.session.send(START_LISTEN, list(key))
+        # The reply passes through _on_param before request() returns
+        self.session.request(PARAM_VALUE, list(key), timeout_sec)
+        return self.value(*key)
+
+    def unwatch(self, track_id: int, device_id: int, param_id: int) -> None:
+        key = (int(track_id), int(device_id), int(param_id))
+        with self._cond:
+            if key not in self._watched:
+                return
+            self._watched.discard(key)
+            self._values.pop(key, None)
+            self._expected.pop(key, None)
+        self.session.send(STOP_LISTEN, list(key))
+
+    def is_watching(self, track_id: int, device_id: int, param_id: int) -> bool:
+        with self._cond:
+            return (int(track_id), int(device_id), int(param_id)) in self._values
+
+    def on_change(self, callback: Callable[[ParamChange], None]) -> None:
+        self._on_change.append(callback)
+
+    def on_drift(self, callback: Callable[[ParamChange], None]) -> None:
+        self._on_drift.append(callback)
+
+    # --- reads -------------------------------------------------------------
+
+    def value(self, track_id: int, device_id: int, param_id: int) -> float:
+        """Last pushed value (KeyError if the parameter is not watched)."""
+        with self._cond:
+            return self._values[(int(track_id), int(device_id), int(param_id))]
+
+    def expect(self, track_id: int, device_id: int, param_id: int, value: float) -> None:
+        """Announce a write we are about to send, so its echo is not reported as drift."""
+        key = (int(track_id), int(device_id), int(param_id))
+        with self._cond:
+            if key in self._watched:
+                self._expected[key] = float(value)
+
+    def wait_for(
+        self,
+        track_id: int,
+        device_id: int,
+        param_id: int,
+        value: float,
+        tolerance: float | None = None,
+        timeout_sec: float = 2.0,
+    ) -> float:
+        """Block until the mirrored value is within tolerance of `value`; returns it."""
+        key = (int(track_id), int(device_id), int(param_id))
+        tol = self.tolerance if tolerance is None else float(tolerance)
+        deadline = time.monotonic() + clip_timeout(timeout_sec)
+        with self._cond:
+            while True:
+                cur = self._values[key]
+                if abs(cur - float(value)) <= tol:
+                    return cur
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Parameter t{key[0]}/d{key[1]}/p{key[2]} stayed at {cur:.6f}, expected {float(value):.6f}")
+                self._cond.wait(remaining)
+
+    def read(self, track_id: int, device_id: int, param_id: int, timeout_sec: float | None = None) -> float:
+        """
+        Current value; waits (up to timeout_sec) for an expected write to land first.
+
+        The default wait is what a polled read with retries would take (RTT-derived).
+        """
+        key = (int(track_id), int(device_id), int(param_id))
+        if timeout_sec is None:
+            timeout_sec = self.session.rtt.budget(PARAM_VALUE)
+        with self._cond:
+            expected = self._expected.get(key)
+        if expected is None:
+            return self.value(*key)
+        try:
+            return self.wait_for(*key, expected, timeout_sec=timeout_sec)
+        except TimeoutError:
+            return self.value(*key)  # drifted or write lost; caller compares
+
+    def devices(self, track_id: int, timeout_sec: float | None = None, refresh: bool = False) -> list[str]:
+        """Device names on a track, from the last devices/name reply seen (queried if none)."""
+        with self._cond:
+            names = self._devices.get(int(track_id))
+        if names is None or refresh:
+            self.session.request(DEVICE_NAMES, [int(track_id)], timeout_sec)
+            with self._cond:
+                names = self._devices[int(track_id)]
+        return list(names)
+
+def active_mirror(target: OscTarget = OscTarget(), listen_port: int = 11001) -> ParamMirror | None:
+    """Mirror on the active session for this target, if one was created."""
+    session = active_session(target, listen_port)
+    return session.memo.get("param_mirror") if session is not None else None
+
+def expect_param(
+    track_id: int,
+    device_id: int,
+    param_id: int,
+    value: float,
+    target: OscTarget = OscTarget(),
+    listen_port: int = 11001,
+) -> None:
+    """Tell the active mirror (if any) about an outgoing write."""
+    mirror = active_mirror(target, listen_port)
+    if mirror is not None:
+        mirror.expect(track_id, device_id, param_id, value)
+
+def read_param_value(
+    track_id: int,
+    device_id: int,
+    param_id: int,
+    target: OscTarget = OscTarget(),
+    timeout_sec: float | None = None,
+    listen_port: int = 11001,
+) -> float:
+    """Parameter value from the active mirror when watched, else one /parameter/value round trip."""
+    mirror = active_mirror(target, listen_port)
+    if mirror is not None and mirror.is_watching(track_id, device_id, param_id):
+        return mirror.read(track_id, device_id, param_id, timeout_sec)
+    resp = request_once(target, PARAM_VALUE, [track_id, device_id, param_id], listen_port, timeout_sec)
+    # (track_id, device_id, param_id, value)
+    return float(resp[3])
@@ -0,0 +1,162 @@
+"""
+asyncio OSC client for AbletonOSC.
+
+One datagram endpoint bound to the reply port both sends and receives, so a
+whole scan/device map/verification can run as coroutines on one event loop:
+
+    async with AsyncOscClient(OscTarget()) as rpc:
+        names, mins, maxs = await asyncio.gather(
+            rpc.call("/live/device/get/parameters/name", [tid, did]),
+            rpc.call("/live/device/get/parameters/min", [tid, did]),
+            rpc.call("/live/device/get/parameters/max", [tid, did]),
+        )
+
+Replies are correlated like OscSession: reply address plus the leading args
+AbletonOSC echoes (track_id, device_id, ...), oldest request first.
+"""
+
+from __future__ import annotations
+import asyncio
+import time
+from typing import Any, Iterable
+
+from pythonosc.osc_message_builder import OscMessageBuilder
+from pythonosc.osc_packet import OscPacket, ParseError
+
+from flaas.osc_rpc import OscTarget
+from osc_common.rtt import RttEstimator, clip_timeout, timeout_error
+from osc_common.trace import current_tracer, record_rpc
+
+def _build(address: str, value: Any) -> bytes:
+    # Same argument handling as SimpleUDPClient.send_message
+    builder = OscMessageBuilder(address=address)
+    if value is None:
+        pass
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            builder.add_arg(v)
+    else:
+        builder.add_arg(value)
+    return builder.build().dgram
+
+class _ReplyProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client: "AsyncOscClient"):
+        self.client = client
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        try:
+            packet = OscPacket(data)
+        except ParseError:
+            return
+        for timed in packet.messages:
+            self.client._on_message(timed.message.address, *timed.message.params)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP port unreachable etc. (Live not running): let timeouts report it
+        pass
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.client._fail_pending(exc or ConnectionError("OSC endpoint closed"))
+
+class AsyncOscClient:
+    """
+    asyncio-native request/response client.
+
+    `call()` takes a per-request timeout (default: the RTT-derived RTO for
+    the endpoint class, see osc_common.rtt); cancelling the awaiting task or
+    timing out drops the pending entry, and `close()` fails whatever is still
+    in flight with ConnectionError, so no waiter is left hanging.
+    """
+
+    def __init__(self, target: OscTarget = OscTarget(), listen_port: int = 11001):
+        self.target = target
+        self.listen_port = int(listen_port)
+        self._transport: asyncio.DatagramTransport | None = None
+        self._pending: dict[str, list[tuple[tuple[Any, ...], asyncio.Future]]] = {}
+        self.rtt = RttEstimator()
+
+    async def start(self) -> "AsyncOscClient":
+        if self._transport is None:
+            loop = asyncio.get_running_loop()
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _ReplyProtocol(self), local_addr=("0.0.0.0", self.listen_port)
+            )
+        return self
+
+    async def close(self) -> None:
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.close()
+        self._fail_pending(ConnectionError("OSC client closed"))
+        await asyncio.sleep(0)  # let connection_lost run before the loop moves on
+
+    @property
+    def is_open(self) -> bool:
+        return self._transport is not None
+
+    async def __aenter__(self) -> "AsyncOscClient":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def _on_message(self, address: str, *args: Any) -> None:
+        waiting = self._pending.get(address, [])
+        for i, (key, fut) in enumerate(waiting):
+            if args[:len(key)] == key and not fut.done():
+                del waiting[i]
+                fut.set_result(tuple(args))
+                return
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        pending, self._pending = self._pending, {}
+        for waiting in pending.values():
+            for _, fut in waiting:
+                if not fut.done():
+                    fut.set_exception(exc)
+
+    def send(self, address: str, value: Any = None) -> None:
+        """Fire-and-forget message."""
+        if self._transport is None:
+            raise ConnectionError("OSC client not started")
+        self._transport.sendto(_build(address, value), (self.target.host, self.target.port))
+
+    async def call(self, address: str, value: Any = None, timeout_sec: float | None = None) -> tuple[Any, ...]:
+        """Send one request and await its reply args (timeout_sec=None: adaptive RTO, no resend)."""
+        await self.start()
+        key = tuple(value) if isinstance(value, (list, tuple)) else ()
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        entry = (key, fut)
+        self._pending.setdefault(address, []).append(entry)
+        tracer, sent, timed_out = current_tracer(), time.perf_counter(), False
+        try:
+            self.send(address, value)
+            resp = await asyncio.wait_for(fut, clip_timeout(timeout_sec if timeout_sec is not None else self.rtt.timeout(address)))
+        except asyncio.TimeoutError as e:
+            timed_out = True
+            if timeout_sec is None:
+                self.rtt.on_timeout(address, sent)
+            raise timeout_error(f"Timed out waiting for reply on :{self.listen_port} for {address}") from e
+        else:
+            self.rtt.observe(address, time.perf_counter() - sent)
+            return resp
+        finally:
+            record_rpc(tracer, address, value, sent, time.perf_counter(), timed_out, transport="async")
+            waiting = self._pending.get(address)
+            if waiting is not None and entry in waiting:
+                waiting.remove(entry)
+
+    async def call_many(
+        self,
+        requests: Iterable[tuple[str, Any]],
+        timeout_sec: float | None = None,
+    ) -> list[tuple[Any, ...]]:
+        """gather() over (address, value) requests; the first failure cancels the rest."""
+        tasks = [asyncio.ensure_future(self.call(a, v, timeout_sec)) for a, v in requests]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
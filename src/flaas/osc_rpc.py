@@ -1,28 +1,290 @@
 from __future__ import annotations
 import queue
 import threading
+import time
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
 from pythonosc.dispatcher import Dispatcher
 from pythonosc.osc_server import ThreadingOSCUDPServer
 from pythonosc.udp_client import SimpleUDPClient
 
+from osc_common.rtt import DEFAULT_RETRIES, RttEstimator, backoff_delay, clip_timeout, deadline_expired, timeout_error
+from osc_common.trace import current_tracer, record_rpc
+
+# serve_forever() checks for shutdown() once per poll; the 0.5 s default made
+# every session close / one-shot request_once() cost up to half a second.
+POLL_INTERVAL_S = 0.02
+
 @dataclass(frozen=True)
 class OscTarget:
     host: str = "127.0.0.1"
     port: int = 11000  # AbletonOSC listen port
 
+class OscRequest(Future):
+    """Future for one in-flight request; keeps what is needed to resend it."""
+
+    def __init__(self, address: str, value: Any, key: tuple[Any, ...]):
+        super().__init__()
+        self.address = address
+        self.value = value
+        self.key = key
+        self.sent = time.perf_counter()
+        self.last_sent = self.sent
+        self.retries = 0
+
+class OscSession:
+    """
+    One client + one bound reply listener, reused for every request.
+
+    Binding is lazy (first request/send), so wrapping a command that never
+    talks to Live costs nothing. While a session is active (`with OscSession():`)
+    request_once() for the same target/listen port routes through it instead of
+    binding a server per call, and replies can't fall between teardown and rebind.
+
+    Any number of requests can be in flight (submit()). A reply goes to the
+    oldest pending request on the same address whose args it starts with
+    (AbletonOSC echoes track_id/device_id/param_id); replies nobody is
+    waiting on are dropped unless a listener is registered for the address
+    (add_listener), which sees every message, including pushed updates.
+
+    Without an explicit timeout_sec, waits come from the session's RTT
+    estimate per endpoint class (osc_common.rtt) and unanswered requests are
+    resent with jittered backoff; an active deadline() caps the total.
+    """
+
+    def __init__(self, target: OscTarget = OscTarget(), listen_port: int = 11001):
+        self.target = target
+        self.listen_port = int(listen_port)
+        self._server: ThreadingOSCUDPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._client: SimpleUDPClient | None = None
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[OscRequest]] = {}
+        self._listeners: dict[str, list[Callable[..., None]]] = {}
+        # Metadata memoized for the session's lifetime (e.g. param_map.DeviceParamTable)
+        self.memo: dict[Any, Any] = {}
+        self.rtt = RttEstimator()
+        self._token: Token | None = None
+
+    # --- lifecycle ---------------------------------------------------------
+
+    def open(self) -> "OscSession":
+        with self._lock:
+            if self._server is None:
+                disp = Dispatcher()
+                disp.set_default_handler(self._on_message)
+                self._server = ThreadingOSCUDPServer(("0.0.0.0", self.listen_port), disp)
+                self._thread = threading.Thread(target=self._server.serve_forever, args=(POLL_INTERVAL_S,), daemon=True)
+                self._thread.start()
+                self._client = SimpleUDPClient(self.target.host, self.target.port)
+        return self
+
+    def close(self) -> None:
+        with self._lock:
+            server, self._server = self._server, None
+            self._client = None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    @property
+    def is_open(self) -> bool:
+        return self._server is not None
+
+    def __enter__(self) -> "OscSession":
+        self._token = _ACTIVE.set(_ACTIVE.get() + (self,))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _ACTIVE.reset(self._token)
+        self._token = None
+        self.close()
+
+    # --- messaging ---------------------------------------------------------
+
+    @property
+    def client(self) -> SimpleUDPClient:
+        self.open()
+        return self._client
+
+    def add_listener(self, address: str, callback: Callable[..., None]) -> Callable[[], None]:
+        """Call callback(*args) for every message on `address`; returns a function that removes it."""
+        with self._lock:
+            self._listeners.setdefault(address, []).append(callback)
+
+        def _remove() -> None:
+            with self._lock:
+                self._listeners[address] = [c for c in self._listeners.get(address, []) if c is not callback]
+
+        return _remove
+
+    def _on_message(self, address: str, *args: Any) -> None:
+        fut = None
+        with self._lock:
+            listeners = list(self._listeners.get(address, ()))
+            waiting = self._pending.get(address, [])
+            for i, f in enumerate(waiting):
+                if args[:len(f.key)] == f.key:
+                    del waiting[i]
+                    fut = f
+                    break
+        for callback in listeners:
+            callback(*args)
+        if fut is not None and fut.set_running_or_notify_cancel():
+            if fut.retries == 0:  # a reply to a resend could answer either copy (Karn)
+                self.rtt.observe(address, time.perf_counter() - fut.sent)
+            fut.set_result(tuple(args))
+
+    def _forget(self, fut: OscRequest) -> None:
+        with self._lock:
+            self._pending[fut.address] = [f for f in self._pending.get(fut.address, []) if f is not fut]
+
+    def send(self, address: str, value: Any = 1) -> None:
+        """Fire-and-forget message on the shared client."""
+        self.client.send_message(address, value)
+
+    def submit(self, address: str, value: Any = 1) -> OscRequest:
+        """Send one message and return a Future for the matching reply (no timeout)."""
+        self.open()
+        fut = OscRequest(address, value, tuple(value) if isinstance(value, (list, tuple)) else ())
+        with self._lock:
+            self._pending.setdefault(address, []).append(fut)
+        fut.add_done_callback(self._forget)
+        tracer = current_tracer()
+        if tracer is not None:
+            # cancelled = gave up waiting (gather timeout)
+            fut.add_done_callback(lambda f: record_rpc(
+                tracer, address, value, f.sent, time.perf_counter(), f.cancelled(), f.retries))
+        self._client.send_message(address, value)
+        return fut
+
+    def resend(self, fut: OscRequest) -> None:
+        """Send a pending request again (its reply will no longer be RTT-sampled)."""
+        fut.retries += 1
+        fut.last_sent = time.perf_counter()
+        self.client.send_message(fut.address, fut.value)
+
+    def request(
+        self,
+        address: str,
+        value: Any = 1,
+        timeout_sec: float | None = None,
+        retries: int = DEFAULT_RETRIES,
+    ) -> tuple[Any, ...]:
+        """Send one message and wait for its reply."""
+        return self.gather([(address, self.submit(address, value))], timeout_sec, retries)[0]
+
+    def gather(
+        self,
+        futures: Sequence[tuple[str, Future]],
+        timeout_sec: float | None = None,
+        retries: int = DEFAULT_RETRIES,
+    ) -> list[tuple[Any, ...]]:
+        """
+        Wait for (address, future) pairs from submit().
+
+        timeout_sec: one fixed wait for the whole batch, no resends. None:
+        adaptive per-attempt waits from the RTT estimate, resending what is
+        still unanswered up to `retries` times.
+        """
+        if timeout_sec is not None:
+            _, not_done = wait([f for _, f in futures], timeout=clip_timeout(timeout_sec))
+        else:
+            not_done = self._wait_adaptive([f for _, f in futures], retries)
+        if not_done:
+            missing = [a for a, f in futures if f in not_done]
+            for f in not_done:
+                f.cancel()
+            raise timeout_error(f"Timed out waiting for reply on :{self.listen_port} for {', '.join(missing)}")
+        return [f.result() for _, f in futures]
+
+    def _wait_adaptive(self, futures: list[Future], retries: int) -> set[Future]:
+        not_done = set(futures)
+        for attempt in range(retries + 1):
+            rto = max(self.rtt.timeout(f.address) for f in not_done)
+            _, not_done = wait(not_done, timeout=clip_timeout(rto))
+            if not not_done:
+                break
+            for f in not_done:
+                self.rtt.on_timeout(f.address, f.last_sent)
+            if attempt == retries:
+                break
+            # Late replies still land during the backoff
+            _, not_done = wait(not_done, timeout=clip_timeout(backoff_delay(attempt)))
+            if not not_done or deadline_expired():
+                break
+            for f in not_done:
+                self.resend(f)
+        return not_done
+
+# Sessions entered in the current thread / asyncio task, innermost last
+_ACTIVE: ContextVar[tuple[OscSession, ...]] = ContextVar("flaas_osc_sessions", default=())
+
+# RTT estimate shared by session-less request_once() calls
+_RTT = RttEstimator()
+
+def active_session(target: OscTarget = OscTarget(), listen_port: int = 11001) -> OscSession | None:
+    """Innermost active session for this target/listen port, if any."""
+    for s in reversed(_ACTIVE.get()):
+        if s.target == target and s.listen_port == listen_port:
+            return s
+    return None
+
+def client_for(target: OscTarget = OscTarget(), listen_port: int = 11001) -> SimpleUDPClient:
+    """The active session's client for this target, or a fresh one when no session is open."""
+    session = active_session(target, listen_port)
+    return session.client if session is not None else SimpleUDPClient(target.host, target.port)
+
+def send_message(target: OscTarget, address: str, args: Any, listen_port: int = 11001) -> None:
+    """Fire-and-forget send, through the active session for this target when there is one."""
+    client_for(target, listen_port).send_message(address, args)
+
+@contextmanager
+def osc_session(target: OscTarget = OscTarget(), listen_port: int = 11001) -> Iterator[OscSession]:
+    """Reuse the active session for this target, or open one for the duration of the block."""
+    s = active_session(target, listen_port)
+    if s is not None:
+        yield s
+        return
+    with OscSession(target, listen_port) as s:
+        yield s
+
+def request_many(
+    target: OscTarget,
+    requests: Iterable[tuple[str, Any]],
+    listen_port: int = 11001,
+    timeout_sec: float | None = None,
+) -> list[tuple[Any, ...]]:
+    """
+    Issue all (address, value) requests back to back and return replies in order.
+
+    The batch costs one round-trip of latency instead of one per request.
+    """
+    with osc_session(target, listen_port) as s:
+        return s.gather([(address, s.submit(address, value)) for address, value in requests], timeout_sec)
+
 def request_once(
     target: OscTarget,
     address: str,
     value: Any = 1,
     listen_port: int = 11001,  # AbletonOSC reply port
-    timeout_sec: float = 2.0,
+    timeout_sec: float | None = None,
 ) -> tuple[Any, ...]:
     """
     Send one OSC message, wait for one reply on `listen_port`, then return reply args.
+
+    Uses the active OscSession for this target if there is one; otherwise binds
+    a listener for just this call. timeout_sec=None waits adaptively (see
+    OscSession.gather); session-less calls share one RTT estimate.
     """
+    session = active_session(target, listen_port)
+    if session is not None:
+        return session.request(address, value, timeout_sec=timeout_sec)
+
     q: "queue.Queue[tuple[Any, ...]]" = queue.Queue()
 
     disp = Dispatcher()
@@ -33,19 +295,34 @@ def request_once(
     disp.map(address, _handler)
 
     server = ThreadingOSCUDPServer(("0.0.0.0", listen_port), disp)
-    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t = threading.Thread(target=server.serve_forever, args=(POLL_INTERVAL_S,), daemon=True)
     t.start()
 
+    tracer = current_tracer()
     client = SimpleUDPClient(target.host, target.port)
+    sent = last_sent = time.perf_counter()
     client.send_message(address, value)
 
+    retries = 0 if timeout_sec is not None else DEFAULT_RETRIES
     try:
-        args = q.get(timeout=timeout_sec)
-    except queue.Empty as e:
+        for attempt in range(retries + 1):
+            wait_s = timeout_sec if timeout_sec is not None else _RTT.timeout(address)
+            try:
+                args = q.get(timeout=clip_timeout(wait_s))
+                break
+            except queue.Empty:
+                if timeout_sec is None:
+                    _RTT.on_timeout(address, last_sent)
+                if attempt == retries or deadline_expired():
+                    record_rpc(tracer, address, value, sent, time.perf_counter(), True, attempt)
+                    raise timeout_error(f"Timed out waiting for reply on :{listen_port} for {address}") from None
+                time.sleep(clip_timeout(backoff_delay(attempt)))
+                last_sent = time.perf_counter()
+                client.send_message(address, value)
+    finally:
         server.shutdown()
         server.server_close()
-        raise TimeoutError(f"Timed out waiting for reply on :{listen_port} for {address}") from e
-
-    server.shutdown()
-    server.server_close()
+    if attempt == 0 and timeout_sec is None:
+        _RTT.observe(address, time.perf_counter() - sent)
+    record_rpc(tracer, address, value, sent, time.perf_counter(), retries=attempt)
     return args
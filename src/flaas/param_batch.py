@@ -0,0 +1,293 @@
+"""
+Batched device parameter writes.
+
+ParamBatch collects /live/device/set/parameter/value writes and sends them as
+OSC bundles on one reused client, so applying a whole chain is one burst
+instead of a socket setup and datagram per parameter. Writing the same
+parameter twice before a flush keeps only the last value.
+
+commit() is the transactional form: flush, then read back every affected
+device with one /live/device/get/parameters/value query per device (all in
+flight together) and diff against what Live should hold, using each
+device's range and quantization:
+
+    with osc_session(target):
+        batch = ParamBatch(target)
+        for pid in gain_ids:
+            batch.set_value(track_id, device_id, pid, 0.0)
+        batch.commit()  # raises ParamVerifyError listing any mismatch
+"""
+
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from pythonosc.osc_bundle import OscBundle
+from pythonosc.osc_bundle_builder import IMMEDIATELY, OscBundleBuilder
+from pythonosc.osc_message_builder import OscMessageBuilder
+from pythonosc.udp_client import SimpleUDPClient
+
+from flaas.config import load_config
+from flaas.observe import active_mirror, expect_param
+from flaas.osc_rpc import OscTarget, active_session, request_many
+from flaas.param_map import (
+    QUANTIZED_TOL,
+    TABLE_QUERIES,
+    DeviceParamTable,
+    cached_param_table,
+    remember_param_table,
+)
+from osc_common.trace import current_tracer
+
+SET_PARAM_ADDRESS = "/live/device/set/parameter/value"
+PARAMS_VALUE_ADDRESS = "/live/device/get/parameters/value"
+
+ParamKey = tuple[int, int, int]  # (track_id, device_id, param_id)
+
+# Well under any UDP/MTU concern on localhost; ~60 bytes per param write
+MAX_BUNDLE_BYTES = 8192
+
+@dataclass(frozen=True)
+class ParamMismatch:
+    key: ParamKey
+    sent: float
+    expected: float       # sent value clamped to range, rounded if quantized
+    actual: float | None  # None: the device reported fewer parameters
+    tolerance: float
+
+    def __str__(self) -> str:
+        t, d, p = self.key
+        actual = "missing" if self.actual is None else f"{self.actual:.6f}"
+        return f"t{t}/d{d}/p{p} expected {self.expected:.6f} (sent {self.sent:.6f}), got {actual}"
+
+@dataclass(frozen=True)
+class VerifyReport:
+    params: int
+    devices: int
+    queries: int  # OSC queries sent for the readback (values + missing tables), one round trip
+    values: dict[ParamKey, float] = field(default_factory=dict)
+    mismatches: tuple[ParamMismatch, ...] = ()
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def __str__(self) -> str:
+        return (f"verified {self.params} param(s) on {self.devices} device(s) with {self.queries} queries, "
+                f"{len(self.mismatches)} mismatch(es), {self.elapsed_ms:.1f} ms")
+
+class ParamVerifyError(RuntimeError):
+    """Readback after commit() did not match the writes."""
+
+    def __init__(self, report: VerifyReport):
+        self.report = report
+        super().__init__("Parameter readback mismatch: " + "; ".join(str(m) for m in report.mismatches))
+
+@dataclass(frozen=True)
+class BatchReport:
+    messages: int
+    bundles: int
+    bytes: int
+    elapsed_ms: float  # includes throttle sleeps between bundles
+    verify: VerifyReport | None = None
+
+    def __str__(self) -> str:
+        out = f"{self.messages} writes in {self.bundles} bundle(s), {self.bytes} B, {self.elapsed_ms:.1f} ms"
+        return out if self.verify is None else f"{out}; {self.verify}"
+
+def verify_writes(
+    writes: dict[ParamKey, float],
+    target: OscTarget = OscTarget(),
+    tables: dict[tuple[int, int], DeviceParamTable] | None = None,
+    listen_port: int = 11001,
+    timeout_sec: float | None = None,
+) -> VerifyReport:
+    """
+    Read back written parameter values and diff them against the writes.
+
+    One /parameters/value query per device, plus the range/quantization
+    queries for devices whose table is neither given nor memoized on the
+    session, all pipelined in one round trip. Devices whose written
+    parameters are all watched by the active ParamMirror are read locally.
+    """
+    t0 = time.perf_counter()
+    by_device: dict[tuple[int, int], dict[int, float]] = {}
+    for (tid, did, pid), value in writes.items():
+        by_device.setdefault((int(tid), int(did)), {})[int(pid)] = float(value)
+    tables = dict(tables or {})
+    for dev in by_device:
+        if dev not in tables and (cached := cached_param_table(*dev, target, listen_port)) is not None:
+            tables[dev] = cached
+
+    mirror = active_mirror(target, listen_port)
+    values: dict[ParamKey, float] = {}
+    requests: list[tuple[str, list[int]]] = []
+    for dev, params in by_device.items():
+        if mirror is not None and all(mirror.is_watching(*dev, pid) for pid in params):
+            values.update({(*dev, pid): mirror.read(*dev, pid) for pid in params})
+        else:
+            requests.append((PARAMS_VALUE_ADDRESS, list(dev)))
+        if dev not in tables:
+            requests.extend((address, list(dev)) for address in TABLE_QUERIES)
+    replies = dict(zip(((a, tuple(v)) for a, v in requests), request_many(target, requests, listen_port, timeout_sec))) if requests else {}
+
+    mismatches: list[ParamMismatch] = []
+    for dev, params in by_device.items():
+        if dev not in tables:
+            tables[dev] = DeviceParamTable.from_replies(*dev, [replies[(a, dev)] for a in TABLE_QUERIES])
+            remember_param_table(tables[dev], target, listen_port)
+        table = tables[dev]
+        current = replies.get((PARAMS_VALUE_ADDRESS, dev))
+        for pid, sent in params.items():
+            key = (*dev, pid)
+            if current is not None and 2 + pid < len(current):
+                values[key] = float(current[2 + pid])
+            known = pid < len(table)
+            expected = table.expected(sent, pid) if known else sent
+            tol = table.tolerance(pid) if known else QUANTIZED_TOL
+            actual = values.get(key)
+            if actual is None or abs(actual - expected) > tol:
+                mismatches.append(ParamMismatch(key=key, sent=sent, expected=expected, actual=actual, tolerance=tol))
+    return VerifyReport(
+        params=len(writes),
+        devices=len(by_device),
+        queries=len(requests),
+        values=values,
+        mismatches=tuple(mismatches),
+        elapsed_ms=(time.perf_counter() - t0) * 1000.0,
+    )
+
+class ParamBatch:
+    """
+    Collect parameter writes and send them as bundles on flush().
+
+    throttle_ms (default: debug.throttle_ms from config.yaml) is the minimum
+    gap between bundles, across flushes too. verify_after_set (default:
+    debug.verify_after_set) is commit()'s default. config.yaml is read at most
+    once per batch, and not at all when both are given. Used as a context
+    manager the batch flushes on a clean exit. commit() also verifies by readback.
+    """
+
+    def __init__(
+        self,
+        target: OscTarget = OscTarget(),
+        throttle_ms: float | None = None,
+        max_bundle_bytes: int = MAX_BUNDLE_BYTES,
+        listen_port: int = 11001,  # shares the client of the OscSession on this port
+        verify_after_set: bool | None = None,
+    ):
+        self.target = target
+        self.listen_port = int(listen_port)
+        cfg = load_config() if throttle_ms is None or verify_after_set is None else None
+        self.throttle_ms = cfg.throttle_ms if throttle_ms is None else float(throttle_ms)
+        self.verify_after_set = cfg.verify_after_set if verify_after_set is None else bool(verify_after_set)
+        self.max_bundle_bytes = int(max_bundle_bytes)
+        self._writes: dict[tuple, tuple[str, list[Any]]] = {}
+        self._client: SimpleUDPClient | None = None
+        self._last_send: float | None = None
+        self._tables: dict[tuple[int, int], DeviceParamTable] = {}
+        self.reports: list[BatchReport] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def __enter__(self) -> "ParamBatch":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def set(self, track_id: int, device_id: int, param_id: int, norm_value: float) -> None:
+        """Queue a normalized [0, 1] write (clamped); a watching ParamMirror expects it."""
+        norm_value = max(0.0, min(1.0, float(norm_value)))
+        expect_param(track_id, device_id, param_id, norm_value, self.target, self.listen_port)
+        self.add(SET_PARAM_ADDRESS, [int(track_id), int(device_id), int(param_id), norm_value])
+
+    def set_value(self, track_id: int, device_id: int, param_id: int, value: float) -> None:
+        """Queue a write in the parameter's own units (Live clamps it to [min, max])."""
+        expect_param(track_id, device_id, param_id, float(value), self.target, self.listen_port)
+        self.add(SET_PARAM_ADDRESS, [int(track_id), int(device_id), int(param_id), float(value)])
+
+    def use_table(self, table: DeviceParamTable) -> None:
+        """Ranges/quantization to verify a device against (e.g. from its device map), saving the query."""
+        self._tables[(table.track_id, table.device_id)] = table
+
+    def add(self, address: str, args: list[Any]) -> None:
+        """Queue any fire-and-forget message; same address + leading ids replaces an earlier write."""
+        self._writes[(address, *args[:-1])] = (address, list(args))
+
+    def _get_client(self) -> SimpleUDPClient:
+        session = active_session(self.target, self.listen_port)
+        if session is not None:
+            return session.client
+        if self._client is None:
+            self._client = SimpleUDPClient(self.target.host, self.target.port)
+        return self._client
+
+    def _bundles(self) -> list[OscBundle]:
+        out: list[OscBundle] = []
+        builder, size = OscBundleBuilder(IMMEDIATELY), 16  # "#bundle\0" + timetag
+        for address, args in self._writes.values():
+            mb = OscMessageBuilder(address=address)
+            for a in args:
+                mb.add_arg(a)
+            msg = mb.build()
+            if size > 16 and size + 4 + msg.size > self.max_bundle_bytes:
+                out.append(builder.build())
+                builder, size = OscBundleBuilder(IMMEDIATELY), 16
+            builder.add_content(msg)
+            size += 4 + msg.size
+        if size > 16:
+            out.append(builder.build())
+        return out
+
+    def flush(self, verify: bool = False, timeout_sec: float | None = None) -> BatchReport:
+        """Send everything queued; returns (and records) the timing for this batch (and readback if verify)."""
+        t0 = time.perf_counter()
+        n = len(self._writes)
+        bundles = self._bundles() if n else []
+        written = {
+            (args[0], args[1], args[2]): args[3]
+            for address, args in self._writes.values() if address == SET_PARAM_ADDRESS
+        }
+        self._writes.clear()
+        client = self._get_client() if bundles else None
+        total = 0
+        for bundle in bundles:
+            if self._last_send is not None and self.throttle_ms > 0:
+                wait = self.throttle_ms / 1000.0 - (time.perf_counter() - self._last_send)
+                if wait > 0:
+                    time.sleep(wait)
+            client.send(bundle)
+            self._last_send = time.perf_counter()
+            total += bundle.size
+        t1 = time.perf_counter()
+        tracer = current_tracer()
+        if tracer is not None and n:
+            tracer.complete(SET_PARAM_ADDRESS, "osc_write", t0, t1, messages=n, bundles=len(bundles), bytes=total)
+        checked = None
+        if verify and written:
+            checked = verify_writes(written, self.target, self._tables, self.listen_port, timeout_sec)
+            if tracer is not None:
+                tracer.complete(PARAMS_VALUE_ADDRESS, "osc_verify", t1, time.perf_counter(), params=checked.params,
+                                devices=checked.devices, queries=checked.queries, mismatches=len(checked.mismatches))
+        report = BatchReport(messages=n, bundles=len(bundles), bytes=total, elapsed_ms=(t1 - t0) * 1000.0, verify=checked)
+        self.reports.append(report)
+        return report
+
+    def commit(self, verify: bool | None = None, timeout_sec: float | None = None) -> BatchReport:
+        """
+        flush() and verify every written parameter by readback.
+
+        verify defaults to the batch's verify_after_set. Raises
+        ParamVerifyError if any value is off by more than its tolerance.
+        """
+        if verify is None:
+            verify = self.verify_after_set
+        report = self.flush(verify=verify, timeout_sec=timeout_sec)
+        if report.verify is not None and not report.verify.ok:
+            raise ParamVerifyError(report.verify)
+        return report
@@ -1,17 +1,165 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from flaas.osc_rpc import OscTarget, request_once
+from typing import Sequence
+
+import numpy as np
+
+from flaas.osc_rpc import OscTarget, active_session, request_many
+
+# Readback tolerance for continuous parameters, as a fraction of their range
+# (Live stores parameter values as 32-bit floats)
+VERIFY_REL_TOL = 1e-3
+QUANTIZED_TOL = 1e-6
+
+TABLE_QUERIES = (
+    "/live/device/get/parameters/name",
+    "/live/device/get/parameters/min",
+    "/live/device/get/parameters/max",
+    "/live/device/get/parameters/is_quantized",
+)
 
 @dataclass(frozen=True)
 class ParamRange:
     min: float
     max: float
 
-def get_param_range(track_id: int, device_id: int, param_id: int, target: OscTarget = OscTarget(), timeout_sec: float = 3.0) -> ParamRange:
-    mins = request_once(target, "/live/device/get/parameters/min", [track_id, device_id], timeout_sec=timeout_sec)
-    maxs = request_once(target, "/live/device/get/parameters/max", [track_id, device_id], timeout_sec=timeout_sec)
-    idx = 2 + int(param_id)
-    return ParamRange(min=float(mins[idx]), max=float(maxs[idx]))
+class DeviceParamTable:
+    """
+    All parameter names/ranges of one device, fetched in one pipelined round-trip.
+
+    Lookups by id or (case-insensitive) name are O(1); linear_to_norm and
+    norm_to_linear accept scalars or arrays of values and ids.
+    """
+
+    def __init__(
+        self,
+        track_id: int,
+        device_id: int,
+        names: Sequence[str],
+        mins: Sequence[float],
+        maxs: Sequence[float],
+        quantized: Sequence[bool] | None = None,
+    ):
+        self.track_id = int(track_id)
+        self.device_id = int(device_id)
+        self.names = tuple(str(n) for n in names)
+        n = len(self.names)
+        # Short min/max replies fall back to [0, 1], as resolve_device_params does
+        self.mins = np.zeros(n, dtype=np.float64)
+        self.maxs = np.ones(n, dtype=np.float64)
+        self.mins[:min(n, len(mins))] = np.asarray(mins, dtype=np.float64)[:n]
+        self.maxs[:min(n, len(maxs))] = np.asarray(maxs, dtype=np.float64)[:n]
+        self.quantized = np.zeros(n, dtype=bool)
+        if quantized is not None:
+            self.quantized[:min(n, len(quantized))] = np.asarray(quantized, dtype=bool)[:n]
+        self._ids = {name.strip().lower(): i for i, name in reversed(list(enumerate(self.names)))}
+
+    @classmethod
+    def fetch(
+        cls,
+        track_id: int,
+        device_id: int,
+        target: OscTarget = OscTarget(),
+        timeout_sec: float | None = None,
+        listen_port: int = 11001,
+    ) -> "DeviceParamTable":
+        replies = request_many(target, [(a, [track_id, device_id]) for a in TABLE_QUERIES], listen_port, timeout_sec)
+        return cls.from_replies(track_id, device_id, replies)
+
+    @classmethod
+    def from_replies(cls, track_id: int, device_id: int, replies: Sequence[tuple]) -> "DeviceParamTable":
+        """Build from the TABLE_QUERIES replies, in order (each starts with track_id, device_id)."""
+        names, mins, maxs, quants = replies
+        return cls(track_id, device_id, names[2:], mins[2:], maxs[2:], quants[2:])
+
+    @classmethod
+    def from_device_map(cls, device_map: dict) -> "DeviceParamTable":
+        """Build from a device-map / eq8-map JSON payload (flat "params" list)."""
+        params = device_map.get("params", [])
+        n = max((p["id"] for p in params), default=-1) + 1
+        names, mins, maxs, quants = [""] * n, [0.0] * n, [1.0] * n, [False] * n
+        for p in params:
+            i = p["id"]
+            names[i], mins[i], maxs[i] = p["name"], p["min"], p["max"]
+            quants[i] = bool(p.get("is_quantized", False))
+        return cls(device_map["track_id"], device_map["device_id"], names, mins, maxs, quants)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def id_of(self, name: str) -> int:
+        try:
+            return self._ids[name.strip().lower()]
+        except KeyError:
+            raise KeyError(f"Parameter '{name}' not found on device {self.device_id} (track {self.track_id})") from None
+
+    def _index(self, ids: int | str | Sequence[int | str] | np.ndarray) -> np.ndarray:
+        if isinstance(ids, str):
+            return np.asarray(self.id_of(ids), dtype=np.intp)
+        arr = np.asarray(ids)
+        if arr.dtype.kind in "US":
+            return np.asarray([self.id_of(str(x)) for x in arr.ravel()], dtype=np.intp).reshape(arr.shape)
+        return arr.astype(np.intp)
+
+    def range(self, param: int | str) -> ParamRange:
+        i = int(self._index(param))
+        return ParamRange(min=float(self.mins[i]), max=float(self.maxs[i]))
+
+    def linear_to_norm(self, values, params) -> float | np.ndarray:
+        """Clamp to [min, max] and map to [0, 1]; zero-width ranges map to 0."""
+        idx = self._index(params)
+        lo, hi = self.mins[idx], self.maxs[idx]
+        span = hi - lo
+        x = np.clip(np.asarray(values, dtype=np.float64), lo, hi)
+        out = np.where(span != 0.0, (x - lo) / np.where(span != 0.0, span, 1.0), 0.0)
+        return float(out) if out.ndim == 0 else out
+
+    def expected(self, values, params) -> float | np.ndarray:
+        """What Live stores for a write: clamped to [min, max], rounded for quantized parameters."""
+        idx = self._index(params)
+        x = np.clip(np.asarray(values, dtype=np.float64), self.mins[idx], self.maxs[idx])
+        out = np.where(self.quantized[idx], np.round(x), x)
+        return float(out) if out.ndim == 0 else out
+
+    def tolerance(self, params, rel_tol: float = VERIFY_REL_TOL) -> float | np.ndarray:
+        """Readback tolerance: rel_tol of the range, or float noise for quantized (stepped) parameters."""
+        idx = self._index(params)
+        out = np.where(self.quantized[idx], QUANTIZED_TOL, np.maximum(rel_tol * (self.maxs[idx] - self.mins[idx]), QUANTIZED_TOL))
+        return float(out) if out.ndim == 0 else out
+
+    def norm_to_linear(self, norms, params) -> float | np.ndarray:
+        """Map [0, 1] (clamped) back to [min, max]."""
+        idx = self._index(params)
+        lo, hi = self.mins[idx], self.maxs[idx]
+        n = np.clip(np.asarray(norms, dtype=np.float64), 0.0, 1.0)
+        out = lo + n * (hi - lo)
+        return float(out) if out.ndim == 0 else out
+
+def get_param_table(
+    track_id: int,
+    device_id: int,
+    target: OscTarget = OscTarget(),
+    timeout_sec: float | None = None,
+    listen_port: int = 11001,
+) -> DeviceParamTable:
+    """DeviceParamTable for a device, memoized on the active OscSession (fetched once per session)."""
+    table = cached_param_table(track_id, device_id, target, listen_port)
+    if table is None:
+        table = DeviceParamTable.fetch(track_id, device_id, target, timeout_sec, listen_port)
+        remember_param_table(table, target, listen_port)
+    return table
+
+def cached_param_table(track_id: int, device_id: int, target: OscTarget = OscTarget(), listen_port: int = 11001) -> DeviceParamTable | None:
+    session = active_session(target, listen_port)
+    return session.memo.get(("param_table", int(track_id), int(device_id))) if session is not None else None
+
+def remember_param_table(table: DeviceParamTable, target: OscTarget = OscTarget(), listen_port: int = 11001) -> None:
+    session = active_session(target, listen_port)
+    if session is not None:
+        session.memo[("param_table", table.track_id, table.device_id)] = table
+
+def get_param_range(track_id: int, device_id: int, param_id: int, target: OscTarget = OscTarget(), timeout_sec: float | None = None) -> ParamRange:
+    return get_param_table(track_id, device_id, target, timeout_sec).range(int(param_id))
 
 def linear_to_norm(x: float, pr: ParamRange) -> float:
     # map [min,max] to [0,1]
@@ -19,3 +167,7 @@ def linear_to_norm(x: float, pr: ParamRange) -> float:
     if pr.max == pr.min:
         return 0.0
     return (v - pr.min) / (pr.max - pr.min)
+
+def norm_to_linear(n: float, pr: ParamRange) -> float:
+    # map [0,1] to [min,max]
+    return pr.min + max(0.0, min(1.0, float(n))) * (pr.max - pr.min)
@@ -6,8 +6,9 @@ from flaas.analyze import analyze_wav
 from flaas.targets import Targets, DEFAULT_TARGETS, MASTER_TRACK_ID, resolve_utility_device_id
 from flaas.actions import GainAction, write_actions
 from flaas.scan import scan_live
-from flaas.osc_rpc import OscTarget, request_once
-from flaas.param_map import get_param_range
+from flaas.observe import read_param_value
+from flaas.osc_rpc import OscTarget
+from flaas.param_map import get_param_table
 
 UTILITY_GAIN_PARAM_ID = 9
 
@@ -21,10 +22,9 @@ class PlanGainResult:
 
 def _get_current_utility_linear(track_id: int, device_id: int, target: OscTarget = OscTarget()) -> float:
     """Get current Utility gain in linear space."""
-    pr = get_param_range(track_id, device_id, UTILITY_GAIN_PARAM_ID, target=target)
-    cur = request_once(target, "/live/device/get/parameter/value", [track_id, device_id, UTILITY_GAIN_PARAM_ID], timeout_sec=3.0)
-    cur_norm = float(cur[3])
-    return pr.min + cur_norm * (pr.max - pr.min)
+    table = get_param_table(track_id, device_id, target=target)
+    cur = read_param_value(track_id, device_id, UTILITY_GAIN_PARAM_ID, target)
+    return table.norm_to_linear(cur, UTILITY_GAIN_PARAM_ID)
 
 def plan_utility_gain_delta_for_master(
     wav: str | Path,
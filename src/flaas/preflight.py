@@ -9,6 +9,10 @@ Hard invariants that must be verified before optimization:
 
 from __future__ import annotations
 from flaas.osc_rpc import OscTarget, request_once
+from osc_common.rtt import deadline
+
+# Total OSC wait for all checks (an answering Live needs a few ms)
+PREFLIGHT_BUDGET_S = 5.0
 
 
 def verify_master_fader(track_id: int, target: OscTarget = OscTarget()) -> tuple[bool, float]:
@@ -23,7 +27,7 @@ def verify_master_fader(track_id: int, target: OscTarget = OscTarget()) -> tuple
     try:
         # Try to read master fader volume
         # Response format varies, may be (track_id, volume) or just volume
-        response = request_once(target, "/live/track/get/volume", [track_id], timeout_sec=1.5)
+        response = request_once(target, "/live/track/get/volume", [track_id])
         
         # Parse response (handle tuple or single value)
         if isinstance(response, (tuple, list)):
@@ -56,7 +60,7 @@ def verify_device_order(track_id: int, expected_order: list[str], target: OscTar
     Returns: (matches_order, actual_devices)
     """
     try:
-        response = request_once(target, "/live/track/get/devices/name", [track_id], timeout_sec=1.5)
+        response = request_once(target, "/live/track/get/devices/name", [track_id])
         device_names = [str(name).strip() for name in list(response)[1:]]  # Drop track_id
         
         # Check if expected devices appear in correct order
@@ -97,8 +101,14 @@ def run_preflight_checks(track_id: int, target: OscTarget = OscTarget(), expecte
         skip_prompts: If True, auto-confirm all user prompts (for non-interactive mode)
     
     Returns: True if all checks pass, False otherwise
-    Prints diagnostics to stdout.
+    Prints diagnostics to stdout. OSC reads share a PREFLIGHT_BUDGET_S deadline,
+    so an unreachable Live fails fast instead of waiting out every retry.
     """
+    with deadline(PREFLIGHT_BUDGET_S, "preflight"):
+        return _run_preflight_checks(track_id, target, expected_chain, skip_prompts)
+
+
+def _run_preflight_checks(track_id: int, target: OscTarget, expected_chain: list[str] | None, skip_prompts: bool) -> bool:
     print(f"\n{'='*70}")
     print(f"PRE-FLIGHT CHECKS")
     print(f"{'='*70}")
@@ -0,0 +1,233 @@
+"""
+Device/parameter metadata registry.
+
+Device names and parameter tables (name, min, max, is_quantized) only change
+when a track's device chain changes, so they are persisted under
+<registry_root>/registry.json and reused across runs:
+
+    tracks: track_id -> {fingerprint, devices, classes, params: device_id -> table}
+
+A track's entry is checked once per registry instance: either by a
+ScanResult passed to sync_scan() (no RPCs) or by one pipelined
+devices/name + devices/class_name query. Only tracks whose fingerprint
+changed lose their cached parameter tables.
+"""
+
+from __future__ import annotations
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from flaas.config import load_config
+from flaas.osc_rpc import OscTarget, request_many, request_once
+from flaas.scan import ScanResult, track_fingerprint
+
+REGISTRY_VERSION = 2
+
+def query_device_params(
+    track_id: int,
+    device_id: int,
+    target: OscTarget = OscTarget(),
+    timeout_sec: float | None = None,
+    listen_port: int = 11001,
+) -> dict[str, dict]:
+    """
+    Query a device's parameter table over OSC (one pipelined round-trip).
+
+    Returns dict: param_name -> {id, min, max, is_quantized}
+    """
+    names_resp, mins_resp, maxs_resp, quants_resp = request_many(target, [
+        ("/live/device/get/parameters/name", [track_id, device_id]),
+        ("/live/device/get/parameters/min", [track_id, device_id]),
+        ("/live/device/get/parameters/max", [track_id, device_id]),
+        ("/live/device/get/parameters/is_quantized", [track_id, device_id]),
+    ], listen_port=listen_port, timeout_sec=timeout_sec)
+
+    names = list(names_resp[2:])
+    mins = list(mins_resp[2:])
+    maxs = list(maxs_resp[2:])
+    quants = list(quants_resp[2:])
+
+    params = {}
+    for i in range(len(names)):
+        params[str(names[i])] = {
+            "id": i,
+            "min": float(mins[i]) if i < len(mins) else 0.0,
+            "max": float(maxs[i]) if i < len(maxs) else 1.0,
+            "is_quantized": bool(quants[i]) if i < len(quants) else False,
+        }
+    return params
+
+def resolve_device_id_by_name(
+    track_id: int,
+    device_name: str,
+    target: OscTarget = OscTarget(),
+    registry: DeviceRegistry | None = None,
+    timeout_sec: float | None = None,
+    partial: bool = False,
+) -> int:
+    """
+    Index of the first device on a track whose name matches (case-insensitive).
+
+    `partial` matches a substring (e.g. "C6" for "Waves C6 Stereo"). Names come
+    from the registry when given, else from one devices/name query.
+    Raises RuntimeError if no device matches.
+    """
+    if registry is not None:
+        names = registry.device_names(track_id, target, timeout_sec)
+    else:
+        names = list(request_once(target, "/live/track/get/devices/name", [track_id], timeout_sec=timeout_sec))[1:]
+
+    wanted = device_name.strip().lower()
+    for idx, name in enumerate(names):
+        have = str(name).strip().lower()
+        if have == wanted or (partial and wanted in have):
+            return idx
+
+    raise RuntimeError(f"Device '{device_name}' not found on track {track_id}. Available: {names}")
+
+def resolve_device_params(
+    track_id: int,
+    device_id: int,
+    target: OscTarget = OscTarget(),
+    registry: DeviceRegistry | None = None,
+    timeout_sec: float | None = None,
+) -> dict[str, dict]:
+    """Parameter table for a device (name -> {id, min, max, is_quantized}), from the registry when given."""
+    if registry is not None:
+        return registry.device_params(track_id, device_id, target, timeout_sec)
+    return query_device_params(track_id, device_id, target, timeout_sec)
+
+@dataclass(frozen=True)
+class RegistryStats:
+    path: str
+    tracks: int
+    devices_with_params: int
+
+@dataclass
+class TrackEntry:
+    fingerprint: str
+    devices: list[str]
+    classes: list[str]
+    params: dict[str, dict[str, dict]] = field(default_factory=dict)  # str(device_id) -> table
+
+class DeviceRegistry:
+    def __init__(self, root: str | Path = "data/registry", listen_port: int = 11001):
+        self.dir = Path(root)
+        self.listen_port = int(listen_port)
+        self.path = self.dir / "registry.json"
+        self.hits = 0
+        self.misses = 0
+        self._validated: set[int] = set()
+        self._tracks: dict[int, TrackEntry] = {}
+        self._load()
+
+    @classmethod
+    def from_config(cls, config_path: str | Path = "config.yaml") -> "DeviceRegistry":
+        cfg = load_config(config_path)
+        root = Path(cfg.registry_root)
+        if not root.is_absolute():
+            root = Path(config_path).parent / root
+        return cls(root)
+
+    # --- persistence -------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != REGISTRY_VERSION:
+            return
+        self._tracks = {int(tid): TrackEntry(**e) for tid, e in (data.get("tracks") or {}).items()}
+
+    def save(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": REGISTRY_VERSION,
+            "tracks": {str(tid): asdict(e) for tid, e in sorted(self._tracks.items())},
+        }
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    # --- validation --------------------------------------------------------
+
+    def _observe(self, track_id: int, devices: list[str], classes: list[str]) -> bool:
+        """Record the current chain; returns True if the stored entry was still valid."""
+        fp = track_fingerprint(track_id, devices, classes)
+        self._validated.add(track_id)
+        entry = self._tracks.get(track_id)
+        if entry is not None and entry.fingerprint == fp:
+            return True
+        self._tracks[track_id] = TrackEntry(fingerprint=fp, devices=list(devices), classes=list(classes))
+        return False
+
+    def sync_scan(self, scan: ScanResult) -> list[int]:
+        """
+        Validate every scanned track without RPCs.
+
+        Returns the track ids whose cached metadata was invalidated.
+        """
+        changed: list[int] = []
+        for t in scan.tracks:
+            known = t.track_id in self._tracks
+            names = [d.name for d in t.devices]
+            classes = [d.class_name for d in t.devices]
+            if not self._observe(t.track_id, names, classes) and known:
+                changed.append(t.track_id)
+        self.save()
+        return changed
+
+    def _track(self, track_id: int, target: OscTarget, timeout_sec: float | None) -> TrackEntry:
+        if track_id not in self._validated:
+            dn, dc = request_many(target, [
+                ("/live/track/get/devices/name", [track_id]),
+                ("/live/track/get/devices/class_name", [track_id]),
+            ], listen_port=self.listen_port, timeout_sec=timeout_sec)
+            if not self._observe(track_id, [str(x) for x in dn[1:]], [str(x) for x in dc[1:]]):
+                self.save()
+        return self._tracks[track_id]
+
+    # --- lookups -----------------------------------------------------------
+
+    def device_names(self, track_id: int, target: OscTarget = OscTarget(), timeout_sec: float | None = None) -> list[str]:
+        """Device names on a track, in chain order."""
+        return list(self._track(track_id, target, timeout_sec).devices)
+
+    def device_params(
+        self,
+        track_id: int,
+        device_id: int,
+        target: OscTarget = OscTarget(),
+        timeout_sec: float | None = None,
+    ) -> dict[str, dict]:
+        """Parameter table for a device; queried over OSC only on a miss."""
+        entry = self._track(track_id, target, timeout_sec)
+        table = entry.params.get(str(device_id))
+        if table is not None:
+            self.hits += 1
+            return {k: dict(v) for k, v in table.items()}
+        self.misses += 1
+        table = query_device_params(track_id, device_id, target, timeout_sec, self.listen_port)
+        entry.params[str(device_id)] = table
+        self.save()
+        return {k: dict(v) for k, v in table.items()}
+
+    def invalidate(self, track_id: int | None = None) -> None:
+        """Forget one track (or everything)."""
+        if track_id is None:
+            self._tracks.clear()
+            self._validated.clear()
+        else:
+            self._tracks.pop(track_id, None)
+            self._validated.discard(track_id)
+        self.save()
+
+    def stats(self) -> RegistryStats:
+        return RegistryStats(
+            path=str(self.path),
+            tracks=len(self._tracks),
+            devices_with_params=sum(len(e.params) for e in self._tracks.values()),
+        )
@@ -1,17 +1,47 @@
+"""
+Live set scan and model cache.
+
+The set fingerprint is a Merkle root: each device hashes its index, name and
+class, a track's chain hash (track_fingerprint, also the metadata registry
+key) hashes its id and device hashes, the track hash adds the track name and
+device count to the chain hash, and the root hashes the (track_id, track
+hash) list. A chain change therefore invalidates the registry entry, the
+track hash and the root together. Hashes are stored in the
+model cache, so diff_scans() names the tracks that changed and
+scan_live_incremental() only re-queries tracks whose cheap probe (name,
+num_devices) differs from the previous scan.
+"""
+
 from __future__ import annotations
 import json
 import hashlib
-from dataclasses import dataclass, asdict
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable
+
+from flaas.osc_rpc import OscRequest, OscSession, OscTarget, osc_session, request_once
+from osc_common.rtt import DEFAULT_RETRIES, backoff_delay, clip_timeout, deadline, deadline_expired, timeout_error
+
+if TYPE_CHECKING:
+    from flaas.registry import DeviceRegistry
 
-from flaas.osc_rpc import OscTarget, request_once
+NUM_DEVICES = "/live/track/get/num_devices"
+DEVICE_NAMES = "/live/track/get/devices/name"
+DEVICE_CLASSES = "/live/track/get/devices/class_name"
+
+# Deadline for one scan, retries included (a 128-track set scans in well under 1 s)
+SCAN_BUDGET_S = 30.0
 
 @dataclass
 class DeviceInfo:
     index: int
     name: str
     class_name: str
+    hash: str = ""
 
 @dataclass
 class TrackInfo:
@@ -19,6 +49,7 @@ class TrackInfo:
     name: str
     num_devices: int
     devices: list[DeviceInfo]
+    hash: str = ""
 
 @dataclass
 class ScanResult:
@@ -28,84 +59,326 @@ class ScanResult:
     num_tracks: int
     tracks: list[TrackInfo]
     fingerprint: str
+    track_ms: dict[int, float] = field(default_factory=dict)  # per-track query latency (first send -> last reply)
+    elapsed_ms: float = 0.0
+    track_ids: list[int] | None = None  # targeted scan scope; None = whole set
+    changed: list[int] = field(default_factory=list)  # incremental scan: tracks whose hash changed
+
+    @classmethod
+    def from_dict(cls, obj: dict[str, Any]) -> "ScanResult":
+        tracks = [
+            TrackInfo(
+                track_id=int(t["track_id"]),
+                name=str(t["name"]),
+                num_devices=int(t["num_devices"]),
+                devices=[DeviceInfo(**d) for d in t.get("devices", [])],
+                hash=t.get("hash", ""),
+            )
+            for t in obj.get("tracks", [])
+        ]
+        return cls(
+            ok=bool(obj.get("ok")),
+            note=str(obj.get("note", "")),
+            created_at_utc=str(obj.get("created_at_utc", "")),
+            num_tracks=int(obj.get("num_tracks", 0)),
+            tracks=tracks,
+            fingerprint=str(obj.get("fingerprint", "")),
+            track_ms={int(k): float(v) for k, v in (obj.get("track_ms") or {}).items()},
+            elapsed_ms=float(obj.get("elapsed_ms", 0.0)),
+            track_ids=obj.get("track_ids"),
+            changed=list(obj.get("changed") or []),
+        )
 
 def _sha256(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
-def scan_live(target: OscTarget = OscTarget(), timeout_sec: float = 2.0, track_ids: list[int] | None = None) -> ScanResult:
+def device_hash(index: int, name: str, class_name: str) -> str:
+    return _sha256(f"{index}:{name}\x1f{class_name}")
+
+def _chain_hash(track_id: int, device_hashes: list[str]) -> str:
+    return _sha256(f"{track_id}:" + "|".join(device_hashes))
+
+def track_fingerprint(track_id: int, device_names: list[str], class_names: list[str]) -> str:
+    """Hash of one track's device chain (names + classes); keys the metadata registry."""
+    return _chain_hash(track_id, [device_hash(i, n, c) for i, (n, c) in enumerate(zip(device_names, class_names))])
+
+def track_hash(track_id: int, name: str, num_devices: int, device_hashes: list[str]) -> str:
+    """Track node of the Merkle tree: the chain hash (registry key) plus track name and device count."""
+    return _sha256(f"{_chain_hash(track_id, device_hashes)}:{name}:{num_devices}")
+
+def root_fingerprint(track_hashes: Iterable[tuple[int, str]]) -> str:
+    """Merkle root over (track_id, track hash) in scan order."""
+    return _sha256(";".join(f"{tid}:{h}" for tid, h in track_hashes))
+
+def _hashed(t: TrackInfo) -> TrackInfo:
+    """Copy of a track with device/track hashes (re)computed from its contents."""
+    devices = [DeviceInfo(d.index, d.name, d.class_name, device_hash(d.index, d.name, d.class_name)) for d in t.devices]
+    h = track_hash(t.track_id, t.name, t.num_devices, [d.hash for d in devices])
+    return TrackInfo(track_id=t.track_id, name=t.name, num_devices=t.num_devices, devices=devices, hash=h)
+
+def diff_scans(old: ScanResult, new: ScanResult) -> list[int]:
+    """Track ids whose hash differs between two scans (including added/removed tracks)."""
+    before = {t.track_id: _hashed(t).hash for t in old.tracks}
+    after = {t.track_id: _hashed(t).hash for t in new.tracks}
+    return sorted(tid for tid in before.keys() | after.keys() if before.get(tid) != after.get(tid))
+
+def load_model_cache(path: str | Path = "data/caches/model_cache.json") -> ScanResult | None:
+    """Previous scan from the model cache, or None if missing/unreadable."""
+    try:
+        return ScanResult.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _run_windowed(
+    session: OscSession,
+    requests: list[tuple[Hashable, str, Any]],
+    window: int,
+    timeout_sec: float | None,
+    on_reply: Callable[[Hashable, tuple[Any, ...]], None],
+    on_send: Callable[[Hashable], None] | None = None,
+) -> None:
+    """
+    Issue (key, address, value) requests with at most `window` in flight.
+
+    Each request gets timeout_sec from its own send. With timeout_sec=None it
+    gets the session's adaptive RTO instead and is resent after a jittered
+    backoff, up to DEFAULT_RETRIES times. Replies are handed to
+    on_reply(key, args) as they complete.
+    """
+    retries = 0 if timeout_sec is not None else DEFAULT_RETRIES
+    pending = deque(requests)
+    in_flight: dict[OscRequest, Hashable] = {}
+    due: dict[OscRequest, float] = {}        # perf_counter() when the current attempt times out
+    resend_at: dict[OscRequest, float] = {}  # backing off before the next attempt
+
+    def _wait_s(f: OscRequest) -> float:
+        return timeout_sec if timeout_sec is not None else session.rtt.timeout(f.address)
+
+    def _fail(futs: Iterable[OscRequest]) -> TimeoutError:
+        missing = sorted({f.address for f in futs})
+        for f in in_flight:
+            f.cancel()
+        return timeout_error(f"Timed out waiting for reply on :{session.listen_port} for {', '.join(missing)}")
+
+    while pending or in_flight:
+        while pending and len(in_flight) < window:
+            key, address, value = pending.popleft()
+            if on_send is not None:
+                on_send(key)
+            f = session.submit(address, value)
+            in_flight[f] = key
+            due[f] = f.sent + _wait_s(f)
+        wake = min(list(due.values()) + list(resend_at.values()))
+        done, _ = wait(in_flight, timeout=clip_timeout(max(0.0, wake - time.perf_counter())), return_when=FIRST_COMPLETED)
+        for f in done:
+            due.pop(f, None)
+            resend_at.pop(f, None)
+            on_reply(in_flight.pop(f), f.result())
+        if done:
+            continue
+        if deadline_expired():
+            raise _fail(in_flight)
+        now = time.perf_counter()
+        for f in [f for f, t in resend_at.items() if t <= now]:
+            del resend_at[f]
+            session.resend(f)
+            due[f] = now + _wait_s(f)
+        expired = [f for f, t in due.items() if t <= now]
+        if any(f.retries >= retries for f in expired):
+            raise _fail(f for f in expired if f.retries >= retries)
+        for f in expired:
+            del due[f]
+            session.rtt.on_timeout(f.address, f.last_sent)
+            resend_at[f] = now + backoff_delay(f.retries)
+
+def _query_tracks(
+    session: OscSession,
+    track_ids: list[int],
+    queries: tuple[str, ...],
+    window: int,
+    timeout_sec: float | None,
+) -> tuple[dict[int, dict[str, tuple[Any, ...]]], dict[int, float]]:
+    """Run `queries` for every track, pipelined; returns replies[tid][address] and per-track ms."""
+    replies: dict[int, dict[str, tuple[Any, ...]]] = {tid: {} for tid in track_ids}
+    started: dict[int, float] = {}
+    track_ms: dict[int, float] = {}
+
+    def _on_send(key: Hashable) -> None:
+        started.setdefault(key[0], time.perf_counter())
+
+    def _on_reply(key: Hashable, resp: tuple[Any, ...]) -> None:
+        tid, address = key
+        replies[tid][address] = resp
+        if len(replies[tid]) == len(queries):
+            track_ms[tid] = (time.perf_counter() - started[tid]) * 1000.0
+
+    requests = [((tid, address), address, [tid]) for tid in track_ids for address in queries]
+    _run_windowed(session, requests, window, timeout_sec, _on_reply, _on_send)
+    return replies, track_ms
+
+def _track_names(
+    session: OscSession,
+    num_tracks: int,
+    track_ids: list[int] | None,
+    window: int,
+    timeout_sec: float | None,
+) -> list[tuple[int, str]]:
+    """(track_id, name) for the whole set, or for the requested ids that exist."""
+    if track_ids is None:
+        names = request_once(session.target, "/live/song/get/track_names", [], session.listen_port, timeout_sec)
+        return list(enumerate(str(n) for n in list(names)[:num_tracks]))
+    # Targeted scan - get names only for requested tracks
+    wanted = [tid for tid in track_ids if tid < num_tracks]
+    replies, _ = _query_tracks(session, wanted, ("/live/track/get/name",), window, timeout_sec)
+    return [
+        (tid, str(r[1]) if len(r) > 1 else f"Track {tid}")
+        for tid, r in ((tid, replies[tid]["/live/track/get/name"]) for tid in wanted)
+    ]
+
+def _num_devices(nd: tuple[Any, ...]) -> int:
+    # response: (track_id, num_devices)
+    return int(nd[1]) if len(nd) > 1 else 0
+
+def _track_info(tid: int, tname: str, nd: tuple[Any, ...], dn: tuple[Any, ...], dc: tuple[Any, ...]) -> TrackInfo:
+    num_devices = _num_devices(nd)
+
+    # responses include track_id first
+    dev_names = list(dn[1:]) if len(dn) > 1 else []
+    dev_class = list(dc[1:]) if len(dc) > 1 else []
+
+    devices: list[DeviceInfo] = []
+    for i in range(min(len(dev_names), len(dev_class))):
+        devices.append(DeviceInfo(index=i, name=str(dev_names[i]), class_name=str(dev_class[i])))
+    return _hashed(TrackInfo(track_id=tid, name=str(tname), num_devices=num_devices, devices=devices))
+
+def scan_live(
+    target: OscTarget = OscTarget(),
+    timeout_sec: float | None = None,
+    track_ids: list[int] | None = None,
+    max_in_flight: int = 24,
+    listen_port: int = 11001,
+    budget_sec: float | None = SCAN_BUDGET_S,
+) -> ScanResult:
     """
     Scan Live set for track/device information.
     
+    Per-track queries (num_devices, devices/name, devices/class_name) are
+    pipelined across tracks with at most `max_in_flight` outstanding; the
+    result and fingerprint are the same as a serial walk.
+    
     Args:
         target: OSC target
-        timeout_sec: RPC timeout
+        timeout_sec: Fixed per-request timeout (None: adaptive, with resends)
         track_ids: Optional list of specific track IDs to scan. If None, scans all tracks.
+        max_in_flight: Bound on outstanding queries (keeps AbletonOSC's queue short)
+        listen_port: AbletonOSC reply port
+        budget_sec: Deadline for the whole scan (None: only an enclosing deadline applies)
     """
-    num_tracks = int(request_once(target, "/live/song/get/num_tracks", None, timeout_sec=timeout_sec)[0])
-    
-    if track_ids is None:
-        # Full scan
-        names = request_once(target, "/live/song/get/track_names", [], timeout_sec=timeout_sec)
-        track_names = list(names)[:num_tracks]
-        tracks_to_scan = list(enumerate(track_names))
-    else:
-        # Targeted scan - get names only for requested tracks
-        tracks_to_scan = []
-        for tid in track_ids:
-            if tid >= num_tracks:
-                continue
-            # Get individual track name
-            name_resp = request_once(target, "/live/track/get/name", [tid], timeout_sec=timeout_sec)
-            tname = name_resp[1] if len(name_resp) > 1 else f"Track {tid}"
-            tracks_to_scan.append((tid, tname))
-
-    tracks: list[TrackInfo] = []
-    fp_parts: list[str] = []
-
-    for tid, tname in tracks_to_scan:
-        nd = request_once(target, "/live/track/get/num_devices", [tid], timeout_sec=timeout_sec)
-        # response: (track_id, num_devices)
-        num_devices = int(nd[1]) if len(nd) > 1 else 0
-
-        dn = request_once(target, "/live/track/get/devices/name", [tid], timeout_sec=timeout_sec)
-        dc = request_once(target, "/live/track/get/devices/class_name", [tid], timeout_sec=timeout_sec)
-
-        # responses include track_id first
-        dev_names = list(dn[1:]) if len(dn) > 1 else []
-        dev_class = list(dc[1:]) if len(dc) > 1 else []
-
-        devices: list[DeviceInfo] = []
-        for i in range(min(len(dev_names), len(dev_class))):
-            devices.append(DeviceInfo(index=i, name=str(dev_names[i]), class_name=str(dev_class[i])))
-
-        tracks.append(TrackInfo(track_id=tid, name=str(tname), num_devices=num_devices, devices=devices))
-        fp_parts.append(f"{tid}:{tname}:{num_devices}:" + "|".join([d.class_name for d in devices]))
-
-    fingerprint = _sha256(";".join(fp_parts))
-    note = f"targeted scan ({len(tracks)} tracks)" if track_ids else "full scan"
+    t_scan = time.perf_counter()
+    with deadline(budget_sec, "scan_live"), osc_session(target, listen_port) as session:
+        num_tracks = int(request_once(target, "/live/song/get/num_tracks", None, listen_port, timeout_sec)[0])
+        tracks_to_scan = _track_names(session, num_tracks, track_ids, max_in_flight, timeout_sec)
+
+        queries = (NUM_DEVICES, DEVICE_NAMES, DEVICE_CLASSES)
+        replies, track_ms = _query_tracks(session, [tid for tid, _ in tracks_to_scan], queries, max_in_flight, timeout_sec)
+        tracks = [_track_info(tid, tname, *(replies[tid][a] for a in queries)) for tid, tname in tracks_to_scan]
 
+    note = f"targeted scan ({len(tracks)} tracks)" if track_ids else "full scan"
     return ScanResult(
         ok=True,
         note=note,
         created_at_utc=datetime.now(timezone.utc).isoformat(),
         num_tracks=num_tracks if track_ids is None else len(tracks),
         tracks=tracks,
-        fingerprint=fingerprint,
+        fingerprint=root_fingerprint((t.track_id, t.hash) for t in tracks),
+        track_ms={tid: round(ms, 3) for tid, ms in track_ms.items()},
+        elapsed_ms=round((time.perf_counter() - t_scan) * 1000.0, 3),
+        track_ids=list(track_ids) if track_ids is not None else None,
     )
 
-def write_model_cache(path: str | Path = "data/caches/model_cache.json", track_ids: list[int] | None = None) -> Path:
+def scan_live_incremental(
+    previous: ScanResult,
+    target: OscTarget = OscTarget(),
+    timeout_sec: float | None = None,
+    track_ids: list[int] | None = None,
+    max_in_flight: int = 24,
+    listen_port: int = 11001,
+    budget_sec: float | None = SCAN_BUDGET_S,
+) -> ScanResult:
+    """
+    Rescan only what changed since `previous`.
+
+    Every track in scope is probed (name + num_devices); devices/name and
+    devices/class_name are re-queried only for tracks whose probe differs or
+    that `previous` does not have. The others keep their cached devices, and
+    the root is recomputed from the track hashes. A device swapped for another
+    without changing the count or track name is not detected - run a full
+    scan_live() for that.
+
+    track_ids defaults to the scope of `previous`.
+    """
+    if track_ids is None:
+        track_ids = previous.track_ids
+    cached = {t.track_id: t for t in previous.tracks}
+    t_scan = time.perf_counter()
+    with deadline(budget_sec, "scan_live_incremental"), osc_session(target, listen_port) as session:
+        num_tracks = int(request_once(target, "/live/song/get/num_tracks", None, listen_port, timeout_sec)[0])
+        tracks_to_scan = _track_names(session, num_tracks, track_ids, max_in_flight, timeout_sec)
+
+        probes, track_ms = _query_tracks(session, [tid for tid, _ in tracks_to_scan], (NUM_DEVICES,), max_in_flight, timeout_sec)
+        stale = [
+            tid for tid, tname in tracks_to_scan
+            if (old := cached.get(tid)) is None
+            or old.name != tname
+            or old.num_devices != _num_devices(probes[tid][NUM_DEVICES])
+        ]
+        fresh, fresh_ms = _query_tracks(session, stale, (DEVICE_NAMES, DEVICE_CLASSES), max_in_flight, timeout_sec)
+        track_ms.update({tid: track_ms[tid] + ms for tid, ms in fresh_ms.items()})
+
+        tracks = [
+            _track_info(tid, tname, probes[tid][NUM_DEVICES], fresh[tid][DEVICE_NAMES], fresh[tid][DEVICE_CLASSES])
+            if tid in fresh else _hashed(cached[tid])
+            for tid, tname in tracks_to_scan
+        ]
+
+    result = ScanResult(
+        ok=True,
+        note=f"incremental scan ({len(stale)} of {len(tracks)} tracks re-queried)",
+        created_at_utc=datetime.now(timezone.utc).isoformat(),
+        num_tracks=num_tracks if track_ids is None else len(tracks),
+        tracks=tracks,
+        fingerprint=root_fingerprint((t.track_id, t.hash) for t in tracks),
+        track_ms={tid: round(ms, 3) for tid, ms in track_ms.items()},
+        elapsed_ms=round((time.perf_counter() - t_scan) * 1000.0, 3),
+        track_ids=list(track_ids) if track_ids is not None else None,
+    )
+    result.changed = diff_scans(previous, result)
+    return result
+
+def write_model_cache(
+    path: str | Path = "data/caches/model_cache.json",
+    track_ids: list[int] | None = None,
+    registry: "DeviceRegistry | None" = None,
+    incremental: bool = False,
+) -> Path:
     """
     Write model cache from Live scan.
     
     Args:
         path: Output file path
         track_ids: Optional list of specific track IDs to scan. If None, scans all tracks.
+        registry: Optional DeviceRegistry to refresh from the scan (drops changed tracks only).
+        incremental: Rescan against the existing cache at `path` (falls back to a full scan).
     """
     out = Path(path)
     out.parent.mkdir(parents=True, exist_ok=True)
 
+    previous = load_model_cache(out) if incremental else None
     try:
-        payload = scan_live(track_ids=track_ids)
+        if previous is not None and previous.ok:
+            payload = scan_live_incremental(previous, track_ids=track_ids)
+        else:
+            payload = scan_live(track_ids=track_ids)
     except Exception as e:
         payload = ScanResult(
             ok=False,
@@ -116,5 +389,8 @@ def write_model_cache(path: str | Path = "data/caches/model_cache.json", track_i
             fingerprint="",
         )
 
+    if registry is not None and payload.ok:
+        registry.sync_scan(payload)
+
     out.write_text(json.dumps(asdict(payload), indent=2) + "\n", encoding="utf-8")
     return out
@@ -0,0 +1,64 @@
+"""
+Decode-once audio session.
+
+AudioSession reads a file on first use and memoizes what analysis derives from
+it (decoded samples, the per-channel K-weighted signal, analysis results), so
+analyze -> check -> verify on one export costs exactly one decode. A
+FollowingMeter can seed a session with the analysis it metered during export
+(finish(session=...)), which then costs no decode at all.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING
+import numpy as np
+from scipy import signal
+
+from flaas.audio_io import AudioData, read_audio_info, read_float
+from flaas.meter import k_weighting_sos
+
+if TYPE_CHECKING:
+    from flaas.analyze import AnalysisResult
+
+class AudioSession:
+    """
+    Lazily decoded view of one audio file.
+
+    Arrays are computed on first access and kept for the session's lifetime;
+    drop the session to release them. `decodes` counts actual file reads.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.decodes = 0
+        # analyze_wav stores its results here, keyed by variant ("" / "timelines")
+        self.analyses: dict[str, AnalysisResult] = {}
+        self._info: AudioData | None = None
+        self._audio: np.ndarray | None = None
+        self._k_weighted: np.ndarray | None = None
+
+    @property
+    def info(self) -> AudioData:
+        if self._info is None:
+            self._info = read_audio_info(self.path)
+        return self._info
+
+    @property
+    def sr(self) -> int:
+        return self.info.sr
+
+    @property
+    def audio(self) -> np.ndarray:
+        """Decoded float32 samples, shape (frames, channels)."""
+        if self._audio is None:
+            self._audio, _ = read_float(self.path)
+            self.decodes += 1
+        return self._audio
+
+    @property
+    def k_weighted(self) -> np.ndarray:
+        """BS.1770 K-weighted signal per channel, (frames, channels), float32; filter starts from rest."""
+        if self._k_weighted is None:
+            sos = k_weighting_sos(self.sr).astype(self.audio.dtype)
+            self._k_weighted = signal.sosfilt(sos, self.audio, axis=0)
+        return self._k_weighted
@@ -28,7 +28,6 @@ def resolve_utility_device_id(target: OscTarget = OscTarget()) -> int:
             target,
             "/live/track/get/devices/name",
             [MASTER_TRACK_ID],
-            timeout_sec=3.0
         )
         # Response format: (track_id, name0, name1, name2, ...)
         # Drop the first element (track_id), keep device names
@@ -10,15 +10,22 @@ import subprocess
 import time
 import os
 from pathlib import Path
+from typing import Callable
 
 
-def auto_export_wav(out_path: str | Path, timeout_s: int = 600) -> None:
+def auto_export_wav(
+    out_path: str | Path,
+    timeout_s: int = 600,
+    on_poll: Callable[[Path], None] | None = None,
+) -> None:
     """
     Trigger Ableton Live export via macOS UI automation (AppleScript).
     
     Args:
         out_path: Path to output WAV file (will be resolved to absolute)
         timeout_s: Maximum time to wait for file to stabilize (default 600s)
+        on_poll: Called with the output path on every wait-loop poll while the
+            file exists; the last call sees the stable file (e.g. FollowingMeter.poll)
     
     Raises:
         RuntimeError: If export fails or file doesn't appear
@@ -237,6 +244,8 @@ end run
         if out_path.exists():
             size_now = out_path.stat().st_size
             mtime_now = out_path.stat().st_mtime
+            if on_poll is not None:
+                on_poll(out_path)
             
             if size_now == size_prev and mtime_now == mtime_prev:
                 stable_checks += 1
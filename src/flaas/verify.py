@@ -1,5 +1,6 @@
 from __future__ import annotations
-from flaas.osc_rpc import OscTarget, request_once
+from flaas.observe import read_param_value
+from flaas.osc_rpc import OscTarget
 from flaas.targets import MASTER_TRACK_ID, resolve_utility_device_id
 
 UTILITY_GAIN_PARAM_ID = 9
@@ -18,7 +19,8 @@ def verify_master_utility_gain(
         target: OSC target
     
     Returns:
-        Normalized parameter value (0.0 - 1.0)
+        Normalized parameter value (0.0 - 1.0). A local read when the active
+        session's ParamMirror watches the parameter.
     """
     # Default to master track
     if track_id is None:
@@ -28,6 +30,4 @@ def verify_master_utility_gain(
     if device_id is None:
         device_id = resolve_utility_device_id(target)
     
-    resp = request_once(target, "/live/device/get/parameter/value", [track_id, device_id, UTILITY_GAIN_PARAM_ID], timeout_sec=3.0)
-    # (track_id, device_id, param_id, value)
-    return float(resp[3])
+    return read_param_value(track_id, device_id, UTILITY_GAIN_PARAM_ID, target)
@@ -1,11 +1,16 @@
 from __future__ import annotations
 from pathlib import Path
 from flaas.analyze import analyze_wav
+from flaas.cache import AnalysisCache
 from flaas.check import check_wav
+from flaas.session import AudioSession
 
-def verify_audio(path: str | Path) -> int:
-    a = analyze_wav(path)
-    c = check_wav(path)
+def verify_audio(path: str | Path | AudioSession, cache: AnalysisCache | None = None) -> int:
+    # One session: check_wav reuses the analysis instead of decoding again.
+    # No cache unless the caller passes one (a plain verify writes nothing).
+    session = path if isinstance(path, AudioSession) else AudioSession(path)
+    a = analyze_wav(session, cache=cache)
+    c = check_wav(session, cache=cache)
     print(f"FILE: {a.file}")
     print(f"LUFS: {a.lufs_i:.2f} (target {c.target_lufs:.2f})  pass={c.pass_lufs}")
     print(f"PEAK: {a.peak_dbfs:.2f} dBFS (limit {c.target_peak_dbfs:.2f}) pass={c.pass_peak}")
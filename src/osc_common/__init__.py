@@ -0,0 +1,8 @@
+"""
+RPC timing and tracing shared by flaas and finishline_audio.
+
+rtt: adaptive timeouts, retry backoff and deadline budgets.
+trace: per-call trace spans (Chrome trace-event JSON lines).
+
+Neither module depends on either application package.
+"""
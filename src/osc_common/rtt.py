@@ -0,0 +1,184 @@
+"""
+Adaptive RPC timeouts, retry backoff and deadline budgets.
+
+Timeouts come from a per-endpoint-class round-trip estimate (RFC 6298, as
+TCP does): SRTT and RTTVAR are smoothed from measured replies and the
+timeout is SRTT + 4 * RTTVAR, clamped to [MIN_RTO_S, MAX_RTO_S]. A timeout
+doubles the class's RTO until the next clean sample, so a busy Live (e.g.
+rendering) stretches waits instead of producing a burst of spurious
+timeouts. Replies to resent requests are ambiguous and are not sampled
+(Karn's algorithm).
+
+Resends wait a full-jitter backoff first (backoff_delay), so a batch that
+timed out together does not hit Live again in lockstep.
+
+A deadline caps every wait inside a high-level operation, however many
+requests and retries it makes:
+
+    with deadline(30.0, "scan_live"):
+        ...  # any request past the budget raises DeadlineExceeded
+
+Nested deadlines never extend an outer one.
+"""
+
+from __future__ import annotations
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+
+INITIAL_RTO_S = 1.0   # before the first sample for a class
+MIN_RTO_S = 0.2
+MAX_RTO_S = 8.0
+ALPHA = 1.0 / 8.0     # SRTT gain
+BETA = 1.0 / 4.0      # RTTVAR gain
+K = 4.0
+
+DEFAULT_RETRIES = 2
+BACKOFF_BASE_S = 0.05
+BACKOFF_CAP_S = 1.0
+
+def endpoint_class(address: str) -> str:
+    """Object + verb of an AbletonOSC address: '/live/track/get/devices/name' -> '/live/track/get'."""
+    parts = address.split("/")
+    return "/".join(parts[:4]) if len(parts) > 4 else address
+
+@dataclass
+class RttStats:
+    srtt: float | None = None
+    rttvar: float = 0.0
+    rto: float = INITIAL_RTO_S
+    samples: int = 0
+    timeouts: int = 0
+    backed_off_at: float | None = None  # perf_counter() of the last RTO doubling
+
+class RttEstimator:
+    """Smoothed RTT and retransmission timeout per endpoint class (thread-safe)."""
+
+    def __init__(
+        self,
+        initial_rto: float = INITIAL_RTO_S,
+        min_rto: float = MIN_RTO_S,
+        max_rto: float = MAX_RTO_S,
+    ):
+        self.initial_rto = float(initial_rto)
+        self.min_rto = float(min_rto)
+        self.max_rto = float(max_rto)
+        self._lock = threading.Lock()
+        self._stats: dict[str, RttStats] = {}
+
+    def _get(self, address: str) -> RttStats:
+        cls = endpoint_class(address)
+        st = self._stats.get(cls)
+        if st is None:
+            st = self._stats[cls] = RttStats(rto=self.initial_rto)
+        return st
+
+    def observe(self, address: str, rtt_s: float) -> None:
+        """Feed one measured round trip (first send only; see Karn)."""
+        rtt_s = max(0.0, float(rtt_s))
+        with self._lock:
+            st = self._get(address)
+            if st.srtt is None:
+                st.srtt, st.rttvar = rtt_s, rtt_s / 2.0
+            else:
+                st.rttvar = (1.0 - BETA) * st.rttvar + BETA * abs(st.srtt - rtt_s)
+                st.srtt = (1.0 - ALPHA) * st.srtt + ALPHA * rtt_s
+            st.samples += 1
+            st.rto = min(self.max_rto, max(self.min_rto, st.srtt + K * st.rttvar))
+
+    def on_timeout(self, address: str, sent: float | None = None) -> None:
+        """
+        Back off: double the class's RTO (up to max_rto) until a clean sample arrives.
+
+        `sent` is when the timed-out attempt went out (perf_counter). Attempts
+        sent before the last doubling were waiting on the old RTO; their
+        timeouts are counted but do not compound it, so a window of requests
+        lost together backs off once.
+        """
+        with self._lock:
+            st = self._get(address)
+            st.timeouts += 1
+            if sent is not None and st.backed_off_at is not None and sent < st.backed_off_at:
+                return
+            st.rto = min(self.max_rto, st.rto * 2.0)
+            st.backed_off_at = time.perf_counter()
+
+    def timeout(self, address: str) -> float:
+        """Current wait for one attempt on `address`."""
+        with self._lock:
+            st = self._stats.get(endpoint_class(address))
+            return st.rto if st is not None else self.initial_rto
+
+    def budget(self, address: str, retries: int = DEFAULT_RETRIES) -> float:
+        """Worst-case wait for a request with `retries` resends (backoff included)."""
+        rto = self.timeout(address)
+        return sum(min(self.max_rto, rto * 2.0 ** i) for i in range(retries + 1)) + retries * BACKOFF_CAP_S
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {cls: asdict(st) for cls, st in sorted(self._stats.items())}
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE_S, cap: float = BACKOFF_CAP_S, rng: random.Random | None = None) -> float:
+    """Full-jitter exponential backoff before resend number attempt + 1."""
+    return (rng or random).uniform(0.0, min(cap, base * 2.0 ** attempt))
+
+class DeadlineExceeded(TimeoutError):
+    """A high-level operation ran out of its deadline budget."""
+
+@dataclass(frozen=True)
+class Deadline:
+    label: str
+    budget_s: float
+    expires: float  # time.monotonic()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+# Innermost deadline of the current thread / asyncio task (tasks inherit it at creation)
+_ACTIVE: ContextVar[Deadline | None] = ContextVar("osc_common_deadline", default=None)
+
+@contextmanager
+def deadline(seconds: float | None, label: str = "operation") -> Iterator[Deadline | None]:
+    """Cap every RPC wait in the block at `seconds` total (None: no budget of its own)."""
+    if seconds is None:
+        yield current_deadline()
+        return
+    expires = time.monotonic() + float(seconds)
+    outer = current_deadline()
+    if outer is not None and outer.expires < expires:
+        expires = outer.expires
+        label = outer.label
+        seconds = outer.budget_s
+    d = Deadline(label=label, budget_s=float(seconds), expires=expires)
+    token = _ACTIVE.set(d)
+    try:
+        yield d
+    finally:
+        _ACTIVE.reset(token)
+
+def current_deadline() -> Deadline | None:
+    return _ACTIVE.get()
+
+def deadline_expired() -> bool:
+    d = current_deadline()
+    return d is not None and d.expired
+
+def clip_timeout(timeout_sec: float) -> float:
+    """timeout_sec, shortened to what is left of the active deadline."""
+    d = current_deadline()
+    return timeout_sec if d is None else min(timeout_sec, d.remaining())
+
+def timeout_error(message: str) -> TimeoutError:
+    """DeadlineExceeded if the active deadline ran out, else a plain TimeoutError."""
+    d = current_deadline()
+    if d is not None and d.expired:
+        return DeadlineExceeded(f"{d.label} exceeded its {d.budget_s:.1f}s budget: {message}")
+    return TimeoutError(message)
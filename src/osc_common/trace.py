@@ -0,0 +1,193 @@
+"""
+Per-call trace spans.
+
+While a Tracer is active, every OSC request (OscSession, request_once,
+finishline OscRpc, AsyncOscClient) and every span() block is written as one
+Chrome trace-event object per line ("ph": "X", microsecond ts/dur):
+
+    with Tracer("output/master_streaming_safe.trace.jsonl"):
+        with span("export", cat="export", file=name):
+            ...
+
+RPC events have cat "rpc", the endpoint address as name and args
+{args, retries, timeout, transport}. summarize_trace() aggregates them per
+endpoint; to_chrome() wraps the lines in {"traceEvents": [...]} for
+chrome://tracing / Perfetto. With no active Tracer, recording is a no-op.
+"""
+
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+MAX_ARG_ITEMS = 6
+MAX_ARG_CHARS = 40
+
+def summarize_args(value: Any) -> Any:
+    """Short, JSON-safe form of request args (long lists and strings truncated)."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= MAX_ARG_CHARS else value[:MAX_ARG_CHARS] + "..."
+    if isinstance(value, (list, tuple)):
+        items = [summarize_args(v) for v in value[:MAX_ARG_ITEMS]]
+        if len(value) > MAX_ARG_ITEMS:
+            items.append(f"+{len(value) - MAX_ARG_ITEMS}")
+        return items
+    return summarize_args(repr(value))
+
+class Tracer:
+    """Appends trace events for the duration of a `with` block (nested tracers: innermost wins)."""
+
+    def __init__(self, path: str | Path, process_name: str = "flaas"):
+        self.path = Path(path)
+        self.process_name = process_name
+        self.events = 0
+        self._lock = threading.Lock()
+        self._fh = None
+        self._token: Token | None = None
+        self._t0 = time.perf_counter()
+
+    def __enter__(self) -> "Tracer":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("w", encoding="utf-8")
+        self._write({"ph": "M", "name": "process_name", "pid": os.getpid(), "tid": 0,
+                     "args": {"name": self.process_name, "started_at_unix": time.time()}})
+        self._token = _ACTIVE.set(self)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _ACTIVE.reset(self._token)
+        self._token = None
+        with self._lock:
+            fh, self._fh = self._fh, None
+        if fh is not None:
+            fh.close()
+
+    def _write(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, default=str) + "\n"
+        with self._lock:
+            if self._fh is not None:
+                self._fh.write(line)
+                self._fh.flush()
+                self.events += 1
+
+    def complete(self, name: str, cat: str, start: float, end: float, **args: Any) -> None:
+        """Record a span from perf_counter() timestamps."""
+        self._write({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self._t0) * 1e6, 1),
+            "dur": round(max(0.0, end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+# Innermost tracer of the current thread / asyncio task (tasks inherit it at creation)
+_ACTIVE: ContextVar[Tracer | None] = ContextVar("osc_common_tracer", default=None)
+
+def current_tracer() -> Tracer | None:
+    return _ACTIVE.get()
+
+@contextmanager
+def span(name: str, cat: str = "flaas", **args: Any) -> Iterator[None]:
+    """Time a block as one span (records the exception type if it raises)."""
+    tracer = current_tracer()
+    if tracer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        tracer.complete(name, cat, start, time.perf_counter(), **args)
+
+def record_rpc(
+    tracer: Tracer | None,
+    address: str,
+    value: Any,
+    sent: float,
+    done: float,
+    timeout: bool = False,
+    retries: int = 0,
+    transport: str = "osc_rpc",
+) -> None:
+    """One request/reply (or timeout) as an "rpc" span; `tracer` is captured at send time."""
+    if tracer is not None:
+        tracer.complete(address, "rpc", sent, done, args=summarize_args(value),
+                        retries=retries, timeout=timeout, transport=transport)
+
+@dataclass(frozen=True)
+class SpanStats:
+    cat: str
+    name: str
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    timeouts: int
+
+    @property
+    def timeout_rate(self) -> float:
+        return self.timeouts / self.count if self.count else 0.0
+
+def _pct(sorted_ms: list[float], q: float) -> float:
+    return sorted_ms[min(len(sorted_ms) - 1, int(round(q * (len(sorted_ms) - 1))))]
+
+def read_trace(path: str | Path) -> list[dict[str, Any]]:
+    """Complete ("X") events from a trace JSONL file (torn last line ignored)."""
+    events: list[dict[str, Any]] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        try:
+            ev = json.loads(line)
+        except ValueError:
+            continue
+        if ev.get("ph") == "X":
+            events.append(ev)
+    return events
+
+def summarize_trace(path: str | Path) -> list[SpanStats]:
+    """Per (cat, name) count, latency percentiles and timeouts; slowest total first."""
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for ev in read_trace(path):
+        groups.setdefault((ev.get("cat", ""), ev["name"]), []).append(ev)
+    out: list[SpanStats] = []
+    for (cat, name), evs in groups.items():
+        ms = sorted(float(e["dur"]) / 1000.0 for e in evs)
+        out.append(SpanStats(
+            cat=cat,
+            name=name,
+            count=len(ms),
+            total_ms=round(sum(ms), 3),
+            p50_ms=round(_pct(ms, 0.50), 3),
+            p95_ms=round(_pct(ms, 0.95), 3),
+            p99_ms=round(_pct(ms, 0.99), 3),
+            timeouts=sum(1 for e in evs if (e.get("args") or {}).get("timeout")),
+        ))
+    out.sort(key=lambda s: s.total_ms, reverse=True)
+    return out
+
+def to_chrome(path: str | Path, out: str | Path | None = None) -> Path:
+    """Wrap a trace JSONL file as a Chrome/Perfetto-loadable JSON object."""
+    src = Path(path)
+    dst = Path(out) if out is not None else src.with_suffix(".json")
+    events = []
+    for line in src.read_text(encoding="utf-8").splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    dst.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}) + "\n", encoding="utf-8")
+    return dst
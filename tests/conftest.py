@@ -0,0 +1,17 @@
+"""Shared fixtures: free reply ports and the bundled fake AbletonOSC."""
+import pytest
+from flaas.fake_live import FakeAbletonOSC, free_udp_port
+from flaas.osc_rpc import OscSession
+
+
+@pytest.fixture
+def free_port():
+    """A free loopback UDP port (reply/listen port for one session)."""
+    return free_udp_port()
+
+
+@pytest.fixture
+def fake_live(free_port):
+    """FakeAbletonOSC with the bundled set, plus a session on its reply port: (fake, session)."""
+    with FakeAbletonOSC(reply_port=free_port) as fake, OscSession(fake.target, listen_port=free_port) as session:
+        yield fake, session
@@ -116,5 +116,214 @@ class TestAnalyze:
             analyze_wav("nonexistent.wav")
 
 
+class TestStreamingAnalyze:
+    """Test block-streaming mode of analyze_wav."""
+
+    @pytest.fixture
+    def noise_wav(self, tmp_path):
+        """Create a ramped noise WAV whose length is not a multiple of any block size."""
+        sample_rate = 44100
+        rng = np.random.default_rng(0)
+        n = sample_rate * 3 + 1234
+        audio = rng.standard_normal((n, 2)) * 0.1 * np.linspace(0.01, 1.0, n)[:, None]
+
+        wav_path = tmp_path / "noise.wav"
+        sf.write(wav_path, audio, sample_rate, subtype="PCM_24")
+        return wav_path
+
+    @pytest.mark.parametrize("block_size", [997, 4410, 65536])
+    def test_streaming_matches_in_memory(self, noise_wav, block_size):
+        """Test that streaming gives the same peak, true peak and LUFS-I."""
+        full = analyze_wav(noise_wav)
+        streamed = analyze_wav(noise_wav, block_size=block_size)
+        assert streamed.peak_dbfs == full.peak_dbfs
+        assert streamed.true_peak_dbtp == pytest.approx(full.true_peak_dbtp, abs=1e-9)
+        assert streamed.lufs_i == pytest.approx(full.lufs_i, abs=1e-9)
+
+    def test_lufs_matches_pyloudnorm(self, noise_wav):
+        """Test that LUFS-I agrees with pyloudnorm on the same stereo signal."""
+        import pyloudnorm as pyln
+        data, sr = sf.read(noise_wav, dtype="float32")
+        expected = pyln.Meter(sr).integrated_loudness(data)
+        result = analyze_wav(noise_wav, block_size=4096)
+        assert result.lufs_i == pytest.approx(expected, abs=1e-3)
+
+    def test_streaming_silent_audio(self, tmp_path):
+        """Test that silence streams to -inf LUFS."""
+        wav_path = tmp_path / "silent.wav"
+        sf.write(wav_path, np.zeros((24000, 2)), 48000)
+        result = analyze_wav(wav_path, block_size=1024)
+        assert result.lufs_i < -70
+
+
+class TestExtendedMetrics:
+    """Test single-pass extended metrics (S/M loudness, LRA, crest, timelines)."""
+
+    @pytest.fixture
+    def dynamic_wav(self, tmp_path):
+        """Create 20 s of noise alternating loud/quiet every 5 s."""
+        sample_rate = 48000
+        rng = np.random.default_rng(2)
+        n = sample_rate * 20
+        env = np.where((np.arange(n) // (sample_rate * 5)) % 2 == 0, 0.3, 0.05)
+        audio = rng.standard_normal(n) * env
+
+        wav_path = tmp_path / "dynamic.wav"
+        sf.write(wav_path, np.stack([audio, audio], axis=1), sample_rate, subtype="FLOAT")
+        return wav_path
+
+    def test_lra_matches_pyloudnorm(self, dynamic_wav):
+        """Test LRA agrees with pyloudnorm (different short-term hop, same method)."""
+        import pyloudnorm as pyln
+        data, sr = sf.read(dynamic_wav, dtype="float32")
+        expected = pyln.Meter(sr).loudness_range(data)
+        assert analyze_wav(dynamic_wav).lra == pytest.approx(expected, abs=0.2)
+
+    def test_crest_factor(self, dynamic_wav):
+        """Test crest factor equals peak / RMS of the mono signal."""
+        from flaas.audio_io import read_mono_float
+        mono, _ = read_mono_float(dynamic_wav)
+        expected = np.max(np.abs(mono)) / np.sqrt(np.mean(mono.astype(np.float64) ** 2))
+        assert analyze_wav(dynamic_wav).crest_factor == pytest.approx(expected, rel=1e-9)
+
+    def test_shortterm_and_momentary_bounds(self, dynamic_wav):
+        """Test max short-term/momentary exceed integrated on dynamic material."""
+        result = analyze_wav(dynamic_wav)
+        assert result.lufs_m_max >= result.lufs_s_max > result.lufs_i - 1.0
+        assert result.lufs_s_last < result.lufs_s_max  # file ends in a quiet section
+
+    def test_timelines_optional(self, dynamic_wav):
+        """Test timelines are only returned on request and sized per 100 ms."""
+        assert analyze_wav(dynamic_wav).timelines is None
+        tl = analyze_wav(dynamic_wav, timelines=True).timelines
+        assert tl.hop_sec == pytest.approx(0.1)
+        assert len(tl.rms_dbfs) == 200
+        assert len(tl.momentary_lufs) == 197
+        assert len(tl.shortterm_lufs) == 171
+
+    def test_streaming_extended_metrics_match(self, dynamic_wav):
+        """Test extended metrics are identical between streaming and in-memory."""
+        full = analyze_wav(dynamic_wav, timelines=True)
+        streamed = analyze_wav(dynamic_wav, block_size=3001, timelines=True)
+        assert streamed.lra == pytest.approx(full.lra, abs=1e-9)
+        assert streamed.crest_factor == pytest.approx(full.crest_factor, rel=1e-12)
+        np.testing.assert_allclose(streamed.timelines.shortterm_lufs, full.timelines.shortterm_lufs, atol=1e-9)
+
+    def test_window_levels(self, dynamic_wav):
+        """Test re-windowing to 1 s / 0.5 s matches direct RMS of each window."""
+        from flaas.analyze import window_levels
+        from flaas.audio_io import read_mono_float
+        mono, sr = read_mono_float(dynamic_wav)
+        starts, rms, _ = window_levels(analyze_wav(dynamic_wav, timelines=True).timelines, 1.0, 0.5)
+        assert starts[:3] == pytest.approx([0.0, 0.5, 1.0])
+        direct = 20 * np.log10(np.sqrt(np.mean(mono[sr * 6:sr * 7].astype(np.float64) ** 2)))
+        assert rms[12] == pytest.approx(direct, abs=1e-6)
+
+    def test_stereo_is_channel_sum_not_mean(self, dynamic_wav, tmp_path):
+        """Test that identical L/R reads 3.01 LU above the same signal in mono."""
+        data, sr = sf.read(dynamic_wav)
+        mono_path = tmp_path / "mono.wav"
+        sf.write(mono_path, data[:, 0], sr, subtype="FLOAT")
+        diff = analyze_wav(dynamic_wav).lufs_i - analyze_wav(mono_path).lufs_i
+        assert diff == pytest.approx(10 * np.log10(2), abs=1e-6)
+
+    def test_silent_lra_undefined(self, tmp_path):
+        """Test LRA on silence is NaN and crest factor is 0."""
+        wav_path = tmp_path / "silent.wav"
+        sf.write(wav_path, np.zeros((48000 * 4, 2)), 48000)
+        result = analyze_wav(wav_path)
+        assert np.isnan(result.lra)
+        assert result.crest_factor == 0.0
+
+
+class TestMultichannel:
+    """Test per-channel metering and BS.1770 channel weights."""
+
+    @pytest.fixture
+    def surround_wav(self, tmp_path):
+        """Create a 4 s 5.1 WAV (L R C LFE Ls Rs) with distinct levels per channel."""
+        sr = 48000
+        rng = np.random.default_rng(5)
+        levels = [0.1, 0.1, 0.2, 0.8, 0.05, 0.05]
+        audio = rng.standard_normal((sr * 4, 6)) * levels
+        path = tmp_path / "surround.wav"
+        sf.write(path, audio, sr, subtype="FLOAT", format="WAVEX")
+        return path
+
+    def test_matches_pyloudnorm_5_0(self, surround_wav, tmp_path):
+        """Test 5.1 loudness equals pyloudnorm's 5.0 (LFE excluded, surrounds x1.41)."""
+        import pyloudnorm as pyln
+        data, sr = sf.read(surround_wav, dtype="float32")
+        expected = pyln.Meter(sr).integrated_loudness(data[:, [0, 1, 2, 4, 5]])
+        assert analyze_wav(surround_wav).lufs_i == pytest.approx(expected, abs=1e-3)
+
+    def test_lfe_ignored(self, surround_wav, tmp_path):
+        """Test that changing only the LFE channel leaves loudness unchanged."""
+        data, sr = sf.read(surround_wav)
+        data[:, 3] *= 0.1
+        quiet_lfe = tmp_path / "quiet_lfe.wav"
+        sf.write(quiet_lfe, data, sr, subtype="FLOAT", format="WAVEX")
+        assert analyze_wav(quiet_lfe).lufs_i == pytest.approx(analyze_wav(surround_wav).lufs_i, abs=1e-9)
+
+    def test_per_channel_peaks(self, surround_wav):
+        """Test per-channel sample/true peak lists and their maxima."""
+        data, _ = sf.read(surround_wav)
+        result = analyze_wav(surround_wav)
+        assert len(result.channel_peak_dbfs) == 6
+        np.testing.assert_allclose(result.channel_peak_dbfs, 20 * np.log10(np.max(np.abs(data), axis=0)), atol=1e-5)
+        assert max(result.channel_peak_dbfs) == result.peak_dbfs
+        assert max(result.channel_true_peak_dbtp) == pytest.approx(result.true_peak_dbtp)
+        assert all(tp >= p for tp, p in zip(result.channel_true_peak_dbtp, result.channel_peak_dbfs))
+
+    def test_streaming_matches_block_size(self, surround_wav):
+        """Test that multichannel results do not depend on block size."""
+        a = analyze_wav(surround_wav, block_size=1000)
+        b = analyze_wav(surround_wav, block_size=1 << 16)
+        assert a.lufs_i == pytest.approx(b.lufs_i, abs=1e-9)
+        assert a.channel_true_peak_dbtp == pytest.approx(b.channel_true_peak_dbtp, abs=1e-9)
+
+
+class TestFloat32Path:
+    """Test that the float32 pipeline stays within 0.01 LU / 0.01 dB of float64."""
+
+    @pytest.fixture
+    def program(self):
+        """30 s of bass-heavy, dynamic stereo material (stresses the 38 Hz high-pass)."""
+        sr = 48000
+        rng = np.random.default_rng(9)
+        t = np.arange(sr * 30) / sr
+        env = 0.2 + 0.8 * (np.sin(2 * np.pi * 0.05 * t) ** 2)
+        x = env * (0.5 * np.sin(2 * np.pi * 41 * t) + 0.1 * rng.standard_normal(len(t)))
+        return np.stack([x, 0.7 * x], axis=1).astype(np.float32), sr
+
+    def test_meter_dtypes_agree(self, program):
+        """Test LUFS-I, LRA, short-term max and true peak across dtypes."""
+        from flaas.meter import StreamingMeter
+        x, sr = program
+        meters = {}
+        for dtype in (np.float32, np.float64):
+            m = StreamingMeter(sr, channels=2, dtype=dtype)
+            for i in range(0, len(x), 65536):
+                m.process(x[i:i + 65536])
+            meters[dtype] = m
+        m32, m64 = meters[np.float32], meters[np.float64]
+        assert m32.integrated_loudness() == pytest.approx(m64.integrated_loudness(), abs=0.01)
+        assert m32.loudness_range() == pytest.approx(m64.loudness_range(), abs=0.01)
+        assert np.max(m32.shortterm_lufs()) == pytest.approx(np.max(m64.shortterm_lufs()), abs=0.01)
+        assert m32.true_peak_dbtp == pytest.approx(m64.true_peak_dbtp, abs=0.01)
+        assert m32.rms_dbfs == pytest.approx(m64.rms_dbfs, abs=0.01)
+
+    def test_session_k_weighting_is_float32(self, program, tmp_path):
+        """Test that the session keeps decoded and filtered arrays in float32."""
+        from flaas.session import AudioSession
+        x, sr = program
+        path = tmp_path / "p.wav"
+        sf.write(path, x, sr, subtype="FLOAT")
+        s = AudioSession(path)
+        assert s.audio.dtype == np.float32
+        assert s.k_weighted.dtype == np.float32
+        assert analyze_wav(s).lufs_i == pytest.approx(analyze_wav(path).lufs_i, abs=0.01)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
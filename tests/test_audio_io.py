@@ -0,0 +1,90 @@
+"""Unit tests for audio_io.py - memory-mapped WAV reader."""
+import struct
+import pytest
+import numpy as np
+import soundfile as sf
+from flaas.audio_io import (
+    open_wav,
+    parse_wav_header,
+    read_audio_info,
+    read_float,
+    read_mono_float,
+)
+
+
+def _signal(frames=5000, channels=2, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.standard_normal((frames, channels)) * 0.3, -1.0, 1.0)
+
+
+class TestParity:
+    """Test that the mapped reader matches soundfile sample-for-sample."""
+
+    @pytest.mark.parametrize("fmt", ["WAV", "WAVEX"])
+    @pytest.mark.parametrize("subtype", ["PCM_U8", "PCM_16", "PCM_24", "PCM_32", "FLOAT", "DOUBLE"])
+    def test_matches_soundfile(self, tmp_path, fmt, subtype):
+        """Test every supported subtype, plain and WAVE_FORMAT_EXTENSIBLE."""
+        path = tmp_path / "x.wav"
+        sf.write(path, _signal(channels=3), 48000, subtype=subtype, format=fmt)
+        assert open_wav(path) is not None
+        ref, _ = sf.read(path, dtype="float32", always_2d=True)
+        got, sr = read_float(path, block_size=999)
+        assert sr == 48000
+        np.testing.assert_array_equal(got, ref)
+
+    def test_info_matches_soundfile(self, tmp_path):
+        """Test header-only metadata."""
+        path = tmp_path / "x.wav"
+        sf.write(path, _signal(frames=1234, channels=6), 96000, subtype="PCM_24", format="WAVEX")
+        info = read_audio_info(path)
+        ref = sf.info(path)
+        assert (info.sr, info.channels, info.samples) == (ref.samplerate, ref.channels, ref.frames)
+
+
+class TestHeaderParsing:
+    """Test chunk walking edge cases."""
+
+    def test_skips_odd_sized_chunk(self, tmp_path):
+        """Test that a padded odd-length chunk before data is skipped correctly."""
+        src = tmp_path / "src.wav"
+        sf.write(src, _signal(frames=100, channels=1), 48000, subtype="PCM_16")
+        data = src.read_bytes()
+        junk = b"JUNK" + struct.pack("<I", 3) + b"abc" + b"\x00"
+        fmt_end = 12 + 8 + struct.unpack("<I", data[16:20])[0]
+        patched = data[:fmt_end] + junk + data[fmt_end:]
+        patched = patched[:4] + struct.pack("<I", len(patched) - 8) + patched[8:]
+        path = tmp_path / "junk.wav"
+        path.write_bytes(patched)
+        got, _ = read_float(path)
+        ref, _ = sf.read(src, dtype="float32", always_2d=True)
+        np.testing.assert_array_equal(got, ref)
+
+    def test_truncated_data_chunk_is_clamped(self, tmp_path):
+        """Test a file still being written (data size larger than file)."""
+        path = tmp_path / "x.wav"
+        sf.write(path, _signal(frames=1000, channels=2), 48000, subtype="PCM_16")
+        data = path.read_bytes()
+        path.write_bytes(data[:-401])  # cut mid-frame
+        layout = parse_wav_header(path)
+        assert layout.frames == 1000 - 101
+        assert read_float(path)[0].shape == (899, 2)
+
+    def test_non_wav_falls_back(self, tmp_path):
+        """Test that FLAC goes through soundfile."""
+        path = tmp_path / "x.flac"
+        sf.write(path, _signal(), 48000, subtype="PCM_16")
+        assert parse_wav_header(path) is None
+        assert read_audio_info(path).samples == 5000
+        assert read_mono_float(path)[0].shape == (5000,)
+
+    def test_raw_is_memmap_view(self, tmp_path):
+        """Test that raw access does not copy the data chunk."""
+        path = tmp_path / "x.wav"
+        sf.write(path, _signal(), 48000, subtype="PCM_16")
+        raw = open_wav(path).raw
+        assert isinstance(raw.base, np.memmap) or isinstance(raw, np.memmap)
+        assert raw.dtype == np.dtype("<i2")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
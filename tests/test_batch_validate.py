@@ -0,0 +1,78 @@
+"""Unit tests for batch_validate.py - parallel streaming validation."""
+import json
+import pytest
+import numpy as np
+import soundfile as sf
+from flaas.batch_validate import run_batch_validate, batch_validate, validate_files, find_wav_files
+from flaas.cache import AnalysisCache
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    """Create a small directory tree of WAVs at different levels, plus one corrupt file."""
+    root = tmp_path / "output"
+    (root / "sub").mkdir(parents=True)
+    t = np.arange(48000) / 48000
+    for i, amp in enumerate([0.05, 0.2, 0.5, 0.9, 0.1, 0.3]):
+        x = amp * np.sin(2 * np.pi * 440 * t)
+        folder = root / "sub" if i % 2 else root
+        sf.write(folder / f"m{i}.wav", np.stack([x, x], axis=1), 48000)
+    (root / "zz_broken.wav").write_bytes(b"not a wav")
+    return root
+
+
+class TestValidateFiles:
+    """Test ordering and parity across worker counts."""
+
+    def test_parallel_matches_serial_order(self, catalogue):
+        """Test that a pool yields the same results in the same order as in-process."""
+        paths = find_wav_files(catalogue)
+        serial = list(validate_files(paths, workers=1))
+        parallel = list(validate_files(paths, workers=3, chunk_size=2))
+        assert [r.file_path for r in parallel] == [str(p) for p in paths]
+        assert [(r.lufs_i, r.true_peak_dbtp, r.issues) for r in parallel] == \
+               [(r.lufs_i, r.true_peak_dbtp, r.issues) for r in serial]
+
+    def test_broken_file_reported_not_raised(self, catalogue):
+        """Test that an unreadable file becomes an issue entry."""
+        results = list(validate_files(find_wav_files(catalogue), workers=2, chunk_size=1))
+        broken = [r for r in results if r.file_name == "zz_broken.wav"]
+        assert len(broken) == 1
+        assert broken[0].issues[0].startswith("Analysis failed")
+
+    def test_cache_counts_aggregate_from_workers(self, catalogue, tmp_path):
+        """Test that worker hit/miss deltas are folded into the parent cache."""
+        paths = [p for p in find_wav_files(catalogue) if p.name != "zz_broken.wav"]
+        cache = AnalysisCache(tmp_path / "caches")
+        list(validate_files(paths, workers=2, chunk_size=2, cache=cache))
+        assert (cache.hits, cache.misses) == (0, len(paths))
+        list(validate_files(paths, workers=2, chunk_size=2, cache=cache))
+        assert (cache.hits, cache.misses) == (len(paths), len(paths))
+
+
+class TestRunBatchValidate:
+    """Test JSONL output and CLI flow."""
+
+    def test_jsonl_in_input_order(self, catalogue, tmp_path):
+        """Test one JSON line per file, in sorted path order."""
+        out = tmp_path / "r.jsonl"
+        results = run_batch_validate(catalogue, workers=2, chunk_size=2, jsonl_out=out)
+        lines = [json.loads(line) for line in out.read_text().splitlines()]
+        assert [d["file_path"] for d in lines] == [r.file_path for r in results]
+        assert len(lines) == 7
+
+    def test_exit_code_and_report(self, catalogue, tmp_path, capsys):
+        """Test that issues give exit code 1 and the summary report is printed."""
+        code = batch_validate(catalogue, workers=1, jsonl_out=tmp_path / "r.jsonl")
+        out = capsys.readouterr().out
+        assert code == 1
+        assert "BATCH STREAMING VALIDATION REPORT" in out
+        assert "[7/7]" in out
+
+    def test_missing_root(self, tmp_path, capsys):
+        """Test that a missing directory is an error."""
+        assert batch_validate(tmp_path / "nope", jsonl_out=None) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
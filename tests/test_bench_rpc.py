@@ -0,0 +1,62 @@
+"""Unit tests for bench_rpc.py - OSC transport benchmarks."""
+import json
+import pytest
+from dataclasses import asdict
+from flaas.bench_rpc import LatencyStats, compare_to_baseline, run_bench, write_bench
+
+
+class TestLatencyStats:
+    """Test percentile and rate math."""
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles over 1..100 ms."""
+        st = LatencyStats.from_samples([float(i) for i in range(1, 101)], elapsed_s=2.0)
+        assert st.p50_ms == pytest.approx(51.0)
+        assert st.p99_ms == pytest.approx(99.0)
+        assert st.rps == pytest.approx(50.0)
+
+    def test_rps_counts_batched_requests(self):
+        """Test that a batch of 10 per sample counts 10 requests."""
+        st = LatencyStats.from_samples([5.0, 5.0], elapsed_s=0.01, per_sample=10)
+        assert st.rps == pytest.approx(2000.0)
+
+
+class TestRunBench:
+    """Test a tiny end-to-end run against the stand-in server."""
+
+    def test_report_shape(self, tmp_path):
+        """Test that every client and scan case is measured and written."""
+        report = run_bench(requests=5, batch=5, tracks=[2], devices=[1])
+        assert set(report.latency) == {"flaas.request_once", "flaas.OscSession.request", "finishline.OscRpc.call"}
+        assert set(report.throughput) == {"flaas.request_many", "finishline.OscRpc.call_many"}
+        assert [(p.tracks, p.max_in_flight) for p in report.scan] == [(2, 1), (2, 24)]
+        assert all(st.p50_ms > 0 for st in report.latency.values())
+        path = write_bench(report, tmp_path / "bench.json")
+        assert json.loads(path.read_text())["latency"]["flaas.OscSession.request"]["n"] == 5
+
+
+class TestCompareToBaseline:
+    """Test regression detection."""
+
+    def _report(self, p50=1.0, rps=1000.0, scan_ms=50.0):
+        st = asdict(LatencyStats(n=10, p50_ms=p50, p90_ms=p50, p99_ms=p50, mean_ms=p50, rps=rps))
+        return {"latency": {"a": st}, "throughput": {}, "scan": [{"tracks": 8, "devices": 2, "max_in_flight": 24, "ms": scan_ms}]}
+
+    def test_within_tolerance(self):
+        """Test that small noise is not flagged."""
+        assert compare_to_baseline(self._report(p50=1.2, rps=900.0, scan_ms=55.0), self._report()) == []
+
+    def test_regressions_flagged(self):
+        """Test that slower latency, lower rps and slower scans are all reported."""
+        out = compare_to_baseline(self._report(p50=2.0, rps=500.0, scan_ms=90.0), self._report())
+        assert any("latency.a.p50_ms" in r for r in out)
+        assert any("latency.a.rps" in r for r in out)
+        assert any(r.startswith("scan.t8.d2.w24") for r in out)
+
+    def test_missing_cases_ignored(self):
+        """Test that cases absent from the baseline are skipped."""
+        assert compare_to_baseline(self._report(p50=5.0), {"latency": {}, "scan": []}) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,136 @@
+"""Unit tests for cache.py - persistent analysis cache."""
+import os
+from dataclasses import asdict
+import pytest
+import numpy as np
+import soundfile as sf
+from unittest.mock import patch
+from flaas.analyze import analyze_wav
+from flaas.cache import AnalysisCache
+from flaas.check import check_wav
+
+
+@pytest.fixture
+def test_wav(tmp_path):
+    """Create a 1 s stereo sine WAV."""
+    t = np.arange(48000) / 48000
+    audio = 0.5 * np.sin(2 * np.pi * 440 * t)
+    path = tmp_path / "test.wav"
+    sf.write(path, np.stack([audio, audio], axis=1), 48000)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalysisCache(tmp_path / "caches")
+
+
+class TestAnalysisCache:
+    """Test hit/miss behavior and invalidation."""
+
+    def test_roundtrip_matches_fresh_analysis(self, test_wav, cache):
+        """Test that a cached result equals the computed one (including timestamp)."""
+        fresh = analyze_wav(test_wav, cache=cache)
+        cached = analyze_wav(test_wav, cache=cache)
+        assert cache.hits == 1 and cache.misses == 1
+        # assert_equal treats NaN == NaN (LRA is undefined for a 1 s tone)
+        np.testing.assert_equal(asdict(cached), asdict(fresh))
+
+    def test_hit_skips_decode(self, test_wav, cache):
+        """Test that a hit never touches the decoder."""
+        analyze_wav(test_wav, cache=cache)
+        with patch("flaas.analyze.read_audio_info") as info:
+            analyze_wav(test_wav, cache=cache)
+            info.assert_not_called()
+
+    def test_check_reuses_analysis(self, test_wav, cache):
+        """Test that analyze followed by check decodes once."""
+        analyze_wav(test_wav, cache=cache)
+        check_wav(test_wav, cache=cache)
+        assert cache.hits == 1
+
+    def test_modified_file_misses(self, test_wav, cache):
+        """Test that rewriting the file invalidates its entry."""
+        analyze_wav(test_wav, cache=cache)
+        sf.write(test_wav, np.zeros((48000, 2)), 48000)
+        st = test_wav.stat()
+        os.utime(test_wav, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        res = analyze_wav(test_wav, cache=cache)
+        assert cache.hits == 0
+        assert res.lufs_i == -float("inf")
+
+    def test_timelines_variant_is_separate(self, test_wav, cache):
+        """Test that a plain entry does not satisfy a timelines request."""
+        analyze_wav(test_wav, cache=cache)
+        res = analyze_wav(test_wav, timelines=True, cache=cache)
+        assert cache.hits == 0
+        assert res.timelines is not None
+        again = analyze_wav(test_wav, timelines=True, cache=cache)
+        assert again.timelines.momentary_lufs == res.timelines.momentary_lufs
+
+    def test_copied_file_reports_new_path(self, test_wav, cache, tmp_path):
+        """Test that identical content at another path reports that path."""
+        analyze_wav(test_wav, cache=cache)
+        copy = tmp_path / "copy.wav"
+        copy.write_bytes(test_wav.read_bytes())
+        st = test_wav.stat()
+        os.utime(copy, ns=(st.st_atime_ns, st.st_mtime_ns))
+        res = analyze_wav(copy, cache=cache)
+        assert cache.hits == 1
+        assert res.file == str(copy)
+
+
+class TestEviction:
+    """Test size-bounded LRU eviction."""
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that the oldest entry goes first and a hit refreshes recency."""
+        paths = []
+        for i in range(3):
+            p = tmp_path / f"f{i}.wav"
+            sf.write(p, np.full((24000, 1), 0.1 * (i + 1)), 48000)
+            paths.append(p)
+
+        cache = AnalysisCache(tmp_path / "caches")
+        analyze_wav(paths[0], cache=cache)
+        entry_size = cache.stats().total_bytes
+        cache.max_bytes = 2 * entry_size + entry_size // 2
+
+        analyze_wav(paths[1], cache=cache)
+        # Age entries explicitly (filesystem mtime resolution can be coarse)
+        for i, entry in enumerate(sorted(cache.dir.glob("*.json"), key=lambda p: p.stat().st_mtime)):
+            os.utime(entry, (1000 + i, 1000 + i))
+        analyze_wav(paths[0], cache=cache)  # hit: f0 becomes most recent
+        analyze_wav(paths[2], cache=cache)  # over budget: f1 evicted
+
+        assert cache.stats().entries == 2
+        assert cache.get(paths[0]) is not None
+        assert cache.get(paths[1]) is None
+
+    def test_clear(self, test_wav, cache):
+        """Test that clear removes all entries."""
+        analyze_wav(test_wav, cache=cache)
+        assert cache.clear() == 1
+        assert cache.stats().entries == 0
+
+
+class TestFromConfig:
+    """Test cache location from config.yaml."""
+
+    def test_relative_root_resolves_against_config(self, tmp_path):
+        """Test that cache_root is relative to the config file."""
+        pytest.importorskip("yaml")
+        cfg = tmp_path / "config.yaml"
+        cfg.write_text("project:\n  cache_root: ./cc\nanalysis:\n  cache_max_mb: 1\n")
+        cache = AnalysisCache.from_config(cfg)
+        assert cache.dir == tmp_path / "cc" / "analysis"
+        assert cache.max_bytes == 1024 * 1024
+
+    def test_missing_config_uses_defaults(self, tmp_path):
+        """Test defaults when config.yaml is absent."""
+        cache = AnalysisCache.from_config(tmp_path / "nope.yaml")
+        assert cache.dir == tmp_path / "data" / "caches" / "analysis"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
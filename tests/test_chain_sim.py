@@ -0,0 +1,125 @@
+"""Unit tests for chain_sim.py - offline Glue/Saturator/Limiter model and search."""
+import pytest
+import numpy as np
+from flaas.chain_sim import (
+    ChainParams,
+    LimiterProbe,
+    _hold_release,
+    glue_compress,
+    limit,
+    measure,
+    predict,
+    saturate,
+    search_chain,
+)
+
+SR = 48000
+
+
+def _db(x: float) -> float:
+    return 20 * np.log10(x)
+
+
+@pytest.fixture(scope="module")
+def program():
+    """6 s of stereo noise with a 0.5 Hz level swell (crest factor like a dense mix)."""
+    rng = np.random.default_rng(0)
+    t = np.arange(6 * SR) / SR
+    env = 0.3 * (1 + 0.8 * np.sin(2 * np.pi * 0.5 * t))
+    return (rng.standard_normal((len(t), 2)) * 0.1 * env[:, None]).astype(np.float32)
+
+
+class TestStages:
+    """Test the per-device models."""
+
+    def test_limiter_holds_ceiling(self, program):
+        """Test that no output sample exceeds the ceiling, whatever the gain."""
+        for gain in (0.0, 12.0, 24.0):
+            y = limit(program, SR, gain, -1.0)
+            assert _db(np.max(np.abs(y))) <= -1.0 + 1e-4
+
+    def test_limiter_below_ceiling_is_gain_only(self, program):
+        """Test that a signal that never reaches the ceiling is just scaled."""
+        y = limit(program * 0.1, SR, 6.0, 0.0)
+        np.testing.assert_allclose(y, program * 0.1 * 10 ** (6 / 20), rtol=1e-5)
+
+    def test_glue_below_threshold_is_makeup_only(self, program):
+        """Test that a quiet signal gets the makeup gain and nothing else."""
+        y = glue_compress(program * 0.01, SR, threshold_db=-10.0, ratio=4.0, attack_ms=10.0, makeup_db=3.0)
+        np.testing.assert_allclose(y, program * 0.01 * 10 ** (3 / 20), rtol=1e-4)
+
+    def test_glue_steady_state_ratio(self):
+        """Test that a steady tone 12 dB over threshold comes out 12 * (1 - 1/4) dB lower."""
+        t = np.arange(2 * SR) / SR
+        x = 0.5 * np.sin(2 * np.pi * 1000 * t)  # peak -6 dBFS
+        y = glue_compress(x, SR, threshold_db=-18.0, ratio=4.0, attack_ms=1.0)
+        assert _db(np.max(np.abs(y[SR:]))) == pytest.approx(-6.0 - 9.0, abs=0.3)
+
+    def test_saturator_is_linear_when_quiet_and_bounded_when_driven(self):
+        """Test tanh soft clip: small signals get the drive gain, output never exceeds 1."""
+        x = np.linspace(-1e-3, 1e-3, 101)
+        np.testing.assert_allclose(saturate(x, 6.0)[:, 0], x * 10 ** (6 / 20), rtol=1e-4)
+        assert np.max(np.abs(saturate(np.linspace(-1, 1, 101), 24.0))) <= 1.0
+
+    def test_hold_release_matches_recursion(self):
+        """Test the vectorized release against g[i] = max(need[i], r * g[i-1])."""
+        rng = np.random.default_rng(1)
+        need = np.abs(rng.standard_normal(20000)) * (rng.random(20000) < 0.01)
+        for r in (0.99, 0.5):
+            ref, g = np.empty_like(need), 0.0
+            for i, v in enumerate(need):
+                g = max(v, r * g)
+                ref[i] = g
+            np.testing.assert_allclose(_hold_release(need, r), ref, atol=1e-12)
+
+
+class TestLimiterProbe:
+    """Test loudness predicted without rendering."""
+
+    def test_matches_rendered_loudness(self, program):
+        """Test probe LUFS against metering the rendered limiter output."""
+        probe = LimiterProbe(program, SR)
+        for gain, ceiling in ((0.0, 0.0), (9.0, -1.0), (18.0, -3.0)):
+            rendered = measure(limit(program, SR, gain, ceiling), SR).lufs_i
+            assert probe.lufs(gain, ceiling) == pytest.approx(rendered, abs=0.05)
+
+
+class TestSearch:
+    """Test the simulated settings search."""
+
+    def test_hits_target_under_true_peak_limit(self, program):
+        """Test that the found settings reproduce the target when simulated again."""
+        start = ChainParams(threshold_db=-20.0, makeup_db=3.0, saturator_drive_db=0.0)
+        found = search_chain(program, SR, start, target_lufs=-12.0, tp_limit_dbtp=-1.0)
+        assert found.reached_target and found.renders >= 1
+        check = predict(program, SR, found.params)
+        assert check.lufs_i == pytest.approx(-12.0, abs=0.5)
+        assert check.true_peak_dbtp <= -1.0
+        assert check.lufs_i == pytest.approx(found.prediction.lufs_i, abs=1e-6)
+
+    def test_offset_shifts_the_target(self, program):
+        """Test that a measured +1 LU model error makes the search aim 1 LU lower."""
+        start = ChainParams(threshold_db=-20.0, makeup_db=3.0)
+        found = search_chain(program, SR, start, target_lufs=-12.0, tp_limit_dbtp=-1.0, lufs_offset=1.0)
+        assert predict(program, SR, found.params).lufs_i == pytest.approx(-13.0, abs=0.5)
+        assert found.params.saturator_drive_db is None
+
+    def test_glue_moves_when_limiter_gain_runs_out(self, program):
+        """Test that lower threshold / more makeup reaches a target the limiter range can't."""
+        start = ChainParams(threshold_db=-20.0)
+        found = search_chain(program, SR, start, target_lufs=-18.0, tp_limit_dbtp=-1.0, gain_range=(-6.0, 6.0))
+        assert found.reached_target
+        assert found.params.threshold_db < -20.0 and found.params.makeup_db > 0.0
+        assert predict(program, SR, found.params).lufs_i == pytest.approx(-18.0, abs=0.5)
+
+    def test_out_of_reach_returns_closest(self, program):
+        """Test that an unreachable target reports the closest safe candidate."""
+        start = ChainParams(threshold_db=-20.0)
+        found = search_chain(program, SR, start, target_lufs=-3.0, tp_limit_dbtp=-1.0, gain_range=(-6.0, 6.0))
+        assert not found.reached_target
+        assert found.params.limiter_gain_db == 6.0
+        assert found.prediction.true_peak_dbtp <= -1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""Unit tests for fake_live.py - stand-in AbletonOSC server."""
+import json
+import time
+import pytest
+from flaas.fake_live import FakeAbletonOSC, FakeLiveSet, NetworkModel
+from flaas.observe import ParamMirror
+from flaas.osc_rpc import OscSession, request_many
+from flaas.param_batch import ParamBatch
+from flaas.scan import scan_live
+
+
+
+class TestFakeLiveSet:
+    """Test fixture loading."""
+
+    def test_bundled_fixture(self):
+        """Test the default set has the stock master chain."""
+        s = FakeLiveSet.load()
+        assert [d.name for d in s.master.devices] == ["Utility", "EQ Eight", "Glue Compressor", "Saturator", "Limiter"]
+        assert s.param(-1000, 0, 9).name == "Gain"
+
+    def test_custom_fixture(self, tmp_path):
+        """Test loading a minimal JSON set."""
+        path = tmp_path / "set.json"
+        path.write_text(json.dumps({
+            "tracks": [{"name": "A", "devices": [{"name": "Limiter", "parameters": [{"name": "Gain", "min": -24, "max": 24}]}]}],
+        }))
+        s = FakeLiveSet.load(path)
+        assert s.device(0, 0).class_name == "Limiter"
+        assert s.master.devices == []
+        with pytest.raises(KeyError):
+            s.param(0, 0, 5)
+
+
+class TestFakeAbletonOSC:
+    """Test the endpoints FLAAS depends on."""
+
+    def test_scan_live(self, fake_live):
+        """Test a full scan against the fake set."""
+        fake, session = fake_live
+        res = scan_live(fake.target, listen_port=session.listen_port)
+        assert [t.name for t in res.tracks] == [t.name for t in fake.live_set.tracks]
+        assert res.tracks[3].num_devices == 3
+
+    def test_device_and_param_queries(self, fake_live):
+        """Test name resolution and parameter tables on the master track."""
+        fake, session = fake_live
+        assert session.request("/live/track/get/devices/name", [-1000])[1:].index("Limiter") == 4
+        names, mins, maxs = request_many(fake.target, [
+            ("/live/device/get/parameters/name", [-1000, 4]),
+            ("/live/device/get/parameters/min", [-1000, 4]),
+            ("/live/device/get/parameters/max", [-1000, 4]),
+        ], listen_port=session.listen_port)
+        assert names[2:4] == ("Device On", "Gain")
+        assert mins[3] == pytest.approx(-24.0) and maxs[3] == pytest.approx(24.0)
+
+    def test_set_clamps_and_quantizes(self, fake_live):
+        """Test that writes land in the set, clamped to range and rounded when quantized."""
+        fake, session = fake_live
+        with ParamBatch(fake.target, throttle_ms=0, listen_port=session.listen_port) as batch:
+            batch.add("/live/device/set/parameter/value", [-1000, 4, 1, 99.0])
+            batch.add("/live/device/set/parameter/value", [-1000, 2, 3, 1.4])
+        resp = session.request("/live/device/get/parameters/value", [-1000, 4])
+        assert resp[3] == pytest.approx(24.0)
+        assert fake.live_set.param(-1000, 2, 3).value == 1.0
+
+    def test_listeners_push_changes(self, fake_live):
+        """Test that start_listen pushes the current value and later changes."""
+        fake, session = fake_live
+        with ParamMirror.for_session(session) as mirror:
+            assert mirror.watch(-1000, 0, 9) == pytest.approx(0.5)
+            fake.set_param(-1000, 0, 9, 0.25)
+            assert mirror.wait_for(-1000, 0, 9, 0.25, timeout_sec=1.0) == pytest.approx(0.25)
+        assert fake.stats.pushes >= 2
+
+    def test_unknown_requests_get_no_reply(self, fake_live):
+        """Test that a bad track id is counted and left unanswered."""
+        fake, session = fake_live
+        with pytest.raises(TimeoutError):
+            session.request("/live/track/get/name", [99], timeout_sec=0.2)
+        assert fake.stats.unknown == 1
+
+
+class TestNetworkModel:
+    """Test injected latency and loss."""
+
+    def test_latency(self, free_port):
+        """Test that a round trip takes at least the configured latency."""
+        with FakeAbletonOSC(reply_port=free_port, network=NetworkModel(latency_ms=30)) as fake:
+            with OscSession(fake.target, listen_port=free_port) as session:
+                session.request("/live/test", "ok")  # bind
+                t0 = time.perf_counter()
+                session.request("/live/song/get/num_tracks", None)
+                assert (time.perf_counter() - t0) * 1000.0 >= 25.0
+
+    def test_jitter_reorders_but_delivers(self, free_port):
+        """Test that jittered replies still correlate to their requests."""
+        with FakeAbletonOSC(reply_port=free_port, network=NetworkModel(latency_ms=5, jitter_ms=5, seed=1)) as fake:
+            resp = request_many(fake.target, [("/live/track/get/name", [i]) for i in range(5)], listen_port=free_port)
+        assert [r[1] for r in resp] == [t.name for t in fake.live_set.tracks]
+
+    def test_total_loss_times_out(self, free_port):
+        """Test that dropped replies surface as timeouts and are counted."""
+        with FakeAbletonOSC(reply_port=free_port, network=NetworkModel(loss=1.0)) as fake:
+            with OscSession(fake.target, listen_port=free_port) as session:
+                with pytest.raises(TimeoutError):
+                    session.request("/live/test", "ok", timeout_sec=0.2)
+        assert fake.stats.dropped == 1 and fake.stats.replies == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
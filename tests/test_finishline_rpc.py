@@ -0,0 +1,92 @@
+"""Unit tests for finishline_audio.osc.rpc - pipelined request/response."""
+import threading
+import pytest
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import ThreadingOSCUDPServer
+from pythonosc.udp_client import SimpleUDPClient
+from finishline_audio.osc.rpc import OscConfig, OscRpc
+
+
+
+@pytest.fixture
+def live(free_port):
+    """Fake AbletonOSC: holds requests until `n` arrive, then replies in reverse order."""
+    port_out = free_port
+    reply = SimpleUDPClient("127.0.0.1", port_out)
+    held, received = [], []
+    state = {"n": 1, "drop_first": 0}
+
+    def _handler(address, *args):
+        received.append(address)
+        if state["drop_first"] > 0:
+            state["drop_first"] -= 1
+            return
+        held.append((address, args))
+        if len(held) >= state["n"]:
+            for addr, a in reversed(held):
+                reply.send_message(addr, list(a) + [f"{addr}:{a}"])
+            held.clear()
+
+    disp = Dispatcher()
+    disp.set_default_handler(_handler)
+    server = ThreadingOSCUDPServer(("127.0.0.1", 0), disp)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    rpc = OscRpc(OscConfig(host="127.0.0.1", port_in=server.server_address[1], port_out=port_out,
+                           timeout_s=0.3, retries=1))
+    rpc.start()
+    yield rpc, state, received
+    rpc.stop()
+    server.shutdown()
+    server.server_close()
+
+
+class TestOscRpc:
+    """Test futures API and reply correlation."""
+
+    def test_call_single(self, live):
+        """Test the plain blocking call."""
+        rpc, _, _ = live
+        assert rpc.call("/live/test") == ("/live/test:()",)
+
+    def test_call_many_correlates_reversed_replies(self, live):
+        """Test that four device queries resolve correctly from reversed replies."""
+        rpc, state, _ = live
+        addrs = ["/live/device/get/parameters/" + a for a in ("name", "min", "max", "is_quantized")]
+        state["n"] = 4
+        got = rpc.call_many([(a, [0, 3]) for a in addrs])
+        assert got == [(0, 3, f"{a}:(0, 3)") for a in addrs]
+
+    def test_same_address_matched_by_ids(self, live):
+        """Test that concurrent queries on one address are told apart by leading args."""
+        rpc, state, _ = live
+        state["n"] = 3
+        futs = [rpc.submit("/live/track/get/name", t) for t in (5, 6, 7)]
+        assert [f.result(timeout=1.0)[0] for f in futs] == [5, 6, 7]
+
+    def test_retry_resends_unanswered(self, live):
+        """Test that a dropped request is resent and then answered."""
+        rpc, state, received = live
+        state["drop_first"] = 1
+        assert rpc.call("/live/song/get/tempo")[0] == "/live/song/get/tempo:()"
+        assert received.count("/live/song/get/tempo") == 2
+
+    def test_timeout_and_cancellation(self, live):
+        """Test that timed-out futures are cancelled and no longer pending."""
+        rpc, state, _ = live
+        state["n"] = 99
+        with pytest.raises(TimeoutError, match="/never"):
+            rpc.call("/never", 1)
+        assert not any(rpc._pending.values())
+
+    def test_stop_fails_pending(self, live):
+        """Test that stopping the RPC fails in-flight futures."""
+        rpc, state, _ = live
+        state["n"] = 99
+        fut = rpc.submit("/live/test")
+        rpc.stop()
+        with pytest.raises(ConnectionError):
+            fut.result(timeout=1.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
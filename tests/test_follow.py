@@ -0,0 +1,96 @@
+"""Unit tests for follow.py - metering a WAV while it is written."""
+import struct
+import pytest
+import numpy as np
+import soundfile as sf
+from flaas.analyze import analyze_wav
+from flaas.follow import FollowingMeter
+
+
+@pytest.fixture
+def finished_wav(tmp_path):
+    """A complete 5 s stereo 24-bit WAV to replay as a growing export."""
+    rng = np.random.default_rng(3)
+    t = np.arange(5 * 48000) / 48000
+    x = 0.4 * np.sin(2 * np.pi * 220 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 0.3 * t))
+    audio = np.stack([x, x + 0.01 * rng.standard_normal(len(x))], axis=1)
+    path = tmp_path / "finished.wav"
+    sf.write(path, audio, 48000, subtype="PCM_24")
+    return path
+
+
+def _data_offset(data: bytes) -> int:
+    pos = 12
+    while True:
+        cid, size = struct.unpack("<4sI", data[pos:pos + 8])
+        if cid == b"data":
+            return pos + 8
+        pos += 8 + size + (size & 1)
+
+
+def _write_growing(src: bytes, dst, cut: int) -> None:
+    """Write src[:cut] with the data chunk size zeroed, like a writer that patches it last."""
+    off = _data_offset(src)
+    head = bytearray(src[:off])
+    head[off - 4:off] = struct.pack("<I", 0)
+    dst.write_bytes(bytes(head) + src[off:cut])
+
+
+class TestFollowingMeter:
+    """Test incremental metering against whole-file analysis."""
+
+    def test_matches_analyze_after_growth(self, finished_wav, tmp_path):
+        """Test that following a growing file gives the same result as analyze_wav."""
+        src = finished_wav.read_bytes()
+        out = tmp_path / "export.wav"
+        follower = FollowingMeter(out, block_size=4096)
+        assert follower.poll() == 0  # not created yet
+
+        off = _data_offset(src)
+        for cut in np.linspace(off, len(src), 7).astype(int)[1:-1]:
+            _write_growing(src, out, int(cut))
+            follower.poll()
+            assert follower.frames_done == (int(cut) - off) // 6
+
+        out.write_bytes(src)  # writer finalizes the header
+        res = follower.finish()
+        ref = analyze_wav(finished_wav)
+        assert res.samples == ref.samples
+        assert res.lufs_i == pytest.approx(ref.lufs_i, abs=1e-6)
+        assert res.true_peak_dbtp == pytest.approx(ref.true_peak_dbtp, abs=1e-6)
+        assert res.lra == pytest.approx(ref.lra, abs=1e-6)
+
+    def test_partial_metrics_available(self, finished_wav, tmp_path):
+        """Test that partial loudness/true peak are reported mid-export."""
+        src = finished_wav.read_bytes()
+        out = tmp_path / "export.wav"
+        follower = FollowingMeter(out)
+        _write_growing(src, out, len(src) // 2)
+        follower.poll()
+        assert follower.seconds == pytest.approx(2.5, abs=0.01)
+        assert follower.partial_lufs_i() is not None
+        assert follower.partial_true_peak_dbtp() <= 0.0
+
+    def test_replaced_file_restarts(self, finished_wav, tmp_path):
+        """Test that a deleted and re-created export is metered from scratch."""
+        src = finished_wav.read_bytes()
+        out = tmp_path / "export.wav"
+        follower = FollowingMeter(out)
+        _write_growing(src, out, len(src) // 2)
+        follower.poll()
+        out.unlink()
+        follower.poll()
+        assert follower.frames_done == 0
+        sf.write(out, np.zeros((48000, 2)), 48000)
+        res = follower.finish()
+        assert res.samples == 48000
+        assert res.lufs_i == -float("inf")
+
+    def test_finish_without_polling(self, finished_wav):
+        """Test that finish() alone analyzes the complete file (manual export path)."""
+        res = FollowingMeter(finished_wav).finish()
+        assert res.lufs_i == pytest.approx(analyze_wav(finished_wav).lufs_i, abs=1e-6)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
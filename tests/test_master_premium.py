@@ -2,14 +2,13 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from flaas.master_premium import (
-    resolve_device_id_by_name,
-    resolve_device_params,
     set_param_normalized,
     db_to_normalized,
     compute_sha256,
     master_premium
 )
 from flaas.osc_rpc import OscTarget
+from flaas.registry import resolve_device_id_by_name, resolve_device_params
 from pathlib import Path
 import tempfile
 
@@ -17,7 +16,7 @@ import tempfile
 class TestResolveDeviceIdByName:
     """Test device ID resolution by name."""
     
-    @patch("flaas.master_premium.request_once")
+    @patch("flaas.registry.request_once")
     def test_resolve_first_device(self, mock_request):
         """Test resolving first device in chain."""
         mock_request.return_value = (-1000, "Utility", "EQ Eight", "Limiter")
@@ -25,7 +24,7 @@ class TestResolveDeviceIdByName:
         device_id = resolve_device_id_by_name(-1000, "Utility")
         assert device_id == 0
     
-    @patch("flaas.master_premium.request_once")
+    @patch("flaas.registry.request_once")
     def test_resolve_middle_device(self, mock_request):
         """Test resolving middle device in chain."""
         mock_request.return_value = (-1000, "Utility", "EQ Eight", "Limiter")
@@ -33,7 +32,7 @@ class TestResolveDeviceIdByName:
         device_id = resolve_device_id_by_name(-1000, "EQ Eight")
         assert device_id == 1
     
-    @patch("flaas.master_premium.request_once")
+    @patch("flaas.registry.request_once")
     def test_resolve_case_insensitive(self, mock_request):
         """Test case-insensitive device resolution."""
         mock_request.return_value = (-1000, "Utility", "EQ Eight")
@@ -41,15 +40,15 @@ class TestResolveDeviceIdByName:
         device_id = resolve_device_id_by_name(-1000, "utility")
         assert device_id == 0
     
-    @patch("flaas.master_premium.request_once")
+    @patch("flaas.registry.request_once")
     def test_resolve_partial_match(self, mock_request):
         """Test partial name matching."""
         mock_request.return_value = (-1000, "Waves C6 Stereo", "Waves SSL")
         
-        device_id = resolve_device_id_by_name(-1000, "C6")
+        device_id = resolve_device_id_by_name(-1000, "C6", partial=True)
         assert device_id == 0
     
-    @patch("flaas.master_premium.request_once")
+    @patch("flaas.registry.request_once")
     def test_device_not_found_raises_error(self, mock_request):
         """Test that missing device raises RuntimeError."""
         mock_request.return_value = (-1000, "Utility", "EQ Eight")
@@ -61,14 +60,14 @@ class TestResolveDeviceIdByName:
 class TestResolveDeviceParams:
     """Test device parameter resolution."""
     
-    @patch("flaas.master_premium.request_once")
+    @patch("flaas.registry.request_many")
     def test_resolve_params_returns_dict(self, mock_request):
         """Test that resolve_device_params returns a dict."""
-        mock_request.side_effect = [
+        mock_request.return_value = [
             (-1000, 0, "Param1", "Param2"),  # names
-            (-1000, 0, 0.0, 0.5),             # values
             (-1000, 0, 0.0, 0.0),             # mins
-            (-1000, 0, 1.0, 1.0)              # maxs
+            (-1000, 0, 1.0, 1.0),             # maxs
+            (-1000, 0, 0, 0),                 # is_quantized
         ]
         
         params = resolve_device_params(-1000, 0)
@@ -76,20 +75,22 @@ class TestResolveDeviceParams:
         assert isinstance(params, dict)
         assert len(params) >= 1
     
-    @patch("flaas.master_premium.request_once")
+    @patch("flaas.registry.request_many")
     def test_params_have_required_keys(self, mock_request):
         """Test that params have required structure."""
-        mock_request.side_effect = [
+        mock_request.return_value = [
             (-1000, 0, "Gain"),
-            (-1000, 0, 0.5),
             (-1000, 0, 0.0),
-            (-1000, 0, 1.0)
+            (-1000, 0, 1.0),
+            (-1000, 0, 0),
         ]
         
         params = resolve_device_params(-1000, 0)
         
         # Should have at least one param
         assert len(params) > 0
+        # One batched call for names/mins/maxs/is_quantized
+        assert mock_request.call_count == 1
         # Each param should have metadata
         for param_name, param_data in params.items():
             assert isinstance(param_data, dict)
@@ -98,7 +99,7 @@ class TestResolveDeviceParams:
 class TestSetParamNormalized:
     """Test normalized parameter setting."""
     
-    @patch("flaas.master_premium.SimpleUDPClient")
+    @patch("flaas.osc_rpc.SimpleUDPClient")
     def test_set_param_sends_osc_message(self, mock_client_class):
         """Test that set_param sends OSC message."""
         mock_client = MagicMock()
@@ -111,7 +112,7 @@ class TestSetParamNormalized:
         args = mock_client.send_message.call_args[0]
         assert args[0] == "/live/device/set/parameter/value"
     
-    @patch("flaas.master_premium.SimpleUDPClient")
+    @patch("flaas.osc_rpc.SimpleUDPClient")
     def test_set_param_clamps_to_valid_range(self, mock_client_class):
         """Test that values are clamped to [0, 1]."""
         mock_client = MagicMock()
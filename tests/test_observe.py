@@ -0,0 +1,98 @@
+"""Unit tests for observe.py - push-based parameter mirror."""
+import time
+import pytest
+from flaas.observe import ParamMirror, read_param_value
+from flaas.param_batch import ParamBatch
+
+GAIN = (-1000, 0, 9)   # master Utility "Gain" (-1..1, 0.5 in the bundled set)
+WIDTH = (-1000, 0, 4)  # master Utility "Stereo Width" (1.0)
+
+
+@pytest.fixture
+def live(fake_live):
+    """Bundled fake Live plus an open session and mirror on its reply port."""
+    fake, session = fake_live
+    with ParamMirror.for_session(session) as mirror:
+        yield fake, session, mirror
+
+
+class TestParamMirror:
+    """Test subscription, local reads and drift detection."""
+
+    def test_watch_seeds_and_subscribes(self, live):
+        """Test that watch() starts a listener and returns the current value."""
+        fake, _, mirror = live
+        assert mirror.watch(*GAIN) == pytest.approx(0.5)
+        assert GAIN in fake.listening
+        assert mirror.is_watching(*GAIN)
+
+    def test_reads_are_local(self, live):
+        """Test that read_param_value() makes no round trip for a watched parameter."""
+        fake, session, mirror = live
+        mirror.watch(*GAIN)
+        n = fake.stats.by_address["/live/device/get/parameter/value"]
+        for _ in range(5):
+            assert read_param_value(*GAIN, session.target, listen_port=session.listen_port) == pytest.approx(0.5)
+        assert fake.stats.by_address["/live/device/get/parameter/value"] == n
+
+    def test_unwatched_falls_back_to_request(self, live):
+        """Test that an unwatched parameter is still read over OSC."""
+        fake, session, _ = live
+        assert read_param_value(*WIDTH, session.target, listen_port=session.listen_port) == pytest.approx(1.0)
+        assert fake.stats.by_address["/live/device/get/parameter/value"] == 1
+
+    def test_own_write_is_not_drift(self, live):
+        """Test that a write announced through ParamBatch lands without a drift report."""
+        fake, session, mirror = live
+        mirror.watch(*GAIN)
+        with ParamBatch(session.target, throttle_ms=0, listen_port=session.listen_port) as batch:
+            batch.set(*GAIN, 0.7)
+        assert read_param_value(*GAIN, session.target, listen_port=session.listen_port) == pytest.approx(0.7)
+        assert mirror.drift == []
+
+    def test_external_change_is_drift(self, live):
+        """Test that a knob touched outside our writes fires the drift callback."""
+        fake, _, mirror = live
+        seen = []
+        changes = []
+        mirror.on_drift(seen.append)
+        mirror.on_change(changes.append)
+        mirror.watch(*GAIN)
+        fake.set_param(*GAIN, 0.9)
+        assert mirror.wait_for(*GAIN, 0.9, timeout_sec=1.0) == pytest.approx(0.9)
+        deadline = time.monotonic() + 1.0
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [c.new for c in seen] == [pytest.approx(0.9)]
+        assert seen[0].expected == pytest.approx(0.5)
+        assert changes[-1].old == pytest.approx(0.5)
+
+    def test_wait_for_timeout(self, live):
+        """Test that waiting for a value that never arrives raises TimeoutError."""
+        _, _, mirror = live
+        mirror.watch(*GAIN)
+        with pytest.raises(TimeoutError, match="expected 0.800000"):
+            mirror.wait_for(*GAIN, 0.8, timeout_sec=0.1)
+
+    def test_close_stops_listeners(self, live):
+        """Test that closing the mirror unsubscribes and detaches it from the session."""
+        fake, session, mirror = live
+        mirror.watch(*GAIN)
+        mirror.close()
+        deadline = time.monotonic() + 1.0
+        while fake.listening and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert fake.listening == set()
+        assert "param_mirror" not in session.memo
+
+    def test_devices_seen_on_session(self, live):
+        """Test that a devices/name reply is mirrored and reused."""
+        fake, session, mirror = live
+        session.request("/live/track/get/devices/name", [0])
+        n = fake.stats.requests
+        assert mirror.devices(0) == ["EQ Eight", "Glue Compressor"]
+        assert fake.stats.requests == n
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
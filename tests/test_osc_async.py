@@ -0,0 +1,130 @@
+"""Unit tests for osc_async.py - asyncio OSC client."""
+import asyncio
+import threading
+import pytest
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import ThreadingOSCUDPServer
+from pythonosc.udp_client import SimpleUDPClient
+from flaas.osc_async import AsyncOscClient
+from flaas.osc_rpc import OscTarget
+
+
+
+@pytest.fixture
+def live(free_port):
+    """Fake AbletonOSC: holds `n` requests, then answers them in reverse order; "/silent" is ignored."""
+    reply_port = free_port
+    reply = SimpleUDPClient("127.0.0.1", reply_port)
+    held = []
+    lock = threading.Lock()
+    state = {"n": 1}
+
+    def _handler(address, *args):
+        if address == "/silent":
+            return
+        with lock:
+            held.append((address, args))
+            if len(held) < state["n"]:
+                return
+            batch = list(reversed(held))
+            held.clear()
+        for addr, a in batch:
+            reply.send_message(addr, list(a) + ["reply"])
+
+    disp = Dispatcher()
+    disp.set_default_handler(_handler)
+    server = ThreadingOSCUDPServer(("127.0.0.1", 0), disp)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield OscTarget(host="127.0.0.1", port=server.server_address[1]), reply_port, state
+    server.shutdown()
+    server.server_close()
+
+
+class TestAsyncOscClient:
+    """Test async calls, correlation, timeouts and shutdown."""
+
+    def test_call_roundtrip(self, live):
+        """Test a single awaited call."""
+        target, reply_port, _ = live
+
+        async def main():
+            async with AsyncOscClient(target, reply_port) as rpc:
+                return await rpc.call("/live/test", [1], timeout_sec=1.0)
+
+        assert asyncio.run(main()) == (1, "reply")
+
+    def test_gather_correlates_reversed_replies(self, live):
+        """Test asyncio.gather over many queries answered out of order."""
+        target, reply_port, state = live
+        state["n"] = 6
+
+        async def main():
+            async with AsyncOscClient(target, reply_port) as rpc:
+                return await asyncio.gather(*(
+                    rpc.call("/live/device/get/name", [0, d], timeout_sec=1.0) for d in range(6)
+                ))
+
+        assert asyncio.run(main()) == [(0, d, "reply") for d in range(6)]
+
+    def test_call_many(self, live):
+        """Test the batched helper keeps request order."""
+        target, reply_port, state = live
+        state["n"] = 2
+
+        async def main():
+            async with AsyncOscClient(target, reply_port) as rpc:
+                return await rpc.call_many([("/a", [1]), ("/b", [2])], timeout_sec=1.0)
+
+        assert asyncio.run(main()) == [(1, "reply"), (2, "reply")]
+
+    def test_timeout_is_per_request(self, live):
+        """Test that one silent query times out without affecting the others."""
+        target, reply_port, _ = live
+
+        async def main():
+            async with AsyncOscClient(target, reply_port) as rpc:
+                res = await asyncio.gather(
+                    rpc.call("/silent", [1], timeout_sec=0.1),
+                    rpc.call("/live/test", [2], timeout_sec=1.0),
+                    return_exceptions=True,
+                )
+                return res, rpc._pending
+
+        (silent, ok), pending = asyncio.run(main())
+        assert isinstance(silent, TimeoutError)
+        assert ok == (2, "reply")
+        assert not any(pending.values())
+
+    def test_cancelled_call_is_forgotten(self, live):
+        """Test that cancelling the awaiting task removes its pending entry."""
+        target, reply_port, _ = live
+
+        async def main():
+            async with AsyncOscClient(target, reply_port) as rpc:
+                task = asyncio.create_task(rpc.call("/silent", [1], timeout_sec=5.0))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                return rpc._pending
+
+        assert not any(asyncio.run(main()).values())
+
+    def test_close_fails_in_flight(self, live):
+        """Test that shutdown fails outstanding calls instead of leaving them hanging."""
+        target, reply_port, _ = live
+
+        async def main():
+            rpc = await AsyncOscClient(target, reply_port).start()
+            task = asyncio.create_task(rpc.call("/silent", [1], timeout_sec=5.0))
+            await asyncio.sleep(0.05)
+            await rpc.close()
+            with pytest.raises(ConnectionError):
+                await task
+            assert not rpc.is_open
+
+        asyncio.run(main())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
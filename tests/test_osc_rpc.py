@@ -1,8 +1,34 @@
 """Unit tests for osc_rpc.py - OSC request/response."""
 import pytest
+import threading
 import time
 from unittest.mock import patch, MagicMock
-from flaas.osc_rpc import OscTarget, request_once
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import ThreadingOSCUDPServer
+from pythonosc.udp_client import SimpleUDPClient
+from flaas.osc_rpc import OscSession, OscTarget, active_session, client_for, osc_session, request_many, request_once
+
+
+@pytest.fixture
+def echo_server(free_port):
+    """Loopback OSC server that echoes every message back to a reply port."""
+    reply_port = free_port
+    reply = SimpleUDPClient("127.0.0.1", reply_port)
+    received = []
+
+    def _echo(address, *args):
+        received.append((address, args))
+        if address != "/silent":
+            reply.send_message(address, list(args))
+
+    disp = Dispatcher()
+    disp.set_default_handler(_echo)
+    server = ThreadingOSCUDPServer(("127.0.0.1", 0), disp)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    target = OscTarget(host="127.0.0.1", port=server.server_address[1])
+    yield target, reply_port, received
+    server.shutdown()
+    server.server_close()
 
 
 class TestOscTarget:
@@ -100,5 +126,134 @@ class TestRequestOnce:
                 assert args[0][1] == 12345  # Port in (host, port) tuple
 
 
+@pytest.fixture
+def reversing_server(free_port):
+    """Loopback server that holds `n` requests, then answers them in reverse order."""
+    reply_port = free_port
+    reply = SimpleUDPClient("127.0.0.1", reply_port)
+    held = []
+    state = {"n": 1}
+
+    def _hold(address, *args):
+        held.append((address, args))
+        if len(held) >= state["n"]:
+            for addr, a in reversed(held):
+                reply.send_message(addr, list(a) + ["reply"])
+            held.clear()
+
+    disp = Dispatcher()
+    disp.set_default_handler(_hold)
+    server = ThreadingOSCUDPServer(("127.0.0.1", 0), disp)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    target = OscTarget(host="127.0.0.1", port=server.server_address[1])
+    yield target, reply_port, state
+    server.shutdown()
+    server.server_close()
+
+
+class TestPipelining:
+    """Test many requests in flight with replies correlated by address + leading args."""
+
+    def test_request_many_out_of_order(self, reversing_server):
+        """Test that reversed replies still land on the right requests."""
+        target, reply_port, state = reversing_server
+        reqs = [
+            ("/live/device/get/parameters/name", [0, 1]),
+            ("/live/device/get/parameters/min", [0, 1]),
+            ("/live/device/get/parameters/max", [0, 1]),
+            ("/live/device/get/parameters/is_quantized", [0, 1]),
+        ]
+        state["n"] = len(reqs)
+        with OscSession(target, listen_port=reply_port):
+            got = request_many(target, reqs, listen_port=reply_port, timeout_sec=1.0)
+        assert got == [(0, 1, "reply")] * 4
+
+    def test_same_address_different_ids(self, reversing_server):
+        """Test that the same query for different devices is told apart by its ids."""
+        target, reply_port, state = reversing_server
+        state["n"] = 3
+        with OscSession(target, listen_port=reply_port) as s:
+            futs = [s.submit("/live/device/get/name", [2, d]) for d in range(3)]
+            assert [f.result(timeout=1.0) for f in futs] == [(2, d, "reply") for d in range(3)]
+
+    def test_timeout_names_missing_addresses(self, reversing_server):
+        """Test that a partial batch times out and reports what is missing."""
+        target, reply_port, state = reversing_server
+        state["n"] = 10
+        with pytest.raises(TimeoutError, match="/x, /y"):
+            request_many(target, [("/x", [1]), ("/y", [1])], listen_port=reply_port, timeout_sec=0.2)
+
+
+class TestOscSession:
+    """Test the persistent session against a loopback echo server."""
+
+    def test_request_roundtrip(self, echo_server):
+        """Test that a session request returns the echoed args."""
+        target, reply_port, _ = echo_server
+        with OscSession(target, listen_port=reply_port) as s:
+            assert s.request("/live/test", ["ok"], timeout_sec=1.0) == ("ok",)
+
+    def test_single_bind_for_many_requests(self, echo_server):
+        """Test that request_once inside a session never binds its own server."""
+        target, reply_port, _ = echo_server
+        with OscSession(target, listen_port=reply_port) as s:
+            s.open()
+            with patch("flaas.osc_rpc.ThreadingOSCUDPServer") as per_call:
+                for i in range(50):
+                    assert request_once(target, "/live/track/get/name", [i], listen_port=reply_port, timeout_sec=1.0) == (i,)
+                per_call.assert_not_called()
+
+    def test_lazy_bind(self, echo_server):
+        """Test that entering a session does not bind until first use."""
+        target, reply_port, _ = echo_server
+        with OscSession(target, listen_port=reply_port) as s:
+            assert not s.is_open
+            s.send("/live/test", 1)
+            assert s.is_open
+        assert not s.is_open
+
+    def test_timeout(self, echo_server):
+        """Test that a missing reply raises TimeoutError and the session stays usable."""
+        target, reply_port, _ = echo_server
+        with OscSession(target, listen_port=reply_port) as s:
+            with pytest.raises(TimeoutError):
+                s.request("/silent", 1, timeout_sec=0.1)
+            assert s.request("/live/test", [7], timeout_sec=1.0) == (7,)
+
+    def test_concurrent_requests_different_addresses(self, echo_server):
+        """Test that threads sharing a session get their own replies."""
+        target, reply_port, _ = echo_server
+        results = {}
+        with OscSession(target, listen_port=reply_port) as s:
+            def _worker(i):
+                results[i] = s.request(f"/addr/{i}", [i], timeout_sec=2.0)
+            threads = [threading.Thread(target=_worker, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert results == {i: (i,) for i in range(8)}
+
+    def test_active_session_matching(self, echo_server):
+        """Test that only a session for the same target/listen port is picked up."""
+        target, reply_port, _ = echo_server
+        assert active_session(target, reply_port) is None
+        with OscSession(target, listen_port=reply_port) as s:
+            assert active_session(target, reply_port) is s
+            assert active_session(OscTarget(port=1), reply_port) is None
+            with osc_session(target, reply_port) as inner:
+                assert inner is s
+        assert active_session(target, reply_port) is None
+
+    def test_client_for_uses_active_session(self, echo_server):
+        """Test that client_for() reuses the session client and falls back to a fresh one."""
+        target, reply_port, _ = echo_server
+        with OscSession(target, listen_port=reply_port) as s:
+            assert client_for(target, reply_port) is s.client
+        with patch("flaas.osc_rpc.SimpleUDPClient") as mock:
+            client_for(target, reply_port)
+        mock.assert_called_once_with(target.host, target.port)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
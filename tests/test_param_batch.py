@@ -0,0 +1,184 @@
+"""Unit tests for param_batch.py - bundled parameter writes."""
+import socket
+import pytest
+from pythonosc.osc_packet import OscPacket
+from flaas.config import FlaasConfig, load_config
+from flaas.osc_rpc import OscSession, OscTarget
+from flaas.param_batch import SET_PARAM_ADDRESS, ParamBatch, ParamVerifyError, verify_writes
+from flaas.param_map import DeviceParamTable, get_param_table
+
+
+@pytest.fixture
+def receiver():
+    """Raw UDP socket standing in for AbletonOSC; returns (target, recv)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.5)
+
+    def recv_all():
+        out = []
+        while True:
+            try:
+                data, _ = sock.recvfrom(65536)
+            except socket.timeout:
+                return out
+            out.append(data)
+            sock.settimeout(0.1)
+
+    yield OscTarget(host="127.0.0.1", port=sock.getsockname()[1]), recv_all
+    sock.close()
+
+
+
+def _messages(dgram):
+    return [(m.message.address, m.message.params) for m in OscPacket(dgram).messages]
+
+
+class TestParamBatch:
+    """Test batching, coalescing, splitting and throttling."""
+
+    def test_chain_is_one_datagram(self, receiver):
+        """Test that a six-parameter chain goes out as a single bundle."""
+        target, recv = receiver
+        batch = ParamBatch(target, throttle_ms=0)
+        for pid in range(6):
+            batch.set(-1000, pid // 3, pid, pid / 10)
+        report = batch.flush()
+        got = recv()
+        assert (report.messages, report.bundles) == (6, 1)
+        assert len(got) == 1 and report.bytes == len(got[0])
+        msgs = _messages(got[0])
+        assert [m[0] for m in msgs] == [SET_PARAM_ADDRESS] * 6
+        assert msgs[4][1] == [-1000, 1, 4, pytest.approx(0.4)]
+
+    def test_last_write_wins_and_clamps(self, receiver):
+        """Test that repeated writes to one parameter coalesce and values are clamped."""
+        target, recv = receiver
+        batch = ParamBatch(target, throttle_ms=0)
+        batch.set(0, 1, 2, 0.3)
+        batch.set(0, 1, 2, 1.7)
+        assert len(batch) == 1
+        batch.flush()
+        assert _messages(recv()[0]) == [(SET_PARAM_ADDRESS, [0, 1, 2, 1.0])]
+
+    def test_splits_and_throttles(self, receiver):
+        """Test that oversized batches split into bundles spaced by throttle_ms."""
+        target, recv = receiver
+        batch = ParamBatch(target, throttle_ms=30, max_bundle_bytes=512)
+        for pid in range(40):
+            batch.set(0, 0, pid, 0.5)
+        report = batch.flush()
+        got = recv()
+        assert report.bundles == len(got) > 1
+        assert sum(len(_messages(d)) for d in got) == 40
+        assert all(len(d) <= 512 for d in got)
+        assert report.elapsed_ms >= 30 * (report.bundles - 1)
+
+    def test_empty_flush_sends_nothing(self, receiver):
+        """Test that flushing an empty batch is a no-op with a zero report."""
+        target, recv = receiver
+        report = ParamBatch(target).flush()
+        assert (report.messages, report.bundles, report.bytes) == (0, 0, 0)
+        assert recv() == []
+
+    def test_context_manager_flushes(self, receiver):
+        """Test that leaving the block sends the queued writes and records the report."""
+        target, recv = receiver
+        with ParamBatch(target, throttle_ms=0) as batch:
+            batch.set(0, 0, 0, 0.1)
+        assert len(recv()) == 1
+        assert batch.reports[-1].messages == 1
+
+    def test_uses_session_client(self, receiver, free_port):
+        """Test that an active OscSession's client is reused."""
+        target, recv = receiver
+        port = free_port
+        with OscSession(target, listen_port=port) as s:
+            batch = ParamBatch(target, throttle_ms=0, listen_port=port)
+            batch.set(0, 0, 0, 0.1)
+            batch.flush()
+            assert s.is_open
+            assert batch._client is None
+        assert len(recv()) == 1
+
+    def test_throttle_from_config(self, tmp_path):
+        """Test that debug.throttle_ms is read from config.yaml."""
+        pytest.importorskip("yaml")
+        cfg = tmp_path / "config.yaml"
+        cfg.write_text("debug:\n  throttle_ms: 40\n")
+        assert load_config(cfg).throttle_ms == 40.0
+        assert load_config(tmp_path / "missing.yaml").throttle_ms == 25.0
+        cfg.write_text("debug:\n  verify_after_set: false\n")
+        assert load_config(cfg).verify_after_set is False
+
+
+class TestCommit:
+    """Test write-then-verify transactions."""
+
+    def test_one_readback_per_device(self, fake_live):
+        """Test that writes on two devices verify with one values query each (tables fetched alongside)."""
+        fake, session = fake_live
+        batch = ParamBatch(fake.target, throttle_ms=0, listen_port=session.listen_port)
+        eq_gains = [5, 9, 13]
+        for pid in eq_gains:
+            batch.set_value(0, 0, pid, 0.0)
+        batch.set_value(-1000, 4, 1, -3.0)  # Limiter gain
+        report = batch.commit(verify=True)
+        v = report.verify
+        assert v.ok and (v.params, v.devices) == (4, 2)
+        assert v.queries == 2 + 2 * 4
+        assert v.values[(-1000, 4, 1)] == pytest.approx(-3.0)
+        # Tables are now memoized on the session: next commit reads values only
+        batch.set_value(0, 0, 5, 1.5)
+        assert batch.commit(verify=True).verify.queries == 1
+
+    def test_quantized_and_clamped_writes_match(self, fake_live):
+        """Test that quantization and range clamping are applied to the expected value."""
+        fake, session = fake_live
+        batch = ParamBatch(fake.target, throttle_ms=0, listen_port=session.listen_port)
+        batch.set_value(-1000, 2, 3, 1.4)    # quantized -> 1.0
+        batch.set_value(-1000, 4, 1, 99.0)   # clamped -> 24.0
+        v = batch.commit(verify=True).verify
+        assert v.ok
+        assert v.values[(-1000, 2, 3)] == 1.0 and v.values[(-1000, 4, 1)] == pytest.approx(24.0)
+
+    def test_mismatch_raises(self, fake_live, monkeypatch):
+        """Test that a write Live ignored is reported with expected and actual values."""
+        fake, session = fake_live
+        stuck = fake.live_set.param(-1000, 4, 1)
+        monkeypatch.setattr(stuck, "set", lambda value: stuck.value)
+        batch = ParamBatch(fake.target, throttle_ms=0, listen_port=session.listen_port)
+        batch.set_value(-1000, 4, 1, -6.0)
+        batch.set_value(-1000, 4, 2, -1.0)
+        with pytest.raises(ParamVerifyError, match="t-1000/d4/p1 expected -6.000000") as exc:
+            batch.commit(verify=True)
+        (m,) = exc.value.report.mismatches
+        assert m.actual == pytest.approx(stuck.value)
+
+    def test_given_table_saves_queries(self, fake_live):
+        """Test that a table from a device map replaces the metadata queries."""
+        fake, session = fake_live
+        table = get_param_table(0, 0, fake.target, listen_port=session.listen_port)
+        session.memo.clear()
+        v = verify_writes({(0, 0, 5): 0.0}, fake.target, {(0, 0): table}, session.listen_port)
+        assert v.ok and v.queries == 1
+
+    def test_commit_respects_config(self, fake_live, monkeypatch):
+        """Test that debug.verify_after_set: false skips the readback."""
+        fake, session = fake_live
+        monkeypatch.setattr("flaas.param_batch.load_config", lambda: FlaasConfig(verify_after_set=False))
+        batch = ParamBatch(fake.target, throttle_ms=0, listen_port=session.listen_port)
+        batch.set_value(0, 0, 5, 0.0)
+        assert batch.commit().verify is None
+
+    def test_explicit_settings_skip_config(self, fake_live, monkeypatch):
+        """Test that config.yaml is not read when throttle and verify are passed in."""
+        fake, session = fake_live
+        monkeypatch.setattr("flaas.param_batch.load_config", lambda: pytest.fail("config read"))
+        batch = ParamBatch(fake.target, throttle_ms=0, listen_port=session.listen_port, verify_after_set=True)
+        batch.set_value(0, 0, 5, 0.0)
+        assert batch.commit().verify.ok
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
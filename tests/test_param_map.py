@@ -0,0 +1,108 @@
+"""Unit tests for param_map.py - device parameter tables."""
+import numpy as np
+import pytest
+from unittest.mock import patch
+from flaas.osc_rpc import OscSession, OscTarget
+from flaas.param_map import DeviceParamTable, ParamRange, get_param_range, get_param_table, linear_to_norm
+
+
+def _replies(track_id=-1000, device_id=2):
+    return [
+        (track_id, device_id, "Device On", "Gain", "Width", "Mode"),
+        (track_id, device_id, 0.0, -1.0, 0.0, 0.0),
+        (track_id, device_id, 1.0, 1.0, 4.0, 0.0),
+        (track_id, device_id, 1, 0, 0, 1),
+    ]
+
+
+@pytest.fixture
+def table():
+    return DeviceParamTable(-1000, 2, *[r[2:] for r in _replies()])
+
+
+class TestDeviceParamTable:
+    """Test lookups and vectorized conversion."""
+
+    def test_lookup_by_id_and_name(self, table):
+        """Test O(1) lookups by id and case-insensitive name."""
+        assert len(table) == 4
+        assert table.id_of("gain") == 1
+        assert table.range("Width") == ParamRange(0.0, 4.0)
+        assert table.range(1) == ParamRange(-1.0, 1.0)
+        assert table.quantized.tolist() == [True, False, False, True]
+        with pytest.raises(KeyError, match="Nope"):
+            table.id_of("Nope")
+
+    def test_scalar_matches_legacy_helper(self, table):
+        """Test that scalar conversion equals linear_to_norm(x, ParamRange)."""
+        for x in (-2.0, -0.5, 0.0, 0.3, 1.0, 5.0):
+            assert table.linear_to_norm(x, "Gain") == pytest.approx(linear_to_norm(x, table.range("Gain")))
+        assert isinstance(table.linear_to_norm(0.0, 1), float)
+
+    def test_vectorized_roundtrip(self, table):
+        """Test array values over array ids, including a zero-width range."""
+        ids = np.array([1, 2, 3, 1])
+        x = np.array([0.5, 1.0, 7.0, -3.0])
+        n = table.linear_to_norm(x, ids)
+        np.testing.assert_allclose(n, [0.75, 0.25, 0.0, 0.0])
+        np.testing.assert_allclose(table.norm_to_linear(n, ids), [0.5, 1.0, 0.0, -1.0])
+        np.testing.assert_allclose(table.linear_to_norm([0.0, 2.0], ["Gain", "Width"]), [0.5, 0.5])
+
+    def test_short_range_replies_default(self):
+        """Test that missing min/max entries fall back to [0, 1]."""
+        t = DeviceParamTable(0, 0, ["A", "B"], [0.5], [])
+        assert t.range("B") == ParamRange(0.0, 1.0)
+        assert t.range("A") == ParamRange(0.5, 1.0)
+
+
+class TestGetParamTable:
+    """Test one fetch per device per session."""
+
+    @patch("flaas.param_map.request_many")
+    def test_memoized_on_session(self, mock_many):
+        """Test that repeated lookups inside a session reuse the table."""
+        mock_many.return_value = _replies()
+        target = OscTarget()
+        with OscSession(target):
+            t1 = get_param_table(-1000, 2, target)
+            assert get_param_range(-1000, 2, 1, target) == ParamRange(-1.0, 1.0)
+            assert get_param_table(-1000, 2, target) is t1
+        assert mock_many.call_count == 1
+
+    @patch("flaas.param_map.request_many")
+    def test_no_session_fetches_each_time(self, mock_many):
+        """Test that without a session nothing is cached."""
+        mock_many.return_value = _replies()
+        get_param_table(-1000, 2)
+        get_param_table(-1000, 2)
+        assert mock_many.call_count == 2
+
+
+class TestVerifyExpectations:
+    """Test expected readback values and tolerances."""
+
+    def test_expected_clamps_and_quantizes(self, table):
+        """Test what Live should hold after a write."""
+        assert table.expected(0.6, "Device On") == 1.0
+        assert table.expected(-3.0, "Gain") == -1.0
+        assert table.expected(2.25, "Width") == 2.25
+        assert table.expected([0.4, 7.0], [0, 2]).tolist() == [0.0, 4.0]
+
+    def test_tolerance(self, table):
+        """Test range-relative tolerance for continuous params and float noise for quantized ones."""
+        assert table.tolerance("Width") == pytest.approx(4e-3)
+        assert table.tolerance("Mode") < 1e-5
+
+    def test_from_device_map(self):
+        """Test building a table from a device-map payload."""
+        t = DeviceParamTable.from_device_map({"track_id": 0, "device_id": 1, "params": [
+            {"id": 1, "name": "Gain", "min": -15.0, "max": 15.0, "is_quantized": False},
+            {"id": 0, "name": "Device On", "min": 0.0, "max": 1.0, "is_quantized": True},
+        ]})
+        assert (t.track_id, t.device_id, len(t)) == (0, 1, 2)
+        assert t.range("Gain") == ParamRange(-15.0, 15.0)
+        assert t.quantized.tolist() == [True, False]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""Unit tests for registry.py - device/parameter metadata registry."""
+import pytest
+from flaas.fake_live import FakeAbletonOSC, FakeLiveSet
+from flaas.osc_rpc import OscSession
+from flaas.registry import DeviceRegistry, resolve_device_id_by_name, resolve_device_params
+from flaas.scan import DeviceInfo, ScanResult, TrackInfo
+
+
+def _device(name, class_name):
+    return {"name": name, "class_name": class_name, "parameters": [
+        {"name": f"{name} P0", "min": 0.0, "max": 1.0},
+        {"name": f"{name} P1", "min": -10.0, "max": 10.0},
+        {"name": f"{name} P2", "min": 1.0, "max": 2.0, "value": 1.0, "is_quantized": True},
+    ]}
+
+
+@pytest.fixture
+def live(free_port):
+    """Fake AbletonOSC with a Glue/Limiter master and one EQ track; counts requests per address."""
+    live_set = FakeLiveSet.from_dict({
+        "master": {"name": "Master", "devices": [_device("Glue Compressor", "GlueCompressor"), _device("Limiter", "Limiter")]},
+        "tracks": [{"name": "Drums", "devices": [_device("EQ Eight", "Eq8")]}],
+    })
+    with FakeAbletonOSC(live_set, reply_port=free_port) as fake, OscSession(fake.target, listen_port=free_port):
+        yield fake.target, fake, fake.stats.by_address, free_port
+
+
+def _params_calls(calls):
+    return sum(v for k, v in calls.items() if k.startswith("/live/device/get/parameters/"))
+
+
+class TestDeviceRegistry:
+    """Test persistence, hit/miss accounting and per-track invalidation."""
+
+    def test_second_run_is_cache_hit(self, live, tmp_path):
+        """Test that a new run reuses persisted tables after one validation round-trip."""
+        target, _, calls, port = live
+        reg = DeviceRegistry(tmp_path, port)
+        params = reg.device_params(-1000, 1, target)
+        assert params["Limiter P1"] == {"id": 1, "min": -10.0, "max": 10.0, "is_quantized": False}
+        assert params["Limiter P2"]["is_quantized"] is True
+        assert reg.misses == 1 and _params_calls(calls) == 4
+
+        calls.clear()
+        reg2 = DeviceRegistry(tmp_path, port)
+        assert reg2.device_names(-1000, target) == ["Glue Compressor", "Limiter"]
+        assert reg2.device_params(-1000, 1, target) == params
+        assert reg2.hits == 1 and reg2.misses == 0
+        assert _params_calls(calls) == 0
+        assert calls["/live/track/get/devices/name"] == 1  # validation only
+
+    def test_changed_chain_invalidates_only_that_track(self, live, tmp_path):
+        """Test that editing one track's chain re-queries that track and keeps the others."""
+        target, fake, calls, port = live
+        reg = DeviceRegistry(tmp_path, port)
+        reg.device_params(-1000, 0, target)
+        reg.device_params(0, 0, target)
+
+        fake.live_set.master.devices.reverse()
+        calls.clear()
+        reg2 = DeviceRegistry(tmp_path, port)
+        assert reg2.device_params(0, 0, target)["EQ Eight P0"]["id"] == 0
+        assert reg2.device_params(-1000, 0, target)["Limiter P0"]["id"] == 0
+        assert (reg2.hits, reg2.misses) == (1, 1)
+
+    def test_sync_scan_validates_without_rpcs(self, live, tmp_path):
+        """Test that a scan result validates tracks and reports changed ones."""
+        target, _, calls, port = live
+        reg = DeviceRegistry(tmp_path, port)
+        reg.device_params(0, 0, target)
+
+        scan = ScanResult(ok=True, note="", created_at_utc="", num_tracks=1, fingerprint="fp1",
+                          tracks=[TrackInfo(0, "Drums", 1, [DeviceInfo(0, "EQ Eight", "Eq8")])])
+        reg2 = DeviceRegistry(tmp_path, port)
+        assert reg2.sync_scan(scan) == []
+        calls.clear()
+        reg2.device_params(0, 0, target)
+        assert sum(calls.values()) == 0
+
+        scan.tracks[0].devices.append(DeviceInfo(1, "Utility", "StereoGain"))
+        scan.fingerprint = "fp2"
+        assert DeviceRegistry(tmp_path, port).sync_scan(scan) == [0]
+
+    def test_engine_resolvers_use_registry(self, live, tmp_path):
+        """Test the shared resolvers against the registry."""
+        target, _, _, port = live
+        reg = DeviceRegistry(tmp_path, port)
+        did = resolve_device_id_by_name(-1000, "limiter", target, registry=reg)
+        assert did == 1
+        params = resolve_device_params(-1000, did, target, registry=reg)
+        assert set(params) == {"Limiter P0", "Limiter P1", "Limiter P2"}
+
+    def test_invalidate_and_stats(self, live, tmp_path):
+        """Test stats counts and clearing."""
+        target, _, _, port = live
+        reg = DeviceRegistry(tmp_path, port)
+        reg.device_params(-1000, 0, target)
+        reg.device_params(-1000, 1, target)
+        st = reg.stats()
+        assert (st.tracks, st.devices_with_params) == (1, 2)
+        reg.invalidate()
+        assert DeviceRegistry(tmp_path, port).stats().tracks == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,214 @@
+"""Unit tests for rtt.py - adaptive timeouts, backoff and deadlines."""
+import asyncio
+import random
+import threading
+import time
+import pytest
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import ThreadingOSCUDPServer
+from pythonosc.udp_client import SimpleUDPClient
+from flaas.fake_live import FakeAbletonOSC, NetworkModel
+from flaas.osc_rpc import OscSession, OscTarget
+from osc_common.rtt import (
+    MAX_RTO_S,
+    MIN_RTO_S,
+    DeadlineExceeded,
+    RttEstimator,
+    backoff_delay,
+    clip_timeout,
+    current_deadline,
+    deadline,
+    endpoint_class,
+    timeout_error,
+)
+from flaas.scan import scan_live
+
+
+
+@pytest.fixture
+def flaky_server(free_port):
+    """Echo server that drops the first `drop` messages on each address ("/silent" never answers)."""
+    reply_port = free_port
+    reply = SimpleUDPClient("127.0.0.1", reply_port)
+    received = []
+    state = {"drop": 0}
+
+    def _echo(address, *args):
+        received.append(address)
+        if address == "/silent" or received.count(address) <= state["drop"]:
+            return
+        reply.send_message(address, list(args))
+
+    disp = Dispatcher()
+    disp.set_default_handler(_echo)
+    server = ThreadingOSCUDPServer(("127.0.0.1", 0), disp)
+    threading.Thread(target=server.serve_forever, args=(0.02,), daemon=True).start()
+    yield OscTarget(host="127.0.0.1", port=server.server_address[1]), reply_port, state, received
+    server.shutdown()
+    server.server_close()
+
+
+class TestRttEstimator:
+    """Test the RFC 6298 estimator."""
+
+    def test_endpoint_class(self):
+        """Test that addresses group by object + verb."""
+        assert endpoint_class("/live/track/get/devices/name") == "/live/track/get"
+        assert endpoint_class("/live/track/get/name") == "/live/track/get"
+        assert endpoint_class("/live/test") == "/live/test"
+
+    def test_initial_and_first_sample(self):
+        """Test the initial RTO and the clamp on a fast first sample."""
+        est = RttEstimator(initial_rto=0.7)
+        assert est.timeout("/live/song/get/tempo") == 0.7
+        est.observe("/live/song/get/tempo", 0.001)
+        assert est.timeout("/live/song/get/tempo") == MIN_RTO_S
+        assert est.timeout("/live/track/get/name") == 0.7  # other class untouched
+
+    def test_tracks_slow_replies(self):
+        """Test that a slow endpoint class gets SRTT + 4 * RTTVAR."""
+        est = RttEstimator()
+        for _ in range(50):
+            est.observe("/live/device/get/parameters/name", 0.5)
+        st = est.snapshot()["/live/device/get"]
+        assert st["srtt"] == pytest.approx(0.5)
+        assert est.timeout("/live/device/get/parameters/name") == pytest.approx(0.5 + 4 * st["rttvar"])
+
+    def test_timeout_backs_off_until_sample(self):
+        """Test RTO doubling, the cap, and reset by the next sample."""
+        est = RttEstimator(initial_rto=1.0)
+        est.on_timeout("/x")
+        assert est.timeout("/x") == 2.0
+        for _ in range(10):
+            est.on_timeout("/x")
+        assert est.timeout("/x") == MAX_RTO_S
+        est.observe("/x", 0.01)
+        assert est.timeout("/x") == MIN_RTO_S
+
+    def test_window_lost_together_backs_off_once(self):
+        """Test that attempts sent before a backoff do not compound it."""
+        est = RttEstimator(initial_rto=0.5)
+        sent = time.perf_counter()
+        for _ in range(6):
+            est.on_timeout("/live/track/get/name", sent)
+        assert est.timeout("/live/track/get/name") == 1.0
+        assert est.snapshot()["/live/track/get"]["timeouts"] == 6
+        est.on_timeout("/live/track/get/name", time.perf_counter())  # resend timed out too
+        assert est.timeout("/live/track/get/name") == 2.0
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test full-jitter bounds."""
+        rng = random.Random(1)
+        delays = [backoff_delay(3, base=0.05, cap=0.2, rng=rng) for _ in range(200)]
+        assert all(0.0 <= d <= 0.2 for d in delays)
+        assert len(set(delays)) > 100
+
+
+class TestDeadline:
+    """Test deadline budgets."""
+
+    def test_nested_never_extends(self):
+        """Test that an inner deadline cannot outlive the outer one."""
+        with deadline(0.5, "outer") as outer:
+            with deadline(10.0, "inner") as inner:
+                assert inner.expires == outer.expires and inner.label == "outer"
+                assert clip_timeout(5.0) <= 0.5
+            with deadline(0.1, "short") as short:
+                assert short.expires < outer.expires
+        assert current_deadline() is None
+        assert clip_timeout(5.0) == 5.0
+
+    def test_expired_budget_error(self):
+        """Test that timeouts past the budget are reported as DeadlineExceeded."""
+        with deadline(0.0, "op"):
+            err = timeout_error("waiting for /x")
+        assert isinstance(err, DeadlineExceeded) and isinstance(err, TimeoutError)
+        assert "op exceeded its 0.0s budget" in str(err)
+        assert type(timeout_error("waiting for /x")) is TimeoutError
+
+    def test_concurrent_deadlines_are_isolated(self):
+        """Test that two threads and two asyncio tasks each see only their own deadline."""
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        def worker(label, seconds):
+            with deadline(seconds, label):
+                barrier.wait()  # both deadlines active at once
+                seen[label] = (current_deadline().label, clip_timeout(5.0))
+                barrier.wait()
+
+        threads = [threading.Thread(target=worker, args=a) for a in (("short", 0.5), ("long", 3.0))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert seen["short"][0] == "short" and seen["short"][1] <= 0.5
+        assert seen["long"][0] == "long" and 0.5 < seen["long"][1] <= 3.0
+
+        async def task(label, seconds):
+            with deadline(seconds, label):
+                await asyncio.sleep(0.01)  # interleave with the other task
+                return current_deadline().label
+
+        async def both():
+            return await asyncio.gather(task("a", 1.0), task("b", 2.0))
+
+        assert asyncio.run(both()) == ["a", "b"]
+        assert current_deadline() is None
+
+
+class TestAdaptiveSession:
+    """Test adaptive waits and resends on OscSession."""
+
+    def test_learns_rtt(self, flaky_server):
+        """Test that replies feed the session's estimate."""
+        target, reply_port, _, _ = flaky_server
+        with OscSession(target, reply_port) as s:
+            for i in range(5):
+                assert s.request("/live/track/get/name", [i]) == (i,)
+            assert s.rtt.timeout("/live/track/get/name") == MIN_RTO_S
+            assert s.rtt.snapshot()["/live/track/get"]["samples"] == 5
+
+    def test_resends_lost_request(self, flaky_server):
+        """Test that a dropped request is resent after a short adaptive wait."""
+        target, reply_port, state, received = flaky_server
+        with OscSession(target, reply_port) as s:
+            s.rtt = RttEstimator(initial_rto=0.1)
+            state["drop"] = 1
+            t0 = time.perf_counter()
+            fut = s.submit("/live/song/get/tempo", [1])
+            assert s.gather([("/live/song/get/tempo", fut)]) == [(1,)]
+            assert time.perf_counter() - t0 < 1.0
+        assert received.count("/live/song/get/tempo") == 2
+        assert fut.retries == 1
+
+    def test_fixed_timeout_does_not_resend(self, flaky_server):
+        """Test that an explicit timeout_sec keeps the single-attempt behavior."""
+        target, reply_port, _, received = flaky_server
+        with OscSession(target, reply_port) as s:
+            with pytest.raises(TimeoutError):
+                s.request("/silent", [1], timeout_sec=0.1)
+        assert received.count("/silent") == 1
+
+    def test_deadline_caps_retries(self, flaky_server):
+        """Test that a silent endpoint fails at the deadline, not after every backed-off retry."""
+        target, reply_port, _, _ = flaky_server
+        with OscSession(target, reply_port) as s:
+            t0 = time.perf_counter()
+            with deadline(0.3, "probe"), pytest.raises(DeadlineExceeded, match="/silent"):
+                s.request("/silent", [1])
+            assert time.perf_counter() - t0 < 0.8
+
+    def test_scan_survives_loss(self, free_port):
+        """Test that a pipelined scan completes over a lossy link."""
+        port = free_port
+        with FakeAbletonOSC(reply_port=port, network=NetworkModel(loss=0.15, seed=7)) as fake:
+            with OscSession(fake.target, port) as s:
+                s.rtt = RttEstimator(initial_rto=0.1)
+                res = scan_live(fake.target, listen_port=port)
+        assert [t.name for t in res.tracks] == [t.name for t in fake.live_set.tracks]
+        assert fake.stats.dropped > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+"""Unit tests for scan.py - concurrent Live set scan."""
+import copy
+import hashlib
+import json
+import threading
+import pytest
+from dataclasses import asdict
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import ThreadingOSCUDPServer
+from pythonosc.udp_client import SimpleUDPClient
+from flaas.osc_rpc import OscSession, OscTarget
+from flaas.scan import diff_scans, load_model_cache, scan_live, scan_live_incremental, track_fingerprint
+
+
+
+TRACKS = [
+    ("Drums", [("EQ Eight", "Eq8"), ("Glue Compressor", "GlueCompressor")]),
+    ("Bass", [("Utility", "StereoGain")]),
+    ("Vox", []),
+] + [(f"T{i}", [("Utility", "StereoGain")]) for i in range(3, 20)]
+
+
+@pytest.fixture
+def live(free_port):
+    """Fake AbletonOSC answering track queries after a short delay; tracks max outstanding requests."""
+    reply_port = free_port
+    reply = SimpleUDPClient("127.0.0.1", reply_port)
+    lock = threading.Lock()
+    tracks = copy.deepcopy(TRACKS)
+    stats = {"outstanding": 0, "max_outstanding": 0, "tracks": tracks, "calls": []}
+
+    def _answer(address, payload):
+        with lock:
+            stats["outstanding"] -= 1
+        reply.send_message(address, payload)
+
+    def _handler(address, *args):
+        with lock:
+            stats["calls"].append(address)
+        if address == "/live/song/get/num_tracks":
+            reply.send_message(address, [len(tracks)])
+            return
+        if address == "/live/song/get/track_names":
+            reply.send_message(address, [name for name, _ in tracks])
+            return
+        tid = args[0]
+        name, chain = tracks[tid]
+        payload = {
+            "/live/track/get/name": [tid, name],
+            "/live/track/get/num_devices": [tid, len(chain)],
+            "/live/track/get/devices/name": [tid] + [n for n, _ in chain],
+            "/live/track/get/devices/class_name": [tid] + [c for _, c in chain],
+        }[address]
+        with lock:
+            stats["outstanding"] += 1
+            stats["max_outstanding"] = max(stats["max_outstanding"], stats["outstanding"])
+        threading.Timer(0.01, _answer, args=(address, payload)).start()
+
+    disp = Dispatcher()
+    disp.set_default_handler(_handler)
+    server = ThreadingOSCUDPServer(("127.0.0.1", 0), disp)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    target = OscTarget(host="127.0.0.1", port=server.server_address[1])
+    with OscSession(target, listen_port=reply_port):
+        yield target, stats, reply_port
+    server.shutdown()
+    server.server_close()
+
+
+def _sha(s):
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+
+def _serial_fingerprint(tracks):
+    """Merkle root computed directly from the fixture."""
+    parts = []
+    for tid, (name, chain) in tracks:
+        devs = [_sha(f"{i}:{n}\x1f{c}") for i, (n, c) in enumerate(chain)]
+        chain_hash = _sha(f"{tid}:" + "|".join(devs))
+        parts.append(f"{tid}:" + _sha(f"{chain_hash}:{name}:{len(chain)}"))
+    return _sha(";".join(parts))
+
+
+class TestScanLive:
+    """Test that the pipelined scan matches the serial result."""
+
+    def test_full_scan_matches_serial_fingerprint(self, live):
+        """Test same tracks, order and fingerprint as the serial walk."""
+        target, _, port = live
+        res = scan_live(target, timeout_sec=2.0, listen_port=port)
+        assert res.num_tracks == len(TRACKS)
+        assert [t.name for t in res.tracks] == [name for name, _ in TRACKS]
+        assert [d.class_name for d in res.tracks[0].devices] == ["Eq8", "GlueCompressor"]
+        assert res.fingerprint == _serial_fingerprint(enumerate(TRACKS))
+
+    def test_window_is_bounded(self, live):
+        """Test that no more than max_in_flight queries are outstanding."""
+        target, stats, port = live
+        scan_live(target, max_in_flight=5, listen_port=port)
+        assert 1 < stats["max_outstanding"] <= 5
+
+    def test_per_track_timing(self, live):
+        """Test that every scanned track gets a latency entry."""
+        target, _, port = live
+        res = scan_live(target, listen_port=port)
+        assert set(res.track_ms) == set(range(len(TRACKS)))
+        assert all(ms >= 10.0 for ms in res.track_ms.values())  # server delays each reply 10 ms
+        assert res.elapsed_ms >= max(res.track_ms.values())
+
+    def test_targeted_scan(self, live):
+        """Test a targeted scan keeps the requested order and skips out-of-range ids."""
+        target, _, port = live
+        res = scan_live(target, track_ids=[2, 0, 99], listen_port=port)
+        assert [t.track_id for t in res.tracks] == [2, 0]
+        assert res.fingerprint == _serial_fingerprint([(2, TRACKS[2]), (0, TRACKS[0])])
+
+
+
+class TestIncrementalScan:
+    """Test Merkle hashes and probe-driven rescans."""
+
+    def test_unchanged_set_requeries_nothing(self, live):
+        """Test that an unchanged set costs the probes only and keeps the root."""
+        target, stats, port = live
+        full = scan_live(target, listen_port=port)
+        stats["calls"].clear()
+        inc = scan_live_incremental(full, target, listen_port=port)
+        assert inc.fingerprint == full.fingerprint
+        assert inc.changed == []
+        assert "/live/track/get/devices/name" not in stats["calls"]
+        assert stats["calls"].count("/live/track/get/num_devices") == len(TRACKS)
+
+    def test_changed_track_is_requeried(self, live):
+        """Test that only the probed-changed track is re-queried and reported."""
+        target, stats, port = live
+        full = scan_live(target, listen_port=port)
+        stats["tracks"][1] = ("Bass", [("Utility", "StereoGain"), ("Saturator", "Saturator")])
+        stats["calls"].clear()
+        inc = scan_live_incremental(full, target, listen_port=port)
+        assert stats["calls"].count("/live/track/get/devices/name") == 1
+        assert inc.changed == [1]
+        assert inc.fingerprint == _serial_fingerprint(enumerate(stats["tracks"]))
+        assert inc.fingerprint == scan_live(target, listen_port=port).fingerprint
+        assert inc.tracks[1].devices[1].class_name == "Saturator"
+
+    def test_diff_scans_names_changed_tracks(self, live):
+        """Test per-track hashes localize a change the probe cannot see."""
+        target, stats, port = live
+        before = scan_live(target, listen_port=port)
+        stats["tracks"][0] = ("Drums", [("EQ Eight", "Eq8"), ("Compressor", "Compressor2")])
+        after = scan_live(target, listen_port=port)
+        assert before.fingerprint != after.fingerprint
+        assert diff_scans(before, after) == [0]
+        assert after.tracks[0].devices[0].hash == before.tracks[0].devices[0].hash
+
+    def test_track_hash_builds_on_registry_key(self, live):
+        """Test that the track hash is derived from the registry's chain fingerprint."""
+        target, _, port = live
+        for t in scan_live(target, listen_port=port).tracks:
+            chain = track_fingerprint(t.track_id, [d.name for d in t.devices], [d.class_name for d in t.devices])
+            assert t.hash == _sha(f"{chain}:{t.name}:{t.num_devices}")
+
+    def test_model_cache_round_trip(self, live, tmp_path):
+        """Test that a written cache loads back with the same hashes."""
+        target, _, port = live
+        res = scan_live(target, track_ids=[0, 1], listen_port=port)
+        path = tmp_path / "model_cache.json"
+        path.write_text(json.dumps(asdict(res)), encoding="utf-8")
+        loaded = load_model_cache(path)
+        assert loaded == res
+        assert loaded.track_ids == [0, 1]
+        assert load_model_cache(tmp_path / "missing.json") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
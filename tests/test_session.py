@@ -0,0 +1,85 @@
+"""Unit tests for session.py - decode-once AudioSession."""
+import pytest
+import numpy as np
+import soundfile as sf
+from unittest.mock import patch
+from flaas.analyze import analyze_wav
+from flaas.cache import AnalysisCache
+from flaas.check import check_wav
+from flaas.follow import FollowingMeter
+from flaas.session import AudioSession
+from flaas.verify_audio import verify_audio
+
+
+@pytest.fixture
+def test_wav(tmp_path):
+    """Create a 2 s stereo sine WAV."""
+    t = np.arange(96000) / 48000
+    audio = 0.5 * np.sin(2 * np.pi * 997 * t)
+    path = tmp_path / "test.wav"
+    sf.write(path, np.stack([audio, 0.5 * audio], axis=1), 48000)
+    return path
+
+
+class TestAudioSession:
+    """Test memoization of decoded and derived arrays."""
+
+    def test_arrays_are_memoized(self, test_wav):
+        """Test that derived arrays are computed once and decode happens once."""
+        s = AudioSession(test_wav)
+        assert s.audio is s.audio
+        assert s.k_weighted is s.k_weighted
+        assert s.decodes == 1
+
+    def test_shapes(self, test_wav):
+        """Test decoded and per-channel K-weighted shapes."""
+        s = AudioSession(test_wav)
+        assert s.audio.shape == (96000, 2)
+        assert s.k_weighted.shape == (96000, 2)
+
+
+class TestSessionAnalysis:
+    """Test analyze/check/verify sharing one session."""
+
+    def test_matches_path_analysis(self, test_wav):
+        """Test that session analysis equals file-based analysis."""
+        a = analyze_wav(test_wav)
+        b = analyze_wav(AudioSession(test_wav))
+        assert b.lufs_i == pytest.approx(a.lufs_i, abs=1e-6)
+        assert b.true_peak_dbtp == pytest.approx(a.true_peak_dbtp, abs=1e-6)
+        assert b.peak_dbfs == pytest.approx(a.peak_dbfs, abs=1e-6)
+
+    def test_analyze_then_check_decodes_once(self, test_wav):
+        """Test that check reuses the session's analysis."""
+        s = AudioSession(test_wav)
+        a = analyze_wav(s)
+        with patch("flaas.analyze.StreamingMeter") as meter:
+            c = check_wav(s)
+            meter.assert_not_called()
+        assert s.decodes == 1
+        assert c.lufs_i == a.lufs_i
+
+    def test_timelines_result_serves_plain_request(self, test_wav):
+        """Test that a timelines analysis satisfies a later plain request."""
+        s = AudioSession(test_wav)
+        full = analyze_wav(s, timelines=True)
+        assert analyze_wav(s) is full
+
+    def test_verify_audio_single_decode(self, test_wav, tmp_path, capsys):
+        """Test that verify_audio decodes the file exactly once."""
+        s = AudioSession(test_wav)
+        verify_audio(s, cache=AnalysisCache(tmp_path / "caches"))
+        assert s.decodes == 1
+        assert "FILE:" in capsys.readouterr().out
+
+    def test_follower_seeds_session(self, test_wav):
+        """Test that a FollowingMeter result is memoized on the session (check needs no decode)."""
+        s = AudioSession(test_wav)
+        follower = FollowingMeter(test_wav)
+        a = follower.finish(session=s)
+        assert check_wav(s).lufs_i == a.lufs_i
+        assert s.decodes == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
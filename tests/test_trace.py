@@ -0,0 +1,112 @@
+"""Unit tests for trace.py - per-call trace spans."""
+import json
+import pytest
+from finishline_audio.osc.rpc import OscConfig, OscRpc
+from flaas.fake_live import FakeAbletonOSC, NetworkModel
+from flaas.osc_rpc import request_once
+from osc_common.trace import Tracer, read_trace, span, summarize_args, summarize_trace, to_chrome
+
+
+
+def _rpc_events(path):
+    return [e for e in read_trace(path) if e["cat"] == "rpc"]
+
+
+class TestSpans:
+    """Test span recording without OSC."""
+
+    def test_no_tracer_is_noop(self, tmp_path):
+        """Test that span() outside a Tracer records nothing and still runs the block."""
+        ran = []
+        with span("idle"):
+            ran.append(1)
+        assert ran == [1]
+
+    def test_span_and_error(self, tmp_path):
+        """Test nested spans and the exception type on a failing block."""
+        path = tmp_path / "t.jsonl"
+        with Tracer(path) as tracer:
+            with span("outer", cat="run", mode="x"):
+                with pytest.raises(ValueError):
+                    with span("inner"):
+                        raise ValueError("boom")
+        assert tracer.events == 3  # metadata + 2 spans
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert lines[0]["ph"] == "M"
+        inner, outer = read_trace(path)
+        assert inner["args"] == {"error": "ValueError"}
+        assert outer["args"] == {"mode": "x"}
+        assert outer["dur"] >= inner["dur"]
+
+    def test_summarize_args_truncates(self):
+        """Test that long lists and strings are shortened."""
+        assert summarize_args([0, 1, 2, 3, 4, 5, 6, 7]) == [0, 1, 2, 3, 4, 5, "+2"]
+        assert summarize_args("x" * 100).endswith("...")
+        assert summarize_args(None) is None
+
+
+class TestRpcSpans:
+    """Test that OSC transports record one span per request."""
+
+    def test_session_requests(self, fake_live, tmp_path):
+        """Test OscSession replies and timeouts."""
+        _, session = fake_live
+        path = tmp_path / "t.jsonl"
+        with Tracer(path):
+            session.request("/live/track/get/name", [0])
+            with pytest.raises(TimeoutError):
+                session.request("/live/track/get/name", [99], timeout_sec=0.1)
+        ok, lost = _rpc_events(path)
+        assert ok["name"] == "/live/track/get/name"
+        assert ok["args"] == {"args": [0], "retries": 0, "timeout": False, "transport": "osc_rpc"}
+        assert lost["args"]["timeout"] is True
+        assert lost["dur"] >= 90_000
+
+    def test_request_once_without_session(self, free_port, tmp_path):
+        """Test the one-shot fallback path."""
+        port = free_port
+        path = tmp_path / "t.jsonl"
+        with FakeAbletonOSC(reply_port=port) as fake, Tracer(path):
+            request_once(fake.target, "/live/song/get/num_tracks", None, port)
+        (ev,) = _rpc_events(path)
+        assert ev["name"] == "/live/song/get/num_tracks" and not ev["args"]["timeout"]
+
+    def test_finishline_retries(self, free_port, tmp_path):
+        """Test that resends are counted on the finishline transport."""
+        port = free_port
+        path = tmp_path / "t.jsonl"
+        with FakeAbletonOSC(reply_port=port, network=NetworkModel(loss=1.0)) as fake:
+            rpc = OscRpc(OscConfig(host=fake.target.host, port_in=fake.target.port, port_out=port, timeout_s=0.05, retries=2))
+            rpc.start()
+            try:
+                with Tracer(path), pytest.raises(TimeoutError):
+                    rpc.call("/live/track/get/name", 0)
+            finally:
+                rpc.stop()
+        (ev,) = _rpc_events(path)
+        assert ev["args"]["transport"] == "finishline"
+        assert ev["args"]["retries"] == 2 and ev["args"]["timeout"] is True
+
+
+class TestSummaries:
+    """Test trace aggregation and Chrome export."""
+
+    def test_summarize_and_chrome(self, tmp_path):
+        """Test per-endpoint counts, percentiles and timeout rate."""
+        path = tmp_path / "t.jsonl"
+        with Tracer(path) as tracer:
+            for i in range(10):
+                tracer.complete("/a", "rpc", 0.0, (i + 1) / 1000.0, timeout=(i == 9))
+            tracer.complete("/b", "rpc", 0.0, 0.001)
+        a, b = summarize_trace(path)
+        assert (a.name, a.count, a.timeouts) == ("/a", 10, 1)
+        assert a.timeout_rate == pytest.approx(0.1)
+        assert a.p50_ms == pytest.approx(5.0) and a.p99_ms == pytest.approx(10.0)
+        assert b.count == 1 and b.timeout_rate == 0.0
+        out = to_chrome(path)
+        doc = json.loads(out.read_text())
+        assert out.suffix == ".json" and len(doc["traceEvents"]) == 12
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
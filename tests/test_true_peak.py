@@ -0,0 +1,94 @@
+"""Unit tests for true_peak.py - BS.1770-4 polyphase true-peak estimator."""
+import pytest
+import numpy as np
+from flaas.true_peak import POLYPHASE_COEFFS, TruePeakState, true_peak
+
+
+def _db(x: float) -> float:
+    return 20 * np.log10(x)
+
+
+class TestPolyphaseCoeffs:
+    """Test the BS.1770-4 Annex 2 filter table."""
+
+    def test_shape(self):
+        """Test 4 phases x 12 taps (48-tap prototype)."""
+        assert POLYPHASE_COEFFS.shape == (4, 12)
+
+    def test_phases_are_mirrored(self):
+        """Test that phase k is phase 3-k reversed (linear-phase prototype)."""
+        for k in range(4):
+            np.testing.assert_array_equal(POLYPHASE_COEFFS[k], POLYPHASE_COEFFS[3 - k][::-1])
+
+
+class TestTruePeak:
+    """Test true_peak against tests/validate_true_peak.py reference levels."""
+
+    @pytest.mark.parametrize("amplitude", [1.0, 0.5, 0.25])
+    def test_sine_1khz_levels(self, amplitude):
+        """Test 1 kHz sine at 0/-6/-12 dBFS reads within 0.5 dB of nominal."""
+        t = np.arange(44100) / 44100
+        x = amplitude * np.sin(2 * np.pi * 1000 * t)
+        assert abs(_db(true_peak(x)) - _db(amplitude)) < 0.5
+
+    def test_intersample_peak_detected(self):
+        """Test fs/4 sine at 45 deg phase: samples sit at -3 dB, true peak is ~0 dBTP."""
+        n = np.arange(48000)
+        x = np.sin(2 * np.pi * n / 4 + np.pi / 4)
+        assert _db(np.max(np.abs(x))) == pytest.approx(-3.01, abs=0.01)
+        assert abs(_db(true_peak(x))) < 0.5
+
+    def test_silence(self):
+        """Test that silence has zero true peak."""
+        assert true_peak(np.zeros(1000)) == 0.0
+
+    def test_no_wraparound_at_edges(self):
+        """Test a single loud sample at the end does not leak into the start (no circular FFT)."""
+        x = np.zeros(4096)
+        x[-1] = 1.0
+        state = TruePeakState()
+        state.process(x[:2048])
+        assert state.peak == 0.0
+
+
+class TestTruePeakState:
+    """Test streaming state handling."""
+
+    @pytest.mark.parametrize("block", [1, 7, 1000, 1 << 17])
+    def test_blockwise_matches_one_shot(self, block):
+        """Test that carried history makes block size irrelevant."""
+        rng = np.random.default_rng(1)
+        x = rng.standard_normal((20000, 2)) * 0.3
+        state = TruePeakState(channels=2)
+        for i in range(0, len(x), block):
+            state.process(x[i:i + block])
+        one_shot = TruePeakState(channels=2)
+        one_shot.process(x)
+        np.testing.assert_allclose(state.peaks, one_shot.peaks, rtol=1e-12)
+
+    def test_per_channel_peaks(self):
+        """Test that channels are tracked independently."""
+        t = np.arange(48000) / 48000
+        x = np.stack([np.sin(2 * np.pi * 997 * t), 0.5 * np.sin(2 * np.pi * 997 * t)], axis=1)
+        state = TruePeakState(channels=2)
+        state.process(x)
+        assert state.peaks[0] == pytest.approx(2 * state.peaks[1], rel=1e-9)
+
+    def test_float32_matches_float64(self):
+        """Test that float32 interpolation is within 0.01 dB of float64."""
+        rng = np.random.default_rng(4)
+        x = (rng.standard_normal((48000, 2)) * 0.3).astype(np.float32)
+        s32, s64 = TruePeakState(2, dtype=np.float32), TruePeakState(2, dtype=np.float64)
+        s32.process(x)
+        s64.process(x)
+        np.testing.assert_allclose(_db(s32.peaks), _db(s64.peaks), atol=0.01)
+
+    def test_channel_mismatch_raises(self):
+        """Test that a block with the wrong channel count is rejected."""
+        state = TruePeakState(channels=2)
+        with pytest.raises(ValueError):
+            state.process(np.zeros((10, 3)))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -7,12 +7,13 @@ from flaas.util import (
     UTILITY_GAIN_PARAM_ID
 )
 from flaas.osc_rpc import OscTarget
+from flaas.param_map import DeviceParamTable
 
 
 class TestSetUtilityGainNorm:
     """Test normalized utility gain setter."""
     
-    @patch("flaas.util.SimpleUDPClient")
+    @patch("flaas.osc_rpc.SimpleUDPClient")
     def test_set_utility_gain_norm_sends_message(self, mock_client_class):
         """Test that gain setter sends OSC message."""
         mock_client = MagicMock()
@@ -25,7 +26,7 @@ class TestSetUtilityGainNorm:
         assert args[0] == "/live/device/set/parameter/value"
         assert args[1] == [-1000, 0, UTILITY_GAIN_PARAM_ID, 0.5]
     
-    @patch("flaas.util.SimpleUDPClient")
+    @patch("flaas.osc_rpc.SimpleUDPClient")
     def test_set_utility_gain_norm_clamps_high(self, mock_client_class):
         """Test that gain values are clamped to 1.0."""
         mock_client = MagicMock()
@@ -36,7 +37,7 @@ class TestSetUtilityGainNorm:
         args = mock_client.send_message.call_args[0][1]
         assert args[3] == 1.0  # Clamped to max
     
-    @patch("flaas.util.SimpleUDPClient")
+    @patch("flaas.osc_rpc.SimpleUDPClient")
     def test_set_utility_gain_norm_clamps_low(self, mock_client_class):
         """Test that gain values are clamped to 0.0."""
         mock_client = MagicMock()
@@ -47,7 +48,7 @@ class TestSetUtilityGainNorm:
         args = mock_client.send_message.call_args[0][1]
         assert args[3] == 0.0  # Clamped to min
     
-    @patch("flaas.util.SimpleUDPClient")
+    @patch("flaas.osc_rpc.SimpleUDPClient")
     def test_set_utility_gain_norm_uses_target(self, mock_client_class):
         """Test that custom target is used."""
         mock_client = MagicMock()
@@ -59,21 +60,31 @@ class TestSetUtilityGainNorm:
         # Verify client was created with custom target
         mock_client_class.assert_called_once_with("192.168.1.100", 9000)
 
+    @patch("flaas.util.expect_param")
+    @patch("flaas.osc_rpc.SimpleUDPClient")
+    def test_set_utility_gain_norm_expects_write(self, mock_client_class, mock_expect):
+        """Test that the write is announced to the mirror (clamped value) before it is sent."""
+        set_utility_gain_norm(track_id=-1000, device_id=0, gain_norm_0_1=1.5)
+
+        mock_expect.assert_called_once_with(-1000, 0, UTILITY_GAIN_PARAM_ID, 1.0, OscTarget())
+
+
+def _utility_table() -> DeviceParamTable:
+    """Utility parameter table with Gain (id 9) spanning -1.0..+1.0."""
+    names = [f"P{i}" for i in range(UTILITY_GAIN_PARAM_ID)] + ["Gain"]
+    mins = [0.0] * UTILITY_GAIN_PARAM_ID + [-1.0]
+    return DeviceParamTable(-1000, 0, names, mins, [1.0] * len(names))
+
 
 class TestSetUtilityGainLinear:
     """Test linear utility gain setter."""
     
-    @patch("flaas.util.get_param_range")
+    @patch("flaas.util.get_param_table")
     @patch("flaas.util.set_utility_gain_norm")
-    def test_set_utility_gain_linear_converts_to_norm(self, mock_set_norm, mock_get_range):
+    def test_set_utility_gain_linear_converts_to_norm(self, mock_set_norm, mock_get_table):
         """Test that linear value is converted to normalized."""
-        from flaas.param_map import ParamRange
-        
-        # Mock param range: -1.0 to +1.0 linear maps to 0.0 to 1.0 normalized
-        mock_get_range.return_value = ParamRange(
-            min=-1.0,
-            max=1.0
-        )
+        # Mock param table: Gain -1.0 to +1.0 linear maps to 0.0 to 1.0 normalized
+        mock_get_table.return_value = _utility_table()
         
         set_utility_gain_linear(track_id=-1000, device_id=0, gain_linear=0.0)
         
@@ -83,32 +94,22 @@ class TestSetUtilityGainLinear:
         call_args = mock_set_norm.call_args[0]
         assert abs(call_args[2] - 0.5) < 0.01  # gain_norm_0_1 is 3rd positional arg
     
-    @patch("flaas.util.get_param_range")
+    @patch("flaas.util.get_param_table")
     @patch("flaas.util.set_utility_gain_norm")
-    def test_set_utility_gain_linear_max_value(self, mock_set_norm, mock_get_range):
+    def test_set_utility_gain_linear_max_value(self, mock_set_norm, mock_get_table):
         """Test that max linear value maps to 1.0 normalized."""
-        from flaas.param_map import ParamRange
-        
-        mock_get_range.return_value = ParamRange(
-            min=-1.0,
-            max=1.0
-        )
+        mock_get_table.return_value = _utility_table()
         
         set_utility_gain_linear(track_id=-1000, device_id=0, gain_linear=1.0)
         
         call_args = mock_set_norm.call_args[0]
         assert abs(call_args[2] - 1.0) < 0.01
     
-    @patch("flaas.util.get_param_range")
+    @patch("flaas.util.get_param_table")
     @patch("flaas.util.set_utility_gain_norm")
-    def test_set_utility_gain_linear_min_value(self, mock_set_norm, mock_get_range):
+    def test_set_utility_gain_linear_min_value(self, mock_set_norm, mock_get_table):
         """Test that min linear value maps to 0.0 normalized."""
-        from flaas.param_map import ParamRange
-        
-        mock_get_range.return_value = ParamRange(
-            min=-1.0,
-            max=1.0
-        )
+        mock_get_table.return_value = _utility_table()
         
         set_utility_gain_linear(track_id=-1000, device_id=0, gain_linear=-1.0)
         
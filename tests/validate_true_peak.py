@@ -4,7 +4,7 @@ True Peak Validation Test
 
 Purpose: Validate our true peak implementation against reference values.
 
-Our implementation: 4x oversampling via scipy.signal.resample
+Our implementation: flaas.true_peak (BS.1770-4 Annex 2 48-tap polyphase, 4x)
 ITU-R BS.1770-4 spec: 4x oversampling with proper inter-sample peak detection
 
 Test methodology:
@@ -13,9 +13,9 @@ Test methodology:
 3. Compare against reference meter (ffmpeg ebur128, Youlean, etc.)
 4. Validate accuracy within 0.5 dB tolerance
 
-CRITICAL: This is a placeholder validation script.
-Our current true peak implementation (scipy resample) is an approximation.
-It needs validation against a trusted reference meter.
+Automated checks for the levels below live in tests/test_true_peak.py.
+This script generates the same signals for comparison against a trusted
+reference meter.
 
 TODO:
 - Generate test signals (1 kHz sine at various levels)
@@ -23,11 +23,6 @@ TODO:
 - Measure same files with ffmpeg -filter ebur128=peak=true
 - Compare results
 - Accept if within 0.5 dB tolerance
-
-If validation fails, replace with proper ITU-R BS.1770-4 implementation:
-- Option 1: Use ffmpeg subprocess for true peak
-- Option 2: Use pyebur128 (needs proper API integration)
-- Option 3: Implement proper oversample + lowpass filter per spec
 """
 
 import numpy as np